@@ -0,0 +1,84 @@
+import threading
+from .connection_pool import close_all_pools
+from .write_queue import write_queue
+
+
+class AppContext:
+    """Registry of the shared services, created on first use and closed together.
+
+    Modules register a factory under a name instead of building an instance
+    at import time; get(name) builds it on the first call and hands every
+    screen the same instance after that. close() runs the shutdown hooks,
+    last added first like atexit. By default they commit the write queue,
+    close the services built so far (newest first, through their close()
+    method) and then close every pooled connection; a hook added later,
+    such as waiting for background tasks, runs before all of these.
+    install(app) runs close() when the QApplication is about to quit.
+    """
+
+    def __init__(self):
+        self._factories = {}
+        self._services = {}
+        self._hooks = []
+        self._lock = threading.RLock()
+
+    def register(self, name, factory):
+        """Make factory() the way to build the service called name"""
+        with self._lock:
+            self._factories[name] = factory
+
+    def get(self, name):
+        """The shared instance of a registered service, built on first use"""
+        with self._lock:
+            if name not in self._services:
+                if name not in self._factories:
+                    raise KeyError(f"No service registered as {name!r}")
+                self._services[name] = self._factories[name]()
+            return self._services[name]
+
+    def is_created(self, name):
+        with self._lock:
+            return name in self._services
+
+    def add_shutdown_hook(self, hook):
+        """Run hook() on close(), before the hooks added earlier"""
+        with self._lock:
+            self._hooks.append(hook)
+
+    def close_services(self):
+        """Close the services built so far; get() builds them afresh afterwards"""
+        with self._lock:
+            services = list(self._services.items())
+            self._services.clear()
+
+        for name, service in reversed(services):
+            close = getattr(service, 'close', None)
+            if close is None:
+                continue
+            try:
+                close()
+            except Exception as e:
+                print(f"Error closing {name}: {str(e)}")
+
+    def close(self):
+        """Run the shutdown hooks, last added first"""
+        with self._lock:
+            hooks = list(self._hooks)
+        for hook in reversed(hooks):
+            try:
+                hook()
+            except Exception as e:
+                print(f"Shutdown hook error: {str(e)}")
+
+    def install(self, app):
+        """Close everything when the Qt application quits"""
+        app.aboutToQuit.connect(self.close)
+        return app
+
+
+# Create the shared application context. On close the queued writes are
+# committed first, then the services close, then the pooled connections.
+app_context = AppContext()
+app_context.add_shutdown_hook(close_all_pools)
+app_context.add_shutdown_hook(app_context.close_services)
+app_context.add_shutdown_hook(write_queue.close)
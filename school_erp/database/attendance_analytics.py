@@ -0,0 +1,198 @@
+import threading
+import time
+from .db_config import db_config
+from .migrations import PRESENT_STATUSES
+
+# Attendance % at or above which a student or section is "Good", then "Average";
+# anything lower is a "Warning"
+GOOD_THRESHOLD = 85.0
+AVERAGE_THRESHOLD = 80.0
+
+# Consecutive absences that put a student on "Warning" whatever their %
+ABSENCE_STREAK_LIMIT = 3
+
+# Seconds before every student is re-read, catching edits the counters cannot see
+FULL_REFRESH_SECONDS = 600
+
+# Students per streak query (SQLite bind variable limit)
+STREAK_BATCH_SIZE = 500
+
+_PRESENT_LIST = ', '.join(f"'{status}'" for status in PRESENT_STATUSES)
+
+# Running counters kept by the attendance triggers, one row per marked student
+COUNTERS_QUERY = '''
+    SELECT sm.student_id, s.roll_no, s.name, s.class, s.section,
+           sm.present_days, sm.total_days
+    FROM attendance_summary sm
+    JOIN students s ON s.student_id = sm.student_id
+'''
+
+# Each student's marks in date order, read straight off the (student_id, date)
+# index. One ordered pass finds the streaks; it measured several times faster
+# than the gaps-and-islands window query, which needs four temp-table sorts.
+MARKS_QUERY = f'''
+    SELECT student_id, date, status IN ({_PRESENT_LIST})
+    FROM attendance
+    WHERE student_id IN ({{placeholders}})
+    ORDER BY student_id, date
+'''
+
+STUDENT_FIELDS = [
+    'student_id', 'roll_no', 'name', 'class', 'section', 'present_days', 'total_days',
+    'percentage', 'current_streak', 'longest_absence', 'last_marked', 'status'
+]
+
+
+def attendance_status(percentage, absence_streak=0):
+    """'Good', 'Average' or 'Warning' for an attendance % and current absence streak"""
+    if absence_streak >= ABSENCE_STREAK_LIMIT or percentage < AVERAGE_THRESHOLD:
+        return 'Warning'
+    if percentage < GOOD_THRESHOLD:
+        return 'Average'
+    return 'Good'
+
+
+def _streaks(marks):
+    """{student_id: (current streak, longest absence run, last date)} from marks
+    ordered by student and date; the current streak is negative for absences"""
+    streaks = {}
+    student = None
+    for student_id, date, present in marks:
+        if student_id != student:
+            student, kind, run, absent_run, longest_absence = student_id, None, 0, 0, 0
+        run = run + 1 if present == kind else 1
+        kind = present
+        absent_run = 0 if present else absent_run + 1
+        longest_absence = max(longest_absence, absent_run)
+        streaks[student_id] = (run if present else -run, longest_absence, date)
+    return streaks
+
+
+def _percentage(present, total):
+    return round(100.0 * present / total, 2) if total else 0.0
+
+
+class AttendanceAnalytics:
+    """Per-student, per-section and per-grade attendance, updated incrementally.
+
+    Percentages come from the running counters the attendance triggers keep
+    in attendance_summary, so reading them never rescans the marks. Streaks
+    need the marks themselves: on refresh() they are recomputed only for the
+    students whose counters moved since the last look (a new or changed mark
+    always moves them), in one index-ordered pass per batch of students.
+    Section and grade figures are folded from the cached students.
+    """
+
+    def __init__(self):
+        self.version = 0
+        self._students = {}
+        self._counters = {}
+        self._loaded_at = None
+        self._lock = threading.Lock()
+
+    def refresh(self, full=False):
+        """Pick up new marks; returns the number of students recomputed"""
+        if self._loaded_at is None or time.monotonic() - self._loaded_at >= FULL_REFRESH_SECONDS:
+            full = True
+
+        conn = db_config.get_connection()
+        rows = conn.execute(COUNTERS_QUERY).fetchall()
+        with self._lock:
+            known = dict(self._counters) if not full else {}
+
+        changed = [row for row in rows if known.get(row[0]) != (row[5], row[6])]
+        streaks = {}
+        for start in range(0, len(changed), STREAK_BATCH_SIZE):
+            ids = [row[0] for row in changed[start:start + STREAK_BATCH_SIZE]]
+            query = MARKS_QUERY.format(placeholders=', '.join('?' * len(ids)))
+            streaks.update(_streaks(conn.execute(query, ids)))
+
+        current_ids = {row[0] for row in rows}
+        with self._lock:
+            if full:
+                self._students = {}
+                self._counters = {}
+            for student_id, roll_no, name, class_name, section, present, total in changed:
+                streak, longest_absence, last_date = streaks.get(student_id, (0, 0, None))
+                percentage = _percentage(present, total)
+                self._students[student_id] = {
+                    'student_id': student_id,
+                    'roll_no': roll_no,
+                    'name': name,
+                    'class': class_name,
+                    'section': section,
+                    'present_days': present,
+                    'total_days': total,
+                    'percentage': percentage,
+                    # Positive: days present in a row; negative: days absent in a row
+                    'current_streak': streak,
+                    'longest_absence': longest_absence,
+                    'last_marked': last_date,
+                    'status': attendance_status(percentage, -streak if streak < 0 else 0)
+                }
+                self._counters[student_id] = (present, total)
+            # Students deleted since the last refresh
+            for student_id in [sid for sid in self._counters if sid not in current_ids]:
+                del self._counters[student_id]
+                del self._students[student_id]
+            if changed or full:
+                self.version += 1
+            if full:
+                self._loaded_at = time.monotonic()
+        return len(changed)
+
+    def students(self, class_name=None, section=None, status=None):
+        """Cached student figures (dicts of STUDENT_FIELDS), lowest attendance first"""
+        with self._lock:
+            students = list(self._students.values())
+        if class_name is not None:
+            students = [s for s in students if s['class'] == class_name]
+        if section is not None:
+            students = [s for s in students if s['section'] == section]
+        if status is not None:
+            students = [s for s in students if s['status'] == status]
+        return sorted(students, key=lambda s: (s['percentage'], s['roll_no'] or ''))
+
+    def _group(self, key):
+        groups = {}
+        with self._lock:
+            students = list(self._students.values())
+        for student in students:
+            group = groups.setdefault(key(student), {
+                'students': 0, 'present_days': 0, 'total_days': 0,
+                'days_held': 0, 'warnings': 0
+            })
+            group['students'] += 1
+            group['present_days'] += student['present_days']
+            group['total_days'] += student['total_days']
+            group['days_held'] = max(group['days_held'], student['total_days'])
+            if student['status'] == 'Warning':
+                group['warnings'] += 1
+        for group in groups.values():
+            group['absent_days'] = group['total_days'] - group['present_days']
+            group['percentage'] = _percentage(group['present_days'], group['total_days'])
+            group['status'] = attendance_status(group['percentage'])
+        return groups
+
+    def sections(self):
+        """{(class, section): totals} over the cached students"""
+        return self._group(lambda s: (s['class'], s['section']))
+
+    def grades(self):
+        """{class: totals} over the cached students"""
+        return self._group(lambda s: s['class'])
+
+    def status_counts(self, class_name, section):
+        """{status: marks} of one class section, straight from the marks"""
+        cursor = db_config.get_connection().execute('''
+            SELECT a.status, COUNT(*)
+            FROM students s
+            JOIN attendance a ON a.student_id = s.student_id
+            WHERE s.class = ? AND s.section IS ?
+            GROUP BY a.status
+        ''', (class_name, section))
+        return dict(cursor.fetchall())
+
+
+# Create the shared analytics cache
+attendance_analytics = AttendanceAnalytics()
@@ -0,0 +1,127 @@
+import sqlite3
+import threading
+import os
+from contextlib import contextmanager
+
+# Number of prepared statements each connection keeps compiled
+DEFAULT_CACHED_STATEMENTS = 256
+
+# Seconds a connection waits on a locked database before giving up
+DEFAULT_TIMEOUT = 30.0
+
+
+class ConnectionPool:
+    """Shared, thread-aware SQLite connections for one database file.
+
+    Every thread borrows its own long-lived connection, so DAOs no longer pay
+    the connect/teardown and schema-open cost on each call. Pragmas are applied
+    once, when a connection is first opened.
+    """
+
+    def __init__(self, db_path, cached_statements=DEFAULT_CACHED_STATEMENTS, timeout=DEFAULT_TIMEOUT):
+        self.db_path = os.path.abspath(db_path)
+        self.cached_statements = cached_statements
+        self.timeout = timeout
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._connections = {}
+        self._wal_enabled = False
+        self.auditor = None
+
+    def _open(self):
+        """Open a new connection and apply the pool pragmas"""
+        conn = sqlite3.connect(
+            self.db_path,
+            timeout=self.timeout,
+            cached_statements=self.cached_statements,
+            check_same_thread=False
+        )
+        with self._lock:
+            # journal_mode is stored in the database file, so set it only once
+            if not self._wal_enabled:
+                conn.execute('PRAGMA journal_mode=WAL')
+                self._wal_enabled = True
+        conn.execute('PRAGMA synchronous=NORMAL')
+        conn.execute('PRAGMA temp_store=MEMORY')
+        if self.auditor is not None:
+            self.auditor.attach(conn)
+        return conn
+
+    def connection(self):
+        """Return the calling thread's connection, opening it on first use"""
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = self._open()
+            self._local.conn = conn
+            with self._lock:
+                self._connections[threading.get_ident()] = conn
+        return conn
+
+    def set_auditor(self, auditor):
+        """Attach a query auditor to every current and future connection"""
+        self.auditor = auditor
+        with self._lock:
+            connections = list(self._connections.values())
+        for conn in connections:
+            auditor.attach(conn)
+
+    def cursor(self):
+        """Return a new cursor on the calling thread's connection"""
+        return self.connection().cursor()
+
+    @contextmanager
+    def transaction(self):
+        """Run a block in a transaction, committing on success and rolling back on error"""
+        conn = self.connection()
+        try:
+            yield conn
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+
+    def close_thread(self):
+        """Close the calling thread's connection"""
+        conn = getattr(self._local, 'conn', None)
+        if conn is not None:
+            self._local.conn = None
+            with self._lock:
+                self._connections.pop(threading.get_ident(), None)
+            conn.close()
+
+    def close_all(self):
+        """Close every connection handed out by this pool"""
+        with self._lock:
+            connections = list(self._connections.values())
+            self._connections.clear()
+        for conn in connections:
+            try:
+                conn.close()
+            except sqlite3.Error as e:
+                print(f"Error closing pooled connection: {e}")
+        self._local = threading.local()
+        if self.auditor is not None:
+            self.auditor.close()
+
+
+_pools = {}
+_pools_lock = threading.Lock()
+
+
+def get_pool(db_path):
+    """Return the shared pool for a database file, creating it on first use"""
+    key = os.path.abspath(db_path)
+    with _pools_lock:
+        pool = _pools.get(key)
+        if pool is None:
+            pool = ConnectionPool(key)
+            _pools[key] = pool
+        return pool
+
+
+def close_all_pools():
+    """Close every pooled connection, e.g. when the application quits"""
+    with _pools_lock:
+        pools = list(_pools.values())
+    for pool in pools:
+        pool.close_all()
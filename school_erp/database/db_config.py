@@ -1,12 +1,36 @@
-import sqlite3
 import os
+import threading
+from .connection_pool import get_pool
+from .migrations import migrate
+from .query_audit import AUDIT_ENV_VAR, enable_query_audit
 
 class DatabaseConfig:
+    """Location of the single consolidated School ERP database"""
+
     def __init__(self):
-        self.db_path = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'school_erp.db')
+        self.db_path = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'school_erp.db')
+        self._schema_ready = False
+        self._schema_lock = threading.Lock()
+        if os.environ.get(AUDIT_ENV_VAR) == '1':
+            enable_query_audit(self.pool)
+
+    @property
+    def pool(self):
+        return get_pool(self.db_path)
 
     def get_connection(self):
-        return sqlite3.connect(self.db_path)
+        """Borrow the calling thread's pooled connection (do not close it)"""
+        conn = self.pool.connection()
+        if not self._schema_ready:
+            self.ensure_schema(conn)
+        return conn
+
+    def ensure_schema(self, conn=None):
+        """Run pending migrations once per process; skipped when the schema is current"""
+        with self._schema_lock:
+            if not self._schema_ready:
+                migrate(conn or self.pool.connection())
+                self._schema_ready = True
 
 # Create an instance of DatabaseConfig
-db_config = DatabaseConfig() 
\ No newline at end of file
+db_config = DatabaseConfig()
@@ -1,21 +1,18 @@
-import sqlite3
+import os
+import sys
 
-# Connect to SQLite and create table
-conn = sqlite3.connect("users.db")
-cursor = conn.cursor()
+# Make the school_erp root importable when run as a script
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from database.db_config import db_config
 
-cursor.execute("""
-    CREATE TABLE IF NOT EXISTS users (
-        id INTEGER PRIMARY KEY AUTOINCREMENT,
-        username TEXT UNIQUE NOT NULL,
-        password TEXT NOT NULL
-    )
-""")
+# Users live in the consolidated store; the schema comes from the migrations
+conn = db_config.get_connection()
+cursor = conn.cursor()
 
 # Insert a sample user (username: admin, password: 1234)
-cursor.execute("INSERT OR IGNORE INTO users (username, password) VALUES (?, ?)")
+cursor.execute("INSERT OR IGNORE INTO users (username, password, role) VALUES (?, ?, ?)", ('admin', '1234', 'admin'))
 
 conn.commit()
-conn.close()
 
 print("Database and table created successfully! User added.")
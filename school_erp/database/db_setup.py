@@ -1,23 +1,17 @@
-import sqlite3
+import os
+import sys
 
-def create_database():
-    """✅ Create the school management database and tables if they don't exist."""
-    conn = sqlite3.connect("school_management.db")
-    cursor = conn.cursor()
+# Make the school_erp root importable when run as a script
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-    # Example: Creating a 'users' table
-    cursor.execute("""
-        CREATE TABLE IF NOT EXISTS users (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            username TEXT UNIQUE NOT NULL,
-            password TEXT NOT NULL,
-            role TEXT NOT NULL
-        )
-    """)
+from database.db_config import db_config
+from database.migrations import get_schema_version
 
-    conn.commit()
-    conn.close()
-    print("✅ Database setup completed!")
+def create_database():
+    """✅ Create the school management database and tables if they don't exist."""
+    db_config.ensure_schema()
+    version = get_schema_version(db_config.get_connection())
+    print(f"✅ Database setup completed! (schema version {version})")
 
 # ✅ Run the function when the script is executed directly
 if __name__ == "__main__":
@@ -0,0 +1,289 @@
+"""
+Streaming export of query results to CSV, XLSX or Parquet.
+
+Rows are pulled from the cursor with fetchmany and written batch by batch
+(csv module, an openpyxl write_only workbook, or a pyarrow ParquetWriter),
+so a multi-year payroll or attendance dump takes the same memory as a
+single batch. The format follows the file extension. Parquet fixes a type
+per column before the first row is written, so a Parquet export reads the
+rows twice: once to find the types of each column's values, then to write.
+
+    python -m database.exporter payroll payroll_2020_2024.xlsx --from 2020-01-01 --to 2024-12-31
+"""
+
+import argparse
+import csv
+import os
+import sys
+import time
+
+if __package__ in (None, ''):
+    # Make the school_erp root importable when run as a script
+    sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from database.db_config import db_config
+
+# Rows per fetchmany call and per write
+DEFAULT_BATCH_SIZE = 2000
+
+# Rows an XLSX worksheet can hold (header included); longer exports continue on a new sheet
+XLSX_MAX_ROWS = 1048576
+
+EXPORT_FORMATS = {'.csv': 'csv', '.xlsx': 'xlsx', '.parquet': 'parquet'}
+
+# Named exports: (query, parameters it takes). A date range defaults to everything.
+EXPORT_QUERIES = {
+    'students': ('''
+        SELECT student_id, name, roll_no, class, section, dob, gender, address,
+               phone, email, parent_name, admission_date, academic_year
+        FROM students ORDER BY roll_no
+    ''', []),
+    'teachers': ('''
+        SELECT teacher_id, name, mother_name, dob, age, cast_category, place, tal,
+               dist, state, adar_no, contact_no, designation, department,
+               joining_date, bank_account, pf_no
+        FROM teachers ORDER BY teacher_id
+    ''', []),
+    'salary_structure': ('''
+        SELECT t.teacher_id, t.name, s.basic_salary, s.da_amount, s.hra_amount,
+               s.conveyance, s.medical, s.other_allowances, s.pf_deduction,
+               s.professional_tax, s.income_tax, s.other_deductions
+        FROM teachers t
+        JOIN salary_structure s ON s.teacher_id = t.teacher_id
+        ORDER BY t.teacher_id
+    ''', []),
+    'payroll': ('''
+        SELECT p.payment_date, p.month_year, p.teacher_id, t.name, t.department,
+               p.working_days, p.holidays, p.total_earnings, p.total_deductions,
+               p.net_salary, p.payment_method, p.payment_status
+        FROM salary_payments p
+        LEFT JOIN teachers t ON t.teacher_id = p.teacher_id
+        WHERE p.payment_date BETWEEN ? AND ?
+        ORDER BY p.payment_date, p.teacher_id
+    ''', ['date_from', 'date_to']),
+    'attendance': ('''
+        SELECT a.date, a.student_id, s.name, s.roll_no, s.class, a.status
+        FROM attendance a
+        LEFT JOIN students s ON s.student_id = a.student_id
+        WHERE a.date BETWEEN ? AND ?
+        ORDER BY a.date, s.roll_no
+    ''', ['date_from', 'date_to']),
+    'textbooks': ('''
+        SELECT title, publisher, grade, quantity, condition, last_inventory, cost_per_book
+        FROM textbooks WHERE department = ?
+        ORDER BY grade, title
+    ''', ['department']),
+}
+
+PARAMETER_DEFAULTS = {'date_from': '0000-01-01', 'date_to': '9999-12-31'}
+
+
+def export_format(path):
+    """Format of an export file, from its extension"""
+    extension = os.path.splitext(path)[1].lower()
+    if extension not in EXPORT_FORMATS:
+        raise ValueError(f"Unsupported export type {extension!r}; use {', '.join(EXPORT_FORMATS)}")
+    return EXPORT_FORMATS[extension]
+
+
+def _write_csv(path, headers, batches):
+    rows = 0
+    with open(path, 'w', newline='', encoding='utf-8-sig') as f:
+        writer = csv.writer(f)
+        writer.writerow(headers)
+        for batch in batches:
+            writer.writerows(batch)
+            rows += len(batch)
+    return rows
+
+
+def _write_xlsx(path, headers, batches):
+    from openpyxl import Workbook
+
+    workbook = Workbook(write_only=True)
+    sheet = None
+    sheet_rows = XLSX_MAX_ROWS
+    rows = 0
+    for batch in batches:
+        for row in batch:
+            if sheet_rows >= XLSX_MAX_ROWS:
+                sheet = workbook.create_sheet(f'Sheet{len(workbook.worksheets) + 1}')
+                sheet.append(headers)
+                sheet_rows = 1
+            sheet.append(row)
+            sheet_rows += 1
+        rows += len(batch)
+    if sheet is None:
+        workbook.create_sheet('Sheet1').append(headers)
+    workbook.save(path)
+    return rows
+
+
+def column_kinds(batches, width):
+    """Python types of the non-null values of each of width columns across batches"""
+    kinds = [set() for _ in range(width)]
+    for batch in batches:
+        for seen, column in zip(kinds, zip(*batch)):
+            seen.update(map(type, column))
+    for seen in kinds:
+        seen.discard(type(None))
+    return kinds
+
+
+def _arrow_type(kinds):
+    import pyarrow as pa
+
+    if not kinds:
+        return pa.null()
+    if kinds <= {int, bool}:
+        return pa.int64()
+    if kinds <= {int, bool, float}:
+        return pa.float64()
+    if kinds == {bytes}:
+        return pa.binary()
+    # Text, or text mixed with numbers: written as text
+    return pa.string()
+
+
+def _arrow_array(values, field, kinds):
+    """values as an array of field's type; raises ValueError when they do not fit it"""
+    import pyarrow as pa
+
+    try:
+        if field.type == pa.string():
+            if kinds - {str}:
+                values = [v if v is None or isinstance(v, str) else str(v) for v in values]
+            return pa.array(values, type=pa.string())
+        # Built from the values and cast safely, so 2.5 is not truncated into an int64 column
+        return pa.array(values).cast(field.type, safe=True)
+    except (pa.ArrowInvalid, pa.ArrowTypeError, pa.ArrowNotImplementedError) as e:
+        raise ValueError(f"Column {field.name!r} has values that do not fit its Parquet type {field.type}: {e}")
+
+
+def _write_parquet(path, headers, batches, kinds=None):
+    """Write batches to Parquet; kinds (see column_kinds) sets the column types.
+
+    Without kinds the first batch decides them, and a later batch whose
+    values do not fit raises ValueError rather than being cast.
+    """
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    writer = None
+    schema = None
+    rows = 0
+    try:
+        for batch in batches:
+            if schema is None:
+                if kinds is None:
+                    kinds = column_kinds([batch], len(headers))
+                schema = pa.schema([(h, _arrow_type(k)) for h, k in zip(headers, kinds)])
+                writer = pq.ParquetWriter(path, schema)
+            columns = list(zip(*batch)) if batch else [()] * len(headers)
+            arrays = [_arrow_array(list(c), field, k) for field, c, k in zip(schema, columns, kinds)]
+            writer.write_table(pa.Table.from_arrays(arrays, schema=schema))
+            rows += len(batch)
+        if writer is None:
+            schema = pa.schema([(h, pa.string()) for h in headers])
+            writer = pq.ParquetWriter(path, schema)
+    finally:
+        if writer is not None:
+            writer.close()
+    return rows
+
+
+WRITERS = {'csv': _write_csv, 'xlsx': _write_xlsx, 'parquet': _write_parquet}
+
+
+def write_rows(path, headers, batches, kinds=None):
+    """Write headers and an iterable of row batches to path; returns the row count.
+
+    kinds, the column_kinds of all the rows, sets the Parquet column types;
+    the other formats ignore it.
+    """
+    fmt = export_format(path)
+    if fmt == 'parquet':
+        return _write_parquet(path, list(headers), batches, kinds)
+    return WRITERS[fmt](path, list(headers), batches)
+
+
+def _cursor_batches(cursor, batch_size, progress_callback):
+    done = 0
+    while True:
+        batch = cursor.fetchmany(batch_size)
+        if not batch:
+            break
+        done += len(batch)
+        if progress_callback:
+            # The total is unknown while streaming
+            progress_callback(done, 0)
+        yield batch
+
+
+def export_query(sql, params, path, batch_size=DEFAULT_BATCH_SIZE, progress_callback=None):
+    """Stream the rows of a query into a CSV, XLSX or Parquet file.
+
+    Only one batch of rows is held at a time. The file is written under a
+    temporary name and moved into place when complete, so a failed export
+    never leaves a truncated file behind. Returns a summary dict.
+    """
+    start = time.perf_counter()
+    fmt = export_format(path)
+    tmp_path = f'{path}.part{os.path.splitext(path)[1]}'
+    # A cursor of its own, so the batches stay valid while other code runs queries
+    cursor = db_config.get_connection().cursor()
+    try:
+        kinds = None
+        if fmt == 'parquet':
+            # First pass: the value types of each column, for the Parquet schema
+            cursor.execute(sql, params)
+            kinds = column_kinds(_cursor_batches(cursor, batch_size, None), len(cursor.description))
+        cursor.execute(sql, params)
+        headers = [column[0] for column in cursor.description]
+        rows = write_rows(tmp_path, headers, _cursor_batches(cursor, batch_size, progress_callback), kinds)
+        os.replace(tmp_path, path)
+    except Exception:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+    finally:
+        cursor.close()
+
+    return {
+        'path': path,
+        'format': fmt,
+        'rows': rows,
+        'seconds': time.perf_counter() - start
+    }
+
+
+def export_dataset(name, path, batch_size=DEFAULT_BATCH_SIZE, progress_callback=None, **params):
+    """Export one of EXPORT_QUERIES, e.g. export_dataset('payroll', 'p.csv', date_from='2021-04-01')"""
+    sql, names = EXPORT_QUERIES[name]
+    values = []
+    for param in names:
+        value = params.get(param) or PARAMETER_DEFAULTS.get(param)
+        if value is None:
+            raise ValueError(f"Export {name!r} needs a {param} value")
+        values.append(value)
+    return export_query(sql, values, path, batch_size=batch_size, progress_callback=progress_callback)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Export a table to CSV, XLSX or Parquet")
+    parser.add_argument('dataset', choices=sorted(EXPORT_QUERIES), help="What to export")
+    parser.add_argument('path', help="Output file; .csv, .xlsx or .parquet")
+    parser.add_argument('--from', dest='date_from', default=None, help="First date (YYYY-MM-DD) of payroll/attendance")
+    parser.add_argument('--to', dest='date_to', default=None, help="Last date (YYYY-MM-DD) of payroll/attendance")
+    parser.add_argument('--department', default=None, help="Department of a textbooks export")
+    parser.add_argument('--batch-size', type=int, default=DEFAULT_BATCH_SIZE, help="Rows per fetchmany call")
+    args = parser.parse_args()
+
+    result = export_dataset(args.dataset, args.path, batch_size=args.batch_size,
+                            date_from=args.date_from, date_to=args.date_to, department=args.department)
+    print(f"Exported {result['rows']} rows to {result['path']} in {result['seconds']:.2f}s")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
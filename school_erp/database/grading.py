@@ -0,0 +1,308 @@
+"""
+Whole-exam grading: totals, percentages, letter grades, class ranks and
+percentiles, and subject statistics for every student of an exam at once.
+
+An exam's exam_results rows are loaded into a students x subjects NumPy
+matrix (NaN where a student has no mark), graded with array operations and
+written back in one transaction: a row per student in exam_report_cards and
+the subject grade on each exam_results row.
+
+    python -m database.grading "Term 1 2025" --boundaries "90:A+,75:A,60:B,45:C,33:D,0:F"
+"""
+
+import argparse
+import os
+import sys
+import time
+from collections import Counter
+from datetime import datetime
+
+import numpy as np
+
+if __package__ in (None, ''):
+    # Make the school_erp root importable when run as a script
+    sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from database.db_config import db_config
+
+# (minimum percentage, letter), highest first; the last boundary is the floor
+GRADE_BOUNDARIES = [
+    (90, 'A+'), (80, 'A'), (70, 'B+'), (60, 'B'),
+    (50, 'C+'), (40, 'C'), (33, 'D'), (0, 'F'),
+]
+
+# Subject percentage needed to pass, for the subject pass rates
+PASS_PERCENTAGE = 33
+
+# Marks of an exam, one row per student and subject. Results entered as unit
+# tests/midterm/final only carry total_score, out of 100.
+EXAM_MARKS_QUERY = '''
+    SELECT student_id, subject, COALESCE(marks, total_score), COALESCE(max_marks, 100)
+    FROM exam_results
+    WHERE exam_name = ? AND student_id IS NOT NULL AND subject IS NOT NULL
+    ORDER BY student_id, subject, result_id
+'''
+
+# Class of each student of an exam, for ranking within the class
+EXAM_CLASSES_QUERY = '''
+    SELECT DISTINCT r.student_id, COALESCE(s.class, '')
+    FROM exam_results r
+    LEFT JOIN students s ON s.student_id = r.student_id
+    WHERE r.exam_name = ? AND r.student_id IS NOT NULL
+'''
+
+
+def parse_boundaries(text):
+    """GRADE_BOUNDARIES from text such as "90:A+,75:A,0:F" """
+    boundaries = []
+    for part in text.split(','):
+        minimum, _, letter = part.partition(':')
+        if not letter.strip():
+            raise ValueError(f"Grade boundary {part!r} is not of the form percentage:letter")
+        boundaries.append((float(minimum), letter.strip()))
+    return sorted(boundaries, reverse=True)
+
+
+def _check_boundaries(boundaries):
+    minimums = [minimum for minimum, letter in boundaries]
+    if not boundaries or minimums != sorted(set(minimums), reverse=True):
+        raise ValueError("Grade boundaries must be distinct and listed highest first")
+    return boundaries
+
+
+def letter_grades(percentages, boundaries=None):
+    """Letter grade of every percentage in an array; None where it is NaN"""
+    boundaries = _check_boundaries(boundaries or GRADE_BOUNDARIES)
+    minimums = np.array([minimum for minimum, letter in reversed(boundaries)], dtype=float)
+    letters = np.array([letter for minimum, letter in reversed(boundaries)] + [None], dtype=object)
+
+    percentages = np.asarray(percentages, dtype=float)
+    index = np.searchsorted(minimums, percentages, side='right') - 1
+    # Below the floor gets the lowest letter; NaN maps to the trailing None
+    index = np.where(index < 0, 0, index)
+    index = np.where(np.isnan(percentages), len(boundaries), index)
+    return letters[index]
+
+
+def grade_for(percentage, boundaries=None):
+    """Letter grade of one percentage"""
+    return letter_grades([percentage], boundaries)[0]
+
+
+def load_exam_marks(exam_name):
+    """(student_ids, subjects, marks, max_marks) of an exam; the matrices are NaN where unmarked"""
+    rows = db_config.get_connection().execute(EXAM_MARKS_QUERY, (exam_name,)).fetchall()
+    if not rows:
+        return [], [], np.empty((0, 0)), np.empty((0, 0))
+
+    student_column, subject_column, mark_column, max_column = zip(*rows)
+    student_ids, student_index = np.unique(np.array(student_column, dtype=object), return_inverse=True)
+    subjects, subject_index = np.unique(np.array(subject_column, dtype=object), return_inverse=True)
+
+    shape = (len(student_ids), len(subjects))
+    marks = np.full(shape, np.nan)
+    max_marks = np.full(shape, np.nan)
+    # A subject entered twice keeps its last row
+    marks[student_index, subject_index] = np.array(mark_column, dtype=float)
+    max_marks[student_index, subject_index] = np.array(max_column, dtype=float)
+    return student_ids.tolist(), subjects.tolist(), marks, max_marks
+
+
+def load_exam_classes(exam_name, student_ids):
+    """Class of each of student_ids ('' when the student is not on record)"""
+    classes = dict(db_config.get_connection().execute(EXAM_CLASSES_QUERY, (exam_name,)).fetchall())
+    return [classes.get(student_id, '') for student_id in student_ids]
+
+
+def _rank(percentages):
+    """Competition ranks and percentiles of one group's percentages; 0 / NaN where unmarked"""
+    graded = ~np.isnan(percentages)
+    ordered = np.sort(percentages[graded])
+    at_or_below = np.searchsorted(ordered, percentages, side='right')
+    ranks = np.where(graded, len(ordered) - at_or_below + 1, 0)
+    percentiles = np.where(graded, 100.0 * at_or_below / max(len(ordered), 1), np.nan)
+    return ranks, percentiles
+
+
+def grade_exam(marks, max_marks, boundaries=None, pass_percentage=PASS_PERCENTAGE, groups=None):
+    """Grade a students x subjects marks matrix in one pass.
+
+    Returns arrays per student (subjects, total_marks, max_marks,
+    percentage, grade, rank, percentile), the subject grade matrix and
+    per-subject statistics (mean, median, std, min, max, pass_rate), all
+    on subject percentages. Ranks are competition ranks (1, 2, 2, 4) on the
+    overall percentage; the percentile is the share of students at or below
+    a student's percentage. With groups (a label per student, such as the
+    class), both are among the students of the same group. Students without
+    marks get NaN / None.
+    """
+    marks = np.asarray(marks, dtype=float)
+    max_marks = np.where(np.isnan(marks), np.nan, np.asarray(max_marks, dtype=float))
+    marked = ~np.isnan(marks)
+
+    subjects_taken = marked.sum(axis=1)
+    totals = np.where(subjects_taken > 0, np.nansum(marks, axis=1), np.nan)
+    max_totals = np.nansum(max_marks, axis=1)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        percentages = np.where(max_totals > 0, 100.0 * totals / max_totals, np.nan)
+        subject_percentages = np.where(max_marks > 0, 100.0 * marks / max_marks, np.nan)
+
+    if groups is None:
+        ranks, percentiles = _rank(percentages)
+    else:
+        ranks = np.zeros(len(percentages), dtype=int)
+        percentiles = np.full(len(percentages), np.nan)
+        labels = np.unique(np.asarray(groups, dtype=object), return_inverse=True)[1]
+        for label in np.unique(labels):
+            members = labels == label
+            ranks[members], percentiles[members] = _rank(percentages[members])
+
+    subject_marked = ~np.isnan(subject_percentages)
+    counts = subject_marked.sum(axis=0)
+    has_marks = counts > 0
+    # Masked columns avoid the all-NaN warnings of nanmean and friends
+    filled = np.where(subject_marked, subject_percentages, 0.0)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        means = np.where(has_marks, filled.sum(axis=0) / counts, np.nan)
+        deviations = np.where(subject_marked, subject_percentages - means, 0.0)
+        stds = np.where(has_marks, np.sqrt((deviations ** 2).sum(axis=0) / counts), np.nan)
+        pass_rates = np.where(
+            has_marks, 100.0 * (subject_marked & (filled >= pass_percentage)).sum(axis=0) / counts, np.nan
+        )
+    mins = np.where(has_marks, np.where(subject_marked, subject_percentages, np.inf).min(axis=0, initial=np.inf), np.nan)
+    maxes = np.where(has_marks, np.where(subject_marked, subject_percentages, -np.inf).max(axis=0, initial=-np.inf), np.nan)
+    medians = np.array([
+        np.median(column[~np.isnan(column)]) if column_has_marks else np.nan
+        for column, column_has_marks in zip(subject_percentages.T, has_marks)
+    ])
+
+    return {
+        'subjects': subjects_taken,
+        'total_marks': totals,
+        'max_marks': max_totals,
+        'percentage': percentages,
+        'grade': letter_grades(percentages, boundaries),
+        'rank': ranks,
+        'percentile': percentiles,
+        'subject_grades': letter_grades(subject_percentages, boundaries),
+        'subject_stats': {
+            'students': counts,
+            'mean': means,
+            'median': medians,
+            'std': stds,
+            'min': mins,
+            'max': maxes,
+            'pass_rate': pass_rates,
+        },
+    }
+
+
+def _value(value):
+    # sqlite3 binds plain Python numbers; NaN becomes NULL
+    if value is None:
+        return None
+    value = value.item() if hasattr(value, 'item') else value
+    return None if isinstance(value, float) and np.isnan(value) else value
+
+
+def save_exam_results(exam_name, student_ids, subjects, result):
+    """Write the report cards and subject grades of a graded exam in one transaction"""
+    published_at = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+    cards = [
+        (exam_name, student_id, _value(result['subjects'][i]), _value(result['total_marks'][i]),
+         _value(result['max_marks'][i]), _value(result['percentage'][i]), result['grade'][i],
+         _value(result['rank'][i]) or None, _value(result['percentile'][i]), published_at)
+        for i, student_id in enumerate(student_ids)
+    ]
+    subject_grades = [
+        (result['subject_grades'][i, j], exam_name, student_id, subject)
+        for i, student_id in enumerate(student_ids)
+        for j, subject in enumerate(subjects)
+        if result['subject_grades'][i, j] is not None
+    ]
+
+    conn = db_config.get_connection()
+    with db_config.pool.transaction():
+        conn.executemany('''
+            INSERT INTO exam_report_cards
+            (exam_name, student_id, subjects, total_marks, max_marks, percentage,
+             grade, class_rank, percentile, published_at)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+            ON CONFLICT (exam_name, student_id) DO UPDATE SET
+                subjects = excluded.subjects, total_marks = excluded.total_marks,
+                max_marks = excluded.max_marks, percentage = excluded.percentage,
+                grade = excluded.grade, class_rank = excluded.class_rank,
+                percentile = excluded.percentile, published_at = excluded.published_at
+        ''', cards)
+        conn.executemany('''
+            UPDATE exam_results SET grade = ?
+            WHERE exam_name = ? AND student_id = ? AND subject = ?
+        ''', subject_grades)
+    return len(cards)
+
+
+def publish_exam_results(exam_name, boundaries=None, progress_callback=None):
+    """Grade every student of an exam and store the results; returns a summary dict.
+
+    Ranks and percentiles are within each student's class.
+
+    progress_callback(done, total) is called after each of the load, grade
+    and save steps, so the job can run through run_in_background.
+    """
+    start = time.perf_counter()
+    student_ids, subjects, marks, max_marks = load_exam_marks(exam_name)
+    classes = load_exam_classes(exam_name, student_ids)
+    if progress_callback:
+        progress_callback(1, 3)
+    result = grade_exam(marks, max_marks, boundaries, groups=classes)
+    if progress_callback:
+        progress_callback(2, 3)
+    published = save_exam_results(exam_name, student_ids, subjects, result) if student_ids else 0
+    if progress_callback:
+        progress_callback(3, 3)
+
+    stats = result['subject_stats']
+    return {
+        'exam_name': exam_name,
+        'students': len(student_ids),
+        'subjects': len(subjects),
+        'published': published,
+        'grade_counts': dict(sorted(Counter(g for g in result['grade'] if g is not None).items())),
+        'subject_stats': {
+            subject: {name: _value(values[j]) for name, values in stats.items()}
+            for j, subject in enumerate(subjects)
+        },
+        'seconds': time.perf_counter() - start
+    }
+
+
+def get_report_cards(exam_name):
+    """Published report cards of an exam, by class and then best first"""
+    cursor = db_config.get_connection().execute('''
+        SELECT r.student_id, s.name, s.roll_no, s.class, r.subjects, r.total_marks,
+               r.max_marks, r.percentage, r.grade, r.class_rank, r.percentile
+        FROM exam_report_cards r
+        LEFT JOIN students s ON s.student_id = r.student_id
+        WHERE r.exam_name = ?
+        ORDER BY s.class, r.class_rank IS NULL, r.class_rank, s.roll_no
+    ''', (exam_name,))
+    return cursor.fetchall()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Grade and publish the results of an exam")
+    parser.add_argument('exam_name', help="Exam name as stored on exam_results")
+    parser.add_argument('--boundaries', type=parse_boundaries, default=None,
+                        help="Grade boundaries, e.g. '90:A+,80:A,70:B+,60:B,50:C+,40:C,33:D,0:F'")
+    args = parser.parse_args()
+
+    summary = publish_exam_results(args.exam_name, args.boundaries)
+    print(f"Published {summary['published']} report cards for {summary['exam_name']} "
+          f"({summary['subjects']} subjects) in {summary['seconds']:.2f}s")
+    for letter, count in summary['grade_counts'].items():
+        print(f"  {letter}: {count}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,44 @@
+class IdentityMap:
+    """Rows already loaded during one request, keyed by (kind, key).
+
+    A screen refresh or a report run creates one, reads through it and drops
+    it when done, so each row is fetched at most once per request and
+    several keys missing at once are fetched with one batched query. It is
+    not shared between requests, so it never serves stale data for long.
+    """
+
+    def __init__(self):
+        self._rows = {}
+
+    def get(self, kind, key, loader):
+        """Row for key, calling loader(key) only the first time it is asked for"""
+        if (kind, key) not in self._rows:
+            self._rows[(kind, key)] = loader(key)
+        return self._rows[(kind, key)]
+
+    def get_many(self, kind, keys, loader):
+        """{key: row} for keys; loader(missing_keys) returns {key: row} for the ones not yet loaded.
+
+        Keys the loader does not return are remembered as None, so they are
+        not asked for again.
+        """
+        missing = [key for key in dict.fromkeys(keys) if (kind, key) not in self._rows]
+        if missing:
+            found = loader(missing)
+            for key in missing:
+                self._rows[(kind, key)] = found.get(key)
+        return {key: self._rows[(kind, key)] for key in keys}
+
+    def put(self, kind, key, row):
+        self._rows[(kind, key)] = row
+
+    def invalidate(self, kind, key=None):
+        """Forget one row, or every row of a kind"""
+        if key is not None:
+            self._rows.pop((kind, key), None)
+        else:
+            for cached in [k for k in self._rows if k[0] == kind]:
+                del self._rows[cached]
+
+    def clear(self):
+        self._rows.clear()
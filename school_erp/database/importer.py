@@ -0,0 +1,285 @@
+"""
+Streaming import of student and teacher sheets (.xlsx or .csv).
+
+Rows are read one at a time (openpyxl read_only mode, or the csv module),
+validated and coerced, and upserted in chunks with executemany inside a
+single transaction, so a large admissions sheet never sits in memory and
+existing rows are updated in place rather than replaced. Rows that fail
+validation are skipped and listed, with their sheet row numbers, in an
+error report next to the source file.
+
+    python -m database.importer students admissions.xlsx --dry-run
+"""
+
+import argparse
+import csv
+import os
+import re
+import sys
+from datetime import date, datetime
+
+if __package__ in (None, ''):
+    # Make the school_erp root importable when run as a script
+    sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from database.db_config import db_config
+from database.metrics import metrics
+from database.teacher_dao import TEACHER_COLUMNS, SALARY_COLUMNS, SHEET_TEACHER_COLUMNS, SHEET_SALARY_COLUMNS
+
+# Rows per executemany call
+DEFAULT_CHUNK_SIZE = 500
+
+# Accepted text forms of a date cell; stored as YYYY-MM-DD
+DATE_FORMATS = ['%Y-%m-%d', '%d-%m-%Y', '%d/%m/%Y', '%Y/%m/%d']
+
+# A whole number written out from a float cell ("101.0")
+_WHOLE_FLOAT = re.compile(r'^\d+\.0$')
+
+# (column, kind, required, extra headings); a column is also matched by its own name
+STUDENT_FIELDS = [
+    ('student_id', 'text', True, ['Student ID', 'ID']),
+    ('name', 'text', True, ['Student Name']),
+    ('roll_no', 'text', True, ['Roll No', 'Roll Number']),
+    ('class', 'text', True, ['Grade', 'Standard']),
+    ('section', 'text', False, []),
+    ('dob', 'date', False, ['Date of Birth']),
+    ('gender', 'text', False, []),
+    ('address', 'text', False, []),
+    ('phone', 'text', False, ['Contact No', 'Mobile']),
+    ('email', 'text', False, []),
+    ('parent_name', 'text', False, ['Parent', 'Guardian Name']),
+    ('admission_date', 'date', False, []),
+    ('academic_year', 'text', False, []),
+]
+
+TEACHER_FIELDS = [
+    (column,
+     'int' if column == 'age' else 'date' if column in ('dob', 'joining_date') else 'text',
+     column in ('teacher_id', 'name'),
+     [heading for heading, target in SHEET_TEACHER_COLUMNS.items() if target == column])
+    for column in TEACHER_COLUMNS
+]
+
+SALARY_FIELDS = [
+    ('teacher_id', 'text', True, ['Employee ID']),
+] + [
+    (column, 'real', False, [heading for heading, target in SHEET_SALARY_COLUMNS.items() if target == column])
+    for column in SALARY_COLUMNS
+]
+
+# Tables each import target writes, in order, with the conflict key of each
+IMPORT_TARGETS = {
+    'students': [('students', 'student_id', STUDENT_FIELDS)],
+    'teachers': [('teachers', 'teacher_id', TEACHER_FIELDS),
+                 ('salary_structure', 'teacher_id', SALARY_FIELDS)],
+}
+
+
+class RowError(ValueError):
+    """A cell that cannot be coerced to its column's type"""
+
+    def __init__(self, column, value, message):
+        super().__init__(message)
+        self.column = column
+        self.value = value
+
+
+def _heading_key(heading):
+    return ' '.join(str(heading).replace('_', ' ').lower().split())
+
+
+def _coerce(column, kind, value):
+    if isinstance(value, str):
+        value = value.strip()
+    if value is None or value == '':
+        return None
+    try:
+        if kind == 'real':
+            return float(value)
+        if kind == 'int':
+            return int(float(value))
+        if kind == 'date':
+            if isinstance(value, (datetime, date)):
+                return value.strftime('%Y-%m-%d')
+            for fmt in DATE_FORMATS:
+                try:
+                    return datetime.strptime(str(value), fmt).strftime('%Y-%m-%d')
+                except ValueError:
+                    pass
+            raise ValueError(f"unrecognised date {value!r}")
+        # Excel stores numeric IDs and phone numbers as floats (101.0),
+        # and CSV exports of such sheets keep the ".0"
+        if isinstance(value, float) and value.is_integer():
+            return str(int(value))
+        value = str(value)
+        if _WHOLE_FLOAT.match(value):
+            return value[:-2]
+        return value
+    except (TypeError, ValueError) as e:
+        raise RowError(column, value, f"{column}: {str(e)}")
+
+
+def iter_rows(path, sheet_name=None):
+    """Yield (row number, cell values) of a .csv or .xlsx file without loading it whole"""
+    if os.path.splitext(path)[1].lower() == '.csv':
+        with open(path, newline='', encoding='utf-8-sig') as f:
+            for number, row in enumerate(csv.reader(f), start=1):
+                yield number, row
+        return
+
+    from openpyxl import load_workbook
+    workbook = load_workbook(path, read_only=True, data_only=True)
+    try:
+        sheet = workbook[sheet_name] if sheet_name else workbook.active
+        for number, row in enumerate(sheet.iter_rows(values_only=True), start=1):
+            yield number, row
+    finally:
+        workbook.close()
+
+
+def _map_header(row, tables):
+    """Map cell positions to columns for each table; None when the row is no header"""
+    headings = {}
+    for fields in (fields for _, _, fields in tables):
+        for column, _, _, extra in fields:
+            for heading in [column] + extra:
+                headings[_heading_key(heading)] = column
+
+    positions = {}
+    for position, cell in enumerate(row):
+        if cell is not None and _heading_key(cell) in headings:
+            positions.setdefault(headings[_heading_key(cell)], position)
+    return positions or None
+
+
+def _upsert_sql(table, key, columns):
+    updates = ', '.join(f'{c} = excluded.{c}' for c in columns if c != key)
+    on_conflict = f'DO UPDATE SET {updates}' if updates else 'DO NOTHING'
+    return f'''
+        INSERT INTO {table} ({', '.join(columns)})
+        VALUES ({', '.join('?' for _ in columns)})
+        ON CONFLICT({key}) {on_conflict}
+    '''
+
+
+def _write_error_report(report_path, errors):
+    with open(report_path, 'w', newline='', encoding='utf-8') as f:
+        writer = csv.writer(f)
+        writer.writerow(['row', 'column', 'value', 'error'])
+        writer.writerows(errors)
+
+
+def import_file(path, target, chunk_size=DEFAULT_CHUNK_SIZE, dry_run=False, sheet_name=None, error_report=None):
+    """Validate the rows of a sheet and upsert the valid ones into the target's tables.
+
+    The header is the first row naming at least one of the target's columns
+    (title rows above it are skipped). Only the columns present in the
+    header are written, so a partial sheet leaves the other columns of
+    existing rows alone. With dry_run nothing is written. Invalid rows go to
+    error_report (default: <file>.errors.csv), which is only created when
+    there are errors. Returns a summary dict.
+    """
+    tables = IMPORT_TARGETS[target]
+    if error_report is None:
+        error_report = os.path.splitext(path)[0] + '.errors.csv'
+
+    main_table, main_key, main_fields = tables[0]
+    kinds = {column: kind for _, _, fields in tables for column, kind, _, _ in fields}
+    required = [column for column, _, is_required, _ in main_fields if is_required]
+
+    positions = None
+    statements = []
+    chunk = []
+    errors = []
+    rows = imported = 0
+    conn = db_config.get_connection()
+
+    def flush():
+        if not dry_run:
+            for i, (sql, _) in enumerate(statements):
+                conn.executemany(sql, [values[i] for values in chunk])
+        chunk.clear()
+
+    try:
+        for number, row in iter_rows(path, sheet_name):
+            if positions is None:
+                positions = _map_header(row, tables)
+                if positions is not None:
+                    missing = [column for column in required if column not in positions]
+                    if missing:
+                        raise ValueError(f"Header row {number} has no column for: {', '.join(missing)}")
+                    for table, key, fields in tables:
+                        table_columns = [column for column, _, _, _ in fields if column in positions]
+                        # A secondary table is only written when the sheet has columns for it
+                        if table == main_table or len(table_columns) > 1:
+                            statements.append((_upsert_sql(table, key, table_columns), table_columns))
+                continue
+
+            if all(cell is None or str(cell).strip() == '' for cell in row):
+                continue
+            rows += 1
+
+            try:
+                record = {}
+                for column, position in positions.items():
+                    value = row[position] if position < len(row) else None
+                    record[column] = _coerce(column, kinds[column], value)
+                for column in required:
+                    if record[column] is None:
+                        raise RowError(column, None, f"{column}: required value is missing")
+            except RowError as e:
+                errors.append((number, e.column, '' if e.value is None else e.value, str(e)))
+                continue
+
+            chunk.append([[record[column] for column in table_columns] for _, table_columns in statements])
+            imported += 1
+            if len(chunk) >= chunk_size:
+                flush()
+
+        if positions is None:
+            raise ValueError(f"No header row with {target} columns found in {os.path.basename(path)}")
+        flush()
+        if not dry_run:
+            conn.commit()
+    except Exception:
+        conn.rollback()
+        raise
+
+    if not dry_run and imported:
+        metrics.invalidate(*[table for table, _, _ in tables if table in metrics.loaders])
+
+    if errors:
+        _write_error_report(error_report, errors)
+
+    return {
+        'target': target,
+        'rows': rows,
+        'imported': imported,
+        'errors': len(errors),
+        'error_report': error_report if errors else None,
+        'dry_run': dry_run
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Import students or teachers from an .xlsx or .csv sheet")
+    parser.add_argument('target', choices=sorted(IMPORT_TARGETS), help="What the sheet holds")
+    parser.add_argument('path', help="The .xlsx or .csv file")
+    parser.add_argument('--dry-run', action='store_true', help="Validate only; write nothing to the database")
+    parser.add_argument('--sheet', default=None, help="Worksheet name (default: the active sheet)")
+    parser.add_argument('--chunk-size', type=int, default=DEFAULT_CHUNK_SIZE, help="Rows per executemany batch")
+    parser.add_argument('--error-report', default=None, help="Where to write rejected rows (default: <file>.errors.csv)")
+    args = parser.parse_args()
+
+    result = import_file(args.path, args.target, chunk_size=args.chunk_size, dry_run=args.dry_run,
+                         sheet_name=args.sheet, error_report=args.error_report)
+    verb = "Validated" if result['dry_run'] else "Imported"
+    print(f"{verb} {result['imported']} of {result['rows']} {result['target']} rows")
+    if result['error_report']:
+        print(f"{result['errors']} rows rejected; see {result['error_report']}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,153 @@
+import os
+import sqlite3
+from datetime import datetime
+from .db_config import db_config
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Where each table of the old per-module database files lands in the
+# consolidated store: (target table, source table, renamed columns, skipped
+# columns). Columns not listed are copied when both sides share the name.
+# Renamed columns map a target column to an SQL expression over "src".
+_TEACHER_FROM_EMPLOYEE = ('teachers', 'employees', {'teacher_id': 'src.id', 'pf_no': 'src.pf_number'}, {'id'})
+_SALARY_FROM_FLAT = ('salary_structure', 'teachers', {}, {'id'})
+_SALARY_FROM_EMPLOYEE = ('salary_structure', 'employees', {'teacher_id': 'src.id'}, {'id'})
+
+LEGACY_SOURCES = [
+    ('screens/school_erp.db', [
+        ('teachers', 'teachers', {}, set()),
+        ('salary_structure', 'salary_structure', {}, set()),
+        ('salary_payments', 'salary_payments', {}, {'payment_id'}),
+    ]),
+    ('school_data.db', [
+        ('teachers', 'teachers', {}, {'id'}),
+        _SALARY_FROM_FLAT,
+        ('salary_payments', 'salary_payments', {}, {'payment_id', 'id'}),
+        ('notices', 'notices', {}, {'id'}),
+    ]),
+    ('screens/school_data.db', [
+        ('teachers', 'teachers', {}, {'id'}),
+        _SALARY_FROM_FLAT,
+        ('salary_payments', 'salary_payments', {}, {'payment_id', 'id'}),
+        ('notices', 'notices', {}, {'id'}),
+    ]),
+    ('salary_slip.db', [
+        _TEACHER_FROM_EMPLOYEE,
+        ('teachers', 'teachers', {}, set()),
+        ('salary_structure', 'salary_structure', {}, set()),
+        ('salary_payments', 'salary_payments', {}, {'payment_id'}),
+        ('salary_slips', 'salary_slips', {}, set()),
+        ('payments', 'payments', {}, set()),
+    ]),
+    ('screens/salary_slip.db', [
+        _TEACHER_FROM_EMPLOYEE,
+        ('salary_slips', 'salary_slips', {}, set()),
+        ('payments', 'payments', {}, set()),
+    ]),
+    ('database/SalSlip.db', [
+        _TEACHER_FROM_EMPLOYEE,
+        _SALARY_FROM_EMPLOYEE,
+    ]),
+    ('database/school_erp.db', [
+        ('students', 'students', {'roll_no': 'src.roll_number', 'class': 'src.grade'}, {'id'}),
+        ('exam_results', 'exam_results', {
+            'student_id': '(SELECT s.student_id FROM legacy.students s WHERE s.id = src.student_id)'
+        }, {'id'}),
+        ('attendance_summary', 'attendance', {
+            'student_id': '(SELECT s.student_id FROM legacy.students s WHERE s.id = src.student_id)'
+        }, {'id'}),
+    ]),
+    ('screens/users.db', [('users', 'users', {}, {'id'})]),
+    ('database/users.db', [('users', 'users', {}, {'id'})]),
+    ('database/teacher.db', [('users', 'users', {}, {'id'})]),
+    ('textbooks.db', [('textbooks', 'textbooks', {'department': "'English'"}, {'id'})]),
+    ('screens/textbooks.db', [('textbooks', 'textbooks', {'department': "'English'"}, {'id'})]),
+    ('social_science_textbooks.db', [('textbooks', 'textbooks', {'department': "'Social Science'"}, {'id'})]),
+    ('screens/social_science_textbooks.db', [('textbooks', 'textbooks', {'department': "'Social Science'"}, {'id'})]),
+]
+
+# Tables without a natural primary key, imported from more than one copy of
+# the same file: a legacy row is skipped when the store already has a row
+# with the same values in these columns
+NATURAL_KEYS = {
+    'textbooks': ('department', 'title', 'grade'),
+}
+
+
+def _columns(conn, schema, table):
+    return [row[1] for row in conn.execute(f'PRAGMA {schema}.table_info({table})')]
+
+
+def _copy_table(conn, target, source, renames, skipped):
+    """Copy one legacy table into the consolidated store, skipping rows it already has"""
+    source_columns = _columns(conn, 'legacy', source)
+    if not source_columns:
+        return 0
+
+    target_columns = []
+    expressions = []
+    for column in _columns(conn, 'main', target):
+        if column in renames:
+            target_columns.append(column)
+            expressions.append(renames[column])
+        elif column in source_columns and column not in skipped:
+            target_columns.append(column)
+            expressions.append(f'src.{column}')
+
+    where = ''
+    if target in NATURAL_KEYS:
+        column_expressions = dict(zip(target_columns, expressions))
+        matches = ' AND '.join(f'dst.{column} = {column_expressions[column]}' for column in NATURAL_KEYS[target])
+        where = f'WHERE NOT EXISTS (SELECT 1 FROM main.{target} AS dst WHERE {matches})'
+
+    cursor = conn.execute(f'''
+        INSERT OR IGNORE INTO {target} ({', '.join(target_columns)})
+        SELECT {', '.join(expressions)} FROM legacy.{source} AS src
+        {where}
+    ''')
+    return cursor.rowcount
+
+
+def import_legacy_databases(base_dir=BASE_DIR):
+    """Merge the old per-module .db files into the consolidated store once"""
+    conn = db_config.get_connection()
+    conn.execute('''
+        CREATE TABLE IF NOT EXISTS legacy_imports (
+            source TEXT PRIMARY KEY,
+            imported_at TEXT
+        )
+    ''')
+    conn.commit()
+
+    imported = {}
+    for relative_path, tables in LEGACY_SOURCES:
+        path = os.path.join(base_dir, relative_path)
+        if not os.path.exists(path) or os.path.samefile(path, db_config.db_path):
+            continue
+        if conn.execute('SELECT 1 FROM legacy_imports WHERE source = ?', (relative_path,)).fetchone():
+            continue
+
+        conn.execute('ATTACH DATABASE ? AS legacy', (path,))
+        try:
+            conn.execute('BEGIN')
+            rows = 0
+            for target, source, renames, skipped in tables:
+                rows += _copy_table(conn, target, source, renames, skipped)
+            conn.execute(
+                'INSERT INTO legacy_imports (source, imported_at) VALUES (?, ?)',
+                (relative_path, datetime.now().strftime('%Y-%m-%d %H:%M:%S'))
+            )
+            conn.commit()
+            imported[relative_path] = rows
+        except sqlite3.Error as e:
+            conn.rollback()
+            print(f"Error importing {relative_path}: {e}")
+        finally:
+            conn.execute('DETACH DATABASE legacy')
+
+    return imported
+
+
+if __name__ == "__main__":
+    for source, rows in import_legacy_databases().items():
+        print(f"Imported {rows} rows from {source}")
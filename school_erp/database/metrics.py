@@ -0,0 +1,120 @@
+import threading
+import time
+from datetime import datetime
+from .db_config import db_config
+
+# Seconds a loaded counter is trusted before it is re-read from the database.
+# DAO writes keep the counters current in between; the TTL only catches
+# writes made outside the DAOs (other processes, hand-written SQL).
+METRIC_TTLS = {
+    'students': 300,
+    'teachers': 300,
+    'pending_fees': 120,
+    'notices_today': 60,
+    'payroll_status': 30,
+}
+
+
+def current_pay_period():
+    """Pay period label of the current month, as payroll_runs stores it ("March 2025")"""
+    return datetime.now().strftime('%B %Y')
+
+
+def _count(sql, params=()):
+    return db_config.get_connection().execute(sql, params).fetchone()[0]
+
+
+def _payroll_status():
+    row = db_config.get_connection().execute(
+        'SELECT status, processed, total FROM payroll_runs WHERE month_year = ?',
+        (current_pay_period(),)
+    ).fetchone()
+    return tuple(row) if row else ('not run', 0, 0)
+
+
+METRIC_LOADERS = {
+    'students': lambda: _count('SELECT COUNT(*) FROM students'),
+    'teachers': lambda: _count('SELECT COUNT(*) FROM teachers'),
+    'pending_fees': lambda: _count('SELECT COUNT(*) FROM pending_fees'),
+    'notices_today': lambda: _count(
+        'SELECT COUNT(*) FROM notices WHERE timestamp >= ?',
+        (datetime.now().strftime('%Y-%m-%d'),)
+    ),
+    'payroll_status': _payroll_status,
+}
+
+
+class MetricsStore:
+    """Cached dashboard counters, kept current by DAO writes and refreshed lazily.
+
+    Reading a counter (peek, snapshot) never touches the database, so a view
+    can poll it every second. A counter is loaded on first use and re-loaded
+    by refresh() once its TTL has passed or after invalidate(); adjust()
+    applies a known change in place. version grows with every change, so a
+    poller can tell whether anything moved since its last look.
+    """
+
+    def __init__(self, loaders=None, ttls=None):
+        self.loaders = loaders or METRIC_LOADERS
+        self.ttls = ttls or METRIC_TTLS
+        self.version = 0
+        self._values = {}
+        self._loaded_at = {}
+        self._lock = threading.Lock()
+
+    def peek(self, name):
+        """Cached value of a counter, or None when it is not loaded"""
+        with self._lock:
+            return self._values.get(name)
+
+    def snapshot(self):
+        """Every cached counter as {name: value}"""
+        with self._lock:
+            return dict(self._values)
+
+    def stale(self):
+        """Names of the counters that are missing or past their TTL"""
+        now = time.monotonic()
+        with self._lock:
+            return [
+                name for name in self.loaders
+                if name not in self._loaded_at or now - self._loaded_at[name] >= self.ttls.get(name, 0)
+            ]
+
+    def refresh(self, names=None):
+        """Re-load the stale counters (or the named ones) and return the snapshot"""
+        for name in (names if names is not None else self.stale()):
+            try:
+                value = self.loaders[name]()
+            except Exception as e:
+                print(f"Metrics error loading {name}: {str(e)}")
+                continue
+            with self._lock:
+                if self._values.get(name) != value:
+                    self.version += 1
+                self._values[name] = value
+                self._loaded_at[name] = time.monotonic()
+        return self.snapshot()
+
+    def get(self, name):
+        """Value of a counter, loading it first when stale"""
+        if name in self.stale():
+            self.refresh([name])
+        return self.peek(name)
+
+    def adjust(self, name, delta):
+        """Apply a known change (e.g. +1 after an insert) to a loaded counter"""
+        with self._lock:
+            if name in self._values:
+                self._values[name] += delta
+                self.version += 1
+
+    def invalidate(self, *names):
+        """Mark counters stale so the next refresh re-loads them"""
+        with self._lock:
+            for name in names or list(self._loaded_at):
+                self._loaded_at.pop(name, None)
+
+
+# Create the shared metrics store
+metrics = MetricsStore()
@@ -0,0 +1,809 @@
+import sqlite3
+from datetime import datetime
+
+# Consolidated schema for the School ERP store. Every table that used to live
+# in its own .db file (school_erp.db, school_data.db, users.db, salary_slip.db,
+# SalSlip.db, textbooks.db, social_science_textbooks.db) is created here once.
+BASE_TABLES = {
+    'users': '''
+        CREATE TABLE IF NOT EXISTS users (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            username TEXT UNIQUE NOT NULL,
+            password TEXT NOT NULL,
+            role TEXT NOT NULL DEFAULT 'teacher',
+            email TEXT
+        )
+    ''',
+    'teachers': '''
+        CREATE TABLE IF NOT EXISTS teachers (
+            teacher_id TEXT PRIMARY KEY,
+            name TEXT,
+            mother_name TEXT,
+            dob TEXT,
+            age INTEGER,
+            cast_category TEXT,
+            place TEXT,
+            tal TEXT,
+            dist TEXT,
+            state TEXT,
+            adar_no TEXT,
+            contact_no TEXT,
+            designation TEXT,
+            department TEXT,
+            joining_date TEXT,
+            bank_account TEXT,
+            pf_no TEXT
+        )
+    ''',
+    'salary_structure': '''
+        CREATE TABLE IF NOT EXISTS salary_structure (
+            teacher_id TEXT PRIMARY KEY,
+            basic_salary REAL,
+            da_amount REAL,
+            hra_amount REAL,
+            conveyance REAL,
+            medical REAL,
+            other_allowances REAL,
+            pf_deduction REAL,
+            professional_tax REAL,
+            income_tax REAL,
+            other_deductions REAL,
+            da_percent REAL,
+            hra_percent REAL,
+            FOREIGN KEY (teacher_id) REFERENCES teachers (teacher_id)
+        )
+    ''',
+    'salary_payments': '''
+        CREATE TABLE IF NOT EXISTS salary_payments (
+            payment_id INTEGER PRIMARY KEY AUTOINCREMENT,
+            teacher_id TEXT,
+            payment_date TEXT,
+            month_year TEXT,
+            working_days INTEGER,
+            holidays INTEGER,
+            total_earnings REAL,
+            total_deductions REAL,
+            net_salary REAL,
+            payment_method TEXT,
+            payment_status TEXT,
+            FOREIGN KEY (teacher_id) REFERENCES teachers (teacher_id)
+        )
+    ''',
+    'salary_slips': '''
+        CREATE TABLE IF NOT EXISTS salary_slips (
+            slip_id INTEGER PRIMARY KEY AUTOINCREMENT,
+            employee_id TEXT,
+            pay_period TEXT,
+            basic_salary REAL,
+            da REAL,
+            hra REAL,
+            conveyance REAL,
+            medical REAL,
+            other_allowances REAL,
+            pf REAL,
+            professional_tax REAL,
+            income_tax REAL,
+            other_deductions REAL,
+            gross_salary REAL,
+            total_deductions REAL,
+            net_salary REAL,
+            generated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            FOREIGN KEY (employee_id) REFERENCES teachers (teacher_id)
+        )
+    ''',
+    'payments': '''
+        CREATE TABLE IF NOT EXISTS payments (
+            payment_id INTEGER PRIMARY KEY AUTOINCREMENT,
+            slip_id INTEGER,
+            amount REAL,
+            payment_method TEXT,
+            transaction_id TEXT,
+            payment_details TEXT,
+            status TEXT,
+            paid_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            FOREIGN KEY (slip_id) REFERENCES salary_slips (slip_id)
+        )
+    ''',
+    'students': '''
+        CREATE TABLE IF NOT EXISTS students (
+            student_id TEXT PRIMARY KEY,
+            name TEXT NOT NULL,
+            roll_no TEXT NOT NULL,
+            class TEXT NOT NULL,
+            section TEXT,
+            dob TEXT,
+            gender TEXT,
+            address TEXT,
+            phone TEXT,
+            email TEXT,
+            parent_name TEXT,
+            admission_date TEXT,
+            academic_year TEXT
+        )
+    ''',
+    'exam_results': '''
+        CREATE TABLE IF NOT EXISTS exam_results (
+            result_id INTEGER PRIMARY KEY AUTOINCREMENT,
+            student_id TEXT,
+            exam_name TEXT,
+            subject TEXT,
+            marks REAL,
+            max_marks REAL,
+            exam_date TEXT,
+            unit_test1 REAL,
+            unit_test2 REAL,
+            midterm REAL,
+            final REAL,
+            total_score REAL,
+            grade TEXT,
+            FOREIGN KEY (student_id) REFERENCES students (student_id)
+        )
+    ''',
+    'attendance': '''
+        CREATE TABLE IF NOT EXISTS attendance (
+            attendance_id INTEGER PRIMARY KEY AUTOINCREMENT,
+            student_id TEXT,
+            date TEXT,
+            status TEXT,
+            FOREIGN KEY (student_id) REFERENCES students (student_id)
+        )
+    ''',
+    'attendance_summary': '''
+        CREATE TABLE IF NOT EXISTS attendance_summary (
+            student_id TEXT PRIMARY KEY,
+            present_days INTEGER NOT NULL DEFAULT 0,
+            total_days INTEGER NOT NULL DEFAULT 0,
+            percentage REAL,
+            FOREIGN KEY (student_id) REFERENCES students (student_id)
+        )
+    ''',
+    'notices': '''
+        CREATE TABLE IF NOT EXISTS notices (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            title TEXT NOT NULL,
+            content TEXT NOT NULL,
+            timestamp DATETIME DEFAULT CURRENT_TIMESTAMP
+        )
+    ''',
+    'pending_fees': '''
+        CREATE TABLE IF NOT EXISTS pending_fees (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            student_id TEXT,
+            amount REAL,
+            due_date TEXT,
+            status TEXT DEFAULT 'Pending',
+            FOREIGN KEY (student_id) REFERENCES students (student_id)
+        )
+    ''',
+    'textbooks': '''
+        CREATE TABLE IF NOT EXISTS textbooks (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            department TEXT NOT NULL DEFAULT 'English',
+            title TEXT NOT NULL,
+            publisher TEXT NOT NULL,
+            quantity INTEGER NOT NULL,
+            condition TEXT NOT NULL,
+            last_inventory TEXT NOT NULL,
+            cost_per_book INTEGER NOT NULL,
+            grade TEXT NOT NULL
+        )
+    ''',
+}
+
+
+def _table_columns(conn, table):
+    return [row[1] for row in conn.execute(f'PRAGMA table_info({table})')]
+
+
+def _create_base_schema(conn):
+    """Create every base table, adding columns missing from older copies"""
+    for table, ddl in BASE_TABLES.items():
+        conn.execute(ddl)
+
+    # Older copies of school_erp.db predate the merged column sets
+    added_columns = {
+        'students': [('academic_year', 'TEXT')],
+        'exam_results': [
+            ('unit_test1', 'REAL'), ('unit_test2', 'REAL'), ('midterm', 'REAL'),
+            ('final', 'REAL'), ('total_score', 'REAL'), ('grade', 'TEXT')
+        ],
+        'salary_structure': [('da_percent', 'REAL'), ('hra_percent', 'REAL')],
+    }
+    for table, columns in added_columns.items():
+        existing = _table_columns(conn, table)
+        for column, column_type in columns:
+            if column not in existing:
+                conn.execute(f'ALTER TABLE {table} ADD COLUMN {column} {column_type}')
+
+    # salary_structure had no key in older copies; one structure per teacher
+    conn.execute('''
+        DELETE FROM salary_structure WHERE rowid NOT IN (
+            SELECT MAX(rowid) FROM salary_structure GROUP BY teacher_id
+        )
+    ''')
+    conn.execute('''
+        CREATE UNIQUE INDEX IF NOT EXISTS idx_salary_structure_teacher
+        ON salary_structure (teacher_id)
+    ''')
+
+
+# Month-end batch payroll runs, resumable from the last committed batch
+PAYROLL_RUNS = [
+    '''
+    CREATE TABLE IF NOT EXISTS payroll_runs (
+        month_year TEXT PRIMARY KEY,
+        status TEXT NOT NULL,
+        total INTEGER NOT NULL DEFAULT 0,
+        processed INTEGER NOT NULL DEFAULT 0,
+        started_at TEXT,
+        finished_at TEXT,
+        error TEXT
+    )
+    ''',
+    'CREATE INDEX IF NOT EXISTS idx_salary_slips_period ON salary_slips (pay_period, employee_id)',
+    'CREATE INDEX IF NOT EXISTS idx_salary_payments_month ON salary_payments (month_year, teacher_id)',
+]
+
+
+# Columns indexed for full-text search, per content table
+FTS_COLUMNS = {
+    'students': ['name', 'roll_no', 'class', 'parent_name', 'phone', 'email'],
+    'teachers': ['name', 'teacher_id', 'designation', 'department', 'contact_no'],
+    'notices': ['title', 'content'],
+    'lesson_plans': ['title', 'resource_book', 'grade', 'teacher', 'topics', 'objectives'],
+}
+
+
+def _create_search_indexes(conn):
+    """Create lesson_plans and an FTS5 index over each FTS_COLUMNS table, kept in sync by triggers"""
+    conn.execute('''
+        CREATE TABLE IF NOT EXISTS lesson_plans (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            department TEXT NOT NULL,
+            title TEXT NOT NULL,
+            resource_book TEXT,
+            grade TEXT,
+            teacher TEXT,
+            last_updated TEXT,
+            topics TEXT,
+            objectives TEXT
+        )
+    ''')
+
+    for table, columns in FTS_COLUMNS.items():
+        fts = f'{table}_fts'
+        column_list = ', '.join(columns)
+        new_values = ', '.join(f'new.{c}' for c in columns)
+        old_values = ', '.join(f'old.{c}' for c in columns)
+        # External content: the index stores only tokens and reads text back from the table
+        conn.execute(f'''
+            CREATE VIRTUAL TABLE IF NOT EXISTS {fts} USING fts5(
+                {column_list}, content='{table}', content_rowid='rowid',
+                tokenize='unicode61 remove_diacritics 2', prefix='2 3'
+            )
+        ''')
+        conn.execute(f'''
+            CREATE TRIGGER IF NOT EXISTS {table}_fts_insert AFTER INSERT ON {table} BEGIN
+                INSERT INTO {fts} (rowid, {column_list}) VALUES (new.rowid, {new_values});
+            END
+        ''')
+        conn.execute(f'''
+            CREATE TRIGGER IF NOT EXISTS {table}_fts_delete AFTER DELETE ON {table} BEGIN
+                INSERT INTO {fts} ({fts}, rowid, {column_list}) VALUES ('delete', old.rowid, {old_values});
+            END
+        ''')
+        conn.execute(f'''
+            CREATE TRIGGER IF NOT EXISTS {table}_fts_update AFTER UPDATE ON {table} BEGIN
+                INSERT INTO {fts} ({fts}, rowid, {column_list}) VALUES ('delete', old.rowid, {old_values});
+                INSERT INTO {fts} (rowid, {column_list}) VALUES (new.rowid, {new_values});
+            END
+        ''')
+        # Index the rows already in the table
+        conn.execute(f"INSERT INTO {fts} ({fts}) VALUES ('rebuild')")
+
+
+# Secondary indexes for the columns the DAOs and screens filter and sort on
+SECONDARY_INDEXES = [
+    'CREATE INDEX IF NOT EXISTS idx_students_roll_no ON students (roll_no)',
+    'CREATE INDEX IF NOT EXISTS idx_exam_results_student ON exam_results (student_id, exam_date)',
+    'CREATE INDEX IF NOT EXISTS idx_attendance_student_date ON attendance (student_id, date)',
+    'CREATE INDEX IF NOT EXISTS idx_attendance_date ON attendance (date)',
+    'CREATE INDEX IF NOT EXISTS idx_salary_payments_teacher ON salary_payments (teacher_id, payment_date)',
+    'CREATE INDEX IF NOT EXISTS idx_salary_slips_employee ON salary_slips (employee_id, generated_at)',
+    'CREATE INDEX IF NOT EXISTS idx_payments_slip ON payments (slip_id)',
+    'CREATE INDEX IF NOT EXISTS idx_notices_timestamp ON notices (timestamp)',
+    'CREATE INDEX IF NOT EXISTS idx_pending_fees_student ON pending_fees (student_id)',
+    'CREATE INDEX IF NOT EXISTS idx_textbooks_department ON textbooks (department)',
+    'CREATE INDEX IF NOT EXISTS idx_lesson_plans_department ON lesson_plans (department, grade)',
+    # Give the planner row counts for the new indexes
+    'ANALYZE',
+]
+
+
+# Content hash of each spreadsheet last imported into the store, so an
+# unchanged sheet is not re-imported (see database.sheet_cache)
+SHEET_IMPORTS = [
+    '''
+    CREATE TABLE IF NOT EXISTS sheet_imports (
+        name TEXT PRIMARY KEY,
+        sha256 TEXT NOT NULL,
+        rows INTEGER,
+        imported_at TEXT
+    )
+    ''',
+]
+
+
+# Per month, department and payment status totals of the two payment ledgers:
+# salary_payments rows and the payments made against salary_slips. Triggers
+# keep the rollup in step with every write, so reports read a few hundred
+# rows instead of summing the payment history.
+#
+# Migration 6 as shipped. Its triggers count a slip paid after a batch run
+# twice; migration 9 replaces them and recomputes the rollup.
+PAYROLL_SUMMARY_TABLE = '''
+    CREATE TABLE IF NOT EXISTS payroll_monthly_summary (
+        month_year TEXT NOT NULL,
+        department TEXT NOT NULL,
+        payment_status TEXT NOT NULL,
+        payments INTEGER NOT NULL DEFAULT 0,
+        total_earnings REAL NOT NULL DEFAULT 0,
+        total_deductions REAL NOT NULL DEFAULT 0,
+        net_salary REAL NOT NULL DEFAULT 0,
+        PRIMARY KEY (month_year, department, payment_status)
+    )
+'''
+
+# Rollup rows recomputed from both ledgers; unknown values group under ''
+_V6_SUMMARY_ROWS = '''
+    SELECT month_year, department, payment_status, COUNT(*),
+           SUM(total_earnings), SUM(total_deductions), SUM(net_salary)
+    FROM (
+        SELECT COALESCE(p.month_year, '') AS month_year,
+               COALESCE(t.department, '') AS department,
+               COALESCE(p.payment_status, '') AS payment_status,
+               COALESCE(p.total_earnings, 0) AS total_earnings,
+               COALESCE(p.total_deductions, 0) AS total_deductions,
+               COALESCE(p.net_salary, 0) AS net_salary
+        FROM salary_payments p
+        LEFT JOIN teachers t ON t.teacher_id = p.teacher_id
+        UNION ALL
+        SELECT COALESCE(s.pay_period, ''), COALESCE(t.department, ''),
+               COALESCE(pm.status, ''), COALESCE(s.gross_salary, 0),
+               COALESCE(s.total_deductions, 0), COALESCE(pm.amount, 0)
+        FROM payments pm
+        LEFT JOIN salary_slips s ON s.slip_id = pm.slip_id
+        LEFT JOIN teachers t ON t.teacher_id = s.employee_id
+    )
+    GROUP BY month_year, department, payment_status
+'''
+
+# How a row of each ledger maps onto the rollup; {r} is new or old
+_V6_SUMMARY_SOURCES = {
+    'salary_payments': {
+        'month_year': "COALESCE({r}.month_year, '')",
+        'department': "COALESCE((SELECT department FROM teachers WHERE teacher_id = {r}.teacher_id), '')",
+        'payment_status': "COALESCE({r}.payment_status, '')",
+        'total_earnings': 'COALESCE({r}.total_earnings, 0)',
+        'total_deductions': 'COALESCE({r}.total_deductions, 0)',
+        'net_salary': 'COALESCE({r}.net_salary, 0)',
+    },
+    'payments': {
+        'month_year': "COALESCE((SELECT pay_period FROM salary_slips WHERE slip_id = {r}.slip_id), '')",
+        'department': '''COALESCE((SELECT t.department FROM salary_slips s
+                       JOIN teachers t ON t.teacher_id = s.employee_id
+                       WHERE s.slip_id = {r}.slip_id), '')''',
+        'payment_status': "COALESCE({r}.status, '')",
+        'total_earnings': 'COALESCE((SELECT gross_salary FROM salary_slips WHERE slip_id = {r}.slip_id), 0)',
+        'total_deductions': 'COALESCE((SELECT total_deductions FROM salary_slips WHERE slip_id = {r}.slip_id), 0)',
+        'net_salary': 'COALESCE({r}.amount, 0)',
+    },
+}
+
+
+def _v6_summary_change(source, r, sign):
+    """SQL adding (sign 1) or removing (sign -1) one ledger row from the rollup"""
+    expr = {column: e.format(r=r) for column, e in _V6_SUMMARY_SOURCES[source].items()}
+    change = f'''
+        INSERT INTO payroll_monthly_summary (month_year, department, payment_status,
+            payments, total_earnings, total_deductions, net_salary)
+        VALUES ({expr['month_year']}, {expr['department']}, {expr['payment_status']},
+            {sign}, {sign} * {expr['total_earnings']}, {sign} * {expr['total_deductions']},
+            {sign} * {expr['net_salary']})
+        ON CONFLICT (month_year, department, payment_status) DO UPDATE SET
+            payments = payments + excluded.payments,
+            total_earnings = total_earnings + excluded.total_earnings,
+            total_deductions = total_deductions + excluded.total_deductions,
+            net_salary = net_salary + excluded.net_salary;
+    '''
+    if sign < 0:
+        # Drop groups whose last payment went
+        change += f'''
+        DELETE FROM payroll_monthly_summary
+        WHERE month_year = {expr['month_year']} AND department = {expr['department']}
+          AND payment_status = {expr['payment_status']} AND payments <= 0;
+        '''
+    return change
+
+
+def _create_payroll_summary(conn):
+    """Create payroll_monthly_summary, fill it from the ledgers and keep it current with triggers"""
+    conn.execute(PAYROLL_SUMMARY_TABLE)
+    for source in _V6_SUMMARY_SOURCES:
+        conn.execute(f'''
+            CREATE TRIGGER IF NOT EXISTS {source}_summary_insert AFTER INSERT ON {source} BEGIN
+                {_v6_summary_change(source, 'new', 1)}
+            END
+        ''')
+        conn.execute(f'''
+            CREATE TRIGGER IF NOT EXISTS {source}_summary_delete AFTER DELETE ON {source} BEGIN
+                {_v6_summary_change(source, 'old', -1)}
+            END
+        ''')
+        conn.execute(f'''
+            CREATE TRIGGER IF NOT EXISTS {source}_summary_update AFTER UPDATE ON {source} BEGIN
+                {_v6_summary_change(source, 'old', -1)}
+                {_v6_summary_change(source, 'new', 1)}
+            END
+        ''')
+    conn.execute('DELETE FROM payroll_monthly_summary')
+    conn.execute(f'''
+        INSERT INTO payroll_monthly_summary (month_year, department, payment_status,
+            payments, total_earnings, total_deductions, net_salary)
+        {_V6_SUMMARY_ROWS}
+    ''')
+
+
+# Migration 9: the same rollup with a teacher's month counted once. Payments
+# against a slip are left out while the teacher has a salary_payments row for
+# the slip's pay period (a batch payroll run writes both).
+
+# Rollup rows recomputed from both ledgers; unknown values group under ''
+PAYROLL_SUMMARY_ROWS = '''
+    SELECT month_year, department, payment_status, COUNT(*),
+           SUM(total_earnings), SUM(total_deductions), SUM(net_salary)
+    FROM (
+        SELECT COALESCE(p.month_year, '') AS month_year,
+               COALESCE(t.department, '') AS department,
+               COALESCE(p.payment_status, '') AS payment_status,
+               COALESCE(p.total_earnings, 0) AS total_earnings,
+               COALESCE(p.total_deductions, 0) AS total_deductions,
+               COALESCE(p.net_salary, 0) AS net_salary
+        FROM salary_payments p
+        LEFT JOIN teachers t ON t.teacher_id = p.teacher_id
+        UNION ALL
+        SELECT COALESCE(s.pay_period, ''), COALESCE(t.department, ''),
+               COALESCE(pm.status, ''), COALESCE(s.gross_salary, 0),
+               COALESCE(s.total_deductions, 0), COALESCE(pm.amount, 0)
+        FROM payments pm
+        LEFT JOIN salary_slips s ON s.slip_id = pm.slip_id
+        LEFT JOIN teachers t ON t.teacher_id = s.employee_id
+        WHERE NOT EXISTS (
+            SELECT 1 FROM salary_payments sp
+            WHERE sp.teacher_id = s.employee_id AND sp.month_year = s.pay_period
+        )
+    )
+    GROUP BY month_year, department, payment_status
+'''
+
+# How a row of each ledger maps onto the rollup, and when it is counted;
+# {r} is new or old
+PAYROLL_SUMMARY_SOURCES = {
+    'salary_payments': {
+        'counted': '1',
+        'month_year': "COALESCE({r}.month_year, '')",
+        'department': "COALESCE((SELECT department FROM teachers WHERE teacher_id = {r}.teacher_id), '')",
+        'payment_status': "COALESCE({r}.payment_status, '')",
+        'total_earnings': 'COALESCE({r}.total_earnings, 0)',
+        'total_deductions': 'COALESCE({r}.total_deductions, 0)',
+        'net_salary': 'COALESCE({r}.net_salary, 0)',
+    },
+    'payments': {
+        'counted': '''NOT EXISTS (SELECT 1 FROM salary_slips s
+                     JOIN salary_payments sp ON sp.teacher_id = s.employee_id AND sp.month_year = s.pay_period
+                     WHERE s.slip_id = {r}.slip_id)''',
+        'month_year': "COALESCE((SELECT pay_period FROM salary_slips WHERE slip_id = {r}.slip_id), '')",
+        'department': '''COALESCE((SELECT t.department FROM salary_slips s
+                       JOIN teachers t ON t.teacher_id = s.employee_id
+                       WHERE s.slip_id = {r}.slip_id), '')''',
+        'payment_status': "COALESCE({r}.status, '')",
+        'total_earnings': 'COALESCE((SELECT gross_salary FROM salary_slips WHERE slip_id = {r}.slip_id), 0)',
+        'total_deductions': 'COALESCE((SELECT total_deductions FROM salary_slips WHERE slip_id = {r}.slip_id), 0)',
+        'net_salary': 'COALESCE({r}.amount, 0)',
+    },
+}
+
+
+_SUMMARY_UPSERT = '''
+        ON CONFLICT (month_year, department, payment_status) DO UPDATE SET
+            payments = payments + excluded.payments,
+            total_earnings = total_earnings + excluded.total_earnings,
+            total_deductions = total_deductions + excluded.total_deductions,
+            net_salary = net_salary + excluded.net_salary;
+'''
+
+
+def _summary_change(source, r, sign):
+    """SQL adding (sign 1) or removing (sign -1) one ledger row from the rollup"""
+    expr = {column: e.format(r=r) for column, e in PAYROLL_SUMMARY_SOURCES[source].items()}
+    change = f'''
+        INSERT INTO payroll_monthly_summary (month_year, department, payment_status,
+            payments, total_earnings, total_deductions, net_salary)
+        SELECT {expr['month_year']}, {expr['department']}, {expr['payment_status']},
+            {sign}, {sign} * {expr['total_earnings']}, {sign} * {expr['total_deductions']},
+            {sign} * {expr['net_salary']}
+        WHERE {expr['counted']}
+        {_SUMMARY_UPSERT}
+    '''
+    if sign < 0:
+        # Drop groups whose last payment went
+        change += f'''
+        DELETE FROM payroll_monthly_summary
+        WHERE month_year = {expr['month_year']} AND department = {expr['department']}
+          AND payment_status = {expr['payment_status']} AND payments <= 0;
+        '''
+    return change
+
+
+def _slip_payments_change(r, sign, condition):
+    """SQL adding or removing the payments against {r}'s teacher and month when condition holds"""
+    expr = {column: e.format(r='pm') for column, e in PAYROLL_SUMMARY_SOURCES['payments'].items()}
+    return f'''
+        INSERT INTO payroll_monthly_summary (month_year, department, payment_status,
+            payments, total_earnings, total_deductions, net_salary)
+        SELECT {expr['month_year']}, {expr['department']}, {expr['payment_status']},
+            {sign} * COUNT(*), {sign} * SUM({expr['total_earnings']}),
+            {sign} * SUM({expr['total_deductions']}), {sign} * SUM({expr['net_salary']})
+        FROM payments pm
+        JOIN salary_slips s ON s.slip_id = pm.slip_id
+        WHERE s.employee_id = {r}.teacher_id AND s.pay_period = {r}.month_year AND {condition}
+        GROUP BY 1, 2, 3
+        {_SUMMARY_UPSERT}
+        DELETE FROM payroll_monthly_summary
+        WHERE month_year = COALESCE({r}.month_year, '') AND payments <= 0;
+    '''
+
+
+def _salary_payments_for(r):
+    return f'salary_payments WHERE teacher_id = {r}.teacher_id AND month_year = {r}.month_year'
+
+
+# The first salary_payments row of a teacher's month takes the payments
+# against that month's slips out of the rollup; removing the last one puts
+# them back
+_SLIP_PAYMENTS_OUT = _slip_payments_change(
+    'new', -1, f"(SELECT COUNT(*) FROM {_salary_payments_for('new')}) = 1"
+)
+_SLIP_PAYMENTS_BACK = _slip_payments_change(
+    'old', 1, f"NOT EXISTS (SELECT 1 FROM {_salary_payments_for('old')})"
+)
+_SLIP_PAYMENTS_MOVED = _slip_payments_change(
+    'new', -1,
+    f"(new.teacher_id IS NOT old.teacher_id OR new.month_year IS NOT old.month_year) "
+    f"AND (SELECT COUNT(*) FROM {_salary_payments_for('new')}) = 1"
+)
+
+PAYROLL_SUMMARY_TRIGGERS = {
+    'salary_payments': (_SLIP_PAYMENTS_OUT, _SLIP_PAYMENTS_BACK, _SLIP_PAYMENTS_BACK + _SLIP_PAYMENTS_MOVED),
+    'payments': ('', '', ''),
+}
+
+
+def _recount_payroll_summary(conn):
+    """Replace the migration 6 triggers, which counted a batch-paid slip twice, and rebuild the rollup"""
+    for source in PAYROLL_SUMMARY_SOURCES:
+        on_insert, on_delete, on_update = PAYROLL_SUMMARY_TRIGGERS[source]
+        conn.execute(f'DROP TRIGGER IF EXISTS {source}_summary_insert')
+        conn.execute(f'''
+            CREATE TRIGGER {source}_summary_insert AFTER INSERT ON {source} BEGIN
+                {_summary_change(source, 'new', 1)}
+                {on_insert}
+            END
+        ''')
+        conn.execute(f'DROP TRIGGER IF EXISTS {source}_summary_delete')
+        conn.execute(f'''
+            CREATE TRIGGER {source}_summary_delete AFTER DELETE ON {source} BEGIN
+                {_summary_change(source, 'old', -1)}
+                {on_delete}
+            END
+        ''')
+        conn.execute(f'DROP TRIGGER IF EXISTS {source}_summary_update')
+        conn.execute(f'''
+            CREATE TRIGGER {source}_summary_update AFTER UPDATE ON {source} BEGIN
+                {_summary_change(source, 'old', -1)}
+                {_summary_change(source, 'new', 1)}
+                {on_update}
+            END
+        ''')
+    conn.execute('DELETE FROM payroll_monthly_summary')
+    conn.execute(f'''
+        INSERT INTO payroll_monthly_summary (month_year, department, payment_status,
+            payments, total_earnings, total_deductions, net_salary)
+        {PAYROLL_SUMMARY_ROWS}
+    ''')
+
+
+# Attendance statuses that count as a day present; anything else is absent
+PRESENT_STATUSES = ('Present', 'Late')
+
+_PRESENT = '(CASE WHEN {r}.status IN (%s) THEN 1 ELSE 0 END)' % ', '.join(f"'{s}'" for s in PRESENT_STATUSES)
+
+
+def _attendance_change(r, sign):
+    """SQL adding (sign 1) or removing (sign -1) one attendance mark from the student's counters"""
+    present = _PRESENT.format(r=r)
+    return f'''
+        INSERT INTO attendance_summary (student_id, present_days, total_days, percentage)
+        VALUES ({r}.student_id, {sign} * {present}, {sign}, 100.0 * {present})
+        ON CONFLICT (student_id) DO UPDATE SET
+            present_days = present_days + excluded.present_days,
+            total_days = total_days + excluded.total_days,
+            percentage = CASE WHEN total_days + excluded.total_days > 0
+                THEN ROUND(100.0 * (present_days + excluded.present_days)
+                           / (total_days + excluded.total_days), 2)
+                ELSE 0 END;
+    '''
+
+
+def _create_attendance_counters(conn):
+    """One mark per student and day, with attendance_summary kept as running counters"""
+    # Keep the latest mark of any day marked twice
+    conn.execute('''
+        DELETE FROM attendance WHERE rowid NOT IN (
+            SELECT MAX(rowid) FROM attendance GROUP BY student_id, date
+        )
+    ''')
+    conn.execute('DROP INDEX IF EXISTS idx_attendance_student_date')
+    conn.execute('''
+        CREATE UNIQUE INDEX IF NOT EXISTS idx_attendance_student_day
+        ON attendance (student_id, date)
+    ''')
+    conn.execute('''
+        CREATE INDEX IF NOT EXISTS idx_students_class_section
+        ON students (class, section, roll_no)
+    ''')
+
+    conn.execute(f'''
+        CREATE TRIGGER IF NOT EXISTS attendance_counters_insert AFTER INSERT ON attendance BEGIN
+            {_attendance_change('new', 1)}
+        END
+    ''')
+    conn.execute(f'''
+        CREATE TRIGGER IF NOT EXISTS attendance_counters_delete AFTER DELETE ON attendance BEGIN
+            {_attendance_change('old', -1)}
+        END
+    ''')
+    conn.execute(f'''
+        CREATE TRIGGER IF NOT EXISTS attendance_counters_update
+        AFTER UPDATE OF student_id, status ON attendance BEGIN
+            {_attendance_change('old', -1)}
+            {_attendance_change('new', 1)}
+        END
+    ''')
+
+    # Counters of students with marks start from their marks; hand-entered
+    # summaries of students without any are kept
+    conn.execute(f'''
+        INSERT OR REPLACE INTO attendance_summary (student_id, present_days, total_days, percentage)
+        SELECT student_id, SUM({_PRESENT.format(r='attendance')}), COUNT(*),
+               ROUND(100.0 * SUM({_PRESENT.format(r='attendance')}) / COUNT(*), 2)
+        FROM attendance
+        WHERE student_id IS NOT NULL
+        GROUP BY student_id
+    ''')
+
+
+# Published whole-exam results, one row per student, written in bulk by
+# database.grading
+REPORT_CARDS = [
+    '''
+    CREATE TABLE IF NOT EXISTS exam_report_cards (
+        exam_name TEXT NOT NULL,
+        student_id TEXT NOT NULL,
+        subjects INTEGER,
+        total_marks REAL,
+        max_marks REAL,
+        percentage REAL,
+        grade TEXT,
+        class_rank INTEGER,
+        percentile REAL,
+        published_at TEXT,
+        PRIMARY KEY (exam_name, student_id),
+        FOREIGN KEY (student_id) REFERENCES students (student_id)
+    )
+    ''',
+    'CREATE INDEX IF NOT EXISTS idx_exam_results_exam ON exam_results (exam_name, student_id, subject)',
+]
+
+
+def _unique_salary_slips(conn):
+    """One slip per teacher and pay period, so a resumed payroll run cannot write a second.
+
+    Duplicate slips are merged into the latest one; payments made against
+    the others move to it.
+    """
+    conn.execute('''
+        CREATE TEMP TABLE slip_keep AS
+        SELECT slip_id, MAX(slip_id) OVER (PARTITION BY employee_id, pay_period) AS keep_id
+        FROM salary_slips
+        WHERE employee_id IS NOT NULL AND pay_period IS NOT NULL
+    ''')
+    conn.execute('''
+        UPDATE payments SET slip_id = (SELECT keep_id FROM slip_keep WHERE slip_keep.slip_id = payments.slip_id)
+        WHERE slip_id IN (SELECT slip_id FROM slip_keep WHERE slip_id != keep_id)
+    ''')
+    conn.execute('DELETE FROM salary_slips WHERE slip_id IN (SELECT slip_id FROM slip_keep WHERE slip_id != keep_id)')
+    conn.execute('DROP TABLE slip_keep')
+    conn.execute('''
+        CREATE UNIQUE INDEX IF NOT EXISTS idx_salary_slips_employee_period
+        ON salary_slips (employee_id, pay_period)
+    ''')
+
+
+# Ordered list of (version, description, step). A step is either a list of SQL
+# statements or a callable taking the connection. Append new migrations here;
+# never edit one that has already shipped.
+MIGRATIONS = [
+    (1, 'Consolidated base schema', _create_base_schema),
+    (2, 'Batch payroll runs', PAYROLL_RUNS),
+    (3, 'Full-text search indexes', _create_search_indexes),
+    (4, 'Secondary indexes', SECONDARY_INDEXES),
+    (5, 'Spreadsheet import log', SHEET_IMPORTS),
+    (6, 'Monthly payroll summary', _create_payroll_summary),
+    (7, 'Attendance counters', _create_attendance_counters),
+    (8, 'Exam report cards', REPORT_CARDS),
+    (9, 'Count each teacher and month once in the payroll summary', _recount_payroll_summary),
+    (10, 'One salary slip per teacher and pay period', _unique_salary_slips),
+]
+
+LATEST_VERSION = MIGRATIONS[-1][0]
+
+
+def get_schema_version(conn):
+    """Return the applied schema version, or 0 for a fresh database"""
+    try:
+        row = conn.execute('SELECT MAX(version) FROM schema_version').fetchone()
+    except sqlite3.OperationalError:
+        return 0
+    return row[0] or 0
+
+
+def migrate(conn):
+    """Bring the database up to LATEST_VERSION; a no-op when already current"""
+    current = get_schema_version(conn)
+    if current >= LATEST_VERSION:
+        return current
+
+    conn.execute('''
+        CREATE TABLE IF NOT EXISTS schema_version (
+            version INTEGER PRIMARY KEY,
+            description TEXT,
+            applied_at TEXT
+        )
+    ''')
+    conn.commit()
+
+    for version, description, step in MIGRATIONS:
+        if version <= current:
+            continue
+        try:
+            # Explicit BEGIN so DDL and data changes of a step commit together
+            conn.execute('BEGIN')
+            if callable(step):
+                step(conn)
+            else:
+                for statement in step:
+                    conn.execute(statement)
+            conn.execute(
+                'INSERT INTO schema_version (version, description, applied_at) VALUES (?, ?, ?)',
+                (version, description, datetime.now().strftime('%Y-%m-%d %H:%M:%S'))
+            )
+            conn.commit()
+            print(f"Applied schema migration {version}: {description}")
+        except Exception as e:
+            conn.rollback()
+            print(f"Schema migration {version} failed: {e}")
+            raise
+        current = version
+
+    return current
@@ -0,0 +1,179 @@
+import pandas as pd
+from datetime import datetime
+from .db_config import db_config
+from .metrics import metrics
+from .teacher_dao import EARNING_COLUMNS, DEDUCTION_COLUMNS
+
+# Slips written per transaction; a 500-teacher school commits once per run
+DEFAULT_BATCH_SIZE = 500
+
+# Teachers with a salary structure but no slip yet for the pay period, so a
+# failed or interrupted run resumes where its last committed batch ended
+PENDING_STRUCTURES_QUERY = '''
+    SELECT t.teacher_id, t.name, s.basic_salary, s.da_amount, s.hra_amount,
+           s.conveyance, s.medical, s.other_allowances, s.pf_deduction,
+           s.professional_tax, s.income_tax, s.other_deductions,
+           s.da_percent, s.hra_percent
+    FROM teachers t
+    JOIN salary_structure s ON s.teacher_id = t.teacher_id
+    WHERE NOT EXISTS (
+        SELECT 1 FROM salary_slips sl
+        WHERE sl.pay_period = ? AND sl.employee_id = t.teacher_id
+    )
+    ORDER BY t.teacher_id
+'''
+
+SLIP_COLUMNS = [
+    'teacher_id', 'pay_period', 'basic_salary', 'da_amount', 'hra_amount',
+    'conveyance', 'medical', 'other_allowances', 'pf_deduction',
+    'professional_tax', 'income_tax', 'other_deductions',
+    'gross_salary', 'total_deductions', 'net_salary'
+]
+
+PAYMENT_COLUMNS = [
+    'teacher_id', 'payment_date', 'pay_period', 'working_days', 'holidays',
+    'gross_salary', 'total_deductions', 'net_salary', 'payment_method', 'payment_status'
+]
+
+
+def compute_payroll(structures):
+    """Add gross, deduction and net columns to a frame of salary structures"""
+    frame = structures.copy()
+    # Structures imported from the admin sheet store DA/HRA as percentages
+    frame['da_amount'] = frame['da_amount'].fillna(frame['basic_salary'] * frame['da_percent'] / 100)
+    frame['hra_amount'] = frame['hra_amount'].fillna(frame['basic_salary'] * frame['hra_percent'] / 100)
+
+    money_columns = EARNING_COLUMNS + DEDUCTION_COLUMNS
+    frame[money_columns] = frame[money_columns].astype(float).fillna(0)
+    frame['gross_salary'] = frame[EARNING_COLUMNS].sum(axis=1)
+    frame['total_deductions'] = frame[DEDUCTION_COLUMNS].sum(axis=1)
+    frame['net_salary'] = frame['gross_salary'] - frame['total_deductions']
+    return frame
+
+
+def _start_run(conn, month_year, force=False):
+    """Claim the month's payroll_runs row and return the slips already processed.
+
+    The claim is one statement, so of two runs started for a month at once
+    only one gets it; the other raises RuntimeError. force takes over a row
+    left 'running' by a process that died mid-run.
+    """
+    cursor = conn.execute('''
+        INSERT INTO payroll_runs (month_year, status, total, processed, started_at, error)
+        VALUES (?, 'running', 0, 0, ?, NULL)
+        ON CONFLICT(month_year) DO UPDATE SET
+            status = excluded.status, started_at = excluded.started_at, error = NULL
+        WHERE payroll_runs.status != 'running' OR ?
+    ''', (month_year, datetime.now().strftime('%Y-%m-%d %H:%M:%S'), bool(force)))
+    conn.commit()
+    if cursor.rowcount == 0:
+        raise RuntimeError(f"A payroll run for {month_year} is already running")
+    metrics.invalidate('payroll_status')
+    return conn.execute(
+        'SELECT processed FROM payroll_runs WHERE month_year = ?', (month_year,)
+    ).fetchone()[0]
+
+
+def run_monthly_payroll(month_year, working_days=None, holidays=None, payment_method='Bank Transfer',
+                        progress_callback=None, batch_size=DEFAULT_BATCH_SIZE, force=False):
+    """Compute and store every pending salary slip and payment for a month.
+
+    Salary structures are loaded in one query and totalled column-wise. Slips
+    and payment rows are written with executemany, batch_size rows per
+    transaction, and progress_callback(processed, total) is called after each
+    commit. The callback stops the run by raising (TaskCancelled when the
+    background task is cancelled): the run is recorded as cancelled and the
+    exception re-raised. Any other error records the run as failed and is
+    re-raised too. Re-running the month only processes the teachers left over.
+    A month already being run raises RuntimeError (see _start_run for force).
+    """
+    conn = db_config.get_connection()
+    processed = _start_run(conn, month_year, force)
+    total = processed
+
+    status = 'running'
+    try:
+        structures = pd.read_sql_query(PENDING_STRUCTURES_QUERY, conn, params=(month_year,))
+        total = processed + len(structures)
+        conn.execute('UPDATE payroll_runs SET total = ? WHERE month_year = ?', (total, month_year))
+        conn.commit()
+
+        frame = compute_payroll(structures)
+        frame['pay_period'] = month_year
+        frame['payment_date'] = datetime.now().strftime('%Y-%m-%d')
+        frame['working_days'] = working_days
+        frame['holidays'] = holidays
+        frame['payment_method'] = payment_method
+        frame['payment_status'] = 'Pending'
+        total_net_salary = float(frame['net_salary'].sum())
+        # Plain Python objects so sqlite3 can bind every value
+        frame = frame.astype(object).where(frame.notna(), None)
+
+        if progress_callback:
+            status = 'cancelled'
+            progress_callback(processed, total)
+            status = 'running'
+
+        for start in range(0, len(frame), batch_size):
+            batch = frame.iloc[start:start + batch_size]
+            with db_config.pool.transaction():
+                conn.executemany('''
+                    INSERT INTO salary_slips
+                    (employee_id, pay_period, basic_salary, da, hra, conveyance, medical,
+                    other_allowances, pf, professional_tax, income_tax, other_deductions,
+                    gross_salary, total_deductions, net_salary)
+                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                ''', batch[SLIP_COLUMNS].itertuples(index=False, name=None))
+                conn.executemany('''
+                    INSERT INTO salary_payments
+                    (teacher_id, payment_date, month_year, working_days, holidays,
+                    total_earnings, total_deductions, net_salary, payment_method, payment_status)
+                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                ''', batch[PAYMENT_COLUMNS].itertuples(index=False, name=None))
+                conn.execute(
+                    'UPDATE payroll_runs SET processed = ? WHERE month_year = ?',
+                    (processed + len(batch), month_year)
+                )
+            processed += len(batch)
+            if progress_callback:
+                status = 'cancelled'
+                progress_callback(processed, total)
+                status = 'running'
+
+        conn.execute('''
+            UPDATE payroll_runs SET status = 'completed', finished_at = ?
+            WHERE month_year = ?
+        ''', (datetime.now().strftime('%Y-%m-%d %H:%M:%S'), month_year))
+        conn.commit()
+        status = 'completed'
+
+    except Exception as e:
+        # Only the progress callback raising means the run was stopped on purpose
+        if status != 'cancelled':
+            status = 'failed'
+        conn.execute(
+            'UPDATE payroll_runs SET status = ?, error = ? WHERE month_year = ?',
+            (status, str(e) or None, month_year)
+        )
+        conn.commit()
+        metrics.invalidate('payroll_status')
+        raise
+
+    metrics.invalidate('payroll_status')
+
+    return {
+        'month_year': month_year,
+        'status': status,
+        'processed': processed,
+        'total': total,
+        'total_net_salary': total_net_salary
+    }
+
+
+def get_payroll_run(month_year):
+    """Get the status row of a month's payroll run"""
+    cursor = db_config.get_connection().execute(
+        'SELECT month_year, status, total, processed, started_at, finished_at, error '
+        'FROM payroll_runs WHERE month_year = ?', (month_year,)
+    )
+    return cursor.fetchone()
@@ -0,0 +1,125 @@
+"""
+Reads and rebuilds of the payroll_monthly_summary rollup.
+
+Triggers on salary_payments and payments (see migrations 6 and 9) keep
+the rollup current as payments are recorded, so month, department and year
+totals come from a few rows instead of the full payment history. A rebuild is
+only needed after editing teachers' departments or bulk-loading history
+with the triggers bypassed:
+
+    python -m database.payroll_summary --year 2024
+"""
+
+import argparse
+import os
+import sys
+
+if __package__ in (None, ''):
+    # Make the school_erp root importable when run as a script
+    sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from database.db_config import db_config
+from database.migrations import PAYROLL_SUMMARY_ROWS
+
+SUMMARY_COLUMNS = [
+    'month_year', 'department', 'payment_status', 'payments',
+    'total_earnings', 'total_deductions', 'net_salary'
+]
+
+# Pay periods whose payments fall in a date range, from either ledger
+_MONTHS_PAID_BETWEEN = '''
+    SELECT DISTINCT month_year FROM salary_payments WHERE payment_date BETWEEN ? AND ?
+    UNION
+    SELECT DISTINCT s.pay_period FROM payments pm
+    JOIN salary_slips s ON s.slip_id = pm.slip_id
+    WHERE pm.paid_at BETWEEN ? AND ?
+'''
+
+
+def _year_filter(year):
+    # Pay periods are stored as typed ("March 2025", "03/2025"), so match the trailing year
+    return 'month_year LIKE ?', f'%{year}'
+
+
+def rebuild_payroll_summary(months=None, year=None, date_from=None, date_to=None):
+    """Recompute the rollup from the ledgers and return the number of rows written.
+
+    Rebuilds the given pay periods, the pay periods of a year, the pay
+    periods with payments dated between date_from and date_to, or (with no
+    arguments) everything, in a single transaction.
+    """
+    conn = db_config.get_connection()
+    if date_from or date_to:
+        dates = (date_from or '0000-01-01', f"{date_to or '9999-12-31'} 23:59:59")
+        found = [row[0] for row in conn.execute(_MONTHS_PAID_BETWEEN, dates + dates)]
+        months = list(months or []) + found
+
+    where, params = '', []
+    if months is not None:
+        months = [month or '' for month in dict.fromkeys(months)]
+        if not months:
+            return 0
+        where, params = f"month_year IN ({', '.join('?' * len(months))})", months
+    elif year is not None:
+        where, pattern = _year_filter(year)
+        params = [pattern]
+
+    condition = f' WHERE {where}' if where else ''
+    with db_config.pool.transaction():
+        conn.execute(f'DELETE FROM payroll_monthly_summary{condition}', params)
+        cursor = conn.execute(f'''
+            INSERT INTO payroll_monthly_summary ({', '.join(SUMMARY_COLUMNS)})
+            SELECT * FROM ({PAYROLL_SUMMARY_ROWS}){condition}
+        ''', params)
+    return cursor.rowcount
+
+
+def get_payroll_summary(month_year=None, year=None, department=None):
+    """Rollup rows as dicts, for one pay period, a year and/or a department"""
+    conditions, params = [], []
+    if month_year is not None:
+        conditions.append('month_year = ?')
+        params.append(month_year)
+    if year is not None:
+        condition, pattern = _year_filter(year)
+        conditions.append(condition)
+        params.append(pattern)
+    if department is not None:
+        conditions.append('department = ?')
+        params.append(department)
+
+    query = f"SELECT {', '.join(SUMMARY_COLUMNS)} FROM payroll_monthly_summary"
+    if conditions:
+        query += ' WHERE ' + ' AND '.join(conditions)
+    query += ' ORDER BY month_year, department, payment_status'
+    cursor = db_config.get_connection().execute(query, params)
+    return [dict(zip(SUMMARY_COLUMNS, row)) for row in cursor.fetchall()]
+
+
+def summarize(rows, key):
+    """Fold rollup rows into totals per key ('month_year', 'department' or 'payment_status')"""
+    totals = {}
+    for row in rows:
+        total = totals.setdefault(row[key], {
+            'payments': 0, 'total_earnings': 0.0, 'total_deductions': 0.0, 'net_salary': 0.0
+        })
+        for column in total:
+            total[column] += row[column]
+    return totals
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Rebuild the monthly payroll summary")
+    parser.add_argument('--month', action='append', dest='months', help="Pay period to rebuild; repeatable")
+    parser.add_argument('--year', default=None, help="Rebuild every pay period of a year")
+    parser.add_argument('--from', dest='date_from', default=None, help="First payment date (YYYY-MM-DD)")
+    parser.add_argument('--to', dest='date_to', default=None, help="Last payment date (YYYY-MM-DD)")
+    args = parser.parse_args()
+
+    count = rebuild_payroll_summary(args.months, args.year, args.date_from, args.date_to)
+    print(f"Rebuilt {count} payroll summary rows")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,180 @@
+"""
+EXPLAIN QUERY PLAN audit of the queries run against the consolidated store.
+
+With auditing on (SCHOOL_ERP_QUERY_AUDIT=1 in the environment, or
+enable_query_audit()), every distinct SELECT/UPDATE/DELETE a pooled
+connection runs is explained once on a separate connection, and any plan
+step that reads a whole table without an index is printed and recorded.
+Run this module to audit the DAO read paths directly:
+
+    python -m database.query_audit
+"""
+
+import os
+import re
+import sqlite3
+import sys
+import threading
+
+if __package__ in (None, ''):
+    # Make the school_erp root importable when run as a script
+    sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# Set to 1 to audit every query of the running application
+AUDIT_ENV_VAR = 'SCHOOL_ERP_QUERY_AUDIT'
+
+AUDITED_STATEMENTS = ('SELECT', 'WITH', 'UPDATE', 'DELETE')
+
+# "SCAN students" is a full table scan; "SCAN students USING INDEX ..." walks
+# an index and "SCAN f VIRTUAL TABLE ..." is answered by FTS5
+_FULL_SCAN = re.compile(r'^SCAN (\w+)$')
+_LITERAL = re.compile(r"'(?:[^']|'')*'|\b\d+(?:\.\d+)?\b")
+
+
+def normalize(sql):
+    """Collapse whitespace and literal values so repeated calls of a query match"""
+    return ' '.join(_LITERAL.sub('?', sql).split())
+
+
+def full_scans(plan):
+    """Return the tables a query plan reads in full"""
+    scans = []
+    for row in plan:
+        match = _FULL_SCAN.match(row[-1])
+        if match:
+            scans.append(match.group(1))
+    return scans
+
+
+class QueryAuditor:
+    """Explains each distinct statement once and records the ones with full scans"""
+
+    def __init__(self, db_path):
+        self.db_path = db_path
+        self.full_scans = {}
+        self._seen = set()
+        self._lock = threading.Lock()
+        self._explain_conn = None
+
+    def attach(self, conn):
+        """Audit every statement conn executes from now on"""
+        conn.set_trace_callback(self._trace)
+
+    def _explain(self, sql):
+        # A statement cannot be explained on the connection that is running
+        # it, so plans come from a connection of our own
+        if self._explain_conn is None:
+            self._explain_conn = sqlite3.connect(self.db_path, check_same_thread=False)
+        return self._explain_conn.execute(f'EXPLAIN QUERY PLAN {sql}').fetchall()
+
+    def _trace(self, sql):
+        statement = sql.strip()
+        if not statement.upper().startswith(AUDITED_STATEMENTS):
+            return
+        key = normalize(statement)
+        with self._lock:
+            if key in self._seen:
+                return
+            self._seen.add(key)
+            try:
+                plan = self._explain(statement)
+            except sqlite3.Error:
+                # e.g. a table created in a transaction not yet committed
+                return
+            scans = full_scans(plan)
+            if scans:
+                self.full_scans[key] = scans
+                print(f"Query audit: full scan of {', '.join(scans)} in: {key}")
+
+    def report(self):
+        """Return {normalized query: [tables scanned in full]}"""
+        with self._lock:
+            return dict(self.full_scans)
+
+    def close(self):
+        if self._explain_conn is not None:
+            self._explain_conn.close()
+            self._explain_conn = None
+
+
+def enable_query_audit(pool):
+    """Audit every connection of a ConnectionPool and return the auditor"""
+    if pool.auditor is None:
+        pool.set_auditor(QueryAuditor(pool.db_path))
+    return pool.auditor
+
+
+def audit_dao_queries():
+    """Run the read paths of the DAOs once under audit and return the full scans"""
+    from database.db_config import db_config
+    from database.teacher_dao import TeacherDAO
+    from database.student_dao import StudentDAO
+    from database.payroll import get_payroll_run, PENDING_STRUCTURES_QUERY
+    from database.payroll_summary import get_payroll_summary
+    from database import search
+    from database.metrics import metrics
+
+    auditor = enable_query_audit(db_config.pool)
+    conn = db_config.get_connection()
+
+    teachers = TeacherDAO()
+    teachers.get_teacher_details('T001')
+    teachers.get_all_teachers()
+    teachers.get_payment_history('T001')
+    teachers.get_teachers_details(['T001', 'T002'])
+    teachers.get_salary_structures(['T001', 'T002'])
+    teachers.get_payment_histories(['T001', 'T002'])
+    teachers.get_payment('T001', 'March 2025')
+    teachers.get_month_payments('March 2025')
+    teachers.get_month_payments('March 2025', ['T001', 'T002'])
+
+    students = StudentDAO()
+    students.get_student('S001')
+    students.get_exam_results('S001')
+    students.get_attendance('S001')
+    StudentDAO.get_all_students()
+    StudentDAO.get_student_by_roll('1')
+    StudentDAO.get_student_results('S001')
+    StudentDAO.search_students('a')
+    StudentDAO.calculate_exam_statistics('S001')
+    StudentDAO.get_class_sections()
+    StudentDAO.get_class_attendance('5', 'A', '2025-06-02')
+
+    get_payroll_run('March 2025')
+    get_payroll_summary(month_year='March 2025')
+    get_payroll_summary(month_year='March 2025', department='Maths')
+    conn.execute(PENDING_STRUCTURES_QUERY, ('March 2025',)).fetchall()
+    search.search_all('a')
+    metrics.refresh(list(metrics.loaders))
+
+    # Queries held by the screens (salary history, payroll summary, notice board)
+    conn.execute('''
+        SELECT s.*, p.payment_method, p.transaction_id, p.status
+        FROM salary_slips s
+        LEFT JOIN payments p ON s.slip_id = p.slip_id
+        WHERE s.employee_id = ?
+        ORDER BY s.generated_at DESC
+    ''', ('T001',)).fetchall()
+    conn.execute('''
+        SELECT t.name, t.department, p.total_earnings, p.total_deductions,
+               p.net_salary, p.payment_status
+        FROM salary_payments p
+        JOIN teachers t ON p.teacher_id = t.teacher_id
+        WHERE p.month_year = ?
+    ''', ('March 2025',)).fetchall()
+    conn.execute('SELECT title, timestamp FROM notices ORDER BY timestamp DESC').fetchall()
+
+    return auditor.report()
+
+
+def main():
+    scans = audit_dao_queries()
+    if not scans:
+        print("Query audit: no full table scans")
+        return 0
+    print(f"Query audit: {len(scans)} queries scan whole tables")
+    return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
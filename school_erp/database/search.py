@@ -0,0 +1,89 @@
+import re
+import sqlite3
+from .db_config import db_config
+from .migrations import FTS_COLUMNS
+
+# What each source returns per hit: (key column, title column, extra columns)
+SEARCH_SOURCES = {
+    'students': ('student_id', 'name', ['roll_no', 'class']),
+    'teachers': ('teacher_id', 'name', ['designation', 'department']),
+    'notices': ('id', 'title', ['timestamp']),
+    'lesson_plans': ('id', 'title', ['department', 'grade', 'teacher']),
+}
+
+# Tokens of a typed query; everything else (quotes, operators) is dropped
+_TOKEN = re.compile(r'\w+', re.UNICODE)
+
+
+def build_match_query(text):
+    """Turn free text into an FTS5 prefix query ("ali 12" -> '"ali"* "12"*'), or None"""
+    tokens = _TOKEN.findall(text.lower())
+    if not tokens:
+        return None
+    return ' '.join(f'"{token}"*' for token in tokens)
+
+
+def search(source, text, limit=20, highlight=('<b>', '</b>')):
+    """Ranked full-text search of one source (students, teachers, notices, lesson_plans).
+
+    Every word of text matches as a prefix, so "ra 10" finds "Rahul" in
+    class "10A". Returns dicts with the row key, title, the source's extra
+    columns, an FTS5 snippet with the matches wrapped in highlight, and the
+    bm25 rank (lower is better), best match first.
+    """
+    match = build_match_query(text)
+    if match is None:
+        return []
+
+    key, title, extra = SEARCH_SOURCES[source]
+    fts = f'{source}_fts'
+    columns = [key, title] + extra
+    try:
+        cursor = db_config.get_connection().execute(f'''
+            SELECT {', '.join('t.' + c for c in columns)},
+                   snippet({fts}, -1, ?, ?, '...', 10), {fts}.rank
+            FROM {fts}
+            JOIN {source} t ON t.rowid = {fts}.rowid
+            WHERE {fts} MATCH ?
+            ORDER BY {fts}.rank
+            LIMIT ?
+        ''', (highlight[0], highlight[1], match, limit))
+        fields = ['key', 'title'] + extra + ['snippet', 'rank']
+        return [dict(zip(fields, row)) for row in cursor.fetchall()]
+    except Exception as e:
+        print(f"Search error: {str(e)}")
+        return []
+
+
+def search_all(text, limit=10):
+    """Search every source and return {source: results}"""
+    return {source: search(source, text, limit) for source in SEARCH_SOURCES}
+
+
+def rebuild_indexes():
+    """Re-index every search source from its table (e.g. after a VACUUM renumbers rowids)"""
+    conn = db_config.get_connection()
+    for table in FTS_COLUMNS:
+        conn.execute(f"INSERT INTO {table}_fts ({table}_fts) VALUES ('rebuild')")
+    conn.commit()
+
+
+def check_indexes():
+    """Rebuild the search indexes that no longer match their tables; returns their sources.
+
+    students and teachers have TEXT keys, so their indexes follow implicit
+    rowids, which a VACUUM (say, from an outside SQLite tool) may renumber.
+    FTS5's integrity-check compares each index with its table. Run at startup.
+    """
+    conn = db_config.get_connection()
+    rebuilt = []
+    for table in FTS_COLUMNS:
+        try:
+            conn.execute(f"INSERT INTO {table}_fts ({table}_fts, rank) VALUES ('integrity-check', 1)")
+        except sqlite3.DatabaseError:
+            conn.execute(f"INSERT INTO {table}_fts ({table}_fts) VALUES ('rebuild')")
+            rebuilt.append(table)
+    conn.commit()
+    if rebuilt:
+        print(f"Rebuilt search indexes: {', '.join(rebuilt)}")
+    return rebuilt
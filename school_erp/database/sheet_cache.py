@@ -0,0 +1,188 @@
+"""
+One-time conversion of the Excel sheets the ERP reads into cached snapshots.
+
+openpyxl parsing is the slowest step of opening the salary screens, so a
+sheet is parsed once and stored as an uncompressed Arrow file that later
+reads memory-map (a pickled DataFrame when pyarrow is not installed).
+Snapshots are keyed by the sheet's content hash; the mtime and size are
+checked first, so an untouched sheet is never even hashed. Sheets that
+feed the database are imported once per content change:
+
+    python -m database.sheet_cache
+"""
+
+import hashlib
+import json
+import os
+import sys
+import threading
+from datetime import datetime
+
+import pandas as pd
+
+if __package__ in (None, ''):
+    # Make the school_erp root importable when run as a script
+    sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+try:
+    import pyarrow.feather as feather
+except ImportError:
+    # Without pyarrow snapshots are pickled DataFrames
+    feather = None
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+CACHE_DIR = os.path.join(BASE_DIR, '.sheet_cache')
+MANIFEST_FILE = os.path.join(CACHE_DIR, 'manifest.json')
+
+# Employee sheet behind the teachers and salary_structure tables
+TEACHERS_SHEET = os.path.join(BASE_DIR, 'teachers_data.xlsx')
+
+_HASH_BLOCK_SIZE = 1 << 20
+
+_lock = threading.Lock()
+
+
+def file_signature(path):
+    """(mtime_ns, size) of a file; cheap to compare on every read"""
+    stat = os.stat(path)
+    return stat.st_mtime_ns, stat.st_size
+
+
+def file_hash(path):
+    """SHA-256 of a file's contents"""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(_HASH_BLOCK_SIZE), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def _load_manifest():
+    try:
+        with open(MANIFEST_FILE) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def _save_manifest(manifest):
+    os.makedirs(CACHE_DIR, exist_ok=True)
+    tmp_path = MANIFEST_FILE + '.tmp'
+    with open(tmp_path, 'w') as f:
+        json.dump(manifest, f, indent=2)
+    os.replace(tmp_path, MANIFEST_FILE)
+
+
+def _cache_key(path, read_kwargs):
+    # The same sheet read with other options (skiprows, sheet_name) is another snapshot
+    options = json.dumps(read_kwargs, sort_keys=True, default=str)
+    return f'{os.path.abspath(path)}|{options}'
+
+
+def _write_snapshot(df, sha256):
+    os.makedirs(CACHE_DIR, exist_ok=True)
+    if feather is not None:
+        snapshot = os.path.join(CACHE_DIR, f'{sha256}.arrow')
+        try:
+            # Uncompressed, so reads can memory-map the columns
+            feather.write_feather(df, snapshot, compression='uncompressed')
+            return snapshot
+        except Exception as e:
+            # e.g. a column mixing numbers and text, which Arrow cannot type
+            print(f"Sheet cache: Arrow snapshot failed, pickling instead: {str(e)}")
+    snapshot = os.path.join(CACHE_DIR, f'{sha256}.pkl')
+    df.to_pickle(snapshot)
+    return snapshot
+
+
+def _read_snapshot(snapshot):
+    if snapshot.endswith('.arrow'):
+        return feather.read_table(snapshot, memory_map=True).to_pandas()
+    return pd.read_pickle(snapshot)
+
+
+def read_sheet(path, **read_kwargs):
+    """pd.read_excel(path, **read_kwargs), served from the snapshot while the sheet is unchanged"""
+    key = _cache_key(path, read_kwargs)
+    signature = list(file_signature(path))
+    with _lock:
+        manifest = _load_manifest()
+        entry = manifest.get(key)
+
+        if entry and entry['signature'] != signature:
+            # Touched but maybe not edited (copied, re-saved): compare contents
+            sha256 = file_hash(path)
+            if sha256 == entry['sha256']:
+                entry['signature'] = signature
+                _save_manifest(manifest)
+            else:
+                entry = None
+
+        if entry and os.path.exists(entry['snapshot']):
+            try:
+                if entry['snapshot'].endswith('.pkl') or feather is not None:
+                    return _read_snapshot(entry['snapshot'])
+            except Exception as e:
+                print(f"Sheet cache: unreadable snapshot {entry['snapshot']}: {str(e)}")
+
+        sha256 = entry['sha256'] if entry else file_hash(path)
+        df = pd.read_excel(path, **read_kwargs)
+        try:
+            manifest[key] = {
+                'signature': signature,
+                'sha256': sha256,
+                'snapshot': _write_snapshot(df, sha256),
+                'rows': len(df),
+                'cached_at': datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+            }
+            _save_manifest(manifest)
+        except OSError as e:
+            # A read-only install still works, it just parses every time
+            print(f"Sheet cache: could not store snapshot: {str(e)}")
+        return df
+
+
+def import_teacher_sheet(path=TEACHERS_SHEET, force=False):
+    """Upsert the employee sheet into the database once per content change.
+
+    The sheet is streamed through database.importer, so rejected rows are
+    listed in its error report. Returns the number of rows imported, or 0
+    when this exact sheet has already been imported (force=True imports it
+    regardless).
+    """
+    from database.db_config import db_config
+    from database.importer import import_file
+
+    sha256 = file_hash(path)
+    name = os.path.basename(path)
+    conn = db_config.get_connection()
+    row = conn.execute('SELECT sha256 FROM sheet_imports WHERE name = ?', (name,)).fetchone()
+    if row and row[0] == sha256 and not force:
+        return 0
+
+    result = import_file(path, 'teachers')
+    if result['error_report']:
+        print(f"Sheet import: {result['errors']} rows rejected; see {result['error_report']}")
+    count = result['imported']
+    conn.execute('''
+        INSERT INTO sheet_imports (name, sha256, rows, imported_at)
+        VALUES (?, ?, ?, ?)
+        ON CONFLICT(name) DO UPDATE SET
+            sha256 = excluded.sha256, rows = excluded.rows, imported_at = excluded.imported_at
+    ''', (name, sha256, count, datetime.now().strftime('%Y-%m-%d %H:%M:%S')))
+    conn.commit()
+    return count
+
+
+def main():
+    force = '--force' in sys.argv[1:]
+    count = import_teacher_sheet(force=force)
+    if count:
+        print(f"Imported {count} employees from {os.path.basename(TEACHERS_SHEET)}")
+    else:
+        print(f"{os.path.basename(TEACHERS_SHEET)} is unchanged since its last import")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,80 +1,36 @@
 from .db_config import db_config
+from .search import build_match_query
+from .metrics import metrics
+from .write_queue import write_queue
+from .app_context import app_context
 from datetime import datetime
 import sqlite3
-import os
+import json
+
+# Statuses the roll call offers; migrations.PRESENT_STATUSES count towards attendance
+ATTENDANCE_STATUSES = ['Present', 'Absent', 'Late', 'Excused']
+
+# Upsert of the day's marks for a class section in one statement. Students
+# not named in the JSON object of exceptions get the default status.
+CLASS_ATTENDANCE_UPSERT = '''
+    INSERT INTO attendance (student_id, date, status)
+    SELECT s.student_id, ?, COALESCE(j.value, ?)
+    FROM students s
+    LEFT JOIN json_each(?) j ON j.key = s.student_id
+    WHERE s.class = ? AND s.section IS ?
+    ON CONFLICT (student_id, date) DO UPDATE SET status = excluded.status
+'''
 
 class StudentDAO:
     def __init__(self):
-        db_path = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'school_erp.db')
-        self.conn = sqlite3.connect(db_path)
+        # Borrow the shared pooled connection instead of opening a private one
+        self.conn = db_config.get_connection()
         self.cursor = self.conn.cursor()
         self.create_tables()
 
     def create_tables(self):
-        self.cursor.execute('''
-        CREATE TABLE IF NOT EXISTS students (
-            student_id TEXT PRIMARY KEY,
-            name TEXT NOT NULL,
-            roll_no TEXT NOT NULL,
-            class TEXT NOT NULL,
-            section TEXT,
-            dob TEXT,
-            gender TEXT,
-            address TEXT,
-            phone TEXT,
-            email TEXT,
-            parent_name TEXT,
-            admission_date TEXT
-        )
-        ''')
-
-        self.cursor.execute('''
-        CREATE TABLE IF NOT EXISTS exam_results (
-            result_id INTEGER PRIMARY KEY AUTOINCREMENT,
-            student_id TEXT,
-            exam_name TEXT,
-            subject TEXT,
-            marks REAL,
-            max_marks REAL,
-            exam_date TEXT,
-            FOREIGN KEY (student_id) REFERENCES students (student_id)
-        )
-        ''')
-
-        self.cursor.execute('''
-        CREATE TABLE IF NOT EXISTS attendance (
-            attendance_id INTEGER PRIMARY KEY AUTOINCREMENT,
-            student_id TEXT,
-            date TEXT,
-            status TEXT,
-            FOREIGN KEY (student_id) REFERENCES students (student_id)
-        )
-        ''')
-        
-        self.conn.commit()
-
-    def add_student(self, student_data):
-        query = '''
-        INSERT INTO students (
-            student_id, name, roll_no, class, section, dob, gender,
-            address, phone, email, parent_name, admission_date
-        ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-        '''
-        self.cursor.execute(query, (
-            student_data['student_id'],
-            student_data['name'],
-            student_data['roll_no'],
-            student_data['class'],
-            student_data['section'],
-            student_data['dob'],
-            student_data['gender'],
-            student_data['address'],
-            student_data['phone'],
-            student_data['email'],
-            student_data['parent_name'],
-            student_data['admission_date']
-        ))
-        self.conn.commit()
+        """Ensure the consolidated schema; skipped when it is already current"""
+        db_config.ensure_schema(self.conn)
 
     def get_student(self, student_id):
         self.cursor.execute('SELECT * FROM students WHERE student_id = ?', (student_id,))
@@ -108,17 +64,14 @@ class StudentDAO:
         ))
         self.conn.commit()
 
-    def delete_student(self, student_id):
-        self.cursor.execute('DELETE FROM students WHERE student_id = ?', (student_id,))
-        self.conn.commit()
-
     def add_exam_result(self, result_data):
+        """Queue an exam result; returns a Future that completes once it is committed"""
         query = '''
         INSERT INTO exam_results (
             student_id, exam_name, subject, marks, max_marks, exam_date
         ) VALUES (?, ?, ?, ?, ?, ?)
         '''
-        self.cursor.execute(query, (
+        return write_queue.submit(query, (
             result_data['student_id'],
             result_data['exam_name'],
             result_data['subject'],
@@ -126,7 +79,6 @@ class StudentDAO:
             result_data['max_marks'],
             result_data['exam_date']
         ))
-        self.conn.commit()
 
     def get_exam_results(self, student_id):
         self.cursor.execute('''
@@ -137,16 +89,17 @@ class StudentDAO:
         return self.cursor.fetchall()
 
     def mark_attendance(self, attendance_data):
+        """Queue an attendance mark; returns a Future that completes once it is committed"""
         query = '''
         INSERT INTO attendance (student_id, date, status)
         VALUES (?, ?, ?)
+        ON CONFLICT (student_id, date) DO UPDATE SET status = excluded.status
         '''
-        self.cursor.execute(query, (
+        return write_queue.submit(query, (
             attendance_data['student_id'],
             attendance_data['date'],
             attendance_data['status']
         ))
-        self.conn.commit()
 
     def get_attendance(self, student_id):
         self.cursor.execute('''
@@ -157,7 +110,8 @@ class StudentDAO:
         return self.cursor.fetchall()
 
     def close(self):
-        self.conn.close()
+        # The connection belongs to the shared pool; only release our cursor
+        self.cursor.close()
 
     @staticmethod
     def add_student(name, roll_number, grade, student_id, academic_year):
@@ -166,16 +120,15 @@ class StudentDAO:
         cursor = conn.cursor()
         try:
             cursor.execute('''
-                INSERT INTO students (name, roll_number, grade, student_id, academic_year)
+                INSERT INTO students (name, roll_no, class, student_id, academic_year)
                 VALUES (?, ?, ?, ?, ?)
             ''', (name, roll_number, grade, student_id, academic_year))
-            student_id = cursor.lastrowid
             conn.commit()
+            metrics.adjust('students', 1)
             return student_id
         except sqlite3.IntegrityError:
+            conn.rollback()
             return None
-        finally:
-            conn.close()
 
     @staticmethod
     def add_exam_results(student_id, subject_results):
@@ -201,77 +154,84 @@ class StudentDAO:
             conn.commit()
             return True
         except Exception as e:
+            conn.rollback()
             print(f"Error adding exam results: {e}")
             return False
-        finally:
-            conn.close()
 
     @staticmethod
-    def update_attendance(student_id, present_days, total_days):
-        """Update student attendance"""
+    def mark_class_attendance(class_name, section, date, statuses=None, default_status='Present'):
+        """Mark every student of a class section for a date in one statement.
+
+        statuses maps student_id to a status for the students who are not
+        default_status; a day marked again is overwritten. The per-student
+        present/total counters in attendance_summary are kept by triggers.
+        Returns a write_queue Future that completes once the marks are committed.
+        """
+        return write_queue.submit(CLASS_ATTENDANCE_UPSERT, (
+            date, default_status, json.dumps(statuses or {}), class_name, section
+        ))
+
+    @staticmethod
+    def get_class_sections():
+        """Distinct (class, section) pairs, for picking a roll call"""
         conn = db_config.get_connection()
         cursor = conn.cursor()
-        try:
-            percentage = (present_days / total_days) * 100 if total_days > 0 else 0
-            cursor.execute('''
-                INSERT OR REPLACE INTO attendance 
-                (student_id, present_days, total_days, percentage)
-                VALUES (?, ?, ?, ?)
-            ''', (student_id, present_days, total_days, percentage))
-            conn.commit()
-            return True
-        except Exception as e:
-            print(f"Error updating attendance: {e}")
-            return False
-        finally:
-            conn.close()
+        cursor.execute('SELECT DISTINCT class, section FROM students ORDER BY class, section')
+        return cursor.fetchall()
+
+    @staticmethod
+    def get_class_attendance(class_name, section, date):
+        """Students of a class section with their mark for a date (None if unmarked) and running totals"""
+        conn = db_config.get_connection()
+        cursor = conn.cursor()
+        cursor.execute('''
+            SELECT s.student_id, s.roll_no, s.name, a.status,
+                   COALESCE(sm.present_days, 0), COALESCE(sm.total_days, 0), sm.percentage
+            FROM students s
+            LEFT JOIN attendance a ON a.student_id = s.student_id AND a.date = ?
+            LEFT JOIN attendance_summary sm ON sm.student_id = s.student_id
+            WHERE s.class = ? AND s.section IS ?
+            ORDER BY s.roll_no
+        ''', (date, class_name, section))
+        return cursor.fetchall()
 
     @staticmethod
     def get_all_students():
         """Get all students from database"""
         conn = db_config.get_connection()
         cursor = conn.cursor()
-        try:
-            cursor.execute('''
-                SELECT s.*, a.percentage as attendance
-                FROM students s
-                LEFT JOIN attendance a ON s.id = a.student_id
-                ORDER BY s.roll_number
-            ''')
-            return cursor.fetchall()
-        finally:
-            conn.close()
+        cursor.execute('''
+            SELECT s.*, a.percentage as attendance
+            FROM students s
+            LEFT JOIN attendance_summary a ON s.student_id = a.student_id
+            ORDER BY s.roll_no
+        ''')
+        return cursor.fetchall()
 
     @staticmethod
     def get_student_by_roll(roll_number):
         """Get student details by roll number"""
         conn = db_config.get_connection()
         cursor = conn.cursor()
-        try:
-            cursor.execute('''
-                SELECT s.*, a.percentage as attendance
-                FROM students s
-                LEFT JOIN attendance a ON s.id = a.student_id
-                WHERE s.roll_number = ?
-            ''', (roll_number,))
-            return cursor.fetchone()
-        finally:
-            conn.close()
+        cursor.execute('''
+            SELECT s.*, a.percentage as attendance
+            FROM students s
+            LEFT JOIN attendance_summary a ON s.student_id = a.student_id
+            WHERE s.roll_no = ?
+        ''', (roll_number,))
+        return cursor.fetchone()
 
     @staticmethod
     def get_student_results(student_id):
         """Get exam results for a student"""
         conn = db_config.get_connection()
         cursor = conn.cursor()
-        try:
-            cursor.execute('''
-                SELECT * FROM exam_results
-                WHERE student_id = ?
-                ORDER BY subject
-            ''', (student_id,))
-            return cursor.fetchall()
-        finally:
-            conn.close()
+        cursor.execute('''
+            SELECT * FROM exam_results
+            WHERE student_id = ?
+            ORDER BY subject
+        ''', (student_id,))
+        return cursor.fetchall()
 
     @staticmethod
     def delete_student(roll_number):
@@ -280,7 +240,7 @@ class StudentDAO:
         cursor = conn.cursor()
         try:
             # Get student ID first
-            cursor.execute('SELECT id FROM students WHERE roll_number = ?', (roll_number,))
+            cursor.execute('SELECT student_id FROM students WHERE roll_no = ?', (roll_number,))
             student = cursor.fetchone()
             if not student:
                 return False
@@ -290,51 +250,60 @@ class StudentDAO:
             # Delete related records
             cursor.execute('DELETE FROM exam_results WHERE student_id = ?', (student_id,))
             cursor.execute('DELETE FROM attendance WHERE student_id = ?', (student_id,))
-            cursor.execute('DELETE FROM students WHERE id = ?', (student_id,))
+            cursor.execute('DELETE FROM attendance_summary WHERE student_id = ?', (student_id,))
+            cursor.execute('DELETE FROM students WHERE student_id = ?', (student_id,))
             
             conn.commit()
+            metrics.adjust('students', -cursor.rowcount)
             return True
         except Exception as e:
+            conn.rollback()
             print(f"Error deleting student: {e}")
             return False
-        finally:
-            conn.close()
 
     @staticmethod
-    def search_students(query):
-        """Search students by name or roll number"""
+    def search_students(query, limit=200):
+        """Search students by name, roll number, class or parent, best match first"""
+        match = build_match_query(query)
+        if match is None:
+            return StudentDAO.get_all_students()
+
         conn = db_config.get_connection()
         cursor = conn.cursor()
-        try:
-            cursor.execute('''
-                SELECT s.*, a.percentage as attendance
-                FROM students s
-                LEFT JOIN attendance a ON s.id = a.student_id
-                WHERE s.name LIKE ? OR s.roll_number LIKE ?
-                ORDER BY s.roll_number
-            ''', (f'%{query}%', f'%{query}%'))
-            return cursor.fetchall()
-        finally:
-            conn.close()
+        # Only the matched rows are joined to their attendance
+        cursor.execute('''
+            SELECT s.*, a.percentage as attendance
+            FROM students_fts f
+            JOIN students s ON s.rowid = f.rowid
+            LEFT JOIN attendance_summary a ON s.student_id = a.student_id
+            WHERE students_fts MATCH ?
+            ORDER BY f.rank
+            LIMIT ?
+        ''', (match, limit))
+        return cursor.fetchall()
 
     @staticmethod
     def calculate_exam_statistics(student_id):
         """Calculate exam statistics for a student"""
         conn = db_config.get_connection()
         cursor = conn.cursor()
-        try:
-            cursor.execute('''
-                SELECT 
-                    AVG(total_score) as avg_score,
-                    MIN(total_score) as min_score,
-                    MAX(total_score) as max_score,
-                    COUNT(*) as total_subjects
-                FROM exam_results
-                WHERE student_id = ?
-            ''', (student_id,))
-            return cursor.fetchone()
-        finally:
-            conn.close()
+        cursor.execute('''
+            SELECT 
+                AVG(total_score) as avg_score,
+                MIN(total_score) as min_score,
+                MAX(total_score) as max_score,
+                COUNT(*) as total_subjects
+            FROM exam_results
+            WHERE student_id = ?
+        ''', (student_id,))
+        return cursor.fetchone()
+
+# The shared StudentDAO is built on first use: app_context.get('student_dao')
+app_context.register('student_dao', StudentDAO)
+
 
-# Create an instance of StudentDAO
-student_dao = StudentDAO()
+def __getattr__(name):
+    # student_dao used to be created at import; keep the name working
+    if name == 'student_dao':
+        return app_context.get('student_dao')
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -1,21 +1,242 @@
-import sqlite3
+from .db_config import db_config
+from .metrics import metrics
+from .write_queue import write_queue
+from .app_context import app_context
 
-# Connect to SQLite and create table
-conn = sqlite3.connect("teacher.db")
-cursor = conn.cursor()
+TEACHER_COLUMNS = [
+    'teacher_id', 'name', 'mother_name', 'dob', 'age', 'cast_category', 'place',
+    'tal', 'dist', 'state', 'adar_no', 'contact_no', 'designation', 'department',
+    'joining_date', 'bank_account', 'pf_no'
+]
 
-cursor.execute("""
-    CREATE TABLE IF NOT EXISTS users (
-        id INTEGER PRIMARY KEY AUTOINCREMENT,
-        username TEXT UNIQUE NOT NULL,
-        password TEXT NOT NULL
-    )
-""")
+SALARY_COLUMNS = [
+    'basic_salary', 'da_amount', 'hra_amount', 'conveyance', 'medical',
+    'other_allowances', 'pf_deduction', 'professional_tax', 'income_tax',
+    'other_deductions', 'da_percent', 'hra_percent'
+]
 
-# Insert a sample user (username: admin, password: 1234)
-cursor.execute("INSERT OR IGNORE INTO users (username, password) VALUES (?, ?)", ("admin", "1234"))
+EARNING_COLUMNS = ['basic_salary', 'da_amount', 'hra_amount', 'conveyance', 'medical', 'other_allowances']
+DEDUCTION_COLUMNS = ['pf_deduction', 'professional_tax', 'income_tax', 'other_deductions']
 
-conn.commit()
-conn.close()
+# Headings of the admin teachers_data.xlsx sheet and the column each one fills
+SHEET_TEACHER_COLUMNS = {
+    'Employee ID': 'teacher_id', 'Employee Name': 'name', 'Designation': 'designation',
+    'Department': 'department', 'Date of Joining': 'joining_date',
+    'Bank Account': 'bank_account', 'PF Number': 'pf_no'
+}
+SHEET_SALARY_COLUMNS = {
+    'Basic Salary': 'basic_salary', 'DA Percent': 'da_percent', 'HRA Percent': 'hra_percent',
+    'Conveyance': 'conveyance', 'Medical': 'medical', 'Other Allowances': 'other_allowances',
+    'PF Deduction': 'pf_deduction', 'Professional Tax': 'professional_tax',
+    'Income Tax': 'income_tax', 'Other Deductions': 'other_deductions'
+}
 
-print("Database and table created successfully! User added.")
+
+# Keys bound per IN (...) list; well under SQLite's host parameter limit
+IN_BATCH_SIZE = 500
+
+def _batches(keys, size=IN_BATCH_SIZE):
+    keys = list(keys)
+    for start in range(0, len(keys), size):
+        yield keys[start:start + size]
+
+
+def _teacher_record(row):
+    """Teacher dict from a TEACHER_COLUMNS + SALARY_COLUMNS row, with salary amounts filled in"""
+    teacher = dict(zip(TEACHER_COLUMNS + SALARY_COLUMNS, row))
+    basic_salary = teacher['basic_salary'] or 0
+    # Structures imported from the admin sheet store DA/HRA as percentages
+    if teacher['da_amount'] is None and teacher['da_percent'] is not None:
+        teacher['da_amount'] = basic_salary * teacher['da_percent'] / 100
+    if teacher['hra_amount'] is None and teacher['hra_percent'] is not None:
+        teacher['hra_amount'] = basic_salary * teacher['hra_percent'] / 100
+    for column in EARNING_COLUMNS + DEDUCTION_COLUMNS:
+        teacher[column] = teacher[column] or 0
+    return teacher
+
+
+class TeacherDAO:
+    """Teachers, their salary structure and salary payments in the consolidated store"""
+
+    def __init__(self):
+        self.conn = db_config.get_connection()
+        self.cursor = self.conn.cursor()
+
+    def add_teacher(self, teacher_data):
+        """Insert a teacher or update the columns given for an existing one"""
+        columns = [c for c in TEACHER_COLUMNS if c in teacher_data]
+        updates = ', '.join(f'{c} = excluded.{c}' for c in columns if c != 'teacher_id')
+        on_conflict = f'DO UPDATE SET {updates}' if updates else 'DO NOTHING'
+        self.cursor.execute(f'''
+            INSERT INTO teachers ({', '.join(columns)})
+            VALUES ({', '.join('?' for _ in columns)})
+            ON CONFLICT(teacher_id) {on_conflict}
+        ''', [teacher_data[c] for c in columns])
+        self.conn.commit()
+        # An upsert may or may not add a row, so re-count on next refresh
+        metrics.invalidate('teachers')
+
+    def update_salary_structure(self, teacher_id, salary_data):
+        """Insert or update a teacher's salary structure"""
+        columns = [c for c in SALARY_COLUMNS if c in salary_data]
+        updates = ', '.join(f'{c} = excluded.{c}' for c in columns)
+        self.cursor.execute(f'''
+            INSERT INTO salary_structure (teacher_id, {', '.join(columns)})
+            VALUES (?, {', '.join('?' for _ in columns)})
+            ON CONFLICT(teacher_id) DO UPDATE SET {updates}
+        ''', [teacher_id] + [salary_data[c] for c in columns])
+        self.conn.commit()
+
+    def import_salary_sheet(self, records):
+        """Upsert rows of the teachers_data.xlsx sheet in one transaction"""
+        teacher_columns = list(SHEET_TEACHER_COLUMNS.values())
+        salary_columns = ['teacher_id'] + list(SHEET_SALARY_COLUMNS.values())
+        teachers = [[str(r.get(h)) if r.get(h) is not None else None for h in SHEET_TEACHER_COLUMNS] for r in records]
+        structures = [[t[0]] + [r.get(h) for h in SHEET_SALARY_COLUMNS] for t, r in zip(teachers, records)]
+        try:
+            self.cursor.executemany(f'''
+                INSERT INTO teachers ({', '.join(teacher_columns)})
+                VALUES ({', '.join('?' for _ in teacher_columns)})
+                ON CONFLICT(teacher_id) DO UPDATE SET
+                {', '.join(f'{c} = excluded.{c}' for c in teacher_columns[1:])}
+            ''', teachers)
+            self.cursor.executemany(f'''
+                INSERT INTO salary_structure ({', '.join(salary_columns)})
+                VALUES ({', '.join('?' for _ in salary_columns)})
+                ON CONFLICT(teacher_id) DO UPDATE SET
+                {', '.join(f'{c} = excluded.{c}' for c in salary_columns[1:])}
+            ''', structures)
+            self.conn.commit()
+        except Exception:
+            self.conn.rollback()
+            raise
+        metrics.invalidate('teachers')
+        return len(teachers)
+
+    def get_teacher_details(self, teacher_id):
+        """Get a teacher joined with their salary structure in one query"""
+        self.cursor.execute(f'''
+            SELECT {', '.join('t.' + c for c in TEACHER_COLUMNS)},
+                   {', '.join('s.' + c for c in SALARY_COLUMNS)}
+            FROM teachers t
+            LEFT JOIN salary_structure s ON s.teacher_id = t.teacher_id
+            WHERE t.teacher_id = ?
+        ''', (teacher_id,))
+        row = self.cursor.fetchone()
+        return _teacher_record(row) if row else None
+
+    def get_teachers_details(self, teacher_ids):
+        """{teacher_id: details} for many teachers, IN_BATCH_SIZE per query"""
+        details = {}
+        for batch in _batches(teacher_ids):
+            self.cursor.execute(f'''
+                SELECT {', '.join('t.' + c for c in TEACHER_COLUMNS)},
+                       {', '.join('s.' + c for c in SALARY_COLUMNS)}
+                FROM teachers t
+                LEFT JOIN salary_structure s ON s.teacher_id = t.teacher_id
+                WHERE t.teacher_id IN ({', '.join('?' for _ in batch)})
+            ''', batch)
+            for row in self.cursor.fetchall():
+                details[row[0]] = _teacher_record(row)
+        return details
+
+    def get_salary_structures(self, teacher_ids=None):
+        """{teacher_id: salary_structure row} for the given teachers, or for everyone"""
+        query = 'SELECT * FROM salary_structure'
+        if teacher_ids is None:
+            return {row[0]: row for row in self.cursor.execute(query).fetchall()}
+        structures = {}
+        for batch in _batches(teacher_ids):
+            self.cursor.execute(f"{query} WHERE teacher_id IN ({', '.join('?' for _ in batch)})", batch)
+            structures.update((row[0], row) for row in self.cursor.fetchall())
+        return structures
+
+    def get_all_teachers(self):
+        """Get every teacher ordered by ID"""
+        self.cursor.execute('SELECT * FROM teachers ORDER BY teacher_id')
+        return self.cursor.fetchall()
+
+    def record_salary_payment(self, payment_data):
+        """Queue a salary payment and return the write queue Future of its ID.
+
+        Payments recorded from several screens at once share a commit. The
+        caller does not wait for it: screens pass the Future to
+        when_committed, anything else can call result().
+        """
+        return write_queue.submit('''
+            INSERT INTO salary_payments (
+                teacher_id, payment_date, month_year, working_days, holidays,
+                total_earnings, total_deductions, net_salary,
+                payment_method, payment_status
+            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+        ''', (
+            payment_data['teacher_id'],
+            payment_data['payment_date'],
+            payment_data['month_year'],
+            payment_data.get('working_days'),
+            payment_data.get('holidays'),
+            payment_data['total_earnings'],
+            payment_data['total_deductions'],
+            payment_data['net_salary'],
+            payment_data['payment_method'],
+            payment_data['payment_status']
+        ))
+
+    def get_payment_history(self, teacher_id):
+        """Get all salary payments for a teacher, newest first"""
+        self.cursor.execute('''
+            SELECT * FROM salary_payments
+            WHERE teacher_id = ?
+            ORDER BY payment_date DESC
+        ''', (teacher_id,))
+        return self.cursor.fetchall()
+
+    def get_payment_histories(self, teacher_ids):
+        """{teacher_id: payments newest first} for many teachers; teachers without payments map to []"""
+        histories = {teacher_id: [] for teacher_id in teacher_ids}
+        for batch in _batches(histories):
+            self.cursor.execute(f'''
+                SELECT * FROM salary_payments
+                WHERE teacher_id IN ({', '.join('?' for _ in batch)})
+                ORDER BY teacher_id, payment_date DESC
+            ''', batch)
+            for row in self.cursor.fetchall():
+                histories[row[1]].append(row)
+        return histories
+
+    def get_payment(self, teacher_id, month_year):
+        """The latest salary payment of a teacher for one month, or None"""
+        self.cursor.execute('''
+            SELECT * FROM salary_payments
+            WHERE month_year = ? AND teacher_id = ?
+            ORDER BY payment_id DESC LIMIT 1
+        ''', (month_year, teacher_id))
+        return self.cursor.fetchone()
+
+    def get_month_payments(self, month_year, teacher_ids=None):
+        """{teacher_id: latest payment} for one month, for the given teachers or everyone paid"""
+        query = '''
+            SELECT * FROM salary_payments
+            WHERE month_year = ?{}
+            ORDER BY payment_id
+        '''
+        payments = {}
+        if teacher_ids is None:
+            rows = self.cursor.execute(query.format(''), (month_year,)).fetchall()
+        else:
+            rows = []
+            for batch in _batches(teacher_ids):
+                in_list = f" AND teacher_id IN ({', '.join('?' for _ in batch)})"
+                rows += self.cursor.execute(query.format(in_list), [month_year] + batch).fetchall()
+        for row in rows:
+            # Ordered by payment_id, so a repeated payment overwrites the earlier one
+            payments[row[1]] = row
+        return payments
+
+    def close(self):
+        # The connection belongs to the shared pool; only release our cursor
+        self.cursor.close()
+
+
+# The shared TeacherDAO, built on first use: app_context.get('teacher_dao')
+app_context.register('teacher_dao', TeacherDAO)
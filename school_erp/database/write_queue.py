@@ -0,0 +1,140 @@
+import atexit
+import queue
+import sqlite3
+import threading
+import time
+from concurrent.futures import Future
+from .db_config import db_config
+
+# Writes committed together at most; a roll-call burst becomes a few commits
+DEFAULT_MAX_BATCH = 500
+
+# Seconds the writer waits for more writes after the first one of a batch
+DEFAULT_MAX_DELAY = 0.05
+
+
+class _Write:
+    __slots__ = ('sql', 'params', 'many', 'future')
+
+    def __init__(self, sql, params, many):
+        self.sql = sql
+        self.params = params
+        self.many = many
+        self.future = Future()
+
+
+# Tells the writer thread to commit what it has and exit
+_STOP = object()
+
+
+class WriteQueue:
+    """Write-behind queue for small, frequent inserts, with group commit.
+
+    submit() hands a statement to a dedicated writer thread and returns a
+    concurrent.futures.Future at once. The writer gathers the writes that
+    arrive within max_delay seconds (up to max_batch of them) and commits
+    them in one transaction, so many writers share one fsync. Each write
+    runs under its own savepoint: a failing row fails only its own Future.
+    A Future completes once its write is committed (result: lastrowid, or
+    rowcount for executemany) or has failed (exception: the sqlite3 error).
+    """
+
+    def __init__(self, max_batch=DEFAULT_MAX_BATCH, max_delay=DEFAULT_MAX_DELAY):
+        self.max_batch = max_batch
+        self.max_delay = max_delay
+        self._queue = queue.Queue()
+        self._lock = threading.Lock()
+        self._thread = None
+
+    def _ensure_writer(self):
+        with self._lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, name='db-writer', daemon=True)
+                self._thread.start()
+
+    def submit(self, sql, params=(), many=False):
+        """Queue one statement (or executemany over params) and return its Future"""
+        write = _Write(sql, params, many)
+        self._ensure_writer()
+        self._queue.put(write)
+        return write.future
+
+    def flush(self, timeout=None):
+        """Block until every write queued so far is committed (or failed)"""
+        if self._thread is None or not self._thread.is_alive():
+            return
+        self.submit(None).result(timeout)
+
+    def close(self, timeout=None):
+        """Commit the queued writes and stop the writer thread"""
+        with self._lock:
+            thread = self._thread
+            self._thread = None
+        if thread is not None and thread.is_alive():
+            self._queue.put(_STOP)
+            thread.join(timeout)
+
+    def _run(self):
+        conn = db_config.get_connection()
+        stopping = False
+        while not stopping:
+            write = self._queue.get()
+            if write is _STOP:
+                break
+            batch = [write]
+            deadline = time.monotonic() + self.max_delay
+            while len(batch) < self.max_batch:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    write = self._queue.get(timeout=remaining)
+                except queue.Empty:
+                    break
+                if write is _STOP:
+                    stopping = True
+                    break
+                batch.append(write)
+            self._commit(conn, batch)
+        db_config.pool.close_thread()
+
+    def _commit(self, conn, batch):
+        outcomes = []
+        try:
+            conn.execute('BEGIN IMMEDIATE')
+            for write in batch:
+                if write.sql is None:
+                    # flush() marker
+                    outcomes.append((write, None, None))
+                    continue
+                conn.execute('SAVEPOINT queued_write')
+                try:
+                    if write.many:
+                        cursor = conn.executemany(write.sql, write.params)
+                        value = cursor.rowcount
+                    else:
+                        cursor = conn.execute(write.sql, write.params)
+                        value = cursor.lastrowid
+                    conn.execute('RELEASE queued_write')
+                    outcomes.append((write, value, None))
+                except sqlite3.Error as e:
+                    conn.execute('ROLLBACK TO queued_write')
+                    conn.execute('RELEASE queued_write')
+                    print(f"Queued write error: {str(e)}")
+                    outcomes.append((write, None, e))
+            conn.commit()
+        except Exception as e:
+            conn.rollback()
+            print(f"Group commit error: {str(e)}")
+            outcomes = [(write, None, e) for write in batch]
+
+        for write, value, error in outcomes:
+            if error is not None:
+                write.future.set_exception(error)
+            else:
+                write.future.set_result(value)
+
+
+# Create the shared write queue; queued writes are committed at exit
+write_queue = WriteQueue()
+atexit.register(write_queue.close)
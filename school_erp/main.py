@@ -1,16 +1,50 @@
 """
 School ERP System - Main Entry Point
 This is the main entry point for the School ERP system.
+
+    python main.py                     # start the application
+    python main.py --profile-startup   # report the login window's startup time
 """
 
+import argparse
 import sys
-from PyQt6.QtWidgets import QApplication
-from screens.login_screen import LoginScreen
+from startup_profiler import DEFAULT_STARTUP_BUDGET_MS, DEFAULT_MODULE_BUDGET_MS
+
+
+def parse_args(argv):
+    parser = argparse.ArgumentParser(description="School ERP System")
+    parser.add_argument('--profile-startup', action='store_true',
+                        help="Report import and login window times instead of starting the app")
+    parser.add_argument('--startup-budget', type=float, default=DEFAULT_STARTUP_BUDGET_MS,
+                        help="Milliseconds allowed until the login window is shown")
+    parser.add_argument('--module-budget', type=float, default=DEFAULT_MODULE_BUDGET_MS,
+                        help="Milliseconds allowed for any single import")
+    # Anything else (e.g. -platform) is left for Qt
+    return parser.parse_known_args(argv)
+
 
 def main():
-    app = QApplication(sys.argv)
+    args, qt_args = parse_args(sys.argv[1:])
+    if args.profile_startup:
+        from startup_profiler import profile_startup
+        sys.exit(profile_startup(args.startup_budget, args.module_budget))
+
+    # Imported here rather than at the top so --profile-startup times these imports too
+    from PyQt6.QtWidgets import QApplication
+    from database.app_context import app_context
+    from database.search import check_indexes
+    from screens.background_tasks import task_manager
+    from screens.login_screen import LoginScreen
+
+    app = QApplication(sys.argv[:1] + qt_args)
+    # On quit: background jobs finish, queued writes commit, then the shared
+    # services and pooled connections close (hooks run last added first)
+    app_context.add_shutdown_hook(task_manager().wait)
+    app_context.install(app)
     window = LoginScreen()
     window.show()
+    # Catch search indexes left pointing at renumbered rowids
+    task_manager().submit(check_indexes, message="Checking search indexes...")
     sys.exit(app.exec())
 
 if __name__ == "__main__":
@@ -0,0 +1,6 @@
+"""
+School ERP System - Reports Package
+This package contains the headless report generators (PDF output rendered
+from database rows, without any screen widgets) and pdf_builder, the shared
+document builder the department screens use for their PDFs.
+"""
@@ -0,0 +1,296 @@
+"""
+Shared reportlab document builder for the department screens.
+
+Paragraph styles, table styles and page setups are described here once and
+compiled on first use, then reused by every PDF the process writes. reportlab
+itself is only imported when a document is first built, or ahead of time by
+warm_up() on a background thread, so screens can import this module for free.
+
+Large tables are emitted as a series of LongTable flowables with the header
+repeated, which keeps layout time linear in the number of rows.
+"""
+
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+# Points per inch, for column widths given in inches
+INCH = 72
+
+# Rows per table flowable; a longer table is split into several
+DEFAULT_CHUNK_ROWS = 200
+
+# name: (landscape, margin in points); every setup is US Letter
+PAGE_SETUPS = {
+    'portrait': (False, 72),
+    'landscape': (True, 30),
+    'landscape_wide': (True, 72),
+}
+
+# name: (parent style in the sample stylesheet, overrides)
+PARAGRAPH_STYLES = {
+    'title': ('Heading1', {'fontSize': 24, 'spaceAfter': 30}),
+    'title_centered': ('Heading1', {'fontSize': 24, 'spaceAfter': 30, 'alignment': 1}),
+    'report_title': ('Heading1', {'fontSize': 28, 'spaceAfter': 30, 'alignment': 1}),
+    'heading': ('Heading2', {}),
+    'subheading': ('Heading3', {}),
+    'normal': ('Normal', {}),
+    'date': ('Normal', {'fontSize': 12}),
+    'date_centered': ('Normal', {'fontSize': 12, 'alignment': 1}),
+    'total': ('Normal', {'fontName': 'Helvetica-Bold', 'fontSize': 14, 'leading': 17}),
+}
+
+# Fonts whose metrics are parsed by warm_up()
+FONTS = ['Helvetica', 'Helvetica-Bold']
+
+# name: TableStyle commands; colours are given as reportlab colour names or hex
+TABLE_STYLES = {
+    # Grey header over beige rows, used by the order and schedule sheets
+    'grey': [
+        ('BACKGROUND', (0, 0), (-1, 0), 'grey'),
+        ('TEXTCOLOR', (0, 0), (-1, 0), 'whitesmoke'),
+        ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
+        ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
+        ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+        ('FONTSIZE', (0, 0), (-1, 0), 14),
+        ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
+        ('BACKGROUND', (0, 1), (-1, -1), 'beige'),
+        ('TEXTCOLOR', (0, 1), (-1, -1), 'black'),
+        ('FONTNAME', (0, 1), (-1, -1), 'Helvetica'),
+        ('FONTSIZE', (0, 1), (-1, -1), 12),
+        ('GRID', (0, 0), (-1, -1), 1, 'black'),
+    ],
+    # Grey header over white rows, used by the maths order list
+    'grey_white': [
+        ('BACKGROUND', (0, 0), (-1, 0), 'grey'),
+        ('TEXTCOLOR', (0, 0), (-1, 0), 'whitesmoke'),
+        ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
+        ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
+        ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+        ('FONTSIZE', (0, 0), (-1, 0), 12),
+        ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
+        ('BACKGROUND', (0, 1), (-1, -1), 'white'),
+        ('TEXTCOLOR', (0, 1), (-1, -1), 'black'),
+        ('FONTNAME', (0, 1), (-1, -1), 'Helvetica'),
+        ('FONTSIZE', (0, 1), (-1, -1), 10),
+        ('GRID', (0, 0), (-1, -1), 1, 'black'),
+    ],
+    # Blue header over white rows
+    'blue': [
+        ('BACKGROUND', (0, 0), (-1, 0), '#2196F3'),
+        ('TEXTCOLOR', (0, 0), (-1, 0), 'white'),
+        ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
+        ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
+        ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+        ('FONTSIZE', (0, 0), (-1, 0), 12),
+        ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
+        ('BACKGROUND', (0, 1), (-1, -1), 'white'),
+        ('TEXTCOLOR', (0, 1), (-1, -1), 'black'),
+        ('FONTNAME', (0, 1), (-1, -1), 'Helvetica'),
+        ('FONTSIZE', (0, 1), (-1, -1), 10),
+        ('GRID', (0, 0), (-1, -1), 1, 'black'),
+        ('PADDING', (0, 0), (-1, -1), 8),
+    ],
+    # Exam schedule
+    'schedule': [
+        ('BACKGROUND', (0, 0), (-1, 0), '#1a73e8'),
+        ('TEXTCOLOR', (0, 0), (-1, 0), 'whitesmoke'),
+        ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
+        ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+        ('FONTSIZE', (0, 0), (-1, 0), 12),
+        ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
+        ('BACKGROUND', (0, 1), (-1, -1), 'white'),
+        ('TEXTCOLOR', (0, 1), (-1, -1), 'black'),
+        ('FONTNAME', (0, 1), (-1, -1), 'Helvetica'),
+        ('FONTSIZE', (0, 1), (-1, -1), 10),
+        ('GRID', (0, 0), (-1, -1), 1, 'black'),
+    ],
+    # Label / value pairs without a header or grid
+    'details': [
+        ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
+        ('FONTNAME', (0, 0), (0, -1), 'Helvetica-Bold'),
+        ('FONTNAME', (1, 0), (1, -1), 'Helvetica'),
+        ('FONTSIZE', (0, 0), (-1, -1), 14),
+        ('BOTTOMPADDING', (0, 0), (-1, -1), 12),
+        ('TOPPADDING', (0, 0), (-1, -1), 12),
+    ],
+    # Bold header over a plain grid
+    'plain': [
+        ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
+        ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+        ('FONTSIZE', (0, 0), (-1, -1), 14),
+        ('BOTTOMPADDING', (0, 0), (-1, -1), 12),
+        ('TOPPADDING', (0, 0), (-1, -1), 12),
+        ('GRID', (0, 0), (-1, -1), 1, 'black'),
+    ],
+    # Signature lines: bold first row, no grid
+    'signature': [
+        ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
+        ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+        ('FONTSIZE', (0, 0), (-1, -1), 14),
+        ('BOTTOMPADDING', (0, 0), (-1, -1), 12),
+        ('TOPPADDING', (0, 0), (-1, -1), 12),
+    ],
+}
+
+_lock = threading.RLock()
+_sample_styles = None
+_paragraph_styles = {}
+_table_styles = {}
+_page_sizes = {}
+_warm_up_thread = None
+_executor = None
+
+
+def paragraph_style(name):
+    """Compiled ParagraphStyle from PARAGRAPH_STYLES"""
+    global _sample_styles
+    with _lock:
+        if name not in _paragraph_styles:
+            from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
+
+            if _sample_styles is None:
+                # Built once and never modified; styles derive from it
+                _sample_styles = getSampleStyleSheet()
+            parent, overrides = PARAGRAPH_STYLES[name]
+            _paragraph_styles[name] = ParagraphStyle(
+                f'Shared_{name}', parent=_sample_styles[parent], **overrides
+            )
+        return _paragraph_styles[name]
+
+
+def table_style(name, total_rows=0):
+    """Compiled TableStyle from TABLE_STYLES, optionally styling the last total_rows rows"""
+    key = (name, total_rows)
+    with _lock:
+        if key not in _table_styles:
+            from reportlab.platypus import TableStyle
+
+            commands = list(TABLE_STYLES[name])
+            if total_rows:
+                commands += [
+                    ('BACKGROUND', (0, -total_rows), (-1, -1), '#f5f5f5'),
+                    ('FONTNAME', (0, -total_rows), (-1, -1), 'Helvetica-Bold'),
+                ]
+            _table_styles[key] = TableStyle(commands)
+        return _table_styles[key]
+
+
+def page_size(page='portrait'):
+    """(width, height) in points of a PAGE_SETUPS page"""
+    with _lock:
+        if page not in _page_sizes:
+            from reportlab.lib.pagesizes import letter, landscape
+
+            _page_sizes[page] = landscape(letter) if PAGE_SETUPS[page][0] else letter
+        return _page_sizes[page]
+
+
+def document(file_path, page='portrait', **options):
+    """SimpleDocTemplate for file_path laid out as a PAGE_SETUPS page"""
+    from reportlab.platypus import SimpleDocTemplate
+
+    margin = PAGE_SETUPS[page][1]
+    for side in ('rightMargin', 'leftMargin', 'topMargin', 'bottomMargin'):
+        options.setdefault(side, margin)
+    return SimpleDocTemplate(file_path, pagesize=page_size(page), **options)
+
+
+def paragraph(text, style='normal'):
+    from reportlab.platypus import Paragraph
+
+    return Paragraph(text, paragraph_style(style))
+
+
+def spacer(height):
+    from reportlab.platypus import Spacer
+
+    return Spacer(1, height)
+
+
+def title_block(title, subtitle=None, style='title'):
+    """Title paragraph, an optional smaller line under it, and a gap"""
+    elements = [paragraph(title, style)]
+    if subtitle:
+        elements.append(paragraph(subtitle, 'date'))
+    elements.append(spacer(20))
+    return elements
+
+
+def table(rows, style='grey', col_widths=None, total_rows=0, header=True,
+          chunk_rows=DEFAULT_CHUNK_ROWS):
+    """Table flowables for rows, the first of which is the header row.
+
+    Up to chunk_rows body rows are laid out per flowable, each repeating the
+    header, so reportlab never measures the whole table at once. total_rows
+    trailing rows are styled as totals. Splitting needs col_widths (in
+    points) to keep the columns aligned; without them one table is built.
+    header=False is for label/value tables with no header row.
+    """
+    from reportlab.platypus import LongTable
+
+    head, body = (rows[:1], rows[1:]) if header else ([], rows)
+    if col_widths is None or len(body) <= chunk_rows:
+        chunks = [body]
+    else:
+        chunks = [body[i:i + chunk_rows] for i in range(0, len(body), chunk_rows)]
+        if total_rows and len(chunks[-1]) <= total_rows:
+            # Keep the totals with at least one row above them
+            chunks[-2:] = [chunks[-2] + chunks[-1]]
+
+    flowables = []
+    for i, chunk in enumerate(chunks):
+        last = i == len(chunks) - 1
+        flowable = LongTable(head + chunk, colWidths=col_widths, repeatRows=len(head))
+        flowable.setStyle(table_style(style, total_rows if last else 0))
+        flowables.append(flowable)
+    return flowables
+
+
+def save_pdf(file_path, elements, page='portrait', **options):
+    """Build elements into file_path and return the path"""
+    document(file_path, page, **options).build(elements)
+    return file_path
+
+
+def save_pdf_async(file_path, elements, page='portrait', **options):
+    """save_pdf on a background thread; returns a concurrent.futures.Future.
+
+    For tools outside the GUI; screens use build_pdf_in_background, which
+    reports through the task status bar.
+    """
+    global _executor
+    with _lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix='pdf')
+    return _executor.submit(save_pdf, file_path, elements, page, **options)
+
+
+def _warm_up():
+    try:
+        import reportlab.platypus  # noqa: F401
+        from reportlab.pdfbase import pdfmetrics
+
+        for font in FONTS:
+            pdfmetrics.getFont(font)
+        for name in PARAGRAPH_STYLES:
+            paragraph_style(name)
+        for name in TABLE_STYLES:
+            table_style(name)
+        for page in PAGE_SETUPS:
+            page_size(page)
+    except Exception as e:
+        print(f"PDF warm-up error: {str(e)}")
+
+
+def warm_up():
+    """Import reportlab and compile the shared styles on a background thread.
+
+    Screens with PDF output call this when they open, so the first PDF does
+    not pay for the imports. Only the first call starts a thread.
+    """
+    global _warm_up_thread
+    with _lock:
+        if _warm_up_thread is None:
+            _warm_up_thread = threading.Thread(target=_warm_up, name='pdf-warm-up', daemon=True)
+            _warm_up_thread.start()
+        return _warm_up_thread
@@ -0,0 +1,365 @@
+"""
+Bulk report card PDFs for a grade or a class section.
+
+Report cards are rendered from the exam tables (exam_results, plus the
+published exam_report_cards row when the exam has been graded), not from
+the student details dialog. Rows are streamed from one ordered query and
+handed to a process pool chunk by chunk, so a whole grade never sits in
+memory at once. Each worker builds its styles and loads its fonts once.
+
+    python -m reports.report_cards "Term 1 2025" 10th out/ --section A --merge
+"""
+
+import argparse
+import os
+import sys
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from itertools import groupby
+
+if __package__ in (None, ''):
+    # Make the school_erp root importable when run as a script
+    sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from database.db_config import db_config
+
+from reports.salary_slips import (
+    SCHOOL_NAME, SCHOOL_ADDRESS, SCHOOL_CONTACT, _merge, _mp_context, _pdf_writer
+)
+
+# Students handed to a worker at a time; also the page count of each merge part
+DEFAULT_CHUNK_SIZE = 25
+
+# Chunks waiting on the pool per worker; bounds memory on large grades
+MAX_PENDING_PER_WORKER = 2
+
+# One row per student and subject, in print order: section, roll number, subject.
+# The report card columns are NULL until the exam is published.
+CARD_ROWS_QUERY = '''
+    SELECT s.student_id, s.name, s.roll_no, s.class, s.section, s.academic_year,
+           rc.total_marks, rc.max_marks, rc.percentage, rc.grade, rc.class_rank,
+           rc.percentile, sm.percentage,
+           r.subject, COALESCE(r.marks, r.total_score), COALESCE(r.max_marks, 100), r.grade
+    FROM students s
+    JOIN exam_results r ON r.student_id = s.student_id AND r.exam_name = ?
+    LEFT JOIN exam_report_cards rc ON rc.exam_name = r.exam_name AND rc.student_id = s.student_id
+    LEFT JOIN attendance_summary sm ON sm.student_id = s.student_id
+    WHERE s.class = ? {section_filter}
+      AND r.subject IS NOT NULL
+    ORDER BY s.section, s.roll_no, s.student_id, r.subject, r.result_id
+'''
+
+STUDENT_COUNT_QUERY = '''
+    SELECT COUNT(DISTINCT s.student_id)
+    FROM students s
+    JOIN exam_results r ON r.student_id = s.student_id AND r.exam_name = ?
+    WHERE s.class = ? {section_filter}
+      AND r.subject IS NOT NULL
+'''
+
+CARD_FIELDS = [
+    'student_id', 'name', 'roll_no', 'class', 'section', 'academic_year',
+    'total_marks', 'max_marks', 'percentage', 'grade', 'class_rank',
+    'percentile', 'attendance'
+]
+
+# Styles built once per worker process by _init_worker
+_styles = None
+_Bookmark = None
+
+
+def _init_worker():
+    """Load the fonts and build the reportlab styles shared by every card a worker renders"""
+    global _styles, _Bookmark
+    from reportlab.lib import colors
+    from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
+    from reportlab.pdfbase import pdfmetrics
+    from reportlab.platypus import Flowable, TableStyle
+
+    # Font metrics are parsed on first use; do it here rather than on the first card
+    for font in ('Helvetica', 'Helvetica-Bold'):
+        pdfmetrics.getFont(font)
+
+    class Bookmark(Flowable):
+        """Zero-size flowable adding an outline entry for the page it lands on"""
+
+        def __init__(self, key, title):
+            super().__init__()
+            self.key = key
+            self.title = title
+
+        def wrap(self, available_width, available_height):
+            return 0, 0
+
+        def draw(self):
+            self.canv.bookmarkPage(self.key)
+            self.canv.addOutlineEntry(self.title, self.key, level=0)
+
+    _Bookmark = Bookmark
+
+    sample = getSampleStyleSheet()
+    _styles = {
+        'title': ParagraphStyle(
+            'CustomTitle', parent=sample['Heading1'], fontSize=24, spaceAfter=6, alignment=1
+        ),
+        'normal': ParagraphStyle(
+            'CustomNormal', parent=sample['Normal'], fontSize=10, spaceAfter=4, alignment=1
+        ),
+        'heading': sample['Heading2'],
+        'info': TableStyle([
+            ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
+            ('FONTNAME', (0, 0), (-1, -1), 'Helvetica'),
+            ('FONTNAME', (0, 0), (0, -1), 'Helvetica-Bold'),
+            ('FONTNAME', (2, 0), (2, -1), 'Helvetica-Bold'),
+            ('FONTSIZE', (0, 0), (-1, -1), 12),
+            ('BOTTOMPADDING', (0, 0), (-1, -1), 6),
+            ('TOPPADDING', (0, 0), (-1, -1), 6),
+        ]),
+        'marks': TableStyle([
+            ('ALIGN', (0, 0), (0, -1), 'LEFT'),
+            ('ALIGN', (1, 0), (-1, -1), 'CENTER'),
+            ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+            ('FONTSIZE', (0, 0), (-1, -1), 12),
+            ('BOTTOMPADDING', (0, 0), (-1, -1), 6),
+            ('TOPPADDING', (0, 0), (-1, -1), 6),
+            ('GRID', (0, 0), (-1, -1), 1, colors.black),
+            ('BACKGROUND', (0, 0), (-1, 0), colors.lightgrey),
+            ('BACKGROUND', (0, -2), (-1, -1), colors.lightgrey),
+            ('FONTNAME', (0, -2), (-1, -1), 'Helvetica-Bold'),
+        ]),
+        'signature': TableStyle([
+            ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
+            ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+            ('FONTSIZE', (0, 0), (-1, -1), 12),
+            ('BOTTOMPADDING', (0, 0), (-1, -1), 8),
+            ('TOPPADDING', (0, 0), (-1, -1), 8),
+        ]),
+    }
+
+
+def _number(value, suffix=''):
+    if value is None:
+        return "-"
+    return f"{value:g}{suffix}" if float(value).is_integer() else f"{value:.2f}{suffix}"
+
+
+def section_label(class_name, section):
+    return f"{class_name} - {section}" if section else class_name
+
+
+def build_card_story(card, exam_name):
+    """Return the flowables of one report card page"""
+    from reportlab.platypus import Table, Paragraph, Spacer
+
+    if _styles is None:
+        _init_worker()
+
+    story = [
+        _Bookmark(f"card_{card['student_id']}",
+                  f"{card['roll_no']} - {card['name']} ({section_label(card['class'], card['section'])})"),
+        Paragraph(SCHOOL_NAME, _styles['title']),
+        Paragraph(SCHOOL_ADDRESS, _styles['normal']),
+        Paragraph(SCHOOL_CONTACT, _styles['normal']),
+        Spacer(1, 10),
+        Paragraph(f"Student Report Card - {exam_name}", _styles['heading']),
+    ]
+
+    info = [
+        ["Student Name:", card['name'] or "", "Student ID:", card['student_id']],
+        ["Class:", section_label(card['class'], card['section']), "Roll No:", card['roll_no'] or ""],
+        ["Academic Year:", card['academic_year'] or "", "Attendance:", _number(card['attendance'], '%')],
+    ]
+    info_table = Table(info, colWidths=[130, 220, 110, 220])
+    info_table.setStyle(_styles['info'])
+    story += [info_table, Spacer(1, 12)]
+
+    marks = [["Subject", "Marks", "Max Marks", "Grade"]]
+    for subject, mark, max_mark, grade in card['subject_marks']:
+        marks.append([subject, _number(mark), _number(max_mark), grade or "-"])
+    marks.append(["Total", _number(card['total_marks']), _number(card['max_marks']), card['grade'] or "-"])
+    marks.append(["Percentage", _number(card['percentage'], '%'),
+                  f"Rank: {card['class_rank'] or '-'}",
+                  f"Percentile: {_number(card['percentile'])}"])
+    marks_table = Table(marks, colWidths=[260, 120, 150, 150])
+    marks_table.setStyle(_styles['marks'])
+    story += [marks_table, Spacer(1, 40)]
+
+    signature = [
+        ["Class Teacher's Signature", "Principal's Signature"],
+        ["_________________", "_________________"],
+        ["Date: _____________", "Date: _____________"]
+    ]
+    signature_table = Table(signature, colWidths=[340, 340])
+    signature_table.setStyle(_styles['signature'])
+    story.append(signature_table)
+    return story
+
+
+def _render(file_path, cards, exam_name):
+    """Render one or more cards into a PDF and return (file_path, pages)"""
+    from reportlab.lib.pagesizes import letter, landscape
+    from reportlab.platypus import SimpleDocTemplate, PageBreak
+
+    story = []
+    for i, card in enumerate(cards):
+        if i:
+            story.append(PageBreak())
+        story += build_card_story(card, exam_name)
+
+    doc = SimpleDocTemplate(file_path, pagesize=landscape(letter), rightMargin=30, leftMargin=30,
+                            topMargin=20, bottomMargin=20)
+    doc.build(story)
+    return file_path, doc.page
+
+
+def _file_name(text):
+    return str(text).replace('/', '_').replace(' ', '_')
+
+
+def _render_chunk(output_dir, exam_name, cards, part):
+    """Worker task: render a chunk of cards, one file each or one merge part"""
+    exam_file_name = _file_name(exam_name)
+    if part is not None:
+        return [_render(os.path.join(output_dir, f"report_cards_{exam_file_name}_part{part:04d}.pdf"),
+                        cards, exam_name)]
+    return [
+        _render(os.path.join(output_dir, f"report_card_{_file_name(card['student_id'])}_{exam_file_name}.pdf"),
+                [card], exam_name)
+        for card in cards
+    ]
+
+
+def _section_filter(section):
+    if section is None:
+        return '', []
+    return 'AND s.section IS ?', [section]
+
+
+def count_report_cards(exam_name, class_name, section=None):
+    """Number of students of a grade (or one section) with marks in an exam"""
+    section_filter, params = _section_filter(section)
+    cursor = db_config.get_connection().execute(
+        STUDENT_COUNT_QUERY.format(section_filter=section_filter),
+        [exam_name, class_name] + params
+    )
+    return cursor.fetchone()[0]
+
+
+def iter_report_cards(exam_name, class_name, section=None):
+    """Yield the report cards of a grade (or one section) as plain dicts, in print order.
+
+    Rows are grouped per student as they stream off the cursor. Totals fall
+    back to the subject marks when the exam has not been published yet.
+    """
+    section_filter, params = _section_filter(section)
+    cursor = db_config.get_connection().execute(
+        CARD_ROWS_QUERY.format(section_filter=section_filter),
+        [exam_name, class_name] + params
+    )
+    for student_id, rows in groupby(cursor, key=lambda row: row[0]):
+        rows = list(rows)
+        card = dict(zip(CARD_FIELDS, rows[0][:len(CARD_FIELDS)]))
+        # A subject entered twice keeps its last row
+        subjects = {}
+        for row in rows:
+            subjects[row[13]] = row[13:17]
+        card['subject_marks'] = list(subjects.values())
+        if card['total_marks'] is None:
+            card['total_marks'] = sum(mark or 0 for _, mark, _, _ in card['subject_marks'])
+            card['max_marks'] = sum(max_mark or 0 for _, _, max_mark, _ in card['subject_marks'])
+            if card['max_marks']:
+                card['percentage'] = round(100.0 * card['total_marks'] / card['max_marks'], 2)
+        yield card
+
+
+def _chunks(cards, chunk_size):
+    chunk = []
+    for card in cards:
+        chunk.append(card)
+        if len(chunk) == chunk_size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def generate_report_cards(exam_name, class_name, output_dir, section=None, merge=False,
+                          workers=None, chunk_size=DEFAULT_CHUNK_SIZE, progress_callback=None):
+    """Render the report cards of a grade (or one section) across a process pool.
+
+    Writes one PDF per student, or a single bookmarked PDF (one outline
+    entry per student) when merge is set. progress_callback(done, total) is
+    called as chunks finish. Returns a dict with the files written, the
+    student and page counts, and students per second.
+    """
+    start = time.perf_counter()
+    if merge:
+        # Fail before rendering anything, not after
+        _pdf_writer()
+    total = count_report_cards(exam_name, class_name, section)
+    os.makedirs(output_dir, exist_ok=True)
+    workers = workers or os.cpu_count() or 1
+
+    files = []
+    pages = 0
+    done = 0
+    pending = deque()
+
+    def collect():
+        nonlocal pages, done
+        count, future = pending.popleft()
+        # Collected in submission order so merge parts stay in roll number order
+        for file_path, page_count in future.result():
+            files.append(file_path)
+            pages += page_count
+        done += count
+        if progress_callback:
+            progress_callback(done, total)
+
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                             mp_context=_mp_context) as executor:
+        for part, chunk in enumerate(_chunks(iter_report_cards(exam_name, class_name, section), chunk_size)):
+            pending.append((len(chunk), executor.submit(
+                _render_chunk, output_dir, exam_name, chunk, part if merge else None
+            )))
+            if len(pending) >= workers * MAX_PENDING_PER_WORKER:
+                collect()
+        while pending:
+            collect()
+
+    if merge and files:
+        name = _file_name(f"report_cards_{exam_name}_{class_name}" + (f"_{section}" if section else ""))
+        files = [_merge(files, os.path.join(output_dir, f"{name}.pdf"))]
+
+    seconds = time.perf_counter() - start
+    return {
+        'exam_name': exam_name,
+        'class': class_name,
+        'section': section,
+        'files': files,
+        'students': done,
+        'pages': pages,
+        'seconds': seconds,
+        'students_per_sec': done / seconds if seconds else 0.0
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate the report card PDFs of a grade or section")
+    parser.add_argument('exam_name', help="Exam name as stored on exam_results")
+    parser.add_argument('class_name', help="Grade as stored on students, e.g. '10th'")
+    parser.add_argument('output_dir', help="Folder the PDFs are written to")
+    parser.add_argument('--section', default=None, help="Only this section of the grade")
+    parser.add_argument('--merge', action='store_true', help="Write a single bookmarked PDF")
+    parser.add_argument('--workers', type=int, default=None, help="Worker processes (default: CPU count)")
+    args = parser.parse_args()
+
+    result = generate_report_cards(args.exam_name, args.class_name, args.output_dir,
+                                   section=args.section, merge=args.merge, workers=args.workers)
+    print(f"Generated {result['students']} report cards, {result['pages']} pages in "
+          f"{result['seconds']:.2f}s ({result['students_per_sec']:.1f} students/sec)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,292 @@
+"""
+Bulk salary slip PDFs for a pay period.
+
+Slips are rendered from salary_slips/teachers rows, not from the salary slip
+widget, and fanned out over a process pool. Each worker builds its paragraph
+and table styles once and reuses them for every slip it renders.
+"""
+
+import argparse
+import multiprocessing
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+if __package__ in (None, ''):
+    # Make the school_erp root importable when run as a script
+    sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from database.db_config import db_config
+
+SCHOOL_NAME = "ABC Public School"
+SCHOOL_ADDRESS = "123, Education Street, City Name, State - 123456"
+SCHOOL_CONTACT = "Phone: (123) 456-7890 | Email: info@abcpublicschool.com"
+
+# Matches the salary slip form (700x800)
+PAGE_SIZE = (700, 800)
+
+# Slips handed to a worker at a time; also the page count of each merge part
+DEFAULT_CHUNK_SIZE = 25
+
+# Workers are spawned, not forked: the pool is started from a QThreadPool
+# thread, and a forked child would inherit the GUI's threads and locks
+_mp_context = multiprocessing.get_context('spawn')
+
+# Latest slip of each employee for the period, with the teacher details
+SLIPS_QUERY = '''
+    SELECT sl.employee_id, t.name, t.designation, t.department, t.joining_date,
+           t.bank_account, t.pf_no, sl.pay_period, sl.basic_salary, sl.da, sl.hra,
+           sl.conveyance, sl.medical, sl.other_allowances, sl.pf, sl.professional_tax,
+           sl.income_tax, sl.other_deductions, sl.gross_salary, sl.total_deductions,
+           sl.net_salary
+    FROM salary_slips sl
+    JOIN teachers t ON t.teacher_id = sl.employee_id
+    WHERE sl.pay_period = ?
+      AND sl.slip_id = (
+          SELECT MAX(slip_id) FROM salary_slips
+          WHERE employee_id = sl.employee_id AND pay_period = sl.pay_period
+      )
+    ORDER BY sl.employee_id
+'''
+
+SLIP_FIELDS = [
+    'employee_id', 'name', 'designation', 'department', 'joining_date',
+    'bank_account', 'pf_no', 'pay_period', 'basic_salary', 'da', 'hra',
+    'conveyance', 'medical', 'other_allowances', 'pf', 'professional_tax',
+    'income_tax', 'other_deductions', 'gross_salary', 'total_deductions',
+    'net_salary'
+]
+
+# Styles built once per worker process by _init_worker
+_styles = None
+
+
+def _init_worker():
+    """Build the reportlab styles shared by every slip a worker renders"""
+    global _styles
+    from reportlab.lib import colors
+    from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
+    from reportlab.platypus import TableStyle
+
+    sample = getSampleStyleSheet()
+    _styles = {
+        'title': ParagraphStyle(
+            'CustomTitle', parent=sample['Heading1'], fontSize=14,
+            textColor=colors.HexColor('#0000FF'), spaceAfter=10, alignment=1
+        ),
+        'normal': ParagraphStyle(
+            'CustomNormal', parent=sample['Normal'], fontSize=10, spaceAfter=5, alignment=1
+        ),
+        'details': TableStyle([
+            ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
+            ('FONTNAME', (0, 0), (-1, -1), 'Helvetica'),
+            ('FONTNAME', (0, 0), (0, -1), 'Helvetica-Bold'),
+            ('FONTNAME', (2, 0), (2, -1), 'Helvetica-Bold'),
+            ('FONTSIZE', (0, 0), (-1, -1), 10),
+            ('BOTTOMPADDING', (0, 0), (-1, -1), 6),
+            ('TOPPADDING', (0, 0), (-1, -1), 6),
+            ('GRID', (0, 0), (-1, -1), 0.5, colors.grey),
+        ]),
+        'salary': TableStyle([
+            ('ALIGN', (0, 0), (-1, 0), 'CENTER'),
+            ('ALIGN', (0, 1), (0, -1), 'LEFT'),
+            ('ALIGN', (1, 1), (1, -1), 'RIGHT'),
+            ('ALIGN', (2, 1), (2, -1), 'LEFT'),
+            ('ALIGN', (3, 1), (3, -1), 'RIGHT'),
+            ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+            ('FONTSIZE', (0, 0), (-1, -1), 10),
+            ('GRID', (0, 0), (-1, -2), 0.5, colors.grey),
+            ('BACKGROUND', (0, 0), (-1, 0), colors.grey),
+            ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
+            ('BOTTOMPADDING', (0, 0), (-1, -1), 6),
+            ('TOPPADDING', (0, 0), (-1, -1), 6),
+            ('FONTNAME', (0, -3), (-1, -1), 'Helvetica-Bold'),
+        ]),
+        'footer': TableStyle([
+            ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
+            ('FONTNAME', (0, 0), (-1, -1), 'Helvetica'),
+            ('FONTNAME', (0, 0), (0, -1), 'Helvetica-Bold'),
+            ('FONTSIZE', (0, 0), (-1, -1), 10),
+            ('BOTTOMPADDING', (0, 0), (-1, -1), 6),
+            ('TOPPADDING', (0, 0), (-1, -1), 6),
+            ('GRID', (0, 0), (-1, -1), 0.5, colors.grey),
+        ]),
+    }
+
+
+def _amount(value):
+    return f"{value or 0:.2f}"
+
+
+def build_slip_story(slip):
+    """Return the flowables of one salary slip page"""
+    from reportlab.platypus import Table, Paragraph, Spacer
+
+    if _styles is None:
+        _init_worker()
+
+    story = [
+        Paragraph(SCHOOL_NAME, _styles['title']),
+        Paragraph(SCHOOL_ADDRESS, _styles['normal']),
+        Paragraph(SCHOOL_CONTACT, _styles['normal']),
+        Spacer(1, 10),
+        Paragraph("SALARY SLIP", _styles['title']),
+        Paragraph(f"For the Month of: {slip['pay_period']}", _styles['normal']),
+        Spacer(1, 10),
+    ]
+
+    details = [
+        ["Employee Name:", slip['name'] or "", "Employee ID:", slip['employee_id']],
+        ["Designation:", slip['designation'] or "", "Department:", slip['department'] or ""],
+        ["Date of Joining:", slip['joining_date'] or "", "Bank Account No:", slip['bank_account'] or ""],
+        ["PF No:", slip['pf_no'] or "", "Pay Period:", slip['pay_period']]
+    ]
+    details_table = Table(details, colWidths=[100, 200, 100, 200])
+    details_table.setStyle(_styles['details'])
+    story += [details_table, Spacer(1, 10)]
+
+    salary = [
+        ["Earnings", "Amount (INR)", "Deductions", "Amount (INR)"],
+        ["Basic Salary", _amount(slip['basic_salary']), "Provident Fund (PF)", _amount(slip['pf'])],
+        ["Dearness Allowance (DA)", _amount(slip['da']), "Professional Tax", _amount(slip['professional_tax'])],
+        ["House Rent Allowance", _amount(slip['hra']), "Income Tax (TDS)", _amount(slip['income_tax'])],
+        ["Conveyance Allowance", _amount(slip['conveyance']), "Other Deductions", _amount(slip['other_deductions'])],
+        ["Medical Allowance", _amount(slip['medical']), "Total Deductions", _amount(slip['total_deductions'])],
+        ["Other Allowances", _amount(slip['other_allowances']), "", ""],
+        ["Gross Salary", _amount(slip['gross_salary']), "", ""],
+        ["", "", "", ""],
+        ["Net Salary", _amount(slip['net_salary']), "", ""]
+    ]
+    salary_table = Table(salary, colWidths=[150, 100, 150, 100])
+    salary_table.setStyle(_styles['salary'])
+    story += [salary_table, Spacer(1, 10)]
+
+    footer = [
+        ["Payment Mode:", "Bank Transfer / Cheque"],
+        ["Salary Disbursed on:", "[DD/MM/YYYY]"],
+        ["Authorized Signatory", "(Principal / Administrator)"]
+    ]
+    footer_table = Table(footer, colWidths=[150, 350])
+    footer_table.setStyle(_styles['footer'])
+    story.append(footer_table)
+    return story
+
+
+def _render(file_path, slips):
+    """Render one or more slips into a PDF and return (file_path, pages)"""
+    from reportlab.platypus import SimpleDocTemplate, PageBreak
+
+    story = []
+    for i, slip in enumerate(slips):
+        if i:
+            story.append(PageBreak())
+        story += build_slip_story(slip)
+
+    doc = SimpleDocTemplate(file_path, pagesize=PAGE_SIZE, rightMargin=20, leftMargin=20,
+                            topMargin=10, bottomMargin=10)
+    doc.build(story)
+    return file_path, doc.page
+
+
+def _render_chunk(output_dir, pay_period_name, slips, part):
+    """Worker task: render a chunk of slips, one file each or one merge part"""
+    if part is not None:
+        return [_render(os.path.join(output_dir, f"salary_slips_{pay_period_name}_part{part:04d}.pdf"), slips)]
+    return [
+        _render(os.path.join(output_dir, f"salary_slip_{slip['employee_id']}_{pay_period_name}.pdf"), [slip])
+        for slip in slips
+    ]
+
+
+def load_slips(pay_period):
+    """Get the slips of a pay period as plain dicts (cheap to send to workers)"""
+    cursor = db_config.get_connection().execute(SLIPS_QUERY, (pay_period,))
+    return [dict(zip(SLIP_FIELDS, row)) for row in cursor.fetchall()]
+
+
+def _pdf_writer():
+    """pypdf's PdfWriter, which merging needs (pip install pypdf)"""
+    try:
+        from pypdf import PdfWriter
+    except ImportError:
+        raise ImportError("Merging the PDFs into one file needs the pypdf package (pip install pypdf)")
+    return PdfWriter
+
+
+def _merge(part_files, merged_path):
+    """Concatenate the part PDFs into merged_path and remove the parts"""
+    writer = _pdf_writer()()
+    for part_file in part_files:
+        writer.append(part_file)
+    with open(merged_path, 'wb') as f:
+        writer.write(f)
+    for part_file in part_files:
+        os.remove(part_file)
+    return merged_path
+
+
+def generate_salary_slips(pay_period, output_dir, merge=False, workers=None,
+                          chunk_size=DEFAULT_CHUNK_SIZE, progress_callback=None):
+    """Render every salary slip of a pay period across a process pool.
+
+    Writes one PDF per employee, or a single multi-page PDF when merge is
+    set. progress_callback(done, total) is called as chunks finish. Returns
+    a dict with the files written, the page count and pages per second.
+    """
+    start = time.perf_counter()
+    if merge:
+        # Fail before rendering anything, not after
+        _pdf_writer()
+    slips = load_slips(pay_period)
+    os.makedirs(output_dir, exist_ok=True)
+    pay_period_name = pay_period.replace('/', '_').replace(' ', '_')
+
+    chunks = [slips[i:i + chunk_size] for i in range(0, len(slips), chunk_size)]
+    files = []
+    pages = 0
+    done = 0
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                             mp_context=_mp_context) as executor:
+        futures = [
+            executor.submit(_render_chunk, output_dir, pay_period_name, chunk, i if merge else None)
+            for i, chunk in enumerate(chunks)
+        ]
+        # Collect in submission order so merge parts stay in employee order
+        for chunk, future in zip(chunks, futures):
+            for file_path, page_count in future.result():
+                files.append(file_path)
+                pages += page_count
+            done += len(chunk)
+            if progress_callback:
+                progress_callback(done, len(slips))
+
+    if merge and files:
+        files = [_merge(files, os.path.join(output_dir, f"salary_slips_{pay_period_name}.pdf"))]
+
+    seconds = time.perf_counter() - start
+    return {
+        'pay_period': pay_period,
+        'files': files,
+        'slips': len(slips),
+        'pages': pages,
+        'seconds': seconds,
+        'pages_per_sec': pages / seconds if seconds else 0.0
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate all salary slip PDFs for a pay period")
+    parser.add_argument('pay_period', help="Pay period as stored on the slips, e.g. 'March 2025'")
+    parser.add_argument('output_dir', help="Folder the PDFs are written to")
+    parser.add_argument('--merge', action='store_true', help="Write a single multi-page PDF")
+    parser.add_argument('--workers', type=int, default=None, help="Worker processes (default: CPU count)")
+    args = parser.parse_args()
+
+    result = generate_salary_slips(args.pay_period, args.output_dir, merge=args.merge, workers=args.workers)
+    print(f"Generated {result['slips']} slips, {result['pages']} pages in {result['seconds']:.2f}s "
+          f"({result['pages_per_sec']:.1f} pages/sec)")
+
+
+if __name__ == "__main__":
+    main()
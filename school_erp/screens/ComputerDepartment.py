@@ -2,12 +2,15 @@ import sys
 from PyQt6.QtWidgets import (QApplication, QMainWindow, QWidget, QVBoxLayout, 
                            QHBoxLayout, QLabel, QLineEdit, QPushButton, QMenuBar,
                            QMenu, QTableWidget, QTableWidgetItem, QHeaderView,
-                           QStackedWidget, QComboBox, QMessageBox, QDialog,
+                           QComboBox, QMessageBox, QDialog,
                            QFormLayout, QSpinBox, QFrame, QGroupBox, QDateEdit,
                            QTimeEdit)
 from PyQt6.QtCore import Qt, QTimer, QDate, QTime
 from PyQt6.QtGui import QAction
 from datetime import datetime
+from screens.lazy_pages import LazyPageStack
+from screens.table_models import RowTableModel, create_table_view
+from screens.row_actions import set_row_actions
 
 class AddHardwareDialog(QDialog):
     def __init__(self, parent=None):
@@ -194,12 +197,17 @@ class HardwareInventoryPage(QWidget):
         layout.addLayout(stats_layout)
 
         # Hardware table
-        self.hardware_table = QTableWidget()
-        self.hardware_table.setColumnCount(6)
-        self.hardware_table.setHorizontalHeaderLabels([
+        self.hardware_model = RowTableModel([
             "Hardware Name", "Lab", "Status", "Last Serviced", "Details", "Actions"
         ])
-        self.hardware_table.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeMode.Stretch)
+        # Status colors
+        self.hardware_model.foreground[2] = {
+            "Operational": Qt.GlobalColor.green,
+            "Needs Maintenance": Qt.GlobalColor.yellow,
+            None: Qt.GlobalColor.red
+        }
+        self.hardware_table, self.hardware_proxy = create_table_view(self.hardware_model, search_columns=range(5))
+        set_row_actions(self.hardware_table, 5, {"Update": self.update_hardware})
 
         # Sample data
         self.sample_data = [
@@ -219,52 +227,16 @@ class HardwareInventoryPage(QWidget):
         self.timer.start(60000)  # Update every minute
 
     def populate_table(self, data):
-        self.hardware_table.setRowCount(len(data))
-        for row, row_data in enumerate(data):
-            for col, value in enumerate(row_data):
-                self.hardware_table.setItem(row, col, QTableWidgetItem(str(value)))
-            
-            # Add Update button
-            update_btn = QPushButton("Update")
-            update_btn.setStyleSheet("""
-                QPushButton {
-                    background-color: #1a73e8;
-                    color: white;
-                    padding: 5px 10px;
-                    border-radius: 3px;
-                }
-                QPushButton:hover {
-                    background-color: #1557b0;
-                }
-            """)
-            update_btn.clicked.connect(lambda checked, row=row: self.update_hardware(row))
-            self.hardware_table.setCellWidget(row, 5, update_btn)
-
-            # Set status color
-            status_item = self.hardware_table.item(row, 2)
-            if status_item.text() == "Operational":
-                status_item.setForeground(Qt.GlobalColor.green)
-            elif status_item.text() == "Needs Maintenance":
-                status_item.setForeground(Qt.GlobalColor.yellow)
-            else:
-                status_item.setForeground(Qt.GlobalColor.red)
+        self.hardware_model.set_rows(data)
 
     def search_hardware(self):
-        search_text = self.search_box.text().lower()
-        for row in range(self.hardware_table.rowCount()):
-            should_show = False
-            for col in range(self.hardware_table.columnCount() - 1):  # Exclude Actions column
-                item = self.hardware_table.item(row, col)
-                if item and search_text in item.text().lower():
-                    should_show = True
-                    break
-            self.hardware_table.setRowHidden(row, not should_show)
+        self.hardware_proxy.set_search_text(self.search_box.text())
 
     def filter_by_lab(self, lab):
-        for row in range(self.hardware_table.rowCount()):
-            lab_item = self.hardware_table.item(row, 1)
-            should_show = lab == "All Labs" or (lab_item and lab == lab_item.text())
-            self.hardware_table.setRowHidden(row, not should_show)
+        if lab == "All Labs":
+            self.hardware_proxy.set_column_filter(1, None)
+        else:
+            self.hardware_proxy.set_column_filter(1, lambda value: value == lab)
 
     def add_hardware(self):
         dialog = AddHardwareDialog(self)
@@ -277,7 +249,7 @@ class HardwareInventoryPage(QWidget):
 
     def update_hardware(self, row):
         QMessageBox.information(self, "Update Hardware", 
-                              f"Update dialog for {self.hardware_table.item(row, 0).text()} will be implemented.")
+                              f"Update dialog for {self.hardware_model.row_data(row)[0]} will be implemented.")
 
     def update_stats(self):
         total = len(self.sample_data)
@@ -292,9 +264,10 @@ class HardwareInventoryPage(QWidget):
         self.check_date_value.setText(datetime.now().strftime("%Y-%m-%d %H:%M"))
 
     def delete_hardware(self):
-        current_row = self.hardware_table.currentRow()
-        if current_row >= 0:
-            hardware_name = self.hardware_table.item(current_row, 0).text()
+        current_index = self.hardware_table.currentIndex()
+        if current_index.isValid():
+            current_row = self.hardware_proxy.mapToSource(current_index).row()
+            hardware_name = self.hardware_model.row_data(current_row)[0]
             confirm = QMessageBox.question(
                 self,
                 "Confirm Deletion",
@@ -302,8 +275,8 @@ class HardwareInventoryPage(QWidget):
                 QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No
             )
             if confirm == QMessageBox.StandardButton.Yes:
-                self.hardware_table.removeRow(current_row)
                 self.sample_data.pop(current_row)
+                self.populate_table(self.sample_data)
                 self.update_stats()
                 QMessageBox.information(self, "Success", "Hardware deleted successfully!")
         else:
@@ -1460,20 +1433,14 @@ class ComputerDepartment(QMainWindow):
         self.tab_buttons[0].setChecked(True)
         main_layout.addLayout(tab_layout)
         
-        # Create stacked widget for pages
-        self.stack = QStackedWidget()
+        # Create stacked widget for pages; each page is built on first activation
+        self.stack = LazyPageStack()
         main_layout.addWidget(self.stack)
         
-        # Create and add pages
-        self.hardware_inventory_page = HardwareInventoryPage()
-        self.software_inventory_page = SoftwareInventoryPage()
-        self.lab_classes_page = LabClassesPage()
-        self.practical_exams_page = PracticalExamsPage()
-        
-        self.stack.addWidget(self.hardware_inventory_page)
-        self.stack.addWidget(self.software_inventory_page)
-        self.stack.addWidget(self.lab_classes_page)
-        self.stack.addWidget(self.practical_exams_page)
+        self.stack.add_page(HardwareInventoryPage)
+        self.stack.add_page(SoftwareInventoryPage)
+        self.stack.add_page(LabClassesPage)
+        self.stack.add_page(PracticalExamsPage)
 
     def switch_tab(self, index):
         # Update button states
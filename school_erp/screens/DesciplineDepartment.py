@@ -9,8 +9,8 @@ from PyQt6.QtWidgets import (QApplication, QMainWindow, QVBoxLayout, QHBoxLayout
                            QWidget, QLineEdit, QComboBox, QHeaderView, QStackedWidget,
                            QDialog, QFormLayout, QSpinBox, QMessageBox, QDateEdit,
                            QFileDialog, QFrame, QGroupBox, QScrollArea)
-from PyQt6.QtGui import QIcon, QPixmap, QFont
-from PyQt6.QtCore import Qt, QEasingCurve, QPropertyAnimation, QRect, QDate, QDateTime
+from PyQt6.QtGui import QIcon, QPixmap, QFont, QColor
+from PyQt6.QtCore import Qt, QEasingCurve, QPropertyAnimation, QRect, QDate, QDateTime, QTimer
 import matplotlib
 matplotlib.use('qtagg')
 import matplotlib.pyplot as plt
@@ -18,6 +18,15 @@ from matplotlib.backends.backend_qtagg import FigureCanvasQTAgg
 from matplotlib.figure import Figure
 import numpy as np
 
+from database.attendance_analytics import attendance_analytics
+from screens.background_tasks import run_in_background, TaskStatusBar
+from screens.row_actions import set_row_actions
+
+# Seconds between checks for new attendance marks while the window is open
+ATTENDANCE_REFRESH_SECONDS = 60
+
+STATUS_COLORS = {'Good': '#27ae60', 'Average': '#f39c12', 'Warning': '#e74c3c'}
+
 class MplCanvas(FigureCanvasQTAgg):
     """Custom matplotlib canvas for embedding plots in PyQt6"""
     def __init__(self, parent=None, width=8, height=4, dpi=100):
@@ -332,7 +341,7 @@ class DisciplineDepartmentPage(QMainWindow):
         search_section = QHBoxLayout()
         
         search_box = QLineEdit()
-        search_box.setPlaceholderText("Search students...")
+        search_box.setPlaceholderText("Search classes...")
         search_box.setStyleSheet("""
             QLineEdit {
                 padding: 8px;
@@ -344,7 +353,7 @@ class DisciplineDepartmentPage(QMainWindow):
         """)
 
         grade_filter = QComboBox()
-        grade_filter.addItems(["All Grades", "Grade 8", "Grade 9", "Grade 10"])
+        grade_filter.addItem("All Grades")
         grade_filter.setStyleSheet("""
             QComboBox {
                 padding: 8px;
@@ -358,14 +367,15 @@ class DisciplineDepartmentPage(QMainWindow):
         search_section.addWidget(search_box)
         search_section.addWidget(grade_filter)
         search_section.addStretch()
+        search_section.addWidget(TaskStatusBar())
         layout.addLayout(search_section)
 
         # Table
         table = QTableWidget()
-        table.setColumnCount(7)
+        table.setColumnCount(6)
         table.setHorizontalHeaderLabels([
             "Grade", "Total Lectures", "Absent Lectures", 
-            "Attendance %", "Status", "Update", "View"
+            "Attendance %", "Status", "Actions"
         ])
         table.setStyleSheet("""
             QTableWidget {
@@ -385,61 +395,109 @@ class DisciplineDepartmentPage(QMainWindow):
             }
         """)
 
-        # Sample data
-        data = [
-            ["Grade 9A", "50", "5", "90%", "Good"],
-            ["Grade 8B", "50", "12", "76%", "Warning"],
-            ["Grade 10C", "50", "8", "84%", "Average"],
-        ]
-
-        table.setRowCount(len(data))
-        for row, row_data in enumerate(data):
-            for col, value in enumerate(row_data):
-                item = QTableWidgetItem(value)
-                item.setTextAlignment(Qt.AlignmentFlag.AlignCenter)
-                table.setItem(row, col, item)
-            
-            # Add buttons
-            update_btn = QPushButton("Update")
-            update_btn.setStyleSheet("""
-                QPushButton {
-                    background: #2196F3;
-                    color: white;
-                    border: none;
-                    padding: 5px 10px;
-                    border-radius: 3px;
-                }
-                QPushButton:hover {
-                    background: #1976D2;
-                }
-            """)
-            
-            view_btn = QPushButton("View")
-            view_btn.setStyleSheet("""
-                QPushButton {
-                    background: #4CAF50;
-                    color: white;
-                    border: none;
-                    padding: 5px 10px;
-                    border-radius: 3px;
-                }
-                QPushButton:hover {
-                    background: #388E3C;
-                }
-            """)
-            view_btn.clicked.connect(lambda checked, r=row: self.show_attendance_details(r))
-
-            table.setCellWidget(row, 5, update_btn)
-            table.setCellWidget(row, 6, view_btn)
+        self.attendance_table = table
+        self.attendance_search = search_box
+        self.attendance_grade_filter = grade_filter
+        self.attendance_sections = []
+        self.analytics_version = None
+        self.analytics_refreshing = False
+        self.analytics_error_shown = False
+        search_box.textChanged.connect(self.filter_attendance_rows)
+        grade_filter.currentTextChanged.connect(self.filter_attendance_rows)
 
         table.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeMode.Stretch)
+        set_row_actions(table, 5, {
+            "Update": lambda row: self.open_roll_call(self.attendance_sections[row]),
+            "View": lambda row: self.show_attendance_details(self.attendance_sections[row]),
+        })
         layout.addWidget(table)
 
         tab.setLayout(layout)
+
+        # Figures come from the incremental analytics cache; poll it for new marks
+        self.load_attendance_analytics()
+        timer = QTimer(self)
+        timer.timeout.connect(self.load_attendance_analytics)
+        timer.start(ATTENDANCE_REFRESH_SECONDS * 1000)
         return tab
 
-    def show_attendance_details(self, row):
-        """Show detailed attendance information in a dialog"""
+    def load_attendance_analytics(self):
+        """Fold new attendance marks into the analytics cache on a background thread"""
+        if self.analytics_refreshing:
+            return
+        self.analytics_refreshing = True
+        run_in_background(
+            attendance_analytics.refresh,
+            on_result=self.show_attendance_analytics,
+            on_error=self.attendance_analytics_failed,
+            message="Updating attendance..."
+        )
+
+    def attendance_analytics_failed(self, error):
+        self.analytics_refreshing = False
+        # The refresh is polled; report a failure once, not on every poll
+        if not self.analytics_error_shown:
+            self.analytics_error_shown = True
+            QMessageBox.warning(self, "Error", f"Failed to update attendance figures: {error}")
+
+    def show_attendance_analytics(self, changed):
+        """Fill the sections table; skipped when nothing changed since the last fill"""
+        self.analytics_refreshing = False
+        self.analytics_error_shown = False
+        if attendance_analytics.version == self.analytics_version:
+            return
+        self.analytics_version = attendance_analytics.version
+
+        sections = attendance_analytics.sections()
+        self.attendance_sections = sorted(sections, key=lambda key: (str(key[0]), str(key[1] or '')))
+
+        grades = sorted({str(class_name) for class_name, section in self.attendance_sections})
+        current_grade = self.attendance_grade_filter.currentText()
+        self.attendance_grade_filter.blockSignals(True)
+        self.attendance_grade_filter.clear()
+        self.attendance_grade_filter.addItems(["All Grades"] + grades)
+        self.attendance_grade_filter.setCurrentText(current_grade)
+        self.attendance_grade_filter.blockSignals(False)
+
+        table = self.attendance_table
+        table.setRowCount(len(self.attendance_sections))
+        for row, key in enumerate(self.attendance_sections):
+            totals = sections[key]
+            class_name, section = key
+            row_data = [
+                f"{class_name} {section}" if section else str(class_name),
+                str(totals['days_held']),
+                str(totals['absent_days']),
+                f"{totals['percentage']:.0f}%",
+                totals['status']
+            ]
+            for col, value in enumerate(row_data):
+                item = QTableWidgetItem(value)
+                item.setTextAlignment(Qt.AlignmentFlag.AlignCenter)
+                table.setItem(row, col, item)
+            table.item(row, 4).setForeground(QColor(STATUS_COLORS[totals['status']]))
+        self.filter_attendance_rows()
+
+    def filter_attendance_rows(self):
+        text = self.attendance_search.text().strip().lower()
+        grade = self.attendance_grade_filter.currentText()
+        for row, (class_name, section) in enumerate(self.attendance_sections):
+            label = self.attendance_table.item(row, 0).text().lower()
+            hidden = (text and text not in label) or (grade != "All Grades" and str(class_name) != grade)
+            self.attendance_table.setRowHidden(row, bool(hidden))
+
+    def open_roll_call(self, key):
+        """Mark attendance for a section; the next poll picks the marks up"""
+        from screens.roll_call import RollCallScreen
+        self.roll_call = RollCallScreen(initial_section=key)
+        self.roll_call.show()
+
+    def show_attendance_details(self, key):
+        """Show attendance figures, status breakdown and at-risk students of a section"""
+        class_name, section = key
+        totals = attendance_analytics.sections().get(key)
+        if totals is None:
+            return
         dialog = QDialog(self)
         dialog.setWindowTitle("Student Attendance Details")
         dialog.setMinimumWidth(800)
@@ -474,10 +532,12 @@ class DisciplineDepartmentPage(QMainWindow):
         info_layout = QFormLayout()
         info_layout.setSpacing(10)
         
-        info_layout.addRow("Grade:", QLabel(f"Grade {9+row}A"))
-        info_layout.addRow("Total Lectures:", QLabel("50"))
-        info_layout.addRow("Absent Lectures:", QLabel("5"))
-        info_layout.addRow("Attendance Percentage:", QLabel("90%"))
+        info_layout.addRow("Grade:", QLabel(f"{class_name} {section}" if section else str(class_name)))
+        info_layout.addRow("Students:", QLabel(str(totals['students'])))
+        info_layout.addRow("Total Lectures:", QLabel(str(totals['days_held'])))
+        info_layout.addRow("Absent Lectures:", QLabel(str(totals['absent_days'])))
+        info_layout.addRow("Attendance Percentage:", QLabel(f"{totals['percentage']:.1f}%"))
+        info_layout.addRow("Students on Warning:", QLabel(str(totals['warnings'])))
         
         info_group.setLayout(info_layout)
         layout.addWidget(info_group)
@@ -489,18 +549,37 @@ class DisciplineDepartmentPage(QMainWindow):
         
         canvas = MplCanvas(self, width=8, height=4, dpi=100)
         
-        # Sample data for pie chart
-        labels = ['Class Lectures', 'Guest Lectures', 'Events', 'Present']
-        sizes = [2, 1, 2, 45]
-        colors = ['#ff9f43', '#ee5253', '#0abde3', '#2ed573']
+        # Marks of the section by status
+        counts = attendance_analytics.status_counts(class_name, section)
+        labels = list(counts)
+        sizes = [counts[label] for label in labels]
+        colors = ['#2ed573', '#ee5253', '#ff9f43', '#0abde3', '#a4b0be']
         
-        canvas.axes.pie(sizes, labels=labels, colors=colors, autopct='%1.1f%%', startangle=90)
+        if sizes:
+            canvas.axes.pie(sizes, labels=labels, colors=colors[:len(sizes)], autopct='%1.1f%%', startangle=90)
         canvas.axes.axis('equal')
         
         graph_layout.addWidget(canvas)
         graph_group.setLayout(graph_layout)
         layout.addWidget(graph_group)
 
+        # Students below the thresholds or on an absence streak
+        warning_group = QGroupBox("Students on Warning")
+        warning_layout = QVBoxLayout()
+        at_risk = attendance_analytics.students(class_name, section, status='Warning')
+        warning_table = QTableWidget(len(at_risk), 4)
+        warning_table.setHorizontalHeaderLabels(["Roll No", "Name", "Attendance %", "Absent in a Row"])
+        warning_table.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeMode.Stretch)
+        warning_table.setEditTriggers(QTableWidget.EditTrigger.NoEditTriggers)
+        for i, student in enumerate(at_risk):
+            absent_run = -student['current_streak'] if student['current_streak'] < 0 else 0
+            for col, value in enumerate([student['roll_no'], student['name'],
+                                         f"{student['percentage']:.1f}%", absent_run]):
+                warning_table.setItem(i, col, QTableWidgetItem(str(value)))
+        warning_layout.addWidget(warning_table)
+        warning_group.setLayout(warning_layout)
+        layout.addWidget(warning_group)
+
         # Buttons
         button_layout = QHBoxLayout()
         button_layout.setSpacing(10)
@@ -1,19 +1,33 @@
 import sys
 from PyQt6.QtWidgets import (QApplication, QMainWindow, QVBoxLayout, QHBoxLayout, 
                            QLabel, QPushButton, QTableWidget, QTableWidgetItem, 
-                           QWidget, QLineEdit, QComboBox, QHeaderView, QStackedWidget,
+                           QWidget, QLineEdit, QComboBox, QHeaderView,
                            QDialog, QFormLayout, QSpinBox, QMessageBox, QDateEdit,
                            QFileDialog)
 from PyQt6.QtGui import QIcon, QPixmap, QFont
 from PyQt6.QtCore import Qt, QEasingCurve, QPropertyAnimation, QRect, QDate, QDateTime
 from datetime import datetime
-import sqlite3
 import os
-from reportlab.lib import colors
-from reportlab.lib.pagesizes import letter
-from reportlab.platypus import SimpleDocTemplate, Table, TableStyle, Paragraph, Spacer
-from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
-from reportlab.lib.units import inch
+
+from database.db_config import db_config
+from reports import pdf_builder
+from screens.lazy_pages import LazyPageStack
+from screens.table_models import RowTableModel, create_table_view
+from screens.row_actions import set_row_actions
+from screens.search_index import SearchIndex, debounce_text_changed
+from screens.background_tasks import run_in_background, TaskStatusBar, build_pdf_in_background
+from screens.exports import export_dataset_in_background
+
+# Textbooks of this department in the shared textbooks table
+DEPARTMENT = 'English'
+
+def fetch_books():
+    """Read the department's textbooks; runs on a background thread"""
+    cursor = db_config.get_connection().cursor()
+    cursor.execute('SELECT title, publisher, quantity, condition, last_inventory, cost_per_book, grade FROM textbooks WHERE department = ?', (DEPARTMENT,))
+    books = cursor.fetchall()
+    cursor.close()
+    return books
 
 class AddBookDialog(QDialog):
     def __init__(self, parent=None):
@@ -80,6 +94,8 @@ class MainWindow(QMainWindow):
         super().__init__()
         self.setWindowTitle("School Management System")
         self.setGeometry(100, 100, 1200, 800)
+        # Load reportlab while the user looks around, not on the first PDF
+        pdf_builder.warm_up()
 
         # Initialize speaking_data with more classes, sorted by grade
         self.speaking_data = [
@@ -127,10 +143,13 @@ class MainWindow(QMainWindow):
         # Create database and load data
         self.create_database()
         self.books_data = []
+        # Search by title, publisher or condition
+        self.books_index = SearchIndex(search_columns=[0, 1, 3])
         
         # Main Widget and Layout
         self.central_widget = QWidget()
         self.setCentralWidget(self.central_widget)
+        self.statusBar().addPermanentWidget(TaskStatusBar())
         self.main_layout = QVBoxLayout(self.central_widget)
         self.main_layout.setSpacing(0)  # Reduce overall spacing
         self.main_layout.setContentsMargins(20, 20, 20, 20)
@@ -156,25 +175,21 @@ class MainWindow(QMainWindow):
         self.update_tab_styles("Textbooks")
         self.main_layout.addLayout(self.tab_layout)
         
-        # Content Area
-        self.stack = QStackedWidget()
+        # Content Area; each page is built on first activation
+        self.stack = LazyPageStack()
         self.main_layout.addWidget(self.stack)
         
         # Load initial data
         self.load_books_data()
         
         # Create pages
-        self.textbooks_page = self.create_textbooks_page()
-        self.speaking_page = self.create_speaking_page()
-        self.lesson_plans_page = self.create_lesson_plans_page()
-        self.stack.addWidget(self.textbooks_page)
-        self.stack.addWidget(self.speaking_page)
-        self.stack.addWidget(self.lesson_plans_page)
+        self.stack.add_page(self.create_textbooks_page)
+        self.stack.add_page(self.create_speaking_page)
+        self.stack.add_page(self.create_lesson_plans_page)
         
         # Add placeholder pages for other tabs
         for _ in range(len(self.tabs) - 3):
-            placeholder = QWidget()
-            self.stack.addWidget(placeholder)
+            self.stack.add_page(QWidget)
 
     def create_textbooks_page(self):
         page = QWidget()
@@ -194,19 +209,8 @@ class MainWindow(QMainWindow):
         stats_layout = QHBoxLayout()
         stats_layout.setSpacing(15)
         
-        total_books = sum(book[2] for book in self.books_data)
-        available_books = sum(book[2] for book in self.books_data if book[3] == "Good")
-        need_books = sum(book[2] for book in self.books_data if book[3] == "Need of Textbook")
-        need_replacement = sum(book[2] for book in self.books_data if book[3] == "Need Replacement")
-        
-        stats = [
-            ("Total Textbooks", str(total_books)),
-            ("Available Textbooks", str(available_books)),
-            ("Need of Textbooks", str(need_books)),
-            ("Need Replacement", str(need_replacement))
-        ]
-        
-        for title, value in stats:
+        self.book_stat_labels = {}
+        for title, value in self.book_stats():
             # Create outer container with border
             container = QWidget()
             container.setStyleSheet("""
@@ -242,6 +246,7 @@ class MainWindow(QMainWindow):
                 }
             """)
             value_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
+            self.book_stat_labels[title] = value_label
             
             # Title label without border
             title_label = QLabel(title)
@@ -274,9 +279,9 @@ class MainWindow(QMainWindow):
         # Left side: Search and Grade selector
         left_controls = QHBoxLayout()
         
-        search = QLineEdit()
-        search.setPlaceholderText("Search textbooks...")
-        search.setStyleSheet("""
+        self.textbook_search = QLineEdit()
+        self.textbook_search.setPlaceholderText("Search textbooks...")
+        self.textbook_search.setStyleSheet("""
             QLineEdit {
                 padding: 8px;
                 border: 1px solid #ddd;
@@ -284,8 +289,8 @@ class MainWindow(QMainWindow):
                 font-size: 14px;
             }
         """)
-        search.textChanged.connect(self.search_textbooks)
-        left_controls.addWidget(search)
+        debounce_text_changed(self.textbook_search, self.search_textbooks)
+        left_controls.addWidget(self.textbook_search)
         
         self.grade_combo = QComboBox()
         self.grade_combo.addItems(["All Grades", "Nursery", "LKG", "UKG"] + [f"Grade {i}" for i in range(1, 11)])
@@ -347,12 +352,31 @@ class MainWindow(QMainWindow):
         order_btn.clicked.connect(self.order_supplies)
         controls.addWidget(order_btn)
         
+        export_btn = QPushButton("Export")
+        export_btn.setStyleSheet("""
+            QPushButton {
+                background-color: #6c757d;
+                color: white;
+                border: none;
+                border-radius: 4px;
+                padding: 8px 15px;
+                font-size: 14px;
+            }
+        """)
+        export_btn.clicked.connect(
+            lambda: export_dataset_in_background(self, 'textbooks', "english_textbooks.xlsx", department=DEPARTMENT)
+        )
+        controls.addWidget(export_btn)
+        
         layout.addLayout(controls)
         
         # Table
-        self.table = QTableWidget()
+        headers = ["Title", "Publisher", "Quantity", "Condition", "Last Inventory", "Actions"]
+        self.books_model = RowTableModel(headers)
+        self.books_model.foreground[3] = {"Good": Qt.GlobalColor.green}
+        self.table, self.books_proxy = create_table_view(self.books_model)
         self.table.setStyleSheet("""
-            QTableWidget {
+            QTableView {
                 border: 1px solid #ddd;
                 border-radius: 4px;
             }
@@ -363,11 +387,7 @@ class MainWindow(QMainWindow):
                 font-weight: bold;
             }
         """)
-        
-        headers = ["Title", "Publisher", "Quantity", "Condition", "Last Inventory", "Actions"]
-        self.table.setColumnCount(len(headers))
-        self.table.setHorizontalHeaderLabels(headers)
-        self.table.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeMode.Stretch)
+        set_row_actions(self.table, 5, {"Update": self.update_book})
         
         self.populate_table(self.books_data)
         layout.addWidget(self.table)
@@ -667,42 +687,40 @@ class MainWindow(QMainWindow):
                     }
                 """)
 
+    def book_stats(self):
+        total_books = sum(book[2] for book in self.books_data)
+        available_books = sum(book[2] for book in self.books_data if book[3] == "Good")
+        need_books = sum(book[2] for book in self.books_data if book[3] == "Need of Textbook")
+        need_replacement = sum(book[2] for book in self.books_data if book[3] == "Need Replacement")
+        
+        return [
+            ("Total Textbooks", str(total_books)),
+            ("Available Textbooks", str(available_books)),
+            ("Need of Textbooks", str(need_books)),
+            ("Need Replacement", str(need_replacement))
+        ]
+
     def populate_table(self, data):
-        self.table.setRowCount(len(data))
-        for row, book in enumerate(data):
-            for col, value in enumerate(book):
-                item = QTableWidgetItem(str(value))
-                if col == 3 and value == "Good":
-                    item.setForeground(Qt.GlobalColor.green)
-                self.table.setItem(row, col, item)
-            
-            update_btn = QPushButton("Update")
-            update_btn.setStyleSheet("""
-                QPushButton {
-                    background-color: #0d6efd;
-                    color: white;
-                    border: none;
-                    padding: 5px 15px;
-                    border-radius: 4px;
-                }
-            """)
-            update_btn.clicked.connect(lambda checked, r=row: self.update_book(r))
-            self.table.setCellWidget(row, 5, update_btn)
+        self.books_model.set_rows(data)
+        # Keep the current search applied to the new rows
+        self.search_textbooks(self.textbook_search.text())
+        for title, value in self.book_stats():
+            self.book_stat_labels[title].setText(value)
 
     def filter_by_grade(self, grade):
         if grade == "All Grades":
-            self.populate_table(self.books_data)
+            self.books_proxy.set_column_filter(0, None)
         else:
-            filtered = [book for book in self.books_data if grade in book[0]]
-            self.populate_table(filtered)
+            self.books_proxy.set_column_filter(0, lambda title: grade in title)
 
     def add_book(self):
         dialog = AddBookDialog(self)
         if dialog.exec() == QDialog.DialogCode.Accepted:
-            conn = sqlite3.connect('textbooks.db')
+            conn = db_config.get_connection()
             cursor = conn.cursor()
             
             new_book = (
+                DEPARTMENT,
                 f"{dialog.grade.currentText()} {dialog.title.text()}",
                 dialog.publisher.text(),
                 dialog.quantity.value(),
@@ -713,19 +731,19 @@ class MainWindow(QMainWindow):
             )
             
             cursor.execute('''
-                INSERT INTO textbooks (title, publisher, quantity, condition, last_inventory, cost_per_book, grade)
-                VALUES (?, ?, ?, ?, ?, ?, ?)
+                INSERT INTO textbooks (department, title, publisher, quantity, condition, last_inventory, cost_per_book, grade)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?)
             ''', new_book)
             
             conn.commit()
-            conn.close()
+            cursor.close()
             
             self.load_books_data()
-            self.populate_table(self.books_data)
             QMessageBox.information(self, "Success", "Book added successfully!")
 
     def delete_book(self):
-        row = self.table.currentRow()
+        index = self.table.currentIndex()
+        row = self.books_proxy.mapToSource(index).row() if index.isValid() else -1
         if row >= 0:
             reply = QMessageBox.question(self, "Confirm Delete", 
                                        "Are you sure you want to delete this book?",
@@ -734,6 +752,7 @@ class MainWindow(QMainWindow):
             
             if reply == QMessageBox.StandardButton.Yes:
                 self.books_data.pop(row)
+                self.books_index.remove(row)
                 self.populate_table(self.books_data)
                 QMessageBox.information(self, "Success", "Book deleted successfully!")
         else:
@@ -1014,25 +1033,11 @@ class MainWindow(QMainWindow):
         
         if file_name:
             try:
-                from reportlab.lib import colors
-                from reportlab.lib.pagesizes import letter
-                from reportlab.platypus import SimpleDocTemplate, Table, TableStyle, Paragraph, Spacer
-                from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
-                
-                doc = SimpleDocTemplate(file_name, pagesize=letter)
-                elements = []
-                styles = getSampleStyleSheet()
-                
-                # Title
-                title_style = ParagraphStyle(
-                    'CustomTitle',
-                    parent=styles['Heading1'],
-                    fontSize=24,
-                    spaceAfter=30
+                doc = pdf_builder.document(file_name)
+                elements = pdf_builder.title_block(
+                    f"Speaking Skills Schedule - {grade}",
+                    f"Generated on {QDate.currentDate().toString('MMMM d, yyyy')}"
                 )
-                elements.append(Paragraph(f"Speaking Skills Schedule - {grade}", title_style))
-                elements.append(Paragraph(f"Generated on {QDate.currentDate().toString('MMMM d, yyyy')}", styles["Normal"]))
-                elements.append(Spacer(1, 20))
                 
                 # Sort classes by date and time
                 sorted_classes = sorted(classes, key=lambda x: (x[2], x[1]))
@@ -1050,28 +1055,8 @@ class MainWindow(QMainWindow):
                         c[6]   # Venue
                     ])
                 
-                # Create table
-                table = Table(data)
-                table.setStyle(TableStyle([
-                    ('BACKGROUND', (0, 0), (-1, 0), colors.grey),
-                    ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
-                    ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
-                    ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-                    ('FONTSIZE', (0, 0), (-1, 0), 14),
-                    ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
-                    ('BACKGROUND', (0, 1), (-1, -1), colors.beige),
-                    ('TEXTCOLOR', (0, 1), (-1, -1), colors.black),
-                    ('FONTNAME', (0, 1), (-1, -1), 'Helvetica'),
-                    ('FONTSIZE', (0, 1), (-1, -1), 12),
-                    ('GRID', (0, 0), (-1, -1), 1, colors.black),
-                    ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
-                    ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
-                ]))
-                
-                elements.append(table)
-                doc.build(elements)
-                
-                QMessageBox.information(self, "Success", "PDF generated successfully!")
+                elements += pdf_builder.table(data)
+                build_pdf_in_background(self, doc, elements, "PDF generated successfully!")
             except Exception as e:
                 QMessageBox.warning(self, "Error", f"Failed to generate PDF: {str(e)}")
 
@@ -1087,30 +1072,14 @@ class MainWindow(QMainWindow):
         self.populate_speaking_table(filtered_data)
 
     def create_database(self):
-        conn = sqlite3.connect('textbooks.db')
-        cursor = conn.cursor()
-        cursor.execute('''
-            CREATE TABLE IF NOT EXISTS textbooks (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                title TEXT NOT NULL,
-                publisher TEXT NOT NULL,
-                quantity INTEGER NOT NULL,
-                condition TEXT NOT NULL,
-                last_inventory TEXT NOT NULL,
-                cost_per_book INTEGER NOT NULL,
-                grade TEXT NOT NULL
-            )
-        ''')
-        conn.commit()
-        conn.close()
+        # The textbooks table is part of the consolidated schema
+        db_config.ensure_schema()
 
     def load_books_data(self):
-        conn = sqlite3.connect('textbooks.db')
-        cursor = conn.cursor()
-        cursor.execute('SELECT title, publisher, quantity, condition, last_inventory, cost_per_book, grade FROM textbooks')
-        books = cursor.fetchall()
-        conn.close()
-        
+        """Fetch the department's textbooks on a background thread"""
+        run_in_background(fetch_books, on_result=self.set_books_data, message="Loading textbooks...")
+
+    def set_books_data(self, books):
         if not books:  # If no data exists, insert sample data
             self.insert_sample_data()
             return self.load_books_data()
@@ -1125,10 +1094,12 @@ class MainWindow(QMainWindow):
                 book[4],  # last_inventory
                 book[5],  # cost_per_book
             ))
-        return self.books_data
+        self.books_index.rebuild(self.books_data)
+        if self.stack.is_loaded(0):
+            self.populate_table(self.books_data)
 
     def insert_sample_data(self):
-        conn = sqlite3.connect('textbooks.db')
+        conn = db_config.get_connection()
         cursor = conn.cursor()
         
         sample_data = [
@@ -1139,12 +1110,12 @@ class MainWindow(QMainWindow):
         ]
         
         cursor.executemany('''
-            INSERT INTO textbooks (title, publisher, quantity, condition, last_inventory, cost_per_book, grade)
-            VALUES (?, ?, ?, ?, ?, ?, ?)
-        ''', sample_data)
+            INSERT INTO textbooks (department, title, publisher, quantity, condition, last_inventory, cost_per_book, grade)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+        ''', [(DEPARTMENT,) + book for book in sample_data])
         
         conn.commit()
-        conn.close()
+        cursor.close()
 
     def generate_order_pdf(self, order_data, total_cost):
         # Ask user where to save the PDF
@@ -1157,37 +1128,11 @@ class MainWindow(QMainWindow):
                 file_name += '.pdf'
             
             # Create the PDF document
-            doc = SimpleDocTemplate(
-                file_name,
-                pagesize=letter,
-                rightMargin=72,
-                leftMargin=72,
-                topMargin=72,
-                bottomMargin=72
-            )
-            
-            # Container for the 'Flowable' objects
-            elements = []
-            
-            # Define styles
-            styles = getSampleStyleSheet()
-            title_style = ParagraphStyle(
-                'CustomTitle',
-                parent=styles['Heading1'],
-                fontSize=24,
-                spaceAfter=30
+            doc = pdf_builder.document(file_name)
+            elements = pdf_builder.title_block(
+                "Textbook Order Summary", f"Date: {datetime.now().strftime('%Y-%m-%d')}"
             )
             
-            # Add the title
-            elements.append(Paragraph("Textbook Order Summary", title_style))
-            elements.append(Spacer(1, 12))
-            
-            # Add date
-            date_style = styles["Normal"]
-            date_style.fontSize = 12
-            elements.append(Paragraph(f"Date: {datetime.now().strftime('%Y-%m-%d')}", date_style))
-            elements.append(Spacer(1, 12))
-            
             # Prepare the table data
             table_data = [["Title", "Quantity", "Cost per Book (₹)", "Total Cost (₹)"]]
             for item in order_data:
@@ -1198,43 +1143,17 @@ class MainWindow(QMainWindow):
                     str(item['cost_per_book'] * item['quantity'])
                 ])
             
-            # Create the table
-            table = Table(table_data, colWidths=[4*inch, 1*inch, 1.5*inch, 1.5*inch])
-            
-            # Add style to the table
-            table.setStyle(TableStyle([
-                ('BACKGROUND', (0, 0), (-1, 0), colors.grey),
-                ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
-                ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
-                ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-                ('FONTSIZE', (0, 0), (-1, 0), 14),
-                ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
-                ('BACKGROUND', (0, 1), (-1, -1), colors.beige),
-                ('TEXTCOLOR', (0, 1), (-1, -1), colors.black),
-                ('FONTNAME', (0, 1), (-1, -1), 'Helvetica'),
-                ('FONTSIZE', (0, 1), (-1, -1), 12),
-                ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
-                ('GRID', (0, 0), (-1, -1), 1, colors.black)
-            ]))
-            
-            elements.append(table)
-            elements.append(Spacer(1, 20))
-            
-            # Add total cost
-            total_paragraph = Paragraph(
-                f"<para fontSize=14><b>Total Order Cost: ₹{total_cost:,}</b></para>",
-                styles["Normal"]
+            elements += pdf_builder.table(
+                table_data, col_widths=[4 * pdf_builder.INCH, 1 * pdf_builder.INCH,
+                                        1.5 * pdf_builder.INCH, 1.5 * pdf_builder.INCH]
             )
-            elements.append(total_paragraph)
+            elements.append(pdf_builder.spacer(20))
             
-            # Build the PDF
-            doc.build(elements)
+            # Add total cost
+            elements.append(pdf_builder.paragraph(f"Total Order Cost: ₹{total_cost:,}", 'total'))
             
-            QMessageBox.information(
-                self,
-                "Success",
-                f"PDF has been generated and saved to:\n{file_name}"
-            )
+            # Build the PDF off the GUI thread
+            build_pdf_in_background(self, doc, elements, f"PDF has been generated and saved to:\n{file_name}")
 
     def update_speaking_class(self, row):
         dialog = QDialog(self)
@@ -1359,14 +1278,7 @@ class MainWindow(QMainWindow):
                 QMessageBox.warning(self, "Error", "Please fill in all fields")
 
     def search_textbooks(self, text):
-        text = text.lower()
-        filtered_data = [
-            book for book in self.books_data 
-            if text in book[0].lower() or  # Title
-               text in book[1].lower() or  # Publisher
-               text in book[3].lower()     # Condition
-        ]
-        self.populate_table(filtered_data)
+        self.books_proxy.set_matched_rows(self.books_index.search(text))
 
     def add_speaking_class(self):
         dialog = QDialog(self)
@@ -1583,7 +1495,7 @@ class MainWindow(QMainWindow):
         ]
         
         for title, value in stats:
-        container = QWidget()
+            container = QWidget()
             container.setStyleSheet("""
                 QWidget {
                     background-color: #f8f9fa;
@@ -2116,7 +2028,7 @@ class MainWindow(QMainWindow):
         self.populate_lesson_table(filtered_data)
 
 if __name__ == "__main__":
-app = QApplication(sys.argv)
-window = MainWindow()
-window.show()
-sys.exit(app.exec())
+    app = QApplication(sys.argv)
+    window = MainWindow()
+    window.show()
+    sys.exit(app.exec())
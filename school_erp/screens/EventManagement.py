@@ -14,12 +14,13 @@ from PyQt6.QtGui import (
 )
 import sys
 from datetime import datetime
-from reportlab.pdfgen import canvas
-from reportlab.lib.pagesizes import letter
-from reportlab.lib import colors
-from reportlab.platypus import Table, TableStyle, SimpleDocTemplate
 import os
 
+from reports import pdf_builder
+from screens.row_actions import set_row_actions
+from screens.search_index import SearchIndex, debounce_text_changed, hide_unmatched_rows
+from screens.background_tasks import TaskStatusBar, build_pdf_in_background
+
 class AddEventDialog(QDialog):
     def __init__(self, parent=None):
         super().__init__(parent)
@@ -462,6 +463,8 @@ class EventListWidget(QWidget):
 class EventManagementPage(QWidget):
     def __init__(self):
         super().__init__()
+        # Load reportlab while the user looks around, not on the first PDF
+        pdf_builder.warm_up()
         self.events = {
             "2024-03-01": {"name": "School Assembly", "time": "08:00", "location": "Main Hall"},
             "2024-03-10": {"name": "Parent Meeting", "time": "14:00", "location": "Conference Room"},
@@ -563,6 +566,7 @@ class EventManagementPage(QWidget):
         self.stacked_widget.addWidget(self.event_records_page)
 
         layout.addWidget(self.stacked_widget)
+        layout.addWidget(TaskStatusBar())
         self.setLayout(layout)
 
     def switch_tab(self, index):
@@ -914,7 +918,7 @@ class EventManagementPage(QWidget):
                 min-width: 400px;
             }
         """)
-        search_box.textChanged.connect(self.filter_volunteers)
+        debounce_text_changed(search_box, self.filter_volunteers)
 
         # Add Volunteer button
         add_volunteer_btn = QPushButton("Add Volunteer")
@@ -1016,6 +1020,7 @@ class EventManagementPage(QWidget):
             ["Tom Brown", "8th", "Cultural Festival", "2024-03-25", "2:00 PM - 6:00 PM", "tom@email.com", "Stage Management"],
             ["Sarah Lee", "9th", "Sports Day", "2024-03-15", "8:00 AM - 12:00 PM", "sarah@email.com", "Equipment Setup"]
         ]
+        self.volunteer_index = SearchIndex(rows=volunteer_data)
 
         self.table.setRowCount(len(volunteer_data))
         for row, data in enumerate(volunteer_data):
@@ -1081,14 +1086,7 @@ class EventManagementPage(QWidget):
 
     def filter_volunteers(self, text):
         try:
-            for row in range(self.table.rowCount()):
-                match = False
-                for col in range(self.table.columnCount()):
-                    item = self.table.item(row, col)
-                    if item and text.lower() in item.text().lower():
-                        match = True
-                        break
-                self.table.setRowHidden(row, not match)
+            hide_unmatched_rows(self.table, self.volunteer_index.search(text))
         except Exception as e:
             QMessageBox.critical(self, "Error", f"An error occurred: {str(e)}")
 
@@ -1096,36 +1094,8 @@ class EventManagementPage(QWidget):
         try:
             file_path, _ = QFileDialog.getSaveFileName(self, "Save PDF", "", "PDF Files (*.pdf)")
             if file_path:
-                from reportlab.lib.pagesizes import letter, landscape
-                from reportlab.lib import colors
-                from reportlab.platypus import SimpleDocTemplate, Table, TableStyle, Paragraph, Spacer
-                from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
-                from reportlab.lib.units import inch
-
-                # Create the PDF document
-                doc = SimpleDocTemplate(
-                    file_path,
-                    pagesize=landscape(letter),
-                    rightMargin=30,
-                    leftMargin=30,
-                    topMargin=30,
-                    bottomMargin=30
-                )
-                
-                elements = []
-                styles = getSampleStyleSheet()
-                
-                # Add title
-                title_style = ParagraphStyle(
-                    'CustomTitle',
-                    parent=styles['Heading1'],
-                    fontSize=24,
-                    spaceAfter=30,
-                    alignment=1  # Center alignment
-                )
-                title = Paragraph("Volunteer List", title_style)
-                elements.append(title)
-                elements.append(Spacer(1, 20))
+                doc = pdf_builder.document(file_path, page='landscape')
+                elements = pdf_builder.title_block("Volunteer List", style='title_centered')
 
                 # Collect visible data from table
                 headers = ["Name", "Grade", "Event", "Date", "Time", "Contact", "Duty"]
@@ -1139,39 +1109,10 @@ class EventManagementPage(QWidget):
                             row_data.append(item.text() if item else "")
                         data.append(row_data)
 
-                # Create table with specific column widths
-                col_widths = [2*inch, 1.5*inch, 1.2*inch, 1.2*inch, 1.2*inch, 1.2*inch]
-                table = Table(data, colWidths=col_widths)
-                
-                # Add table style
-                table.setStyle(TableStyle([
-                    # Header style
-                    ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#2196F3')),
-                    ('TEXTCOLOR', (0, 0), (-1, 0), colors.white),
-                    ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
-                    ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-                    ('FONTSIZE', (0, 0), (-1, 0), 12),
-                    ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
-                    
-                    # Cell style
-                    ('BACKGROUND', (0, 1), (-1, -2), colors.white),
-                    ('TEXTCOLOR', (0, 1), (-1, -1), colors.black),
-                    ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
-                    ('FONTNAME', (0, 1), (-1, -1), 'Helvetica'),
-                    ('FONTSIZE', (0, 1), (-1, -1), 10),
-                    ('GRID', (0, 0), (-1, -2), 1, colors.black),
-                    ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
-                    ('PADDING', (0, 0), (-1, -1), 8),
-                    
-                    # Total row style
-                    ('BACKGROUND', (0, -1), (-1, -1), colors.HexColor('#f5f5f5')),
-                    ('FONTNAME', (0, -1), (-1, -1), 'Helvetica-Bold'),
-                    ('GRID', (0, -1), (-1, -1), 1, colors.black),
-                ]))
-
-                elements.append(table)
-                doc.build(elements)
-                QMessageBox.information(self, "Success", f"PDF saved at: {file_path}")
+                inch = pdf_builder.INCH
+                col_widths = [2*inch, 1.5*inch, 1.2*inch, 1.2*inch, 1.2*inch, 1.2*inch, 1.2*inch]
+                elements += pdf_builder.table(data, style='blue', col_widths=col_widths)
+                build_pdf_in_background(self, doc, elements, f"PDF saved at: {file_path}")
             else:
                 QMessageBox.warning(self, "PDF Generation", "No file path selected.")
         except Exception as e:
@@ -1446,6 +1387,7 @@ class EventManagementPage(QWidget):
         # Set a fixed width for the Actions column
         self.inventory_table.horizontalHeader().setSectionResizeMode(5, QHeaderView.ResizeMode.Fixed)
         self.inventory_table.setColumnWidth(5, 80)  # Set Actions column width to 80px
+        set_row_actions(self.inventory_table, 5, {"Update": self.update_inventory_item})
 
         # Sample Data
         inventory_data = [
@@ -1461,41 +1403,6 @@ class EventManagementPage(QWidget):
                 item = QTableWidgetItem(value)
                 item.setTextAlignment(Qt.AlignmentFlag.AlignCenter)
                 self.inventory_table.setItem(row, col, item)
-            
-            # Add update button
-            actions_widget = QWidget()
-            actions_layout = QHBoxLayout(actions_widget)
-            actions_layout.setContentsMargins(2, 2, 2, 2)
-            actions_layout.setSpacing(0)
-            
-            edit_btn = QPushButton("Update")
-            edit_btn.setStyleSheet("""
-                QPushButton {
-                    background: #2196F3;
-                    color: white;
-                    border: none;
-                    padding: 4px 8px;
-                    border-radius: 3px;
-                    font-weight: bold;
-                    min-width: 60px;
-                    max-width: 60px;
-                    font-size: 11px;
-                    height: 32px;
-                }
-                QPushButton:hover {
-                    background: #1976D2;
-                }
-                QPushButton:pressed {
-                    background: #1565C0;
-                }
-            """)
-            
-            # Store the row number in the button's property
-            edit_btn.setProperty("row", row)
-            edit_btn.clicked.connect(self.handle_update_click)
-            
-            actions_layout.addWidget(edit_btn, alignment=Qt.AlignmentFlag.AlignCenter)
-            self.inventory_table.setCellWidget(row, 5, actions_widget)
 
         table_layout.addWidget(self.inventory_table)
         table_container.setLayout(table_layout)
@@ -1763,33 +1670,6 @@ class EventManagementPage(QWidget):
             item = QTableWidgetItem(value)
             item.setTextAlignment(Qt.AlignmentFlag.AlignCenter)
             self.inventory_table.setItem(row, col, item)
-            
-        # Add action button
-        actions_widget = QWidget()
-        actions_layout = QHBoxLayout()
-        actions_layout.setContentsMargins(4, 4, 4, 4)
-        
-        edit_btn = QPushButton("Update")
-        edit_btn.setStyleSheet("""
-            QPushButton {
-                background: #2196F3;
-                color: white;
-                border: none;
-                padding: 4px 8px;
-                border-radius: 3px;
-                font-weight: bold;
-                min-width: 60px;
-                font-size: 11px;
-                height: 32px;
-            }
-            QPushButton:hover {
-                background: #1976D2;
-            }
-        """)
-        
-        actions_layout.addWidget(edit_btn)
-        actions_widget.setLayout(actions_layout)
-        self.inventory_table.setCellWidget(row, 5, actions_widget)
         
         dialog.accept()
         QMessageBox.information(self, "Success", "Inventory item added successfully")
@@ -1925,36 +1805,8 @@ class EventManagementPage(QWidget):
         try:
             file_path, _ = QFileDialog.getSaveFileName(dialog, "Save PDF", "", "PDF Files (*.pdf)")
             if file_path:
-                from reportlab.lib.pagesizes import letter, landscape
-                from reportlab.lib import colors
-                from reportlab.platypus import SimpleDocTemplate, Table, TableStyle, Paragraph, Spacer
-                from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
-                from reportlab.lib.units import inch
-
-                # Create the PDF document
-                doc = SimpleDocTemplate(
-                    file_path,
-                    pagesize=landscape(letter),
-                    rightMargin=30,
-                    leftMargin=30,
-                    topMargin=30,
-                    bottomMargin=30
-                )
-                
-                elements = []
-                styles = getSampleStyleSheet()
-                
-                # Add title
-                title_style = ParagraphStyle(
-                    'CustomTitle',
-                    parent=styles['Heading1'],
-                    fontSize=24,
-                    spaceAfter=30,
-                    alignment=1  # Center alignment
-                )
-                title = Paragraph("Supply Order List", title_style)
-                elements.append(title)
-                elements.append(Spacer(1, 20))
+                doc = pdf_builder.document(file_path, page='landscape')
+                elements = pdf_builder.title_block("Supply Order List", style='title_centered')
 
                 # Create table
                 headers = ["Item Name", "Category", "Current Stock", "Required", "Unit Cost (₹)", "Total Cost (₹)"]
@@ -1963,40 +1815,10 @@ class EventManagementPage(QWidget):
                 # Add total row
                 data.append(["Total", "", "", "", "", f"₹{total_cost:,}"])
 
-                # Create table with specific column widths
+                inch = pdf_builder.INCH
                 col_widths = [2*inch, 1.5*inch, 1.2*inch, 1.2*inch, 1.2*inch, 1.2*inch]
-                table = Table(data, colWidths=col_widths)
-                
-                # Add table style
-                table.setStyle(TableStyle([
-                    # Header style
-                    ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#2196F3')),
-                    ('TEXTCOLOR', (0, 0), (-1, 0), colors.white),
-                    ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
-                    ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-                    ('FONTSIZE', (0, 0), (-1, 0), 12),
-                    ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
-                    
-                    # Cell style
-                    ('BACKGROUND', (0, 1), (-1, -2), colors.white),
-                    ('TEXTCOLOR', (0, 1), (-1, -1), colors.black),
-                    ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
-                    ('FONTNAME', (0, 1), (-1, -1), 'Helvetica'),
-                    ('FONTSIZE', (0, 1), (-1, -1), 10),
-                    ('GRID', (0, 0), (-1, -2), 1, colors.black),
-                    ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
-                    ('PADDING', (0, 0), (-1, -1), 8),
-                    
-                    # Total row style
-                    ('BACKGROUND', (0, -1), (-1, -1), colors.HexColor('#f5f5f5')),
-                    ('FONTNAME', (0, -1), (-1, -1), 'Helvetica-Bold'),
-                    ('GRID', (0, -1), (-1, -1), 1, colors.black),
-                ]))
-
-                elements.append(table)
-                doc.build(elements)
-                QMessageBox.information(dialog, "Success", f"PDF saved at: {file_path}")
-                dialog.accept()
+                elements += pdf_builder.table(data, style='blue', col_widths=col_widths, total_rows=1)
+                build_pdf_in_background(dialog, doc, elements, f"PDF saved at: {file_path}", on_success=dialog.accept)
             else:
                 QMessageBox.warning(dialog, "PDF Generation", "No file path selected.")
         except Exception as e:
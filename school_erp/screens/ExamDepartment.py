@@ -2,19 +2,25 @@ import sys
 from PyQt6.QtWidgets import (QApplication, QMainWindow, QWidget, QVBoxLayout, 
                            QHBoxLayout, QLabel, QLineEdit, QPushButton, QMenuBar,
                            QMenu, QTableWidget, QTableWidgetItem, QHeaderView,
-                           QStackedWidget, QFileDialog, QMessageBox, QDialog,
+                           QFileDialog, QMessageBox, QDialog,
                            QFormLayout, QDateEdit, QTimeEdit, QComboBox, QSpinBox,
                            QFrame, QDoubleSpinBox, QTabWidget, QGroupBox, QGridLayout,
-                           QProgressBar, QScrollArea, QTextEdit)
+                           QProgressBar, QScrollArea, QTextEdit, QInputDialog)
 from PyQt6.QtCore import Qt, QDate, QTime
 from PyQt6.QtGui import QAction, QColor
-from reportlab.lib import colors
-from reportlab.lib.pagesizes import letter, landscape
-from reportlab.platypus import SimpleDocTemplate, Table, TableStyle, Paragraph, Spacer
-from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
 import os
 from datetime import datetime
 
+from database.grading import grade_for, publish_exam_results
+from reports import pdf_builder
+from reports.report_cards import generate_report_cards
+from screens.lazy_pages import LazyPageStack
+from screens.table_models import RowTableModel, create_table_view
+from screens.row_actions import set_row_actions
+from screens.search_index import SearchIndex, debounce_text_changed
+from screens.background_tasks import TaskStatusBar, build_pdf_in_background, run_in_background
+from screens.exports import export_view_in_background
+
 class AddExamDialog(QDialog):
     def __init__(self, parent=None):
         super().__init__(parent)
@@ -220,7 +226,7 @@ class PreviousPapersPage(QWidget):
                 min-width: 300px;
             }
         """)
-        self.search_box.textChanged.connect(self.search_papers)
+        debounce_text_changed(self.search_box, self.search_papers)
 
         upload_btn = QPushButton("Upload Paper")
         upload_btn.setStyleSheet("""
@@ -241,12 +247,11 @@ class PreviousPapersPage(QWidget):
         layout.addLayout(search_layout)
 
         # Papers table
-        self.papers_table = QTableWidget()
-        self.papers_table.setColumnCount(5)
-        self.papers_table.setHorizontalHeaderLabels([
+        self.papers_model = RowTableModel([
             "Paper Name", "Grade", "Uploaded By", "Date", "Actions"
         ])
-        self.papers_table.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeMode.Stretch)
+        self.papers_table, self.papers_proxy = create_table_view(self.papers_model)
+        set_row_actions(self.papers_table, 4, {"Download": self.download_paper})
 
         # Sample data
         self.sample_data = [
@@ -255,43 +260,17 @@ class PreviousPapersPage(QWidget):
             ["English Final 2022", "11th", "Ms. Williams", "2022-12-05"],
             ["History Midterm 2022", "8th", "Dr. Miller", "2022-10-12"]
         ]
+        self.search_index = SearchIndex(rows=self.sample_data)
         
         self.populate_table(self.sample_data)
         layout.addWidget(self.papers_table)
 
     def populate_table(self, data):
-        self.papers_table.setRowCount(len(data))
-        for row, row_data in enumerate(data):
-            for col, value in enumerate(row_data):
-                self.papers_table.setItem(row, col, QTableWidgetItem(str(value)))
-            
-            # Add Download button
-            download_btn = QPushButton("Download")
-            download_btn.setStyleSheet("""
-                QPushButton {
-                    background-color: #f0f2f5;
-                    border: none;
-                    padding: 5px 10px;
-                    border-radius: 3px;
-                }
-                QPushButton:hover {
-                    background-color: #e4e6e9;
-                }
-            """)
-            download_btn.clicked.connect(lambda checked, row=row: self.download_paper(row))
-            self.papers_table.setCellWidget(row, 4, download_btn)
+        self.papers_model.set_rows(data)
+        self.search_papers(self.search_box.text())
 
-    def search_papers(self):
-        search_text = self.search_box.text().lower()
-        if not search_text:
-            self.populate_table(self.sample_data)
-            return
-        
-        filtered_data = [
-            row for row in self.sample_data
-            if any(search_text in str(cell).lower() for cell in row)
-        ]
-        self.populate_table(filtered_data)
+    def search_papers(self, text):
+        self.papers_proxy.set_matched_rows(self.search_index.search(text))
 
     def upload_paper(self):
         file_name, _ = QFileDialog.getOpenFileName(
@@ -318,10 +297,11 @@ class PreviousPapersPage(QWidget):
                 datetime.now().strftime("%Y-%m-%d")
             ]
             self.sample_data.insert(0, new_paper)
+            self.search_index.insert(0, new_paper)
             self.populate_table(self.sample_data)
 
     def download_paper(self, row):
-        paper_name = self.papers_table.item(row, 0).text()
+        paper_name = self.papers_model.row_data(row)[0]
         QMessageBox.information(
             self,
             "Download",
@@ -359,7 +339,7 @@ class UpcomingExamsPage(QWidget):
                 min-width: 300px;
             }
         """)
-        self.search_box.textChanged.connect(self.search_exams)
+        debounce_text_changed(self.search_box, self.search_exams)
 
         add_exam_btn = QPushButton("Add Exam")
         add_exam_btn.setStyleSheet("""
@@ -375,18 +355,31 @@ class UpcomingExamsPage(QWidget):
         """)
         add_exam_btn.clicked.connect(self.add_exam)
 
+        export_btn = QPushButton("Export")
+        export_btn.setStyleSheet("""
+            QPushButton {
+                background-color: #6c757d;
+                color: white;
+                padding: 8px 16px;
+                border-radius: 5px;
+            }
+            QPushButton:hover {
+                background-color: #5a6268;
+            }
+        """)
+        export_btn.clicked.connect(lambda: export_view_in_background(self, self.exams_table, "upcoming_exams.xlsx"))
+
         search_layout.addWidget(self.search_box)
         search_layout.addWidget(add_exam_btn)
+        search_layout.addWidget(export_btn)
         layout.addLayout(search_layout)
 
         # Exams table
-        self.exams_table = QTableWidget()
-        self.exams_table.setColumnCount(8)
-        self.exams_table.setHorizontalHeaderLabels([
+        self.exams_model = RowTableModel([
             "Exam Name", "Grade", "Date", "Time", "Venue",
             "Room Capacity", "Total Students", "Supervisor Name"
         ])
-        self.exams_table.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeMode.Stretch)
+        self.exams_table, self.exams_proxy = create_table_view(self.exams_model)
 
         # Sample data
         self.sample_data = [
@@ -396,6 +389,7 @@ class UpcomingExamsPage(QWidget):
             ["History Quiz", "8th", "2023-10-22", "09:30", "Room 105", "35", "30", "Mr. Davis"],
             ["Computer Practical Test", "12th", "2023-10-25", "13:00", "Computer Lab", "30", "28", "Dr. Wilson"]
         ]
+        self.search_index = SearchIndex(rows=self.sample_data)
         
         self.populate_table(self.sample_data)
         layout.addWidget(self.exams_table)
@@ -424,66 +418,36 @@ class UpcomingExamsPage(QWidget):
         layout.addLayout(button_layout)
 
     def populate_table(self, data):
-        self.exams_table.setRowCount(len(data))
-        for row, row_data in enumerate(data):
-            for col, value in enumerate(row_data):
-                self.exams_table.setItem(row, col, QTableWidgetItem(str(value)))
+        self.exams_model.set_rows(data)
+        self.search_exams(self.search_box.text())
 
-    def search_exams(self):
-        search_text = self.search_box.text().lower()
-        if not search_text:
-            self.populate_table(self.sample_data)
-            return
-        
-        filtered_data = [
-            row for row in self.sample_data
-            if any(search_text in str(cell).lower() for cell in row)
-        ]
-        self.populate_table(filtered_data)
+    def search_exams(self, text):
+        self.exams_proxy.set_matched_rows(self.search_index.search(text))
 
     def add_exam(self):
         dialog = AddExamDialog(self)
         if dialog.exec() == QDialog.DialogCode.Accepted:
             new_exam = dialog.get_exam_data()
             self.sample_data.append(new_exam)
+            self.search_index.append(new_exam)
             self.populate_table(self.sample_data)
             QMessageBox.information(self, "Success", "Exam added successfully!")
 
     def generate_pdf(self):
         try:
-            doc = SimpleDocTemplate("exam_schedule.pdf", pagesize=landscape(letter))
-            elements = []
+            doc = pdf_builder.document("exam_schedule.pdf", page='landscape_wide')
 
             data = [["Exam Name", "Grade", "Date", "Time", "Venue", 
                     "Room Capacity", "Total Students", "Supervisor Name"]]
             
-            for row in range(self.exams_table.rowCount()):
-                row_data = []
-                for col in range(8):
-                    item = self.exams_table.item(row, col)
-                    row_data.append(item.text() if item else "")
-                data.append(row_data)
+            # The exams currently shown, in the table's order
+            for row in range(self.exams_proxy.rowCount()):
+                exam = self.exams_model.row_data(self.exams_proxy.source_row(row))
+                data.append([str(value) for value in exam])
 
             col_widths = [120, 50, 70, 50, 80, 70, 70, 100]
-            table = Table(data, colWidths=col_widths)
-            table.setStyle(TableStyle([
-                ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#1a73e8')),
-                ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
-                ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
-                ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-                ('FONTSIZE', (0, 0), (-1, 0), 12),
-                ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
-                ('BACKGROUND', (0, 1), (-1, -1), colors.white),
-                ('TEXTCOLOR', (0, 1), (-1, -1), colors.black),
-                ('FONTNAME', (0, 1), (-1, -1), 'Helvetica'),
-                ('FONTSIZE', (0, 1), (-1, -1), 10),
-                ('GRID', (0, 0), (-1, -1), 1, colors.black),
-                ('ROWHEIGHT', (0, 0), (-1, -1), 30)
-            ]))
-            
-            elements.append(table)
-            doc.build(elements)
-            QMessageBox.information(self, "Success", "PDF generated successfully!")
+            elements = pdf_builder.table(data, style='schedule', col_widths=col_widths)
+            build_pdf_in_background(self, doc, elements, "PDF generated successfully!")
             
         except Exception as e:
             QMessageBox.critical(self, "Error", f"Error generating PDF: {str(e)}")
@@ -915,8 +879,8 @@ class StudentDetailsDialog(QDialog):
         total_subjects = len(data["subjects"])
         percentage = (total_marks / (total_subjects * 100)) * 100 if total_subjects > 0 else 0
         
-        # Determine overall grade
-        grade = "A+" if percentage >= 90 else "A" if percentage >= 80 else "B+" if percentage >= 70 else "B" if percentage >= 60 else "C+" if percentage >= 50 else "C" if percentage >= 40 else "D" if percentage >= 33 else "F"
+        # Determine overall grade with the shared grade boundaries
+        grade = grade_for(percentage)
         
         data["total_marks"] = total_marks
         data["percentage"] = percentage
@@ -948,19 +912,8 @@ class StudentDetailsDialog(QDialog):
                 return
 
             # Create PDF document with larger size
-            doc = SimpleDocTemplate("student_report_card.pdf", pagesize=landscape(letter))
-            elements = []
-            
-            # Add title
-            styles = getSampleStyleSheet()
-            title_style = ParagraphStyle(
-                'CustomTitle',
-                parent=styles['Heading1'],
-                fontSize=28,
-                spaceAfter=30,
-                alignment=1  # Center alignment
-            )
-            elements.append(Paragraph("Student Report Card", title_style))
+            doc = pdf_builder.document("student_report_card.pdf", page='landscape_wide')
+            elements = pdf_builder.title_block("Student Report Card", style='report_title')
             
             # Add student information
             data = [
@@ -973,22 +926,11 @@ class StudentDetailsDialog(QDialog):
                 ["Last Exam Score:", f"{self.exam_score_edit.value()}%"],
                 ["Attendance:", f"{self.attendance_edit.value()}%"]
             ]
-            
-            # Create table for student info
-            t = Table(data, colWidths=[200, 400])
-            t.setStyle(TableStyle([
-                ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
-                ('FONTNAME', (0, 0), (0, -1), 'Helvetica-Bold'),
-                ('FONTNAME', (1, 0), (1, -1), 'Helvetica'),
-                ('FONTSIZE', (0, 0), (-1, -1), 14),
-                ('BOTTOMPADDING', (0, 0), (-1, -1), 12),
-                ('TOPPADDING', (0, 0), (-1, -1), 12),
-            ]))
-            elements.append(t)
-            elements.append(Spacer(1, 20))
+            elements += pdf_builder.table(data, style='details', col_widths=[200, 400], header=False)
+            elements.append(pdf_builder.spacer(20))
             
             # Add subject marks
-            elements.append(Paragraph("Subject Marks", styles['Heading2']))
+            elements.append(pdf_builder.paragraph("Subject Marks", 'heading'))
             subject_data = [["Subject", "Marks"]]
             for subject, spin in self.subject_marks.items():
                 subject_data.append([subject, str(spin.value())])
@@ -999,48 +941,28 @@ class StudentDetailsDialog(QDialog):
             subject_data.append(["Total", str(total_marks)])
             subject_data.append(["Percentage", f"{percentage:.2f}%"])
             
-            t = Table(subject_data, colWidths=[300, 150])
-            t.setStyle(TableStyle([
-                ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
-                ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-                ('FONTSIZE', (0, 0), (-1, -1), 14),
-                ('BOTTOMPADDING', (0, 0), (-1, -1), 12),
-                ('TOPPADDING', (0, 0), (-1, -1), 12),
-                ('GRID', (0, 0), (-1, -1), 1, colors.black),
-                ('BACKGROUND', (-2, -2), (-1, -1), colors.lightgrey),
-                ('FONTNAME', (-2, -2), (-1, -1), 'Helvetica-Bold'),
-            ]))
-            elements.append(t)
-            elements.append(Spacer(1, 20))
+            elements += pdf_builder.table(subject_data, style='plain', col_widths=[300, 150], total_rows=2)
+            elements.append(pdf_builder.spacer(20))
             
             # Add extracurricular activities
             if self.activities:
-                elements.append(Paragraph("Extracurricular Activities", styles['Heading2']))
+                elements.append(pdf_builder.paragraph("Extracurricular Activities", 'heading'))
                 activity_data = [["Activity", "Details"]]
                 for name, details in self.activities.items():
                     activity_data.append([name, details['details'].text()])
                 
-                t = Table(activity_data, colWidths=[300, 400])
-                t.setStyle(TableStyle([
-                    ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
-                    ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-                    ('FONTSIZE', (0, 0), (-1, -1), 14),
-                    ('BOTTOMPADDING', (0, 0), (-1, -1), 12),
-                    ('TOPPADDING', (0, 0), (-1, -1), 12),
-                    ('GRID', (0, 0), (-1, -1), 1, colors.black),
-                ]))
-                elements.append(t)
-                elements.append(Spacer(1, 20))
+                elements += pdf_builder.table(activity_data, style='plain', col_widths=[300, 400])
+                elements.append(pdf_builder.spacer(20))
             
             # Add achievements
-            elements.append(Paragraph("Achievements", styles['Heading2']))
-            elements.append(Paragraph(self.achievements.toPlainText(), styles['Normal']))
-            elements.append(Spacer(1, 20))
+            elements.append(pdf_builder.paragraph("Achievements", 'heading'))
+            elements.append(pdf_builder.paragraph(self.achievements.toPlainText()))
+            elements.append(pdf_builder.spacer(20))
             
             # Add teacher's remarks
-            elements.append(Paragraph("Teacher's Remarks", styles['Heading2']))
-            elements.append(Paragraph(self.teacher_remarks.toPlainText(), styles['Normal']))
-            elements.append(Spacer(1, 40))
+            elements.append(pdf_builder.paragraph("Teacher's Remarks", 'heading'))
+            elements.append(pdf_builder.paragraph(self.teacher_remarks.toPlainText()))
+            elements.append(pdf_builder.spacer(40))
             
             # Add signature lines
             signature_data = [
@@ -1048,27 +970,13 @@ class StudentDetailsDialog(QDialog):
                 ["_________________", "_________________"],
                 ["Date: _____________", "Date: _____________"]
             ]
+            elements += pdf_builder.table(signature_data, style='signature', col_widths=[350, 350])
             
-            t = Table(signature_data, colWidths=[350, 350])
-            t.setStyle(TableStyle([
-                ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
-                ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-                ('FONTSIZE', (0, 0), (-1, -1), 14),
-                ('BOTTOMPADDING', (0, 0), (-1, -1), 12),
-                ('TOPPADDING', (0, 0), (-1, -1), 12),
-            ]))
-            elements.append(t)
-            
-            # Build PDF
-            doc.build(elements)
-            
-            # Show success message with file location
-            msg = QMessageBox()
-            msg.setIcon(QMessageBox.Icon.Information)
-            msg.setWindowTitle("Success")
-            msg.setText("PDF generated successfully!")
-            msg.setInformativeText(f"File saved as: {os.path.abspath('student_report_card.pdf')}")
-            msg.exec()
+            # Build PDF off the GUI thread
+            build_pdf_in_background(
+                self, doc, elements,
+                f"PDF generated successfully!\nFile saved as: {os.path.abspath('student_report_card.pdf')}"
+            )
             
         except Exception as e:
             QMessageBox.critical(self, "Error", f"Error generating PDF: {str(e)}")
@@ -1137,19 +1045,49 @@ class StudentExamRecordsPage(QWidget):
         """)
         delete_student_btn.clicked.connect(self.deleteStudent)
         
+        publish_btn = QPushButton("Publish Exam Results")
+        publish_btn.setStyleSheet("""
+            QPushButton {
+                background-color: #2196F3;
+                color: white;
+                padding: 8px 15px;
+                border-radius: 4px;
+                font-weight: bold;
+            }
+            QPushButton:hover {
+                background-color: #1976D2;
+            }
+        """)
+        publish_btn.clicked.connect(self.publishExamResults)
+        
+        print_cards_btn = QPushButton("Print Report Cards")
+        print_cards_btn.setStyleSheet("""
+            QPushButton {
+                background-color: #2196F3;
+                color: white;
+                padding: 8px 15px;
+                border-radius: 4px;
+                font-weight: bold;
+            }
+            QPushButton:hover {
+                background-color: #1976D2;
+            }
+        """)
+        print_cards_btn.clicked.connect(self.printReportCards)
+        
         top_layout.addWidget(search_container, stretch=2)
         top_layout.addWidget(add_student_btn)
         top_layout.addWidget(delete_student_btn)
+        top_layout.addWidget(publish_btn)
+        top_layout.addWidget(print_cards_btn)
         
         # Table
-        self.table = QTableWidget()
-        self.table.setColumnCount(6)  # Changed from 7 to 6 (removed Actions column)
-        self.table.setHorizontalHeaderLabels([
+        self.model = RowTableModel([
             "Student Name", "Grade", "Roll No", "Last Exam Score", "Attendance", "View Details"
         ])
-        self.table.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeMode.Stretch)
-        self.table.setSelectionBehavior(QTableWidget.SelectionBehavior.SelectRows)
-        self.table.setSelectionMode(QTableWidget.SelectionMode.SingleSelection)
+        # Search by name or roll number
+        self.table, self.proxy = create_table_view(self.model, search_columns=[0, 2])
+        set_row_actions(self.table, 5, {"View Details": self.viewStudentDetails})
         
         # Add sample data
         self.loadSampleData()
@@ -1158,24 +1096,85 @@ class StudentExamRecordsPage(QWidget):
         layout.addLayout(top_layout)
         layout.addWidget(self.table)
 
+    def publishExamResults(self):
+        """Grade every student of an exam and store the report cards as one background job"""
+        exam_name, ok = QInputDialog.getText(self, "Publish Exam Results", "Exam name:")
+        if not ok or not exam_name.strip():
+            return
+        run_in_background(
+            publish_exam_results, exam_name.strip(),
+            on_result=self.showPublishedResults,
+            on_error=lambda error: QMessageBox.critical(self, "Error", f"Failed to publish results: {error}"),
+            message="Publishing exam results...",
+            report_progress=True
+        )
+
+    def showPublishedResults(self, summary):
+        if not summary['published']:
+            QMessageBox.warning(self, "Publish Exam Results",
+                                f"No marks found for {summary['exam_name']}.")
+            return
+        grades = "\n".join(f"{letter}: {count}" for letter, count in summary['grade_counts'].items())
+        QMessageBox.information(
+            self, "Results Published",
+            f"Published {summary['published']} report cards for {summary['exam_name']} "
+            f"({summary['subjects']} subjects).\n\n{grades}"
+        )
+
+    def printReportCards(self):
+        """Render the report cards of a whole grade or section as one background job"""
+        exam_name, ok = QInputDialog.getText(self, "Print Report Cards", "Exam name:")
+        if not ok or not exam_name.strip():
+            return
+        class_name, ok = QInputDialog.getItem(
+            self, "Print Report Cards", "Grade:", [f"{i}th" for i in range(6, 13)], 4, False
+        )
+        if not ok:
+            return
+        section, ok = QInputDialog.getText(self, "Print Report Cards", "Section (blank for the whole grade):")
+        if not ok:
+            return
+        output_dir = QFileDialog.getExistingDirectory(self, "Save Report Cards To")
+        if not output_dir:
+            return
+        merge = QMessageBox.question(
+            self, "Print Report Cards",
+            "Combine the report cards into a single PDF?",
+            QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No
+        ) == QMessageBox.StandardButton.Yes
+
+        run_in_background(
+            generate_report_cards, exam_name.strip(), class_name, output_dir,
+            section=section.strip() or None, merge=merge,
+            on_result=self.showPrintedReportCards,
+            on_error=lambda error: QMessageBox.critical(self, "Error", f"Failed to print report cards: {error}"),
+            message="Printing report cards...",
+            report_progress=True
+        )
+
+    def showPrintedReportCards(self, result):
+        if not result['students']:
+            QMessageBox.warning(self, "Print Report Cards",
+                                f"No marks found for {result['class']} in {result['exam_name']}.")
+            return
+        QMessageBox.information(
+            self, "Report Cards Printed",
+            f"Printed {result['students']} report cards in {result['seconds']:.1f}s "
+            f"({result['students_per_sec']:.1f} per second).\n"
+            f"{len(result['files'])} file(s) saved to: {os.path.dirname(os.path.abspath(result['files'][0]))}"
+        )
+
     def viewStudentDetails(self, row):
-            student_data = [
-            self.table.item(row, col).text()
-            for col in range(self.table.columnCount() - 1)  # Exclude "View Details" column
-            ]
+            student_data = [str(value) for value in self.model.row_data(row)]
             dialog = StudentDetailsDialog(self, student_data)
             if dialog.exec() == QDialog.DialogCode.Accepted:
                 # Update the table with the edited details
-                for col, value in enumerate(student_data):
-                    self.table.setItem(row, col, QTableWidgetItem(value))
+                self.sample_data[row] = student_data
+                self.populate_table(self.sample_data)
                 QMessageBox.information(self, "Success", "Student details updated successfully!")
 
     def searchStudents(self, text):
-        for row in range(self.table.rowCount()):
-            name = self.table.item(row, 0).text().lower()
-            roll_no = self.table.item(row, 2).text().lower()
-            should_show = text.lower() in name or text.lower() in roll_no
-            self.table.setRowHidden(row, not should_show)
+        self.proxy.set_search_text(text)
 
     def showAddStudentDialog(self):
         dialog = AddStudentDialog(self)
@@ -1183,9 +1182,10 @@ class StudentExamRecordsPage(QWidget):
             self.loadSampleData()  # Refresh table
 
     def deleteStudent(self):
-        current_row = self.table.currentRow()
-        if current_row >= 0:
-            student_name = self.table.item(current_row, 0).text()
+        current_index = self.table.currentIndex()
+        if current_index.isValid():
+            current_row = self.proxy.mapToSource(current_index).row()
+            student_name = self.model.row_data(current_row)[0]
             confirm = QMessageBox.question(
                 self,
                 "Confirm Deletion",
@@ -1193,7 +1193,8 @@ class StudentExamRecordsPage(QWidget):
                 QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No
             )
             if confirm == QMessageBox.StandardButton.Yes:
-                self.table.removeRow(current_row)
+                self.sample_data.pop(current_row)
+                self.populate_table(self.sample_data)
                 QMessageBox.information(self, "Success", "Student record deleted successfully!")
         else:
             QMessageBox.warning(self, "Warning", "Please select a student to delete.")
@@ -1209,37 +1210,20 @@ class StudentExamRecordsPage(QWidget):
         self.populate_table(self.sample_data)
 
     def populate_table(self, data):
-        self.table.setRowCount(len(data))
-        for row, row_data in enumerate(data):
-            # Add student data
-            for col, value in enumerate(row_data):
-                self.table.setItem(row, col, QTableWidgetItem(str(value)))
-            
-            # Add View Details button
-            view_details_btn = QPushButton("View Details")
-            view_details_btn.setStyleSheet("""
-                QPushButton {
-                    background-color: #1a73e8;
-                    color: white;
-                    padding: 5px 10px;
-                    border-radius: 3px;
-                }
-                QPushButton:hover {
-                    background-color: #1557b0;
-                }
-            """)
-            view_details_btn.clicked.connect(lambda checked, row=row: self.viewStudentDetails(row))
-            self.table.setCellWidget(row, 5, view_details_btn)
+        self.model.set_rows(data)
 
 class ExamDepartment(QMainWindow):
     def __init__(self):
         super().__init__()
         self.setWindowTitle("School Management System")
         self.setGeometry(100, 100, 1400, 800)
+        # Load reportlab while the user looks around, not on the first PDF
+        pdf_builder.warm_up()
         
         # Create central widget and layout
         central_widget = QWidget()
         self.setCentralWidget(central_widget)
+        self.statusBar().addPermanentWidget(TaskStatusBar())
         main_layout = QVBoxLayout(central_widget)
         
         # Create menubar
@@ -1287,20 +1271,14 @@ class ExamDepartment(QMainWindow):
         self.tab_buttons[0].setChecked(True)
         main_layout.addLayout(tab_layout)
         
-        # Create stacked widget for pages
-        self.stack = QStackedWidget()
+        # Create stacked widget for pages; each page is built on first activation
+        self.stack = LazyPageStack()
         main_layout.addWidget(self.stack)
         
-        # Create and add pages
-        self.upcoming_exams_page = UpcomingExamsPage()
-        self.previous_papers_page = PreviousPapersPage()
-        self.exam_inventory_page = ExamInventoryPage()
-        self.student_exam_records_page = StudentExamRecordsPage()
-        
-        self.stack.addWidget(self.upcoming_exams_page)
-        self.stack.addWidget(self.previous_papers_page)
-        self.stack.addWidget(self.exam_inventory_page)
-        self.stack.addWidget(self.student_exam_records_page)
+        self.stack.add_page(UpcomingExamsPage)
+        self.stack.add_page(PreviousPapersPage)
+        self.stack.add_page(ExamInventoryPage)
+        self.stack.add_page(StudentExamRecordsPage)
 
     def switch_tab(self, index):
         # Update button states
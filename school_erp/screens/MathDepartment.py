@@ -2,18 +2,21 @@ import sys
 from PyQt6.QtWidgets import (QApplication, QMainWindow, QWidget, QVBoxLayout, 
                            QHBoxLayout, QLabel, QLineEdit, QPushButton, QMenuBar,
                            QMenu, QTableWidget, QTableWidgetItem, QHeaderView,
-                           QStackedWidget, QFileDialog, QMessageBox, QDialog,
+                           QFileDialog, QMessageBox, QDialog,
                            QFormLayout, QDateEdit, QComboBox, QSpinBox,
                            QFrame, QDoubleSpinBox, QTabWidget, QGroupBox,
                            QGridLayout)
 from PyQt6.QtCore import Qt, QDate
 from PyQt6.QtGui import QAction
-from reportlab.lib import colors
-from reportlab.lib.pagesizes import letter
-from reportlab.platypus import SimpleDocTemplate, Table, TableStyle, Paragraph, Spacer
-from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
 import os
 from datetime import datetime
+from reports import pdf_builder
+from screens.lazy_pages import LazyPageStack
+from screens.table_models import RowTableModel, create_table_view
+from screens.row_actions import set_row_actions
+from screens.search_index import SearchIndex, debounce_text_changed
+from screens.background_tasks import TaskStatusBar, build_pdf_in_background
+from screens.exports import export_view_in_background
 
 class AddTextbookDialog(QDialog):
     def __init__(self, parent=None):
@@ -65,6 +68,8 @@ class AddTextbookDialog(QDialog):
 class TextbooksPage(QWidget):
     def __init__(self):
         super().__init__()
+        # Load reportlab while the user looks around, not on the first PDF
+        pdf_builder.warm_up()
         self.initUI()
 
     def initUI(self):
@@ -224,7 +229,7 @@ class TextbooksPage(QWidget):
                 min-width: 300px;
             }
         """)
-        self.search_box.textChanged.connect(self.search_textbooks)
+        debounce_text_changed(self.search_box, self.search_textbooks)
         
         search_layout_inner.addWidget(search_icon)
         search_layout_inner.addWidget(self.search_box)
@@ -292,9 +297,25 @@ class TextbooksPage(QWidget):
         """)
         order_btn.clicked.connect(self.generate_order_pdf)
 
+        export_btn = QPushButton("Export")
+        export_btn.setStyleSheet("""
+            QPushButton {
+                background-color: #6c757d;
+                color: white;
+                padding: 8px 16px;
+                border-radius: 5px;
+                font-weight: bold;
+            }
+            QPushButton:hover {
+                background-color: #5a6268;
+            }
+        """)
+        export_btn.clicked.connect(lambda: export_view_in_background(self, self.table, "math_textbooks.xlsx"))
+
         buttons_layout.addWidget(add_btn)
         buttons_layout.addWidget(delete_btn)
         buttons_layout.addWidget(order_btn)
+        buttons_layout.addWidget(export_btn)
 
         search_layout.addWidget(search_container)
         search_layout.addWidget(self.grade_filter)
@@ -302,12 +323,14 @@ class TextbooksPage(QWidget):
         layout.addLayout(search_layout)
 
         # Textbooks table
-        self.table = QTableWidget()
-        self.table.setColumnCount(6)
-        self.table.setHorizontalHeaderLabels([
+        self.model = RowTableModel([
             "Title", "Publisher", "Quantity", "Condition", "Last Inventory", "Actions"
         ])
-        self.table.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeMode.Stretch)
+        self.model.alignment[2] = Qt.AlignmentFlag.AlignCenter  # Quantity column
+        # Color code the condition
+        self.model.foreground[3] = {"Good": Qt.GlobalColor.darkGreen, None: Qt.GlobalColor.darkYellow}
+        self.table, self.proxy = create_table_view(self.model, search_columns=[0, 1])
+        set_row_actions(self.table, 5, {"Update": self.update_textbook})
 
         # Sample data
         self.sample_data = [
@@ -325,68 +348,32 @@ class TextbooksPage(QWidget):
             ["Mathematics Grade 9", "Pearson Education", "52", "Good", "2023-09-10"],
             ["Algebra & Calculus Grade 10", "Oxford Publications", "40", "Needs Replacement", "2023-09-10"]
         ]
+        # Search by title or publisher
+        self.search_index = SearchIndex(search_columns=[0, 1], rows=self.sample_data)
         
         self.populate_table(self.sample_data)
         layout.addWidget(self.table)
 
     def populate_table(self, data):
-        self.table.setRowCount(len(data))
-        for row, row_data in enumerate(data):
-            for col, value in enumerate(row_data):
-                item = QTableWidgetItem(str(value))
-                if col == 2:  # Quantity column
-                    item.setTextAlignment(Qt.AlignmentFlag.AlignCenter)
-                self.table.setItem(row, col, item)
-                
-                # Color code the condition
-                if col == 3:
-                    if value == "Good":
-                        item.setForeground(Qt.GlobalColor.darkGreen)
-                    else:
-                        item.setForeground(Qt.GlobalColor.darkYellow)
-            
-            # Add Update button
-            update_btn = QPushButton("Update")
-            update_btn.setStyleSheet("""
-                QPushButton {
-                    background-color: #1a73e8;
-                    color: white;
-                    padding: 5px 10px;
-                    border-radius: 3px;
-                }
-                QPushButton:hover {
-                    background-color: #1557b0;
-                }
-            """)
-            update_btn.clicked.connect(lambda checked, row=row: self.update_textbook(row))
-            self.table.setCellWidget(row, 5, update_btn)
+        self.model.set_rows(data)
+        # Keep the current search applied to the new rows
+        self.search_textbooks(self.search_box.text())
 
         # Update stats
         self.update_stats()
 
-    def search_textbooks(self):
-        search_text = self.search_box.text().lower()
-        grade_filter = self.grade_filter.currentText()
-        
-        for row in range(self.table.rowCount()):
-            title = self.table.item(row, 0).text().lower()
-            publisher = self.table.item(row, 1).text().lower()
-            
-            title_match = search_text in title or search_text in publisher
-            grade_match = grade_filter == "All Grades" or grade_filter in title
-            
-            self.table.setRowHidden(row, not (title_match and grade_match))
+    def search_textbooks(self, text):
+        self.proxy.set_matched_rows(self.search_index.search(text))
 
     def filter_by_grade(self, grade):
         if grade == "All Grades":
-            self.populate_table(self.sample_data)
+            self.proxy.set_column_filter(0, None)
+            self.update_stats()
             return
 
-        filtered_data = [
-            row for row in self.sample_data
-            if grade in row[0]  # Check if grade appears in the title
-        ]
-        self.populate_table(filtered_data)
+        # Check if grade appears in the title
+        self.proxy.set_column_filter(0, lambda title: grade in title)
+        filtered_data = [row for row in self.sample_data if grade in row[0]]
         
         # Update stats for filtered data
         total_books = sum(int(row[2]) for row in filtered_data)
@@ -414,14 +401,12 @@ class TextbooksPage(QWidget):
         if dialog.exec() == QDialog.DialogCode.Accepted:
             new_textbook = dialog.get_textbook_data()
             self.sample_data.append(new_textbook)
+            self.search_index.append(new_textbook)
             self.populate_table(self.sample_data)
             QMessageBox.information(self, "Success", "Textbook added successfully!")
 
     def update_textbook(self, row):
-        current_data = [
-            self.table.item(row, col).text()
-            for col in range(self.table.columnCount() - 1)
-        ]
+        current_data = self.model.row_data(row)
         
         dialog = AddTextbookDialog(self)
         dialog.title.setText(current_data[0])
@@ -432,17 +417,18 @@ class TextbooksPage(QWidget):
         if dialog.exec() == QDialog.DialogCode.Accepted:
             updated_data = dialog.get_textbook_data()
             self.sample_data[row] = updated_data
+            self.search_index.update(row, updated_data)
             self.populate_table(self.sample_data)
             QMessageBox.information(self, "Success", "Textbook updated successfully!")
 
     def delete_textbook(self):
-        selected_rows = self.table.selectedItems()
+        selected_rows = self.table.selectionModel().selectedRows()
         if not selected_rows:
             QMessageBox.warning(self, "Warning", "Please select a textbook to delete.")
             return
 
-        row = selected_rows[0].row()
-        textbook_name = self.table.item(row, 0).text()
+        row = self.proxy.mapToSource(selected_rows[0]).row()
+        textbook_name = self.model.row_data(row)[0]
 
         reply = QMessageBox.question(
             self,
@@ -453,8 +439,9 @@ class TextbooksPage(QWidget):
         )
 
         if reply == QMessageBox.StandardButton.Yes:
-            self.table.removeRow(row)
             del self.sample_data[row]
+            self.search_index.remove(row)
+            self.populate_table(self.sample_data)
             QMessageBox.information(self, "Success", f"'{textbook_name}' has been deleted successfully.")
 
     def update_stats(self):
@@ -492,31 +479,13 @@ class TextbooksPage(QWidget):
                 file_name += '.pdf'
 
             # Create PDF document
-            doc = SimpleDocTemplate(file_name, pagesize=letter)
-            elements = []
-            
-            # Add title
-            styles = getSampleStyleSheet()
-            title_style = ParagraphStyle(
-                'CustomTitle',
-                parent=styles['Heading1'],
-                fontSize=24,
-                spaceAfter=30,
-                alignment=1
-            )
-            elements.append(Paragraph("Textbook Order List", title_style))
-            elements.append(Spacer(1, 20))
-            
-            # Add date
-            date_style = ParagraphStyle(
-                'DateStyle',
-                parent=styles['Normal'],
-                fontSize=12,
-                alignment=1
-            )
-            elements.append(Paragraph(f"Generated on: {datetime.now().strftime('%Y-%m-%d')}", date_style))
-            elements.append(Spacer(1, 30))
-            
+            doc = pdf_builder.document(file_name)
+            elements = pdf_builder.title_block("Textbook Order List", style='title_centered')
+            elements.append(pdf_builder.paragraph(
+                f"Generated on: {datetime.now().strftime('%Y-%m-%d')}", 'date_centered'
+            ))
+            elements.append(pdf_builder.spacer(30))
+
             # Group books by grade
             grade_books = {}
             for row in self.sample_data:
@@ -533,13 +502,13 @@ class TextbooksPage(QWidget):
                     grade_books[grade].append(row)
             
             if not grade_books:
-                elements.append(Paragraph("No textbooks currently need ordering.", styles['Normal']))
+                elements.append(pdf_builder.paragraph("No textbooks currently need ordering."))
             else:
                 # Add each grade's books
                 for grade in sorted(grade_books.keys()):
                     # Add grade header
-                    elements.append(Paragraph(f"{grade} Textbooks", styles['Heading2']))
-                    elements.append(Spacer(1, 10))
+                    elements.append(pdf_builder.paragraph(f"{grade} Textbooks", 'heading'))
+                    elements.append(pdf_builder.spacer(10))
                     
                     # Create table for this grade
                     grade_data = [["Title", "Current Quantity", "Condition", "Required Quantity"]]
@@ -551,52 +520,35 @@ class TextbooksPage(QWidget):
                             str(int(int(row[2]) * 1.5))  # Required Quantity (50% more than current)
                         ])
                     
-                    table = Table(grade_data, colWidths=[250, 100, 100, 100])
-                    table.setStyle(TableStyle([
-                        ('BACKGROUND', (0, 0), (-1, 0), colors.grey),
-                        ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
-                        ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
-                        ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-                        ('FONTSIZE', (0, 0), (-1, 0), 12),
-                        ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
-                        ('BACKGROUND', (0, 1), (-1, -1), colors.white),
-                        ('TEXTCOLOR', (0, 1), (-1, -1), colors.black),
-                        ('FONTNAME', (0, 1), (-1, -1), 'Helvetica'),
-                        ('FONTSIZE', (0, 1), (-1, -1), 10),
-                        ('GRID', (0, 0), (-1, -1), 1, colors.black),
-                        ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
-                        ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
-                    ]))
-                    elements.append(table)
-                    elements.append(Spacer(1, 20))
+                    elements += pdf_builder.table(grade_data, style='grey_white',
+                                                  col_widths=[250, 100, 100, 100])
+                    elements.append(pdf_builder.spacer(20))
             
             # Add summary
-            elements.append(Spacer(1, 20))
+            elements.append(pdf_builder.spacer(20))
             summary_text = [
-                Paragraph("Order Summary:", styles['Heading3']),
-                Paragraph(f"Total Grades Needing Books: {len(grade_books)}", styles['Normal']),
-                Paragraph(f"Total Books to Order: {sum(len(books) for books in grade_books.values())}", styles['Normal'])
+                pdf_builder.paragraph("Order Summary:", 'subheading'),
+                pdf_builder.paragraph(f"Total Grades Needing Books: {len(grade_books)}"),
+                pdf_builder.paragraph(f"Total Books to Order: {sum(len(books) for books in grade_books.values())}")
             ]
             elements.extend(summary_text)
             
-            # Build PDF
-            doc.build(elements)
-            
-            # Show success message with file location
-            QMessageBox.information(
-                self,
-                "Success",
-                f"Order list PDF generated successfully!\nSaved as: {file_name}"
+            def open_folder():
+                # Open the containing folder
+                if sys.platform == 'win32':
+                    os.startfile(os.path.dirname(file_name))
+                elif sys.platform == 'darwin':  # macOS
+                    os.system(f'open "{os.path.dirname(file_name)}"')
+                else:  # Linux
+                    os.system(f'xdg-open "{os.path.dirname(file_name)}"')
+
+            # Build PDF off the GUI thread
+            build_pdf_in_background(
+                self, doc, elements,
+                f"Order list PDF generated successfully!\nSaved as: {file_name}",
+                on_success=open_folder
             )
             
-            # Open the containing folder
-            if sys.platform == 'win32':
-                os.startfile(os.path.dirname(file_name))
-            elif sys.platform == 'darwin':  # macOS
-                os.system(f'open "{os.path.dirname(file_name)}"')
-            else:  # Linux
-                os.system(f'xdg-open "{os.path.dirname(file_name)}"')
-            
         except Exception as e:
             QMessageBox.critical(
                 self,
@@ -1677,6 +1629,7 @@ class MathDepartment(QMainWindow):
         # Create central widget and layout
         central_widget = QWidget()
         self.setCentralWidget(central_widget)
+        self.statusBar().addPermanentWidget(TaskStatusBar())
         main_layout = QVBoxLayout(central_widget)
         
         # Create menubar
@@ -1724,20 +1677,14 @@ class MathDepartment(QMainWindow):
         self.tab_buttons[0].setChecked(True)
         main_layout.addLayout(tab_layout)
         
-        # Create stacked widget for pages
-        self.stack = QStackedWidget()
+        # Create stacked widget for pages; each page is built on first activation
+        self.stack = LazyPageStack()
         main_layout.addWidget(self.stack)
         
-        # Create and add pages
-        self.textbooks_page = TextbooksPage()
-        self.teaching_equipment_page = TeachingEquipmentPage()
-        self.lesson_plans_page = LessonPlansPage()
-        self.events_records_page = EventsRecordsPage()
-        
-        self.stack.addWidget(self.textbooks_page)
-        self.stack.addWidget(self.teaching_equipment_page)
-        self.stack.addWidget(self.lesson_plans_page)
-        self.stack.addWidget(self.events_records_page)
+        self.stack.add_page(TextbooksPage)
+        self.stack.add_page(TeachingEquipmentPage)
+        self.stack.add_page(LessonPlansPage)
+        self.stack.add_page(EventsRecordsPage)
 
     def switch_tab(self, index):
         # Update button states
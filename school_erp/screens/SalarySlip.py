@@ -1,6 +1,6 @@
+# Run from the school_erp folder: python -m screens.SalarySlip
 import sys
 import os
-import pandas as pd
 from PyQt5.QtWidgets import (
     QApplication, QMainWindow, QWidget, QLabel, QLineEdit, QPushButton,
     QVBoxLayout, QHBoxLayout, QFormLayout, QTableWidget,
@@ -10,7 +10,8 @@ from PyQt5.QtWidgets import (
 from PyQt5.QtCore import Qt
 from PyQt5.QtGui import QFont
 from datetime import datetime
-from database import DatabaseHandler
+from database.sheet_cache import read_sheet
+from screens.database import DatabaseHandler
 
 class SalarySlipApp(QMainWindow):
     def __init__(self):
@@ -157,20 +158,24 @@ class SalarySlipApp(QMainWindow):
         # Set layout for central widget
         self.central_widget.setLayout(self.layout)
         
-        # Load employee database
-        self.load_employee_database()
+        # The Excel employee sheet is read on first use, not at startup
+        self.employee_data = None
         
         # Initialize database handler
         self.db = DatabaseHandler()
 
     def load_employee_database(self):
+        """Return the Excel employee sheet, reading it on the first call"""
+        if self.employee_data is not None:
+            return self.employee_data
         try:
             # Get the path to the Excel file
             current_dir = os.path.dirname(os.path.abspath(__file__))
             excel_path = os.path.join(current_dir, 'database', 'teachers_data.xlsx')
             
-            # Load the Excel file
-            self.employee_data = pd.read_excel(excel_path)
+            # Load the Excel file (from its cached snapshot when unchanged)
+            self.employee_data = read_sheet(excel_path)
+            return self.employee_data
             
         except Exception as e:
             QMessageBox.critical(self, "Error", f"Failed to load employee database: {str(e)}")
@@ -3,17 +3,18 @@ from PyQt6.QtWidgets import (QApplication, QMainWindow, QWidget, QVBoxLayout,
                            QHBoxLayout, QLabel, QLineEdit, QPushButton, 
                            QTableWidget, QTableWidgetItem, QHeaderView,
                            QComboBox, QMessageBox, QDialog, QFormLayout,
-                           QDateEdit, QFrame, QStackedWidget, QSpinBox,
+                           QDateEdit, QFrame, QSpinBox,
                            QFileDialog, QScrollArea, QGroupBox)
 from PyQt6.QtCore import Qt, QDate
 from datetime import datetime
-from reportlab.lib import colors
-from reportlab.lib.pagesizes import letter
-from reportlab.platypus import SimpleDocTemplate, Table, TableStyle, Paragraph, Spacer
-from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
-from reportlab.lib.units import inch
 import os
 
+from reports import pdf_builder
+from screens.lazy_pages import LazyPageStack
+from screens.table_models import RowTableModel, create_table_view
+from screens.row_actions import set_row_actions
+from screens.background_tasks import TaskStatusBar, build_pdf_in_background
+
 class AddInspectionDialog(QDialog):
     def __init__(self, parent=None):
         super().__init__(parent)
@@ -1095,13 +1096,21 @@ class ChemicalStorageTab(QWidget):
         layout.addLayout(search_layout)
 
         # Chemicals table
-        self.chemicals_table = QTableWidget()
-        self.chemicals_table.setColumnCount(6)
-        self.chemicals_table.setHorizontalHeaderLabels([
+        self.chemicals_model = RowTableModel([
             "Chemical Name", "Category", "Storage Location", "Quantity", "Hazard Level", "Actions"
         ])
-        self.chemicals_table.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeMode.Stretch)
-        self.chemicals_table.setSortingEnabled(True)
+        self.chemicals_model.default_alignment = Qt.AlignmentFlag.AlignCenter
+        # Hazard level colors
+        self.chemicals_model.foreground[4] = {
+            "High": Qt.GlobalColor.red,
+            "Medium": Qt.GlobalColor.darkYellow,
+            None: Qt.GlobalColor.green
+        }
+        self.chemicals_table, self.chemicals_proxy = create_table_view(self.chemicals_model, search_columns=range(5))
+        set_row_actions(self.chemicals_table, 5, {
+            "Update": self.update_chemical,
+            "Delete": self.delete_chemical
+        })
 
         # Sample data - empty initially
         self.sample_data = []
@@ -1113,82 +1122,10 @@ class ChemicalStorageTab(QWidget):
         self.update_stats()
 
     def populate_table(self, data):
-        self.chemicals_table.setRowCount(len(data))
-        for row, row_data in enumerate(data):
-            for col, value in enumerate(row_data):
-                item = QTableWidgetItem(str(value))
-                
-                # Center align all cells
-                item.setTextAlignment(Qt.AlignmentFlag.AlignCenter)
-                
-                # Make items read-only
-                item.setFlags(item.flags() & ~Qt.ItemFlag.ItemIsEditable)
-                
-                # Set hazard level color
-                if col == 4:  # Hazard Level column
-                    if value == "High":
-                        item.setForeground(Qt.GlobalColor.red)
-                    elif value == "Medium":
-                        item.setForeground(Qt.GlobalColor.darkYellow)
-                    else:
-                        item.setForeground(Qt.GlobalColor.green)
-                
-                self.chemicals_table.setItem(row, col, item)
-            
-            # Create button container widget
-            button_widget = QWidget()
-            button_layout = QHBoxLayout(button_widget)
-            button_layout.setContentsMargins(0, 0, 0, 0)
-            
-            # Add Update button
-            update_btn = QPushButton("Update")
-            update_btn.setStyleSheet("""
-                QPushButton {
-                    background-color: #1a73e8;
-                    color: white;
-                    padding: 5px 10px;
-                    border-radius: 3px;
-                    min-width: 60px;
-                }
-                QPushButton:hover {
-                    background-color: #1557b0;
-                }
-            """)
-            update_btn.clicked.connect(lambda checked, row=row: self.update_chemical(row))
-            
-            # Add Delete button
-            delete_btn = QPushButton("Delete")
-            delete_btn.setStyleSheet("""
-                QPushButton {
-                    background-color: #dc3545;
-                    color: white;
-                    padding: 5px 10px;
-                    border-radius: 3px;
-                    min-width: 60px;
-                }
-                QPushButton:hover {
-                    background-color: #c82333;
-                }
-            """)
-            delete_btn.clicked.connect(lambda checked, row=row: self.delete_chemical(row))
-            
-            # Add buttons to layout
-            button_layout.addWidget(update_btn)
-            button_layout.addWidget(delete_btn)
-            button_layout.setAlignment(Qt.AlignmentFlag.AlignCenter)
-            
-            self.chemicals_table.setCellWidget(row, 5, button_widget)
+        self.chemicals_model.set_rows(data)
 
     def search_chemicals(self):
-        search_text = self.search_box.text().lower()
-        for row in range(self.chemicals_table.rowCount()):
-            should_show = False
-            for col in range(self.chemicals_table.columnCount() - 1):  # Exclude Actions column
-                item = self.chemicals_table.item(row, col)
-                if item and search_text in item.text().lower():
-                    should_show = True
-                    break
-            self.chemicals_table.setRowHidden(row, not should_show)
+        self.chemicals_proxy.set_search_text(self.search_box.text())
 
     def add_chemical(self):
         dialog = AddChemicalDialog(self)
@@ -1202,11 +1139,12 @@ class ChemicalStorageTab(QWidget):
         dialog = AddChemicalDialog(self)
         
         # Pre-fill the dialog with existing data
-        dialog.chemical_name.setText(self.chemicals_table.item(row, 0).text())
-        dialog.category.setCurrentText(self.chemicals_table.item(row, 1).text())
-        dialog.location.setCurrentText(self.chemicals_table.item(row, 2).text())
-        dialog.quantity.setText(self.chemicals_table.item(row, 3).text())
-        dialog.hazard_level.setCurrentText(self.chemicals_table.item(row, 4).text())
+        chemical = self.chemicals_model.row_data(row)
+        dialog.chemical_name.setText(str(chemical[0]))
+        dialog.category.setCurrentText(str(chemical[1]))
+        dialog.location.setCurrentText(str(chemical[2]))
+        dialog.quantity.setText(str(chemical[3]))
+        dialog.hazard_level.setCurrentText(str(chemical[4]))
         
         if dialog.exec() == QDialog.DialogCode.Accepted:
             new_data = dialog.get_chemical_data()
@@ -1215,7 +1153,7 @@ class ChemicalStorageTab(QWidget):
             QMessageBox.information(self, "Success", "Chemical updated successfully!")
 
     def delete_chemical(self, row):
-        chemical_name = self.chemicals_table.item(row, 0).text()
+        chemical_name = self.chemicals_model.row_data(row)[0]
         reply = QMessageBox.question(
             self, 
             'Delete Chemical',
@@ -1403,60 +1341,12 @@ class ChemicalStorageTab(QWidget):
                     ])
             
             # Create PDF
-            doc = SimpleDocTemplate(
-                file_name,
-                pagesize=letter,
-                rightMargin=72,
-                leftMargin=72,
-                topMargin=72,
-                bottomMargin=72
-            )
-            
-            # Create story for PDF
-            story = []
-            styles = getSampleStyleSheet()
-            
-            # Create title style
-            title_style = ParagraphStyle(
-                'CustomTitle',
-                parent=styles['Heading1'],
-                fontSize=24,
-                spaceAfter=30
-            )
+            doc = pdf_builder.document(file_name)
+            story = pdf_builder.title_block("Chemical Order List", f"Generated on: {current_date}")
+            story += pdf_builder.table(order_details[3:])  # Skip the header rows we added earlier
             
-            # Add title
-            story.append(Paragraph("Chemical Order List", title_style))
-            story.append(Paragraph(f"Generated on: {current_date}", styles["Normal"]))
-            story.append(Spacer(1, 20))
-            
-            # Create table
-            table = Table(order_details[3:])  # Skip the header rows we added earlier
-            table.setStyle(TableStyle([
-                ('BACKGROUND', (0, 0), (-1, 0), colors.grey),
-                ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
-                ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
-                ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-                ('FONTSIZE', (0, 0), (-1, 0), 14),
-                ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
-                ('BACKGROUND', (0, 1), (-1, -1), colors.beige),
-                ('TEXTCOLOR', (0, 1), (-1, -1), colors.black),
-                ('FONTNAME', (0, 1), (-1, -1), 'Helvetica'),
-                ('FONTSIZE', (0, 1), (-1, -1), 12),
-                ('GRID', (0, 0), (-1, -1), 1, colors.black),
-                ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
-                ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
-            ]))
-            
-            story.append(table)
-            
-            # Build PDF
-            doc.build(story)
-            
-            QMessageBox.information(
-                self,
-                "Success",
-                f"Purchase order has been created and PDF saved as:\n{file_name}"
-            )
+            # Build PDF off the GUI thread
+            build_pdf_in_background(self, doc, story, f"Purchase order has been created and PDF saved as:\n{file_name}")
 
     def update_stats(self):
         # Calculate total required chemicals across all standards
@@ -2063,10 +1953,13 @@ class ScienceLabDepartment(QMainWindow):
         super().__init__()
         self.setWindowTitle("Science Lab Management")
         self.setGeometry(100, 100, 1400, 800)
+        # Load reportlab while the user looks around, not on the first PDF
+        pdf_builder.warm_up()
         
         # Create central widget and layout
         central_widget = QWidget()
         self.setCentralWidget(central_widget)
+        self.statusBar().addPermanentWidget(TaskStatusBar())
         main_layout = QVBoxLayout(central_widget)
 
         # Add description text at the top
@@ -2105,20 +1998,14 @@ class ScienceLabDepartment(QMainWindow):
         self.tab_buttons[0].setChecked(True)
         main_layout.addLayout(tab_layout)
         
-        # Create stacked widget for pages
-        self.stack = QStackedWidget()
+        # Create stacked widget for pages; each page is built on first activation
+        self.stack = LazyPageStack()
         main_layout.addWidget(self.stack)
         
-        # Create and add pages
-        self.safety_equipment_page = SafetyEquipmentTab()
-        self.lab_equipment_page = LabEquipmentTab()
-        self.chemical_storage_page = ChemicalStorageTab()
-        self.guest_lectures_page = GuestLecturesTab()
-        
-        self.stack.addWidget(self.safety_equipment_page)
-        self.stack.addWidget(self.lab_equipment_page)
-        self.stack.addWidget(self.chemical_storage_page)
-        self.stack.addWidget(self.guest_lectures_page)
+        self.stack.add_page(SafetyEquipmentTab)
+        self.stack.add_page(LabEquipmentTab)
+        self.stack.add_page(ChemicalStorageTab)
+        self.stack.add_page(GuestLecturesTab)
 
     def switch_tab(self, index):
         # Update button states
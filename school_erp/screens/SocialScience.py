@@ -1,19 +1,22 @@
 import sys
 from PyQt6.QtWidgets import (QApplication, QMainWindow, QVBoxLayout, QHBoxLayout, 
                            QLabel, QPushButton, QTableWidget, QTableWidgetItem, 
-                           QWidget, QLineEdit, QComboBox, QHeaderView, QStackedWidget,
+                           QWidget, QLineEdit, QComboBox, QHeaderView,
                            QDialog, QFormLayout, QSpinBox, QMessageBox, QDateEdit,
                            QFileDialog)
 from PyQt6.QtGui import QIcon, QPixmap, QFont
 from PyQt6.QtCore import Qt, QEasingCurve, QPropertyAnimation, QRect, QDate, QDateTime
 from datetime import datetime
-import sqlite3
 import os
-from reportlab.lib import colors
-from reportlab.lib.pagesizes import letter
-from reportlab.platypus import SimpleDocTemplate, Table, TableStyle, Paragraph, Spacer
-from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
-from reportlab.lib.units import inch
+
+from database.db_config import db_config
+from reports import pdf_builder
+from screens.lazy_pages import LazyPageStack
+from screens.background_tasks import TaskStatusBar, build_pdf_in_background
+from screens.exports import export_dataset_in_background
+
+# Textbooks of this department in the shared textbooks table
+DEPARTMENT = 'Social Science'
 
 class AddBookDialog(QDialog):
     def __init__(self, parent=None):
@@ -80,6 +83,8 @@ class MainWindow(QMainWindow):
         super().__init__()
         self.setWindowTitle("School Management System")
         self.setGeometry(100, 100, 1200, 800)
+        # Load reportlab while the user looks around, not on the first PDF
+        pdf_builder.warm_up()
 
         # Initialize speaking_data with sample social science activities
         self.interactive_data = [
@@ -149,6 +154,7 @@ class MainWindow(QMainWindow):
         # Main Widget and Layout
         self.central_widget = QWidget()
         self.setCentralWidget(self.central_widget)
+        self.statusBar().addPermanentWidget(TaskStatusBar())
         self.main_layout = QVBoxLayout(self.central_widget)
         self.main_layout.setSpacing(0)
         self.main_layout.setContentsMargins(20, 20, 20, 20)
@@ -174,50 +180,32 @@ class MainWindow(QMainWindow):
         self.update_tab_styles("Textbooks")
         self.main_layout.addLayout(self.tab_layout)
         
-        # Content Area
-        self.stack = QStackedWidget()
+        # Content Area; each page is built on first activation
+        self.stack = LazyPageStack()
         self.main_layout.addWidget(self.stack)
         
         # Load initial data
         self.load_books_data()
         
         # Create pages
-        self.textbooks_page = self.create_textbooks_page()
-        self.interactive_page = self.create_interactive_page()
-        self.lesson_plans_page = self.create_lesson_plans_page()
-        self.stack.addWidget(self.textbooks_page)
-        self.stack.addWidget(self.interactive_page)
-        self.stack.addWidget(self.lesson_plans_page)
+        self.stack.add_page(self.create_textbooks_page)
+        self.stack.add_page(self.create_interactive_page)
+        self.stack.add_page(self.create_lesson_plans_page)
         
         # Add placeholder pages for other tabs
         for _ in range(len(self.tabs) - 3):
-            placeholder = QWidget()
-            self.stack.addWidget(placeholder)
+            self.stack.add_page(QWidget)
 
     def create_database(self):
-        conn = sqlite3.connect('social_science_textbooks.db')
-        cursor = conn.cursor()
-        cursor.execute('''
-            CREATE TABLE IF NOT EXISTS textbooks (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                title TEXT NOT NULL,
-                publisher TEXT NOT NULL,
-                quantity INTEGER NOT NULL,
-                condition TEXT NOT NULL,
-                last_inventory TEXT NOT NULL,
-                cost_per_book INTEGER NOT NULL,
-                grade TEXT NOT NULL
-            )
-        ''')
-        conn.commit()
-        conn.close()
+        # The textbooks table is part of the consolidated schema
+        db_config.ensure_schema()
 
     def load_books_data(self):
-        conn = sqlite3.connect('social_science_textbooks.db')
+        conn = db_config.get_connection()
         cursor = conn.cursor()
-        cursor.execute('SELECT title, publisher, quantity, condition, last_inventory, cost_per_book, grade FROM textbooks')
+        cursor.execute('SELECT title, publisher, quantity, condition, last_inventory, cost_per_book, grade FROM textbooks WHERE department = ?', (DEPARTMENT,))
         books = cursor.fetchall()
-        conn.close()
+        cursor.close()
         
         if not books:  # If no data exists, insert sample data
             self.insert_sample_data()
@@ -236,7 +224,7 @@ class MainWindow(QMainWindow):
         return self.books_data
 
     def insert_sample_data(self):
-        conn = sqlite3.connect('social_science_textbooks.db')
+        conn = db_config.get_connection()
         cursor = conn.cursor()
         
         sample_data = [
@@ -249,12 +237,12 @@ class MainWindow(QMainWindow):
         ]
         
         cursor.executemany('''
-            INSERT INTO textbooks (title, publisher, quantity, condition, last_inventory, cost_per_book, grade)
-            VALUES (?, ?, ?, ?, ?, ?, ?)
-        ''', sample_data)
+            INSERT INTO textbooks (department, title, publisher, quantity, condition, last_inventory, cost_per_book, grade)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+        ''', [(DEPARTMENT,) + book for book in sample_data])
         
         conn.commit()
-        conn.close()
+        cursor.close()
 
     def populate_table(self, data):
         self.table.setRowCount(len(data))
@@ -475,6 +463,22 @@ class MainWindow(QMainWindow):
         order_btn.clicked.connect(self.order_supplies)
         controls.addWidget(order_btn)
         
+        export_btn = QPushButton("Export")
+        export_btn.setStyleSheet("""
+            QPushButton {
+                background-color: #6c757d;
+                color: white;
+                border: none;
+                border-radius: 4px;
+                padding: 8px 15px;
+                font-size: 14px;
+            }
+        """)
+        export_btn.clicked.connect(
+            lambda: export_dataset_in_background(self, 'textbooks', "social_science_textbooks.xlsx", department=DEPARTMENT)
+        )
+        controls.addWidget(export_btn)
+        
         layout.addLayout(controls)
         
         # Table
@@ -1018,10 +1022,11 @@ class MainWindow(QMainWindow):
     def add_book(self):
         dialog = AddBookDialog(self)
         if dialog.exec() == QDialog.DialogCode.Accepted:
-            conn = sqlite3.connect('social_science_textbooks.db')
+            conn = db_config.get_connection()
             cursor = conn.cursor()
             
             new_book = (
+                DEPARTMENT,
                 f"{dialog.grade.currentText()} {dialog.title.text()}",
                 dialog.publisher.text(),
                 dialog.quantity.value(),
@@ -1032,12 +1037,12 @@ class MainWindow(QMainWindow):
             )
             
             cursor.execute('''
-                INSERT INTO textbooks (title, publisher, quantity, condition, last_inventory, cost_per_book, grade)
-                VALUES (?, ?, ?, ?, ?, ?, ?)
+                INSERT INTO textbooks (department, title, publisher, quantity, condition, last_inventory, cost_per_book, grade)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?)
             ''', new_book)
             
             conn.commit()
-            conn.close()
+            cursor.close()
             
             self.load_books_data()
             self.populate_table(self.books_data)
@@ -1209,32 +1214,11 @@ class MainWindow(QMainWindow):
             if not file_name.endswith('.pdf'):
                 file_name += '.pdf'
             
-            doc = SimpleDocTemplate(
-                file_name,
-                pagesize=letter,
-                rightMargin=72,
-                leftMargin=72,
-                topMargin=72,
-                bottomMargin=72
-            )
-            
-            elements = []
-            styles = getSampleStyleSheet()
-            title_style = ParagraphStyle(
-                'CustomTitle',
-                parent=styles['Heading1'],
-                fontSize=24,
-                spaceAfter=30
+            doc = pdf_builder.document(file_name)
+            elements = pdf_builder.title_block(
+                "Social Science Textbook Order Summary", f"Date: {datetime.now().strftime('%Y-%m-%d')}"
             )
             
-            elements.append(Paragraph("Social Science Textbook Order Summary", title_style))
-            elements.append(Spacer(1, 12))
-            
-            date_style = styles["Normal"]
-            date_style.fontSize = 12
-            elements.append(Paragraph(f"Date: {datetime.now().strftime('%Y-%m-%d')}", date_style))
-            elements.append(Spacer(1, 12))
-            
             table_data = [["Title", "Quantity", "Cost per Book (₹)", "Total Cost (₹)"]]
             for item in order_data:
                 table_data.append([
@@ -1244,38 +1228,14 @@ class MainWindow(QMainWindow):
                     str(item['cost_per_book'] * item['quantity'])
                 ])
             
-            table = Table(table_data, colWidths=[4*inch, 1*inch, 1.5*inch, 1.5*inch])
-            table.setStyle(TableStyle([
-                ('BACKGROUND', (0, 0), (-1, 0), colors.grey),
-                ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
-                ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
-                ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-                ('FONTSIZE', (0, 0), (-1, 0), 14),
-                ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
-                ('BACKGROUND', (0, 1), (-1, -1), colors.beige),
-                ('TEXTCOLOR', (0, 1), (-1, -1), colors.black),
-                ('FONTNAME', (0, 1), (-1, -1), 'Helvetica'),
-                ('FONTSIZE', (0, 1), (-1, -1), 12),
-                ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
-                ('GRID', (0, 0), (-1, -1), 1, colors.black)
-            ]))
-            
-            elements.append(table)
-            elements.append(Spacer(1, 20))
-            
-            total_paragraph = Paragraph(
-                f"<para fontSize=14><b>Total Order Cost: ₹{total_cost:,}</b></para>",
-                styles["Normal"]
+            elements += pdf_builder.table(
+                table_data, col_widths=[4 * pdf_builder.INCH, 1 * pdf_builder.INCH,
+                                        1.5 * pdf_builder.INCH, 1.5 * pdf_builder.INCH]
             )
-            elements.append(total_paragraph)
-            
-            doc.build(elements)
+            elements.append(pdf_builder.spacer(20))
+            elements.append(pdf_builder.paragraph(f"Total Order Cost: ₹{total_cost:,}", 'total'))
             
-            QMessageBox.information(
-                self,
-                "Success",
-                f"PDF has been generated and saved to:\n{file_name}"
-            )
+            build_pdf_in_background(self, doc, elements, f"PDF has been generated and saved to:\n{file_name}")
 
     def populate_lesson_table(self, data):
         self.lesson_table.setRowCount(len(data))
@@ -1684,34 +1644,11 @@ class MainWindow(QMainWindow):
                 if not file_name.endswith('.pdf'):
                     file_name += '.pdf'
                 
-                doc = SimpleDocTemplate(
-                    file_name,
-                    pagesize=letter,
-                    rightMargin=72,
-                    leftMargin=72,
-                    topMargin=72,
-                    bottomMargin=72
+                doc = pdf_builder.document(file_name)
+                elements = pdf_builder.title_block(
+                    "Social Science Department - Supply Order", f"Date: {datetime.now().strftime('%Y-%m-%d')}"
                 )
                 
-                elements = []
-                styles = getSampleStyleSheet()
-                
-                # Title
-                title_style = ParagraphStyle(
-                    'CustomTitle',
-                    parent=styles['Heading1'],
-                    fontSize=24,
-                    spaceAfter=30
-                )
-                elements.append(Paragraph("Social Science Department - Supply Order", title_style))
-                elements.append(Spacer(1, 12))
-                
-                # Date
-                date_style = styles["Normal"]
-                date_style.fontSize = 12
-                elements.append(Paragraph(f"Date: {datetime.now().strftime('%Y-%m-%d')}", date_style))
-                elements.append(Spacer(1, 12))
-                
                 # Order details table
                 table_data = [["Resource Name", "Order Quantity", "Unit Cost (₹)", "Total Cost (₹)"]]
                 
@@ -1730,38 +1667,20 @@ class MainWindow(QMainWindow):
                         f"₹{total:,}"
                     ])
                 
-                pdf_table = Table(table_data, colWidths=[4*inch, 1.2*inch, 1.2*inch, 1.2*inch])
-                pdf_table.setStyle(TableStyle([
-                    ('BACKGROUND', (0, 0), (-1, 0), colors.grey),
-                    ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
-                    ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
-                    ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-                    ('FONTSIZE', (0, 0), (-1, 0), 14),
-                    ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
-                    ('BACKGROUND', (0, 1), (-1, -1), colors.beige),
-                    ('TEXTCOLOR', (0, 1), (-1, -1), colors.black),
-                    ('FONTNAME', (0, 1), (-1, -1), 'Helvetica'),
-                    ('FONTSIZE', (0, 1), (-1, -1), 12),
-                    ('GRID', (0, 0), (-1, -1), 1, colors.black)
-                ]))
-                
-                elements.append(pdf_table)
-                elements.append(Spacer(1, 20))
+                elements += pdf_builder.table(
+                    table_data, col_widths=[4 * pdf_builder.INCH, 1.2 * pdf_builder.INCH,
+                                            1.2 * pdf_builder.INCH, 1.2 * pdf_builder.INCH]
+                )
+                elements.append(pdf_builder.spacer(20))
                 
                 # Grand Total
-                elements.append(Paragraph(
-                    f"<para fontSize=14><b>Grand Total: ₹{grand_total:,}</b></para>",
-                    styles["Normal"]
-                ))
-                
-                doc.build(elements)
+                elements.append(pdf_builder.paragraph(f"Grand Total: ₹{grand_total:,}", 'total'))
                 
-                QMessageBox.information(
-                    dialog,
-                    "Success",
-                    f"Order PDF has been generated and saved to:\n{file_name}"
+                build_pdf_in_background(
+                    dialog, doc, elements,
+                    f"Order PDF has been generated and saved to:\n{file_name}",
+                    on_success=dialog.accept
                 )
-                dialog.accept()
         
         generate_pdf_btn.clicked.connect(generate_pdf)
         cancel_btn.clicked.connect(dialog.reject)
@@ -10,6 +10,7 @@ import os
 import sys
 import shutil
 from datetime import datetime
+from screens.row_actions import set_row_actions
 
 class SportsRecreationPage(QMainWindow):
     def __init__(self):
@@ -222,6 +223,7 @@ class CoachDataPage(QWidget):
             "Name", "Sport", "Experience", "Contact", "Status", "Actions"
         ])
         self.coaches_table.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeMode.Stretch)
+        set_row_actions(self.coaches_table, 5, {"Update": None, "View": self.show_view_form})
         layout.addWidget(self.coaches_table)
 
     def load_sample_data(self):
@@ -241,44 +243,6 @@ class CoachDataPage(QWidget):
             self.coaches_table.setItem(row, 2, QTableWidgetItem(coach["experience"]))
             self.coaches_table.setItem(row, 3, QTableWidgetItem(coach["contact"]))
             self.coaches_table.setItem(row, 4, QTableWidgetItem(coach["status"]))
-            
-            # Add action buttons
-            actions_widget = QWidget()
-            actions_layout = QHBoxLayout(actions_widget)
-            actions_layout.setContentsMargins(0, 0, 0, 0)
-            
-            update_btn = QPushButton("Update")
-            update_btn.setStyleSheet("""
-                QPushButton {
-                    background-color: #1a73e8;
-                    color: white;
-                    padding: 4px 8px;
-                    border-radius: 3px;
-                    font-size: 12px;
-                }
-                QPushButton:hover {
-                    background-color: #1557b0;
-                }
-            """)
-            
-            view_btn = QPushButton("View")
-            view_btn.setStyleSheet("""
-                QPushButton {
-                    background-color: #28a745;
-                    color: white;
-                    padding: 4px 8px;
-                    border-radius: 3px;
-                    font-size: 12px;
-                }
-                QPushButton:hover {
-                    background-color: #218838;
-                }
-            """)
-            view_btn.clicked.connect(lambda checked, r=row: self.show_view_form(r))
-            
-            actions_layout.addWidget(update_btn)
-            actions_layout.addWidget(view_btn)
-            self.coaches_table.setCellWidget(row, 5, actions_widget)
 
     def show_view_form(self, row=None):
         # Create view form dialog
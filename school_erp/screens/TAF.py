@@ -6,8 +6,9 @@ from PyQt6.QtWidgets import (
     QTableWidgetItem, QFileDialog, QTextEdit, QDateEdit, QTimeEdit, QStackedWidget
 )
 from PyQt6.QtCore import Qt
-from reportlab.lib.pagesizes import letter
-from reportlab.pdfgen import canvas
+
+from reports import pdf_builder
+from screens.background_tasks import build_pdf_in_background
 
 class TeacherAdmissionForm(QWidget):
     def __init__(self):
@@ -111,14 +112,14 @@ class TeacherAdmissionForm(QWidget):
         pdf_path = QFileDialog.getSaveFileName(self, "Save PDF", "Teacher_Admission_Form.pdf", "PDF Files (*.pdf)")[0]
         if not pdf_path:
             return
-        c = canvas.Canvas(pdf_path, pagesize=letter)
-        c.drawString(200, 800, "Teacher Admission Form")
-        c.setFont("Helvetica", 10)
-        c.drawString(50, 770, "Interview Details:")
-        c.drawString(70, 750, f"Date: {self.interview_date.text()}")
-        c.drawString(70, 730, f"Time: {self.interview_time.text()}")
-        c.drawString(70, 710, f"Panel Members: {self.panel_members.toPlainText()}")
-        c.save()
+        elements = pdf_builder.title_block("Teacher Admission Form")
+        elements.append(pdf_builder.paragraph("Interview Details", 'heading'))
+        elements += pdf_builder.table([
+            ["Date:", self.interview_date.text()],
+            ["Time:", self.interview_time.text()],
+            ["Panel Members:", self.panel_members.toPlainText()],
+        ], style='details', col_widths=[150, 300], header=False)
+        build_pdf_in_background(self, pdf_builder.document(pdf_path), elements, f"PDF saved at: {pdf_path}")
 
     def upload_file(self, label):
         file_dialog = QFileDialog()
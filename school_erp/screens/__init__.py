@@ -1,19 +1,38 @@
 """
 School ERP System - Screens Package
 This package contains all the screen modules for the School ERP system.
+
+The names below are imported on first access, so importing one screen (the
+login window at startup) does not pull in every other screen and the
+pandas, reportlab and NumPy imports behind them. As in any package, once
+a submodule sharing a name below (ExamDepartment, SalarySlip) has been
+imported, that name on the package is the submodule.
 """
 
-from .database import Database, DatabaseHandler
-from .SalarySlip import SalarySlip
-from .login_screen import LoginScreen
-from .ExamDepartment import ExamDepartment
-from .main_window import MainWindow
-
-__all__ = [
-    'Database',
-    'DatabaseHandler',
-    'SalarySlip',
-    'LoginScreen',
-    'ExamDepartment',
-    'MainWindow'
-] 
\ No newline at end of file
+import importlib
+
+# name: (module, attribute); the modules the names were always imported from
+_EXPORTS = {
+    'Database': ('.database', 'Database'),
+    'DatabaseHandler': ('.database', 'DatabaseHandler'),
+    'SalarySlip': ('.SalarySlip', 'SalarySlip'),
+    'LoginScreen': ('.login_screen', 'LoginScreen'),
+    'ExamDepartment': ('.ExamDepartment', 'ExamDepartment'),
+    'MainWindow': ('.main_window', 'MainWindow'),
+}
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name):
+    if name not in _EXPORTS:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    module_name, attribute = _EXPORTS[name]
+    value = getattr(importlib.import_module(module_name, __name__), attribute)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(list(globals()) + __all__)
+
@@ -1,7 +1,8 @@
 import sys
-import os
-import pandas as pd
-import sqlite3
+from database.db_config import db_config
+from database.teacher_dao import TeacherDAO
+from database.metrics import metrics
+from database.write_queue import write_queue
 from PyQt6.QtWidgets import (
     QApplication, QWidget, QHBoxLayout, QVBoxLayout,
     QPushButton, QLabel, QFrame, QStackedLayout, QTextEdit,
@@ -15,58 +16,18 @@ from PyQt6.QtCore import Qt, QTimer, QTime, QDateTime, QMargins
 from PyQt6.QtGui import QFont, QTextDocument
 from datetime import datetime
 
+from screens.background_tasks import run_in_background, build_pdf_in_background, when_committed, TaskStatusBar
+
 class SalaryDatabase:
     def __init__(self):
         self.setup_database()
 
     def setup_database(self):
-        """Initialize the salary database with required tables"""
+        """Connect to the consolidated store that holds teachers and salaries"""
         try:
-            self.conn = sqlite3.connect("school_data.db")
-            self.cursor = self.conn.cursor()
-
-            # Create teachers table if not exists
-            self.cursor.execute('''
-            CREATE TABLE IF NOT EXISTS teachers (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                teacher_id TEXT UNIQUE,
-                name TEXT,
-                designation TEXT,
-                department TEXT,
-                joining_date TEXT,
-                bank_account TEXT,
-                pf_no TEXT,
-                basic_salary REAL,
-                da_percent REAL,
-                hra_percent REAL,
-                conveyance REAL,
-                medical REAL,
-                other_allowances REAL,
-                pf_deduction REAL,
-                professional_tax REAL,
-                income_tax REAL,
-                other_deductions REAL
-            )
-            ''')
-
-            # Create salary_payments table if not exists
-            self.cursor.execute('''
-            CREATE TABLE IF NOT EXISTS salary_payments (
-                payment_id INTEGER PRIMARY KEY AUTOINCREMENT,
-                teacher_id TEXT,
-                payment_date TEXT,
-                month_year TEXT,
-                total_earnings REAL,
-                total_deductions REAL,
-                net_salary REAL,
-                payment_method TEXT,
-                payment_status TEXT,
-                FOREIGN KEY (teacher_id) REFERENCES teachers (teacher_id)
-            )
-            ''')
-
-            self.conn.commit()
-            print("Salary database initialized successfully!")
+            self.dao = TeacherDAO()
+            self.conn = self.dao.conn
+            self.cursor = self.dao.cursor
 
         except Exception as e:
             print(f"Error setting up database: {e}")
@@ -74,40 +35,27 @@ class SalaryDatabase:
     def get_teacher_details(self, teacher_id):
         """Get teacher details including salary structure"""
         try:
-            self.cursor.execute('''
-                SELECT * FROM teachers WHERE teacher_id = ?
-            ''', (teacher_id,))
-            
-            teacher = self.cursor.fetchone()
+            teacher = self.dao.get_teacher_details(teacher_id)
             if teacher:
-                # Convert to dictionary with column names
-                columns = [description[0] for description in self.cursor.description]
-                teacher_dict = dict(zip(columns, teacher))
-                
-                # Calculate derived values
-                basic_salary = teacher_dict['basic_salary']
-                da_amount = basic_salary * (teacher_dict['da_percent'] / 100)
-                hra_amount = basic_salary * (teacher_dict['hra_percent'] / 100)
-                
                 # Return complete teacher details
                 return {
-                    'name': teacher_dict['name'],
-                    'designation': teacher_dict['designation'],
-                    'department': teacher_dict['department'],
-                    'joining_date': teacher_dict['joining_date'],
-                    'bank_account': teacher_dict['bank_account'],
-                    'pf_no': teacher_dict['pf_no'],
+                    'name': teacher['name'],
+                    'designation': teacher['designation'],
+                    'department': teacher['department'],
+                    'joining_date': teacher['joining_date'],
+                    'bank_account': teacher['bank_account'],
+                    'pf_no': teacher['pf_no'],
                     'salary_structure': {
-                        'basic_salary': basic_salary,
-                        'da_amount': da_amount,
-                        'hra_amount': hra_amount,
-                        'conveyance': teacher_dict['conveyance'],
-                        'medical': teacher_dict['medical'],
-                        'other_allowances': teacher_dict['other_allowances'],
-                        'pf_deduction': teacher_dict['pf_deduction'],
-                        'professional_tax': teacher_dict['professional_tax'],
-                        'income_tax': teacher_dict['income_tax'],
-                        'other_deductions': teacher_dict['other_deductions']
+                        'basic_salary': teacher['basic_salary'],
+                        'da_amount': teacher['da_amount'],
+                        'hra_amount': teacher['hra_amount'],
+                        'conveyance': teacher['conveyance'],
+                        'medical': teacher['medical'],
+                        'other_allowances': teacher['other_allowances'],
+                        'pf_deduction': teacher['pf_deduction'],
+                        'professional_tax': teacher['professional_tax'],
+                        'income_tax': teacher['income_tax'],
+                        'other_deductions': teacher['other_deductions']
                     }
                 }
             return None
@@ -116,34 +64,13 @@ class SalaryDatabase:
             return None
 
     def record_salary_payment(self, payment_data):
-        """Record a salary payment in the database"""
-        try:
-            self.cursor.execute('''
-                INSERT INTO salary_payments (
-                    teacher_id, payment_date, month_year,
-                    total_earnings, total_deductions, net_salary,
-                    payment_method, payment_status
-                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?)
-            ''', (
-                payment_data['teacher_id'],
-                payment_data['payment_date'],
-                payment_data['month_year'],
-                payment_data['total_earnings'],
-                payment_data['total_deductions'],
-                payment_data['net_salary'],
-                payment_data['payment_method'],
-                payment_data['payment_status']
-            ))
-            self.conn.commit()
-            return True
-        except Exception as e:
-            print(f"Error recording salary payment: {e}")
-            return False
+        """Queue a salary payment; returns the write queue Future of its ID"""
+        return self.dao.record_salary_payment(payment_data)
 
     def close(self):
-        """Close the database connection"""
-        if hasattr(self, 'conn'):
-            self.conn.close()
+        """Release the cursor; the connection stays with the shared pool"""
+        if hasattr(self, 'dao'):
+            self.dao.close()
 
 class SalarySlipWidget(QWidget):
     def __init__(self):
@@ -552,10 +479,8 @@ class SalarySlipWidget(QWidget):
             ]))
             content.append(footer_table)
             
-            # Build PDF
-            doc.build(content)
-            
-            QMessageBox.information(self, "Success", f"PDF saved successfully at:\n{file_path}")
+            # Build PDF off the GUI thread
+            build_pdf_in_background(self, doc, content, f"PDF saved successfully at:\n{file_path}")
             
         except Exception as e:
             QMessageBox.critical(self, "Error", f"Failed to generate PDF: {str(e)}")
@@ -631,10 +556,14 @@ class SalarySlipWidget(QWidget):
                     'payment_status': "Completed"
                 }
                 
-                if self.db.record_salary_payment(payment_data):
-                    QMessageBox.information(self, "Success", "Payment processed successfully!")
-                else:
-                    QMessageBox.warning(self, "Error", "Failed to record payment.")
+                # Report once the write queue commits the payment
+                when_committed(
+                    self.db.record_salary_payment(payment_data),
+                    on_result=lambda payment_id: QMessageBox.information(
+                        self, "Success", "Payment processed successfully!"),
+                    on_error=lambda error: QMessageBox.warning(
+                        self, "Error", f"Failed to record payment: {error}")
+                )
             
         except Exception as e:
             QMessageBox.critical(self, "Error", f"Failed to process payment: {str(e)}")
@@ -646,24 +575,17 @@ class AdminDashboard(QWidget):
         self.setGeometry(100, 100, 1200, 700)
         self.setStyleSheet("background-color: #eef9fd;")
 
+        self.metrics_version = None
+        self.metrics_refreshing = False
+
         self.initDatabase()
         self.initUI()
         self.loadDashboardData()
 
     def initDatabase(self):
-        """Connect to SQLite database"""
-        self.conn = sqlite3.connect("school_data.db")
+        """Borrow the pooled connection to the consolidated database (notices are migrated there)"""
+        self.conn = db_config.get_connection()
         self.cursor = self.conn.cursor()
-        # Create notices table if it doesn't exist
-        self.cursor.execute('''
-            CREATE TABLE IF NOT EXISTS notices (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                title TEXT NOT NULL,
-                content TEXT NOT NULL,
-                timestamp DATETIME DEFAULT CURRENT_TIMESTAMP
-            )
-        ''')
-        self.conn.commit()
 
     def initUI(self):
         """Initialize User Interface"""
@@ -743,6 +665,7 @@ class AdminDashboard(QWidget):
         dashboard_layout.setContentsMargins(30, 30, 30, 30)
 
         top_bar_layout = QHBoxLayout()
+        top_bar_layout.addWidget(TaskStatusBar())
         self.clock_label = QLabel()
         self.clock_label.setStyleSheet("font-size: 16px; font-weight: bold; color: #555;")
         top_bar_layout.addStretch()
@@ -751,6 +674,8 @@ class AdminDashboard(QWidget):
 
         timer = QTimer(self)
         timer.timeout.connect(self.updateClock)
+        # Counters are cached, so polling them with the clock is cheap
+        timer.timeout.connect(self.loadDashboardData)
         timer.start(1000)
         self.updateClock()
 
@@ -765,8 +690,11 @@ class AdminDashboard(QWidget):
         self.total_students_card = QLabel("Total Students: Loading...")
         self.pending_fees_card = QLabel("Pending Fees: Loading...")
         self.total_teachers_card = QLabel("Total Teachers: Loading...")
+        self.notices_today_card = QLabel("Notices Today: Loading...")
+        self.payroll_status_card = QLabel("Payroll: Loading...")
 
-        for card in [self.total_students_card, self.pending_fees_card, self.total_teachers_card]:
+        for card in [self.total_students_card, self.pending_fees_card, self.total_teachers_card,
+                     self.notices_today_card, self.payroll_status_card]:
             card.setFixedSize(180, 60)
             card.setStyleSheet("background-color: #6d78f6; color: white; font-weight: bold; border-radius: 10px;")
             card.setAlignment(Qt.AlignmentFlag.AlignCenter)
@@ -788,29 +716,32 @@ class AdminDashboard(QWidget):
         self.clock_label.setText(f"🕒 {current_time}")
 
     def loadDashboardData(self):
-        """Fetch student, pending fees, and teacher data from the database"""
-        try:
-            df = pd.read_excel("screens/students.xlsx", skiprows=3)
-            df.columns = df.columns.str.strip().str.lower()
-            df.rename(columns={
-                "babalad vakratunda shrishail": "student_name",
-                "joyti": "roll_no",
-                "akurdi": "dob"
-            }, inplace=True)
-
-            total_students = df.shape[0] if "student_name" in df.columns else 0
-            self.total_students_card.setText(f"Total Students: {total_students}")
-
-            self.cursor.execute("SELECT COUNT(*) FROM pending_fees")
-            pending_fees = self.cursor.fetchone()[0]
-            self.pending_fees_card.setText(f"Pending Fees: {pending_fees}")
-
-            self.cursor.execute("SELECT COUNT(*) FROM teachers")
-            total_teachers = self.cursor.fetchone()[0]
-            self.total_teachers_card.setText(f"Total Teachers: {total_teachers}")
-
-        except Exception as e:
-            print(f"❌ Error fetching dashboard data: {e}")
+        """Show the cached dashboard counters and refresh stale ones in the background"""
+        if metrics.version != self.metrics_version:
+            self.metrics_version = metrics.version
+            self.showDashboardData(metrics.snapshot())
+
+        if not self.metrics_refreshing and metrics.stale():
+            self.metrics_refreshing = True
+            run_in_background(
+                metrics.refresh,
+                on_result=self.showDashboardData,
+                message="Refreshing dashboard..."
+            ).signals.finished.connect(self.finishMetricsRefresh)
+
+    def finishMetricsRefresh(self):
+        self.metrics_refreshing = False
+
+    def showDashboardData(self, counts):
+        """Fill the dashboard cards with the cached counters"""
+        self.metrics_version = metrics.version
+        self.total_students_card.setText(f"Total Students: {counts.get('students', '...')}")
+        self.pending_fees_card.setText(f"Pending Fees: {counts.get('pending_fees', '...')}")
+        self.total_teachers_card.setText(f"Total Teachers: {counts.get('teachers', '...')}")
+        self.notices_today_card.setText(f"Notices Today: {counts.get('notices_today', '...')}")
+        if 'payroll_status' in counts:
+            status, processed, total = counts['payroll_status']
+            self.payroll_status_card.setText(f"Payroll: {status} ({processed}/{total})")
 
     def showNoticeBoard(self):
         """Create and show Digital Notice Board"""
@@ -883,15 +814,24 @@ class AdminDashboard(QWidget):
             content = content_input.toPlainText().strip()
             if title and content:
                 timestamp = QDateTime.currentDateTime().toString("yyyy-MM-dd hh:mm:ss")
-                self.cursor.execute(
+                future = write_queue.submit(
                     "INSERT INTO notices (title, content, timestamp) VALUES (?, ?, ?)",
                     (title, content, timestamp)
                 )
-                self.conn.commit()
                 
-                # Add to list
+                # Add to list now; take it back out if the write fails
                 item = QListWidgetItem(f"📢 {title}\n🕒 {timestamp}")
                 notice_list.insertItem(0, item)
+
+                def notice_failed(error):
+                    notice_list.takeItem(notice_list.row(item))
+                    QMessageBox.warning(self, "Error", f"Failed to post notice: {error}")
+
+                when_committed(
+                    future,
+                    on_result=lambda row_id: metrics.adjust('notices_today', 1),
+                    on_error=notice_failed
+                )
                 
                 # Clear inputs
                 title_input.clear()
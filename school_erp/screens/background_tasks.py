@@ -0,0 +1,236 @@
+from PyQt6.QtCore import QObject, QRunnable, QThreadPool, pyqtSignal
+from PyQt6.QtWidgets import QWidget, QHBoxLayout, QLabel, QProgressBar, QPushButton, QMessageBox
+
+
+class TaskCancelled(Exception):
+    """Raised inside a task's progress callback once the task is cancelled"""
+
+
+class TaskSignals(QObject):
+    """Signals a Task emits back to the GUI thread"""
+    progress = pyqtSignal(int, int)
+    result = pyqtSignal(object)
+    error = pyqtSignal(str)
+    finished = pyqtSignal()
+
+
+class Task(QRunnable):
+    """Runs fn(*args, **kwargs) on a pool thread and reports through signals.
+
+    With report_progress=True, fn is also passed progress_callback(done, total),
+    the hook run_monthly_payroll and generate_salary_slips already take; it
+    emits progress and raises TaskCancelled once the task is cancelled, so long
+    loops stop at their next step. A cancelled task emits no result; finished
+    is always emitted.
+    """
+
+    def __init__(self, fn, *args, report_progress=False, **kwargs):
+        super().__init__()
+        # The manager holds the task until it finishes
+        self.setAutoDelete(False)
+        self.fn = fn
+        self.args = args
+        self.kwargs = kwargs
+        self.signals = TaskSignals()
+        self.cancelled = False
+        if report_progress:
+            self.kwargs['progress_callback'] = self._report_progress
+
+    def _report_progress(self, done, total):
+        if self.cancelled:
+            raise TaskCancelled()
+        self.signals.progress.emit(done, total)
+
+    def cancel(self):
+        self.cancelled = True
+
+    def run(self):
+        try:
+            result = self.fn(*self.args, **self.kwargs)
+            if not self.cancelled:
+                self.signals.result.emit(result)
+        except TaskCancelled:
+            pass
+        except Exception as e:
+            print(f"Background task error: {str(e)}")
+            if not self.cancelled:
+                self.signals.error.emit(str(e))
+        finally:
+            self.signals.finished.emit()
+
+
+class TaskManager(QObject):
+    """Submits tasks to the global QThreadPool and tracks the ones still running"""
+    status_changed = pyqtSignal(str)
+    busy_changed = pyqtSignal(bool)
+    progress = pyqtSignal(int, int)
+
+    def __init__(self, pool=None):
+        super().__init__()
+        self.pool = pool or QThreadPool.globalInstance()
+        self._tasks = {}
+
+    def submit(self, fn, *args, on_result=None, on_error=None, on_progress=None,
+               message="Working...", report_progress=False, **kwargs):
+        """Run fn(*args, **kwargs) in the background; callbacks run on the GUI thread"""
+        task = Task(fn, *args, report_progress=report_progress, **kwargs)
+        if on_result:
+            task.signals.result.connect(on_result)
+        if on_error:
+            task.signals.error.connect(on_error)
+        if on_progress:
+            task.signals.progress.connect(on_progress)
+        task.signals.progress.connect(self.progress)
+        task.signals.finished.connect(lambda: self._finished(task))
+
+        was_busy = self.is_busy()
+        self._tasks[task] = message
+        self.status_changed.emit(message)
+        if not was_busy:
+            self.busy_changed.emit(True)
+        self.pool.start(task)
+        return task
+
+    def _finished(self, task):
+        if self._tasks.pop(task, None) is None:
+            return
+        if self._tasks:
+            self.status_changed.emit(next(reversed(self._tasks.values())))
+        else:
+            self.status_changed.emit("")
+            self.busy_changed.emit(False)
+
+    def cancel(self, task):
+        """Cancel a task; one still queued is dropped without running"""
+        task.cancel()
+        if self.pool.tryTake(task):
+            task.signals.finished.emit()
+
+    def cancel_all(self):
+        for task in list(self._tasks):
+            self.cancel(task)
+
+    def is_busy(self):
+        return bool(self._tasks)
+
+    def wait(self, msecs=-1):
+        """Block until every pool thread is idle (e.g. before closing the database)"""
+        return self.pool.waitForDone(msecs)
+
+
+_task_manager = None
+
+
+def task_manager():
+    """The application-wide TaskManager"""
+    global _task_manager
+    if _task_manager is None:
+        _task_manager = TaskManager()
+    return _task_manager
+
+
+def run_in_background(fn, *args, **kwargs):
+    """Submit fn to the application-wide TaskManager; see TaskManager.submit"""
+    return task_manager().submit(fn, *args, **kwargs)
+
+
+def when_committed(future, on_result=None, on_error=None):
+    """Run callbacks on the GUI thread once a write_queue Future completes.
+
+    on_result gets the write's result (its lastrowid), on_error the message
+    of the error that rolled it back.
+    """
+    signals = TaskSignals()
+    if on_result:
+        signals.result.connect(on_result)
+    if on_error:
+        signals.error.connect(on_error)
+
+    def done(f):
+        # Runs on the writer thread; the signals queue the calls to the GUI thread
+        error = f.exception()
+        if error is not None:
+            signals.error.emit(str(error))
+        else:
+            signals.result.emit(f.result())
+
+    future.add_done_callback(done)
+    return signals
+
+
+def build_pdf_in_background(parent, doc, elements, success_message, on_success=None):
+    """Run a reportlab doc.build(elements) on a pool thread and report the outcome.
+
+    The flowables are assembled on the GUI thread from widget values; only the
+    layout and file write move off it. on_success runs after the message box.
+    """
+    def finished(result):
+        QMessageBox.information(parent, "Success", success_message)
+        if on_success:
+            on_success()
+
+    return run_in_background(
+        doc.build, elements,
+        on_result=finished,
+        on_error=lambda error: QMessageBox.critical(parent, "Error", f"Failed to generate PDF: {error}"),
+        message="Generating PDF..."
+    )
+
+
+class TaskStatusBar(QWidget):
+    """Status label, progress bar and Cancel button for background tasks.
+
+    Hidden while nothing runs. The bar is indeterminate until a task reports
+    progress. Add it to a QStatusBar with addPermanentWidget or to any layout.
+    """
+
+    def __init__(self, manager=None, parent=None):
+        super().__init__(parent)
+        self.manager = manager or task_manager()
+
+        layout = QHBoxLayout(self)
+        layout.setContentsMargins(4, 0, 4, 0)
+
+        self.status_label = QLabel()
+        self.status_label.setStyleSheet("color: #2c3e50;")
+        layout.addWidget(self.status_label)
+
+        self.progress_bar = QProgressBar()
+        self.progress_bar.setMaximumWidth(200)
+        self.progress_bar.setMaximumHeight(16)
+        self.progress_bar.setTextVisible(False)
+        layout.addWidget(self.progress_bar)
+
+        self.cancel_btn = QPushButton("Cancel")
+        self.cancel_btn.setStyleSheet("""
+            QPushButton {
+                background-color: #dc3545;
+                color: white;
+                border: none;
+                padding: 2px 10px;
+                border-radius: 3px;
+            }
+            QPushButton:hover {
+                background-color: #c82333;
+            }
+        """)
+        self.cancel_btn.clicked.connect(self.manager.cancel_all)
+        layout.addWidget(self.cancel_btn)
+
+        self.manager.status_changed.connect(self.status_label.setText)
+        self.manager.busy_changed.connect(self.set_busy)
+        self.manager.progress.connect(self.set_progress)
+        self.set_busy(self.manager.is_busy())
+
+    def set_busy(self, busy):
+        # Indeterminate until the first progress report
+        self.progress_bar.setRange(0, 0)
+        self.setVisible(busy)
+
+    def set_progress(self, done, total):
+        if total <= 0:
+            # Streaming work with no known end: stay indeterminate
+            self.progress_bar.setRange(0, 0)
+            return
+        self.progress_bar.setRange(0, total)
+        self.progress_bar.setValue(done)
@@ -1,25 +1,16 @@
-import sqlite3
 import os
+import sys
+
+# Make the school_erp root importable when run as a script
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from database.db_config import db_config
 
 def create_users_database():
-    # Get the absolute path to the database
-    db_path = os.path.join(os.path.dirname(__file__), "users.db")
-    
-    # Connect to the database
-    conn = sqlite3.connect(db_path)
+    # Users live in the consolidated database; the schema is migrated on connect
+    conn = db_config.get_connection()
     cursor = conn.cursor()
     
-    # Create users table
-    cursor.execute('''
-    CREATE TABLE IF NOT EXISTS users (
-        id INTEGER PRIMARY KEY AUTOINCREMENT,
-        username TEXT UNIQUE NOT NULL,
-        password TEXT NOT NULL,
-        role TEXT NOT NULL,
-        email TEXT
-    )
-    ''')
-    
     # Insert some test users
     test_users = [
         ('admin', 'admin123', 'admin', 'admin@school.com'),
@@ -31,11 +22,10 @@ def create_users_database():
     VALUES (?, ?, ?, ?)
     ''', test_users)
     
-    # Commit changes and close connection
+    # Commit changes
     conn.commit()
-    conn.close()
     
     print("Users database created successfully!")
 
 if __name__ == "__main__":
-    create_users_database() 
\ No newline at end of file
+    create_users_database()
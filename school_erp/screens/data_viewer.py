@@ -1,81 +1,47 @@
 from PyQt6.QtWidgets import (QApplication, QMainWindow, QWidget, QVBoxLayout, QHBoxLayout,
                              QTabWidget, QTableWidget, QTableWidgetItem, QLabel, QPushButton,
                              QComboBox, QHeaderView)
-from PyQt6.QtCore import Qt
 import sys
 import os
-import sqlite3
+
+from database.db_config import db_config
+from database.teacher_dao import TeacherDAO
+from database.identity_map import IdentityMap
+from database.app_context import app_context
+from screens.table_models import RowTableModel, create_table_view
+from screens.background_tasks import run_in_background, TaskStatusBar
+from screens.exports import export_dataset_in_background
 
 # Database connection
 class Database:
     def __init__(self):
-        self.conn = sqlite3.connect('school_erp.db')
+        self.conn = db_config.get_connection()
         self.cursor = self.conn.cursor()
         self.create_tables()
 
     def create_tables(self):
-        # Create teachers table
-        self.cursor.execute('''
-        CREATE TABLE IF NOT EXISTS teachers (
-            teacher_id TEXT PRIMARY KEY,
-            name TEXT,
-            mother_name TEXT,
-            dob TEXT,
-            age INTEGER,
-            cast_category TEXT,
-            place TEXT,
-            tal TEXT,
-            dist TEXT,
-            state TEXT,
-            adar_no TEXT,
-            contact_no TEXT,
-            designation TEXT,
-            department TEXT,
-            joining_date TEXT,
-            bank_account TEXT,
-            pf_no TEXT
-        )
-        ''')
+        """Ensure the consolidated schema; skipped when it is already current"""
+        db_config.ensure_schema(self.conn)
+
+# Built on first use instead of at import
+app_context.register('viewer_db', Database)
 
-        # Create salary_structure table
-        self.cursor.execute('''
-        CREATE TABLE IF NOT EXISTS salary_structure (
-            teacher_id TEXT,
-            basic_salary REAL,
-            da_amount REAL,
-            hra_amount REAL,
-            conveyance REAL,
-            medical REAL,
-            other_allowances REAL,
-            pf_deduction REAL,
-            professional_tax REAL,
-            income_tax REAL,
-            other_deductions REAL,
-            FOREIGN KEY (teacher_id) REFERENCES teachers (teacher_id)
-        )
-        ''')
 
-        # Create salary_payments table
-        self.cursor.execute('''
-        CREATE TABLE IF NOT EXISTS salary_payments (
-            payment_id INTEGER PRIMARY KEY AUTOINCREMENT,
-            teacher_id TEXT,
-            payment_date TEXT,
-            month_year TEXT,
-            working_days INTEGER,
-            holidays INTEGER,
-            total_earnings REAL,
-            total_deductions REAL,
-            net_salary REAL,
-            payment_method TEXT,
-            payment_status TEXT,
-            FOREIGN KEY (teacher_id) REFERENCES teachers (teacher_id)
-        )
-        ''')
-        self.conn.commit()
+def __getattr__(name):
+    # db used to be created at import; keep the name working
+    if name == 'db':
+        return app_context.get('viewer_db')
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
-# Create database instance
-db = Database()
+def fetch_teachers():
+    """Read the teachers and all their salary structures; runs on a background thread"""
+    conn = db_config.get_connection()
+    teachers = conn.execute("""
+        SELECT teacher_id, name, mother_name, dob, age, cast_category,
+               place, dist, state, adar_no, contact_no, department
+        FROM teachers
+    """).fetchall()
+    return teachers, TeacherDAO().get_salary_structures()
 
 class DatabaseViewer(QMainWindow):
     def __init__(self):
@@ -83,9 +49,14 @@ class DatabaseViewer(QMainWindow):
         self.setWindowTitle("School ERP Database Viewer")
         self.setGeometry(100, 100, 1200, 600)
         
+        # Rows loaded since the last refresh, so switching teachers re-reads nothing
+        self.dao = TeacherDAO()
+        self.identity_map = IdentityMap()
+        
         # Create central widget and layout
         central_widget = QWidget()
         self.setCentralWidget(central_widget)
+        self.statusBar().addPermanentWidget(TaskStatusBar())
         layout = QVBoxLayout(central_widget)
         
         # Create tab widget
@@ -96,14 +67,12 @@ class DatabaseViewer(QMainWindow):
         teachers_tab = QWidget()
         teachers_layout = QVBoxLayout(teachers_tab)
         
-        # Teachers Table
-        self.teachers_table = QTableWidget()
-        self.teachers_table.setColumnCount(12)
-        self.teachers_table.setHorizontalHeaderLabels([
+        # Teachers Table, read on a background thread
+        self.teachers_model = RowTableModel([
             "ID", "Name", "Mother's Name", "DOB", "Age", "Category",
             "Place", "District", "State", "Aadhar", "Contact", "Department"
         ])
-        self.teachers_table.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeMode.ResizeToContents)
+        self.teachers_table, self.teachers_proxy = create_table_view(self.teachers_model, stretch=False)
         teachers_layout.addWidget(self.teachers_table)
         
         # Salary Structure Tab
@@ -141,13 +110,13 @@ class DatabaseViewer(QMainWindow):
         payments_layout.addLayout(payment_select_layout)
         
         # Payments Table
-        self.payments_table = QTableWidget()
-        self.payments_table.setColumnCount(8)
-        self.payments_table.setHorizontalHeaderLabels([
+        self.payments_model = RowTableModel([
             "Date", "Month/Year", "Working Days", "Holidays",
             "Total Earnings", "Total Deductions", "Net Salary", "Status"
         ])
-        self.payments_table.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeMode.ResizeToContents)
+        for col in (4, 5, 6):
+            self.payments_model.formatters[col] = lambda value: f"₹{value}"
+        self.payments_table, self.payments_proxy = create_table_view(self.payments_model, stretch=False)
         payments_layout.addWidget(self.payments_table)
         
         # Add tabs to tab widget
@@ -160,34 +129,44 @@ class DatabaseViewer(QMainWindow):
         refresh_btn.clicked.connect(self.load_all_data)
         layout.addWidget(refresh_btn)
         
+        # Export buttons; whole tables are streamed to file, not read into the views
+        export_layout = QHBoxLayout()
+        exports = [
+            ("Export Teachers", 'teachers'),
+            ("Export Salary Structures", 'salary_structure'),
+            ("Export Payroll History", 'payroll'),
+            ("Export Attendance", 'attendance'),
+        ]
+        for label, dataset in exports:
+            export_btn = QPushButton(label)
+            export_btn.clicked.connect(
+                lambda checked, name=dataset: export_dataset_in_background(self, name, f"{name}.xlsx")
+            )
+            export_layout.addWidget(export_btn)
+        layout.addLayout(export_layout)
+        
         # Load initial data
         self.load_all_data()
     
     def load_all_data(self):
-        self.load_teachers_data()
-        self.update_teacher_combos()
+        run_in_background(fetch_teachers, on_result=self.show_teachers, message="Loading teachers...")
+    
+    def show_teachers(self, result):
+        teachers, structures = result
+        self.identity_map = IdentityMap()
+        for teacher in teachers:
+            self.identity_map.put('salary', teacher[0], structures.get(teacher[0]))
+        self.teachers_model.set_rows(teachers)
+        self.update_teacher_combos(teachers)
         self.load_salary_data()
         self.load_payment_data()
     
-    def load_teachers_data(self):
-        db.cursor.execute("SELECT * FROM teachers")
-        teachers = db.cursor.fetchall()
-        
-        self.teachers_table.setRowCount(len(teachers))
-        for row, teacher in enumerate(teachers):
-            for col in range(12):
-                item = QTableWidgetItem(str(teacher[col]))
-                item.setFlags(item.flags() & ~Qt.ItemFlag.ItemIsEditable)  # Make read-only
-                self.teachers_table.setItem(row, col, item)
-    
-    def update_teacher_combos(self):
-        db.cursor.execute("SELECT teacher_id, name FROM teachers")
-        teachers = db.cursor.fetchall()
-        
+    def update_teacher_combos(self, teachers):
         self.salary_teacher_combo.clear()
         self.payment_teacher_combo.clear()
         
-        for teacher_id, name in teachers:
+        for teacher in teachers:
+            teacher_id, name = teacher[0], teacher[1]
             display_text = f"{name} (ID: {teacher_id})"
             self.salary_teacher_combo.addItem(display_text, teacher_id)
             self.payment_teacher_combo.addItem(display_text, teacher_id)
@@ -196,8 +175,9 @@ class DatabaseViewer(QMainWindow):
         if self.salary_teacher_combo.currentData():
             teacher_id = self.salary_teacher_combo.currentData()
             
-            db.cursor.execute("SELECT * FROM salary_structure WHERE teacher_id = ?", (teacher_id,))
-            salary = db.cursor.fetchone()
+            salary = self.identity_map.get(
+                'salary', teacher_id, lambda key: self.dao.get_salary_structures([key]).get(key)
+            )
             
             if salary:
                 # Earnings
@@ -250,26 +230,12 @@ class DatabaseViewer(QMainWindow):
         if self.payment_teacher_combo.currentData():
             teacher_id = self.payment_teacher_combo.currentData()
             
-            db.cursor.execute("SELECT * FROM salary_payments WHERE teacher_id = ? ORDER BY payment_date DESC", (teacher_id,))
-            payments = db.cursor.fetchall()
-            
-            self.payments_table.setRowCount(len(payments))
-            for row, payment in enumerate(payments):
-                items = [
-                    payment[2],  # payment_date
-                    payment[3],  # month_year
-                    str(payment[4]),  # working_days
-                    str(payment[5]),  # holidays
-                    f"₹{payment[6]}",  # total_earnings
-                    f"₹{payment[7]}",  # total_deductions
-                    f"₹{payment[8]}",  # net_salary
-                    payment[10]  # status
-                ]
-                
-                for col, item_text in enumerate(items):
-                    item = QTableWidgetItem(item_text)
-                    item.setFlags(item.flags() & ~Qt.ItemFlag.ItemIsEditable)  # Make read-only
-                    self.payments_table.setItem(row, col, item)
+            # Read once per teacher until the next refresh
+            payments = self.identity_map.get(
+                'payments', teacher_id, lambda key: self.dao.get_payment_histories([key])[key]
+            )
+            # Date, month/year, working days, holidays, earnings, deductions, net, status
+            self.payments_model.set_rows([payment[2:9] + payment[10:11] for payment in payments])
 
 if __name__ == "__main__":
     app = QApplication(sys.argv)
@@ -1,146 +1,27 @@
-import sqlite3
 from datetime import datetime
-import os
+from database.db_config import db_config
+from database.teacher_dao import TeacherDAO
+from database.app_context import app_context
 
-class Database:
+class Database(TeacherDAO):
     def __init__(self):
-        # Get the absolute path to the database
-        db_path = os.path.join(os.path.dirname(__file__), "school_erp.db")
-        self.conn = sqlite3.connect(db_path)
-        self.cursor = self.conn.cursor()
+        # Teachers, salary structures and payments live in the consolidated store
+        super().__init__()
         self.create_tables()
 
     def create_tables(self):
-        # Create teachers table
-        self.cursor.execute('''
-        CREATE TABLE IF NOT EXISTS teachers (
-            teacher_id TEXT PRIMARY KEY,
-            name TEXT,
-            mother_name TEXT,
-            dob TEXT,
-            age INTEGER,
-            cast_category TEXT,
-            place TEXT,
-            tal TEXT,
-            dist TEXT,
-            state TEXT,
-            adar_no TEXT,
-            contact_no TEXT,
-            designation TEXT,
-            department TEXT,
-            joining_date TEXT,
-            bank_account TEXT,
-            pf_no TEXT
-        )
-        ''')
-
-        # Create salary_structure table
-        self.cursor.execute('''
-        CREATE TABLE IF NOT EXISTS salary_structure (
-            teacher_id TEXT,
-            basic_salary REAL,
-            da_amount REAL,
-            hra_amount REAL,
-            conveyance REAL,
-            medical REAL,
-            other_allowances REAL,
-            pf_deduction REAL,
-            professional_tax REAL,
-            income_tax REAL,
-            other_deductions REAL,
-            FOREIGN KEY (teacher_id) REFERENCES teachers (teacher_id)
-        )
-        ''')
-
-        # Create salary_payments table
-        self.cursor.execute('''
-        CREATE TABLE IF NOT EXISTS salary_payments (
-            payment_id INTEGER PRIMARY KEY AUTOINCREMENT,
-            teacher_id TEXT,
-            payment_date TEXT,
-            month_year TEXT,
-            working_days INTEGER,
-            holidays INTEGER,
-            total_earnings REAL,
-            total_deductions REAL,
-            net_salary REAL,
-            payment_method TEXT,
-            payment_status TEXT,
-            FOREIGN KEY (teacher_id) REFERENCES teachers (teacher_id)
-        )
-        ''')
-
-        self.conn.commit()
-
-    def close(self):
-        self.conn.close()
+        """Ensure the consolidated schema; skipped when it is already current"""
+        db_config.ensure_schema(self.conn)
 
 class DatabaseHandler:
     def __init__(self):
-        self.db_name = os.path.join(os.path.dirname(__file__), "salary_slip.db")
+        self.db_name = db_config.db_path
         self.setup_database()
 
     def setup_database(self):
-        """Create necessary tables if they don't exist"""
+        """Ensure the consolidated schema exists"""
         try:
-            conn = sqlite3.connect(self.db_name)
-            cursor = conn.cursor()
-
-            # Create employees table
-            cursor.execute('''
-                CREATE TABLE IF NOT EXISTS employees (
-                    id TEXT PRIMARY KEY,
-                    name TEXT NOT NULL,
-                    designation TEXT,
-                    department TEXT,
-                    joining_date TEXT,
-                    bank_account TEXT,
-                    pf_number TEXT,
-                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-                )
-            ''')
-
-            # Create salary_slips table
-            cursor.execute('''
-                CREATE TABLE IF NOT EXISTS salary_slips (
-                    slip_id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    employee_id TEXT,
-                    pay_period TEXT,
-                    basic_salary REAL,
-                    da REAL,
-                    hra REAL,
-                    conveyance REAL,
-                    medical REAL,
-                    other_allowances REAL,
-                    pf REAL,
-                    professional_tax REAL,
-                    income_tax REAL,
-                    other_deductions REAL,
-                    gross_salary REAL,
-                    total_deductions REAL,
-                    net_salary REAL,
-                    generated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                    FOREIGN KEY (employee_id) REFERENCES employees (id)
-                )
-            ''')
-
-            # Create payments table
-            cursor.execute('''
-                CREATE TABLE IF NOT EXISTS payments (
-                    payment_id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    slip_id INTEGER,
-                    amount REAL,
-                    payment_method TEXT,
-                    transaction_id TEXT,
-                    payment_details TEXT,
-                    status TEXT,
-                    paid_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                    FOREIGN KEY (slip_id) REFERENCES salary_slips (slip_id)
-                )
-            ''')
-
-            conn.commit()
-            conn.close()
+            db_config.ensure_schema()
 
         except Exception as e:
             print(f"Database setup error: {str(e)}")
@@ -149,13 +30,20 @@ class DatabaseHandler:
     def save_employee(self, emp_data):
         """Save or update employee information"""
         try:
-            conn = sqlite3.connect(self.db_name)
+            conn = db_config.get_connection()
             cursor = conn.cursor()
 
             cursor.execute('''
-                INSERT OR REPLACE INTO employees 
-                (id, name, designation, department, joining_date, bank_account, pf_number)
+                INSERT INTO teachers
+                (teacher_id, name, designation, department, joining_date, bank_account, pf_no)
                 VALUES (?, ?, ?, ?, ?, ?, ?)
+                ON CONFLICT(teacher_id) DO UPDATE SET
+                    name = excluded.name,
+                    designation = excluded.designation,
+                    department = excluded.department,
+                    joining_date = excluded.joining_date,
+                    bank_account = excluded.bank_account,
+                    pf_no = excluded.pf_no
             ''', (
                 emp_data['id'],
                 emp_data['name'],
@@ -167,24 +55,25 @@ class DatabaseHandler:
             ))
 
             conn.commit()
-            conn.close()
             return True
 
         except Exception as e:
+            db_config.get_connection().rollback()
             print(f"Save employee error: {str(e)}")
             return False
 
     def get_employee(self, emp_id):
         """Retrieve employee information"""
         try:
-            conn = sqlite3.connect(self.db_name)
+            conn = db_config.get_connection()
             cursor = conn.cursor()
 
-            cursor.execute('SELECT * FROM employees WHERE id = ?', (emp_id,))
+            cursor.execute('''
+                SELECT teacher_id, name, designation, department, joining_date, bank_account, pf_no
+                FROM teachers WHERE teacher_id = ?
+            ''', (emp_id,))
             result = cursor.fetchone()
-            
-            conn.close()
-            
+
             if result:
                 return {
                     'id': result[0],
@@ -204,7 +93,7 @@ class DatabaseHandler:
     def save_salary_slip(self, emp_id, pay_period, earnings, deductions, totals):
         """Save salary slip information"""
         try:
-            conn = sqlite3.connect(self.db_name)
+            conn = db_config.get_connection()
             cursor = conn.cursor()
 
             cursor.execute('''
@@ -213,6 +102,14 @@ class DatabaseHandler:
                 other_allowances, pf, professional_tax, income_tax, other_deductions,
                 gross_salary, total_deductions, net_salary)
                 VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                ON CONFLICT (employee_id, pay_period) DO UPDATE SET
+                    basic_salary = excluded.basic_salary, da = excluded.da, hra = excluded.hra,
+                    conveyance = excluded.conveyance, medical = excluded.medical,
+                    other_allowances = excluded.other_allowances, pf = excluded.pf,
+                    professional_tax = excluded.professional_tax, income_tax = excluded.income_tax,
+                    other_deductions = excluded.other_deductions, gross_salary = excluded.gross_salary,
+                    total_deductions = excluded.total_deductions, net_salary = excluded.net_salary,
+                    generated_at = CURRENT_TIMESTAMP
             ''', (
                 emp_id,
                 pay_period,
@@ -231,19 +128,23 @@ class DatabaseHandler:
                 float(totals['net_salary'])
             ))
 
-            slip_id = cursor.lastrowid
+            # Saving a period's slip again updates it in place
+            slip_id = cursor.execute(
+                'SELECT slip_id FROM salary_slips WHERE employee_id = ? AND pay_period = ?',
+                (emp_id, pay_period)
+            ).fetchone()[0]
             conn.commit()
-            conn.close()
             return slip_id
 
         except Exception as e:
+            db_config.get_connection().rollback()
             print(f"Save salary slip error: {str(e)}")
             return None
 
     def save_payment(self, slip_id, amount, payment_method, payment_details):
         """Save payment information"""
         try:
-            conn = sqlite3.connect(self.db_name)
+            conn = db_config.get_connection()
             cursor = conn.cursor()
 
             transaction_id = datetime.now().strftime('%Y%m%d%H%M%S')
@@ -262,17 +163,17 @@ class DatabaseHandler:
             ))
 
             conn.commit()
-            conn.close()
             return transaction_id
 
         except Exception as e:
+            db_config.get_connection().rollback()
             print(f"Save payment error: {str(e)}")
             return None
 
     def get_salary_history(self, emp_id):
         """Retrieve salary history for an employee"""
         try:
-            conn = sqlite3.connect(self.db_name)
+            conn = db_config.get_connection()
             cursor = conn.cursor()
 
             cursor.execute('''
@@ -284,8 +185,7 @@ class DatabaseHandler:
             ''', (emp_id,))
             
             results = cursor.fetchall()
-            conn.close()
-            
+
             history = []
             for row in results:
                 history.append({
@@ -308,7 +208,7 @@ class DatabaseHandler:
     def get_payment_details(self, slip_id):
         """Retrieve payment details for a salary slip"""
         try:
-            conn = sqlite3.connect(self.db_name)
+            conn = db_config.get_connection()
             cursor = conn.cursor()
 
             cursor.execute('''
@@ -316,8 +216,7 @@ class DatabaseHandler:
             ''', (slip_id,))
             
             result = cursor.fetchone()
-            conn.close()
-            
+
             if result:
                 return {
                     'payment_id': result[0],
@@ -334,8 +233,15 @@ class DatabaseHandler:
             print(f"Get payment details error: {str(e)}")
             return None
 
-# Create an instance of the database
-db = Database()
+# Built on first use instead of at import
+app_context.register('teacher_db', Database)
+app_context.register('db_handler', DatabaseHandler)
+
 
-# Create an instance of the database handler
-db_handler = DatabaseHandler() 
\ No newline at end of file
+def __getattr__(name):
+    # db and db_handler used to be created at import; keep the names working
+    if name == 'db':
+        return app_context.get('teacher_db')
+    if name == 'db_handler':
+        return app_context.get('db_handler')
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -1,14 +1,9 @@
-import sqlite3
-import os
+from database.db_config import db_config
 
 class DatabaseHandler:
     def __init__(self):
-        # Get the path to the database file
-        current_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
-        db_path = os.path.join(current_dir, 'school_data.db')
-        
-        # Connect to the database
-        self.conn = sqlite3.connect(db_path)
+        # Borrow the pooled connection to the consolidated database
+        self.conn = db_config.get_connection()
         self.cursor = self.conn.cursor()
     
     def get_teacher_details(self, teacher_id):
@@ -33,5 +28,5 @@ class DatabaseHandler:
         self.conn.commit()
     
     def close(self):
-        """Close the database connection"""
-        self.conn.close() 
\ No newline at end of file
+        """Release the cursor; the connection stays with the shared pool"""
+        self.cursor.close() 
\ No newline at end of file
@@ -1,17 +1,27 @@
-from database import db
+from database.app_context import app_context
+from database.payroll import run_monthly_payroll, get_payroll_run
+from database.payroll_summary import get_payroll_summary, summarize
+from database.identity_map import IdentityMap
 from datetime import datetime
 
+from screens.background_tasks import TaskCancelled
+
+
+def teacher_dao():
+    """The shared TeacherDAO, built on first use"""
+    return app_context.get('teacher_dao')
+
 class TeacherOperations:
     @staticmethod
     def get_teacher(teacher_id):
         """Get teacher details by ID"""
-        return db.get_teacher_details(teacher_id)
+        return teacher_dao().get_teacher_details(teacher_id)
     
     @staticmethod
     def add_teacher(teacher_data):
         """Add a new teacher"""
         try:
-            db.add_teacher(teacher_data)
+            teacher_dao().add_teacher(teacher_data)
             return True, "Teacher added successfully"
         except Exception as e:
             return False, f"Error adding teacher: {str(e)}"
@@ -20,7 +30,7 @@ class TeacherOperations:
     def update_salary(teacher_id, salary_data):
         """Update teacher's salary structure"""
         try:
-            db.update_salary_structure(teacher_id, salary_data)
+            teacher_dao().update_salary_structure(teacher_id, salary_data)
             return True, "Salary structure updated successfully"
         except Exception as e:
             return False, f"Error updating salary: {str(e)}"
@@ -31,7 +41,7 @@ class PayrollOperations:
         """Process salary for a teacher"""
         try:
             # Get teacher details with salary structure
-            teacher = db.get_teacher_details(teacher_id)
+            teacher = teacher_dao().get_teacher_details(teacher_id)
             if not teacher:
                 return False, "Teacher not found"
             
@@ -68,12 +78,28 @@ class PayrollOperations:
         except Exception as e:
             return False, f"Error processing salary: {str(e)}"
     
+    @staticmethod
+    def process_monthly_payroll(month_year, working_days, holidays, progress_callback=None):
+        """Process salary slips and payments for every teacher in one batch"""
+        try:
+            result = run_monthly_payroll(month_year, working_days, holidays,
+                                         progress_callback=progress_callback)
+            return True, result
+        except TaskCancelled:
+            # Let the background task see the cancellation
+            raise
+        except Exception as e:
+            run = get_payroll_run(month_year)
+            # A run refused because another is under way leaves that run's row as it is
+            if run and run[1] != 'running':
+                return False, f"Payroll stopped after {run[3]} of {run[2]} teachers ({str(e)}); run it again to resume"
+            return False, f"Error processing payroll: {str(e)}"
+    
     @staticmethod
     def record_payment(payment_data):
-        """Record a salary payment"""
+        """Queue a salary payment; the result is the write queue Future of its ID"""
         try:
-            payment_id = db.record_salary_payment(payment_data)
-            return True, f"Payment recorded with ID: {payment_id}"
+            return True, teacher_dao().record_salary_payment(payment_data)
         except Exception as e:
             return False, f"Error recording payment: {str(e)}"
     
@@ -81,80 +107,118 @@ class PayrollOperations:
     def get_payment_history(teacher_id):
         """Get payment history for a teacher"""
         try:
-            history = db.get_payment_history(teacher_id)
+            history = teacher_dao().get_payment_history(teacher_id)
             return True, history
         except Exception as e:
             return False, f"Error fetching payment history: {str(e)}"
 
+def slip_data(teacher, payment):
+    """Salary slip data from teacher details and a salary_payments row"""
+    return {
+        'teacher': teacher,
+        'payment': {
+            'payment_date': payment[2],
+            'month_year': payment[3],
+            'working_days': payment[4],
+            'holidays': payment[5],
+            'total_earnings': payment[6],
+            'total_deductions': payment[7],
+            'net_salary': payment[8],
+            'payment_method': payment[9],
+            'payment_status': payment[10]
+        }
+    }
+
 class ReportOperations:
     @staticmethod
-    def generate_salary_slip(teacher_id, month_year):
-        """Generate salary slip data"""
+    def generate_salary_slip(teacher_id, month_year, identity_map=None):
+        """Generate salary slip data; pass one identity_map to reuse rows across calls of a report"""
         try:
+            identity_map = identity_map if identity_map is not None else IdentityMap()
+
             # Get teacher details
-            teacher = db.get_teacher_details(teacher_id)
+            teacher = identity_map.get('teacher', teacher_id, teacher_dao().get_teacher_details)
             if not teacher:
                 return False, "Teacher not found"
             
-            # Get payment record for the month
-            payments = db.get_payment_history(teacher_id)
-            payment = next((p for p in payments if p[3] == month_year), None)
+            # Get payment record for the month by its (month_year, teacher_id) key
+            payment = identity_map.get('payment', (teacher_id, month_year), lambda key: teacher_dao().get_payment(*key))
             
             if not payment:
                 return False, "Payment record not found for the specified month"
             
-            slip_data = {
-                'teacher': teacher,
-                'payment': {
-                    'payment_date': payment[2],
-                    'month_year': payment[3],
-                    'working_days': payment[4],
-                    'holidays': payment[5],
-                    'total_earnings': payment[6],
-                    'total_deductions': payment[7],
-                    'net_salary': payment[8],
-                    'payment_method': payment[9],
-                    'payment_status': payment[10]
-                }
-            }
-            
-            return True, slip_data
+            return True, slip_data(teacher, payment)
         except Exception as e:
             return False, f"Error generating salary slip: {str(e)}"
     
     @staticmethod
-    def get_monthly_payroll_summary(month_year):
-        """Get summary of all payments for a month"""
+    def generate_salary_slips(month_year, teacher_ids=None):
+        """Generate slip data for every teacher paid in a month (or the given ones) in two queries"""
         try:
-            query = '''
-            SELECT 
-                t.name,
-                t.department,
-                p.total_earnings,
-                p.total_deductions,
-                p.net_salary,
-                p.payment_status
-            FROM salary_payments p
-            JOIN teachers t ON p.teacher_id = t.teacher_id
-            WHERE p.month_year = ?
-            '''
-            db.cursor.execute(query, (month_year,))
-            results = db.cursor.fetchall()
-            
+            payments = teacher_dao().get_month_payments(month_year, teacher_ids)
+            teachers = teacher_dao().get_teachers_details(list(payments))
+            slips = [
+                slip_data(teachers[teacher_id], payment)
+                for teacher_id, payment in payments.items()
+                if teacher_id in teachers
+            ]
+            return True, slips
+        except Exception as e:
+            return False, f"Error generating salary slips: {str(e)}"
+    
+    @staticmethod
+    def get_monthly_payroll_summary(month_year, include_payments=True):
+        """Get summary of all payments for a month; totals come from the payroll rollup"""
+        try:
+            rows = get_payroll_summary(month_year=month_year)
+            totals = summarize(rows, 'month_year').get(month_year, {})
             summary = {
                 'month_year': month_year,
-                'total_payments': len(results),
-                'total_amount': sum(r[4] for r in results),
-                'payments': [{
+                'total_payments': totals.get('payments', 0),
+                'total_amount': totals.get('net_salary', 0.0),
+                'total_earnings': totals.get('total_earnings', 0.0),
+                'total_deductions': totals.get('total_deductions', 0.0),
+                'by_department': summarize(rows, 'department'),
+                'by_status': summarize(rows, 'payment_status')
+            }
+
+            if include_payments:
+                query = '''
+                SELECT 
+                    t.name,
+                    t.department,
+                    p.total_earnings,
+                    p.total_deductions,
+                    p.net_salary,
+                    p.payment_status
+                FROM salary_payments p
+                JOIN teachers t ON p.teacher_id = t.teacher_id
+                WHERE p.month_year = ?
+                '''
+                teacher_dao().cursor.execute(query, (month_year,))
+                summary['payments'] = [{
                     'name': r[0],
                     'department': r[1],
                     'earnings': r[2],
                     'deductions': r[3],
                     'net_salary': r[4],
                     'status': r[5]
-                } for r in results]
-            }
+                } for r in teacher_dao().cursor.fetchall()]
             
             return True, summary
         except Exception as e:
-            return False, f"Error generating monthly summary: {str(e)}" 
\ No newline at end of file
+            return False, f"Error generating monthly summary: {str(e)}"
+    
+    @staticmethod
+    def get_yearly_payroll_summary(year):
+        """Get month and department totals of a year's payroll from the rollup"""
+        try:
+            rows = get_payroll_summary(year=year)
+            return True, {
+                'year': year,
+                'by_month': summarize(rows, 'month_year'),
+                'by_department': summarize(rows, 'department'),
+                'by_status': summarize(rows, 'payment_status')
+            }
+        except Exception as e:
+            return False, f"Error generating yearly summary: {str(e)}" 
\ No newline at end of file
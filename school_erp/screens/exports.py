@@ -0,0 +1,63 @@
+import os
+from PyQt6.QtWidgets import QFileDialog, QMessageBox
+from database.exporter import EXPORT_FORMATS, export_dataset, write_rows
+
+from screens.background_tasks import run_in_background
+
+EXPORT_FILTERS = "CSV Files (*.csv);;Excel Workbook (*.xlsx);;Parquet Files (*.parquet)"
+
+
+def choose_export_path(parent, default_name):
+    """Ask where to save an export; the extension picks the format. None when cancelled"""
+    file_path, selected_filter = QFileDialog.getSaveFileName(parent, "Export Data", default_name, EXPORT_FILTERS)
+    if not file_path:
+        return None
+    if os.path.splitext(file_path)[1].lower() not in EXPORT_FORMATS:
+        # Take the extension of the chosen filter, e.g. "(*.xlsx)"
+        file_path += selected_filter[selected_filter.rfind('*') + 1:-1]
+    return file_path
+
+
+def _report(parent, result):
+    QMessageBox.information(parent, "Export Complete",
+                            f"Exported {result['rows']} rows to:\n{result['path']}")
+
+
+def export_dataset_in_background(parent, name, default_name, **params):
+    """Stream one of the exporter's named datasets to a file the user picks"""
+    file_path = choose_export_path(parent, default_name)
+    if file_path:
+        run_in_background(
+            export_dataset, name, file_path,
+            on_result=lambda result: _report(parent, result),
+            on_error=lambda error: QMessageBox.critical(parent, "Error", f"Export failed: {error}"),
+            message=f"Exporting {name}...",
+            report_progress=True,
+            **params
+        )
+
+
+def export_view_in_background(parent, view, default_name):
+    """Export the rows a RowTableModel-backed view shows, in its current order and filter"""
+    file_path = choose_export_path(parent, default_name)
+    if not file_path:
+        return
+
+    proxy = view.model()
+    model = proxy.sourceModel()
+    model.fetch_all()
+    rows = [list(model.row_data(proxy.source_row(row))) for row in range(proxy.rowCount())]
+    # Headers past the row width are action columns, which hold no data
+    width = max((len(row) for row in rows), default=len(model.headers))
+    headers = model.headers[:width]
+
+    def write():
+        count = write_rows(file_path, headers, [rows])
+        return {'path': file_path, 'rows': count}
+
+    run_in_background(
+        write,
+        on_result=lambda result: _report(parent, result),
+        on_error=lambda error: QMessageBox.critical(parent, "Error", f"Export failed: {error}"),
+        message="Exporting table..."
+    )
@@ -0,0 +1,71 @@
+from PyQt6.QtWidgets import QStackedWidget, QWidget
+from PyQt6.QtCore import QTimer
+
+# Idle time (ms) after a tab switch before the next tab is prefetched
+PREFETCH_DELAY_MS = 300
+
+
+class LazyPageStack(QStackedWidget):
+    """QStackedWidget that builds each page the first time it is shown.
+
+    Pages are registered as factories (a page class or a create_*_page
+    method). Until a page is needed its slot holds an empty placeholder, so a
+    department window opens after building only its first tab. With prefetch
+    enabled, the tab after the current one is built once the event loop has
+    been idle for PREFETCH_DELAY_MS; Qt widgets can only be created on the GUI
+    thread, so prefetching happens there between user events.
+    """
+
+    def __init__(self, parent=None, prefetch=True):
+        super().__init__(parent)
+        self.prefetch_enabled = prefetch
+        self._factories = []
+        self._pages = {}
+        self._prefetch_timer = QTimer(self)
+        self._prefetch_timer.setSingleShot(True)
+        self._prefetch_timer.timeout.connect(self._prefetch_next)
+
+    def add_page(self, factory):
+        """Register a page factory and return its index"""
+        index = len(self._factories)
+        self._factories.append(factory)
+        self.addWidget(QWidget())
+        if index == self.currentIndex():
+            self.page(index)
+            self._schedule_prefetch()
+        return index
+
+    def is_loaded(self, index):
+        return index in self._pages
+
+    def page(self, index):
+        """Return the page at index, building it on first use"""
+        if index in self._pages:
+            return self._pages[index]
+
+        page = self._factories[index]()
+        placeholder = self.widget(index)
+        current = self.currentIndex()
+        # Qt moves the current index when the current widget is removed
+        self.blockSignals(True)
+        self.removeWidget(placeholder)
+        self.insertWidget(index, page)
+        super().setCurrentIndex(current)
+        self.blockSignals(False)
+        placeholder.deleteLater()
+        self._pages[index] = page
+        return page
+
+    def setCurrentIndex(self, index):
+        self.page(index)
+        super().setCurrentIndex(index)
+        self._schedule_prefetch()
+
+    def _schedule_prefetch(self):
+        if self.prefetch_enabled:
+            self._prefetch_timer.start(PREFETCH_DELAY_MS)
+
+    def _prefetch_next(self):
+        next_index = self.currentIndex() + 1
+        if next_index < len(self._factories) and not self.is_loaded(next_index):
+            self.page(next_index)
@@ -1,13 +1,19 @@
 import sys
-import os
-import sqlite3
 from PyQt6.QtWidgets import (
     QApplication, QWidget, QLabel, QLineEdit, QPushButton,
     QVBoxLayout, QHBoxLayout, QCheckBox, QFrame, QMessageBox
 )
 from PyQt6.QtGui import QFont
 from PyQt6.QtCore import Qt
-from .main_window import MainWindow
+from database.db_config import db_config
+from screens.background_tasks import run_in_background
+
+def fetch_user(username, password, role):
+    """Look up a user row; runs on a background thread"""
+    cursor = db_config.get_connection().cursor()
+    cursor.execute("SELECT * FROM users WHERE username = ? AND password = ? AND role = ?",
+                   (username, password, role))
+    return cursor.fetchone()
 
 class LoginScreen(QWidget):
     def __init__(self):
@@ -102,29 +108,26 @@ class LoginScreen(QWidget):
 
     def verify_login(self, username, password, role):
         """Verify login credentials from SQLite database"""
-        # Get the absolute path to the database
-        db_path = os.path.join(os.path.dirname(os.path.dirname(__file__)), "screens", "users.db")
-        
-        try:
-            conn = sqlite3.connect(db_path)
-            cursor = conn.cursor()
-
-            cursor.execute("SELECT * FROM users WHERE username = ? AND password = ? AND role = ?", 
-                         (username, password, role.lower().replace(' login', '')))
-            user = cursor.fetchone()
-
-            conn.close()
-
-            if user:
-                QMessageBox.information(self, "Login Successful", f"Welcome {role.replace(' Login', '')}!")
-                self.open_main_application(role)
-            else:
-                QMessageBox.warning(self, "Login Failed", "Invalid username or password.")
-        except sqlite3.Error as e:
-            QMessageBox.critical(self, "Database Error", f"Error accessing database: {str(e)}")
+        run_in_background(
+            fetch_user, username, password, role.lower().replace(' login', ''),
+            on_result=lambda user: self.finish_login(user, role),
+            on_error=lambda error: QMessageBox.critical(self, "Database Error", f"Error accessing database: {error}"),
+            message="Checking credentials..."
+        )
+
+    def finish_login(self, user, role):
+        """Open the application once the credentials are checked"""
+        if user:
+            QMessageBox.information(self, "Login Successful", f"Welcome {role.replace(' Login', '')}!")
+            self.open_main_application(role)
+        else:
+            QMessageBox.warning(self, "Login Failed", "Invalid username or password.")
 
     def open_main_application(self, role):
         """Open the main application based on user role"""
+        # Imported here: the main window pulls in the department screens,
+        # which the login window should not wait for
+        from screens.main_window import MainWindow
         self.main_window = MainWindow()
         self.main_window.show()
         self.close()
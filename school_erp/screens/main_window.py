@@ -1,8 +1,9 @@
 import sys
 from PyQt6.QtWidgets import QMainWindow, QWidget, QVBoxLayout, QTabWidget
 from PyQt6.QtCore import Qt
-from .SalarySlip import SalarySlip
-from .ExamDepartment import ExamDepartment
+# SalarySlip.py is the standalone PyQt5 app; embed the PyQt6 salary slip form
+from screens.admin_screen import SalarySlipWidget as SalarySlip
+from screens.ExamDepartment import ExamDepartment
 
 class MainWindow(QMainWindow):
     def __init__(self):
@@ -0,0 +1,182 @@
+from PyQt6.QtWidgets import (QApplication, QWidget, QVBoxLayout, QHBoxLayout, QLabel, QPushButton,
+                             QComboBox, QDateEdit, QTableWidget, QTableWidgetItem, QHeaderView,
+                             QMessageBox)
+from PyQt6.QtCore import Qt, QDate
+import sys
+
+from database.migrations import PRESENT_STATUSES
+from database.student_dao import StudentDAO, ATTENDANCE_STATUSES
+from screens.background_tasks import run_in_background, when_committed, TaskStatusBar
+
+
+class RollCallScreen(QWidget):
+    """Morning roll call: mark a whole class section for a day and save it in one write"""
+
+    def __init__(self, initial_section=None):
+        super().__init__()
+        self.setWindowTitle("Roll Call - School ERP")
+        self.setGeometry(150, 100, 900, 700)
+        # (class, section) to open on, e.g. from the Discipline attendance report
+        self.initial_section = initial_section
+        self.student_ids = []
+        self.initUI()
+        self.load_sections()
+
+    def initUI(self):
+        layout = QVBoxLayout(self)
+        layout.setContentsMargins(20, 20, 20, 20)
+
+        title = QLabel("Class Roll Call")
+        title.setStyleSheet("font-size: 22px; font-weight: bold; color: #2c3e50;")
+        layout.addWidget(title)
+
+        controls = QHBoxLayout()
+        controls.addWidget(QLabel("Class:"))
+        self.section_combo = QComboBox()
+        self.section_combo.setMinimumWidth(180)
+        self.section_combo.currentIndexChanged.connect(self.load_students)
+        controls.addWidget(self.section_combo)
+
+        controls.addWidget(QLabel("Date:"))
+        self.date_edit = QDateEdit(QDate.currentDate())
+        self.date_edit.setCalendarPopup(True)
+        self.date_edit.setDisplayFormat("yyyy-MM-dd")
+        self.date_edit.dateChanged.connect(self.load_students)
+        controls.addWidget(self.date_edit)
+        controls.addStretch()
+
+        all_present_btn = QPushButton("Mark All Present")
+        all_present_btn.clicked.connect(lambda: self.set_all('Present'))
+        controls.addWidget(all_present_btn)
+
+        self.save_btn = QPushButton("Save Attendance")
+        self.save_btn.setStyleSheet("""
+            QPushButton {
+                background-color: #27ae60;
+                color: white;
+                padding: 8px 16px;
+                border-radius: 4px;
+                font-weight: bold;
+            }
+            QPushButton:hover {
+                background-color: #219a52;
+            }
+        """)
+        self.save_btn.clicked.connect(self.save_attendance)
+        controls.addWidget(self.save_btn)
+        layout.addLayout(controls)
+
+        self.table = QTableWidget()
+        self.table.setColumnCount(5)
+        self.table.setHorizontalHeaderLabels(["Roll No", "Name", "Status", "Days Present", "Attendance %"])
+        self.table.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeMode.Stretch)
+        self.table.verticalHeader().setVisible(False)
+        layout.addWidget(self.table)
+
+        footer = QHBoxLayout()
+        self.count_label = QLabel()
+        self.count_label.setStyleSheet("font-weight: bold; color: #2c3e50;")
+        footer.addWidget(self.count_label)
+        footer.addStretch()
+        footer.addWidget(TaskStatusBar())
+        layout.addLayout(footer)
+
+    def selected_section(self):
+        return self.section_combo.currentData()
+
+    def selected_date(self):
+        return self.date_edit.date().toString("yyyy-MM-dd")
+
+    def load_sections(self):
+        run_in_background(
+            StudentDAO.get_class_sections,
+            on_result=self.show_sections,
+            on_error=lambda error: QMessageBox.critical(self, "Error", f"Failed to load classes: {error}"),
+            message="Loading classes..."
+        )
+
+    def show_sections(self, sections):
+        self.section_combo.blockSignals(True)
+        self.section_combo.clear()
+        for class_name, section in sections:
+            label = f"{class_name} - {section}" if section else class_name
+            self.section_combo.addItem(label, (class_name, section))
+        if self.initial_section is not None:
+            index = self.section_combo.findData(tuple(self.initial_section))
+            if index >= 0:
+                self.section_combo.setCurrentIndex(index)
+        self.section_combo.blockSignals(False)
+        self.load_students()
+
+    def load_students(self):
+        selected = self.selected_section()
+        if selected is None:
+            return
+        run_in_background(
+            StudentDAO.get_class_attendance, selected[0], selected[1], self.selected_date(),
+            on_result=self.show_students,
+            on_error=lambda error: QMessageBox.critical(self, "Error", f"Failed to load students: {error}"),
+            message="Loading roll call..."
+        )
+
+    def show_students(self, rows):
+        self.student_ids = [row[0] for row in rows]
+        self.table.setRowCount(len(rows))
+        for i, (student_id, roll_no, name, status, present_days, total_days, percentage) in enumerate(rows):
+            for col, value in ((0, roll_no), (1, name), (3, f"{present_days} / {total_days}"),
+                               (4, f"{percentage:.1f}%" if percentage is not None else "-")):
+                item = QTableWidgetItem(str(value))
+                item.setFlags(item.flags() & ~Qt.ItemFlag.ItemIsEditable)
+                self.table.setItem(i, col, item)
+
+            combo = QComboBox()
+            combo.addItems(ATTENDANCE_STATUSES)
+            # Unmarked students start as present; the teacher only changes the exceptions
+            combo.setCurrentText(status or 'Present')
+            combo.currentTextChanged.connect(self.update_count)
+            self.table.setCellWidget(i, 2, combo)
+        self.update_count()
+
+    def statuses(self):
+        return {
+            student_id: self.table.cellWidget(i, 2).currentText()
+            for i, student_id in enumerate(self.student_ids)
+        }
+
+    def set_all(self, status):
+        for i in range(len(self.student_ids)):
+            self.table.cellWidget(i, 2).setCurrentText(status)
+
+    def update_count(self):
+        statuses = self.statuses().values()
+        present = sum(1 for status in statuses if status in PRESENT_STATUSES)
+        self.count_label.setText(f"Present: {present} / {len(self.student_ids)}")
+
+    def save_attendance(self):
+        selected = self.selected_section()
+        if selected is None or not self.student_ids:
+            QMessageBox.warning(self, "Roll Call", "No students to mark.")
+            return
+
+        # Only the exceptions travel; everyone else is marked Present by the same statement
+        exceptions = {sid: status for sid, status in self.statuses().items() if status != 'Present'}
+        self.save_btn.setEnabled(False)
+        future = StudentDAO.mark_class_attendance(selected[0], selected[1], self.selected_date(), exceptions)
+        when_committed(future, on_result=self.attendance_saved, on_error=self.attendance_failed)
+
+    def attendance_saved(self, result):
+        self.save_btn.setEnabled(True)
+        QMessageBox.information(self, "Roll Call",
+                                f"Attendance saved for {len(self.student_ids)} students.")
+        self.load_students()
+
+    def attendance_failed(self, error):
+        self.save_btn.setEnabled(True)
+        QMessageBox.critical(self, "Error", f"Failed to save attendance: {error}")
+
+
+if __name__ == "__main__":
+    app = QApplication(sys.argv)
+    window = RollCallScreen()
+    window.show()
+    sys.exit(app.exec())
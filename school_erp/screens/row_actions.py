@@ -0,0 +1,155 @@
+from PyQt6.QtWidgets import QStyledItemDelegate, QStyleOptionViewItem, QStyle, QApplication
+from PyQt6.QtCore import Qt, QRect, QSize, QEvent, QAbstractProxyModel, pyqtSignal
+from PyQt6.QtGui import QColor, QPainter
+
+# Button colours per action: (background, hover background, text)
+BUTTON_COLORS = {
+    "Update": ("#1a73e8", "#1557b0", "#ffffff"),
+    "View": ("#28a745", "#218838", "#ffffff"),
+    "View Details": ("#1a73e8", "#1557b0", "#ffffff"),
+    "Delete": ("#dc3545", "#c82333", "#ffffff"),
+    "Download": ("#f0f2f5", "#e4e6e9", "#000000"),
+}
+DEFAULT_COLORS = BUTTON_COLORS["Update"]
+
+BUTTON_HEIGHT = 26
+BUTTON_MIN_WIDTH = 60
+BUTTON_PADDING = 10
+BUTTON_SPACING = 6
+
+
+class RowActionDelegate(QStyledItemDelegate):
+    """Paints a row's action buttons (Update/View/Delete/Download) in one column.
+
+    No widget is created per row: every visible cell of the column is painted
+    from the same list of action labels and clicks are hit-tested against the
+    painted button rectangles. actionTriggered(action, row_id) reports the
+    clicked label and the row id, which is the source model row (mapped
+    through any sort/filter proxy) unless a row_id(index) callable is given.
+    """
+
+    actionTriggered = pyqtSignal(str, object)
+
+    def __init__(self, actions, parent=None, row_id=None):
+        super().__init__(parent)
+        self.actions = list(actions)
+        self.row_id = row_id
+        self._mouse_pos = None
+        self._colors = {}
+
+    def _color(self, color):
+        if color not in self._colors:
+            self._colors[color] = QColor(color)
+        return self._colors[color]
+
+    def _button_rects(self, option):
+        """Return (action, rect) for each button, centred in the cell"""
+        metrics = option.fontMetrics
+        widths = [
+            max(BUTTON_MIN_WIDTH, metrics.horizontalAdvance(action) + 2 * BUTTON_PADDING)
+            for action in self.actions
+        ]
+        total = sum(widths) + BUTTON_SPACING * (len(widths) - 1)
+        cell = option.rect
+        height = min(BUTTON_HEIGHT, cell.height() - 4)
+        x = cell.x() + max(0, (cell.width() - total) // 2)
+        y = cell.y() + (cell.height() - height) // 2
+
+        rects = []
+        for action, width in zip(self.actions, widths):
+            rects.append((action, QRect(x, y, width, height)))
+            x += width + BUTTON_SPACING
+        return rects
+
+    def _action_at(self, option, pos):
+        if pos is None:
+            return None
+        for action, rect in self._button_rects(option):
+            if rect.contains(pos):
+                return action
+        return None
+
+    def _resolve_row_id(self, index):
+        if self.row_id is not None:
+            return self.row_id(index)
+        model = index.model()
+        while isinstance(model, QAbstractProxyModel):
+            index = model.mapToSource(index)
+            model = index.model()
+        return index.row()
+
+    def paint(self, painter, option, index):
+        # Cell background and selection as usual, without the cell text
+        cell_option = QStyleOptionViewItem(option)
+        self.initStyleOption(cell_option, index)
+        cell_option.text = ""
+        style = cell_option.widget.style() if cell_option.widget else QApplication.style()
+        style.drawControl(QStyle.ControlElement.CE_ItemViewItem, cell_option, painter, cell_option.widget)
+
+        hovered = None
+        if option.state & QStyle.StateFlag.State_MouseOver:
+            hovered = self._action_at(option, self._mouse_pos)
+
+        painter.save()
+        painter.setRenderHint(QPainter.RenderHint.Antialiasing)
+        for action, rect in self._button_rects(option):
+            background, hover, text = BUTTON_COLORS.get(action, DEFAULT_COLORS)
+            painter.setPen(Qt.PenStyle.NoPen)
+            painter.setBrush(self._color(hover if action == hovered else background))
+            painter.drawRoundedRect(rect, 3, 3)
+            painter.setPen(self._color(text))
+            painter.drawText(rect, Qt.AlignmentFlag.AlignCenter, action)
+        painter.restore()
+
+    def sizeHint(self, option, index):
+        rects = self._button_rects(option)
+        width = rects[-1][1].right() - rects[0][1].left() if rects else 0
+        return QSize(width + 2 * BUTTON_SPACING, BUTTON_HEIGHT + 8)
+
+    def editorEvent(self, event, model, option, index):
+        event_type = event.type()
+        if event_type == QEvent.Type.MouseMove:
+            pos = event.position().toPoint()
+            # Repaint the cell only when the pointer moves onto another button
+            if self._action_at(option, pos) != self._action_at(option, self._mouse_pos):
+                self._mouse_pos = pos
+                if option.widget is not None:
+                    option.widget.viewport().update(option.rect)
+            else:
+                self._mouse_pos = pos
+            return False
+
+        if event_type in (QEvent.Type.MouseButtonPress, QEvent.Type.MouseButtonRelease,
+                          QEvent.Type.MouseButtonDblClick):
+            if event.button() != Qt.MouseButton.LeftButton:
+                return False
+            action = self._action_at(option, event.position().toPoint())
+            if action is None:
+                return False
+            if event_type == QEvent.Type.MouseButtonRelease:
+                self.actionTriggered.emit(action, self._resolve_row_id(index))
+            # Clicking a button does not change the selection
+            return True
+
+        return super().editorEvent(event, model, option, index)
+
+
+def set_row_actions(view, column, handlers, row_id=None):
+    """Paint a button per handler in column of view and dispatch its clicks.
+
+    handlers maps each button label to a callable taking the row id (None
+    for a button that does nothing yet); buttons are drawn in the order
+    given. Returns the delegate, which is owned by the view.
+    """
+    delegate = RowActionDelegate(handlers.keys(), view, row_id)
+
+    def dispatch(action, row):
+        handler = handlers.get(action)
+        if handler is not None:
+            handler(row)
+
+    delegate.actionTriggered.connect(dispatch)
+    view.setItemDelegateForColumn(column, delegate)
+    # Mouse moves reach the delegate only with tracking on (for hover colours)
+    view.setMouseTracking(True)
+    return delegate
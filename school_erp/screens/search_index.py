@@ -0,0 +1,127 @@
+from PyQt6.QtCore import QTimer
+
+# Length of the substrings the index is keyed on
+GRAM_SIZE = 3
+
+# Pause (ms) after the last keystroke before a search runs
+SEARCH_DELAY_MS = 250
+
+
+def _grams(cells):
+    grams = set()
+    for cell in cells:
+        for i in range(len(cell) - GRAM_SIZE + 1):
+            grams.add(cell[i:i + GRAM_SIZE])
+    return grams
+
+
+class SearchIndex:
+    """Lowercase trigram index over the text cells of a table's rows.
+
+    Cells are lowercased and split into trigrams once, when a row is added or
+    updated, instead of on every keystroke. A query is answered from the
+    postings of its trigrams and only those candidates get a substring check;
+    a query that extends the previous one only re-checks the previous matches.
+    Rows are addressed by their position in the caller's list, and insert and
+    remove shift the later positions the same way list.insert/list.pop do.
+    """
+
+    def __init__(self, search_columns=None, rows=None):
+        self.search_columns = search_columns
+        self.rebuild(rows or [])
+
+    def rebuild(self, rows):
+        """Index rows from scratch"""
+        self._postings = {}
+        self._cells = {}
+        self._keys = []
+        self._positions = {}
+        self._next_key = 0
+        self._last = None
+        for row in rows:
+            self.append(row)
+
+    def __len__(self):
+        return len(self._keys)
+
+    def _index(self, key, row):
+        columns = self.search_columns if self.search_columns is not None else range(len(row))
+        cells = tuple(str(row[c]).lower() for c in columns if c < len(row) and row[c] is not None)
+        self._cells[key] = cells
+        for gram in _grams(cells):
+            self._postings.setdefault(gram, set()).add(key)
+
+    def _unindex(self, key):
+        for gram in _grams(self._cells.pop(key)):
+            keys = self._postings[gram]
+            keys.discard(key)
+            if not keys:
+                del self._postings[gram]
+
+    def append(self, row):
+        self.insert(len(self._keys), row)
+
+    def insert(self, position, row):
+        # Keys stay fixed while positions shift, so postings never need renumbering
+        key = self._next_key
+        self._next_key += 1
+        self._index(key, row)
+        if position == len(self._keys) and self._positions is not None:
+            self._positions[key] = position
+        else:
+            self._positions = None
+        self._keys.insert(position, key)
+        self._last = None
+
+    def update(self, position, row):
+        key = self._keys[position]
+        self._unindex(key)
+        self._index(key, row)
+        self._last = None
+
+    def remove(self, position):
+        self._unindex(self._keys.pop(position))
+        self._positions = None
+        self._last = None
+
+    def _candidates(self, query):
+        if self._last is not None and query.startswith(self._last[0]):
+            return self._last[1]
+        if len(query) < GRAM_SIZE:
+            # Shorter than a gram: check every row, on pre-lowercased cells
+            return self._cells.keys()
+        postings = sorted(
+            (self._postings.get(query[i:i + GRAM_SIZE], set()) for i in range(len(query) - GRAM_SIZE + 1)),
+            key=len
+        )
+        return postings[0].intersection(*postings[1:])
+
+    def search(self, text):
+        """Return the positions of rows with a cell containing text, or None for an empty query"""
+        query = text.lower()
+        if not query:
+            self._last = None
+            return None
+
+        matched = {key for key in self._candidates(query) if any(query in cell for cell in self._cells[key])}
+        self._last = (query, matched)
+
+        if self._positions is None:
+            self._positions = {key: position for position, key in enumerate(self._keys)}
+        return {self._positions[key] for key in matched}
+
+
+def debounce_text_changed(line_edit, handler, delay_ms=SEARCH_DELAY_MS):
+    """Call handler(text) once typing in line_edit pauses for delay_ms; returns the timer"""
+    timer = QTimer(line_edit)
+    timer.setSingleShot(True)
+    timer.setInterval(delay_ms)
+    timer.timeout.connect(lambda: handler(line_edit.text()))
+    line_edit.textChanged.connect(lambda text: timer.start())
+    return timer
+
+
+def hide_unmatched_rows(table, rows):
+    """Show only the given rows of a QTableWidget; None shows every row"""
+    for row in range(table.rowCount()):
+        table.setRowHidden(row, rows is not None and row not in rows)
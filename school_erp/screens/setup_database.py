@@ -1,73 +1,16 @@
 import os
-import sqlite3
+import sys
+
+# Make the school_erp root importable when run as a script
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from database.db_config import db_config
 
 def setup_database():
-    # Get the absolute path to the database
-    db_path = os.path.join(os.path.dirname(__file__), "school_erp.db")
-    
-    # Connect to the database
-    conn = sqlite3.connect(db_path)
+    # Tables come from the consolidated schema migrations
+    conn = db_config.get_connection()
     cursor = conn.cursor()
     
-    # Create teachers table
-    cursor.execute('''
-    CREATE TABLE IF NOT EXISTS teachers (
-        teacher_id TEXT PRIMARY KEY,
-        name TEXT,
-        mother_name TEXT,
-        dob TEXT,
-        age INTEGER,
-        cast_category TEXT,
-        place TEXT,
-        tal TEXT,
-        dist TEXT,
-        state TEXT,
-        adar_no TEXT,
-        contact_no TEXT,
-        designation TEXT,
-        department TEXT,
-        joining_date TEXT,
-        bank_account TEXT,
-        pf_no TEXT
-    )
-    ''')
-    
-    # Create salary_structure table
-    cursor.execute('''
-    CREATE TABLE IF NOT EXISTS salary_structure (
-        teacher_id TEXT,
-        basic_salary REAL,
-        da_amount REAL,
-        hra_amount REAL,
-        conveyance REAL,
-        medical REAL,
-        other_allowances REAL,
-        pf_deduction REAL,
-        professional_tax REAL,
-        income_tax REAL,
-        other_deductions REAL,
-        FOREIGN KEY (teacher_id) REFERENCES teachers (teacher_id)
-    )
-    ''')
-    
-    # Create salary_payments table
-    cursor.execute('''
-    CREATE TABLE IF NOT EXISTS salary_payments (
-        payment_id INTEGER PRIMARY KEY AUTOINCREMENT,
-        teacher_id TEXT,
-        payment_date TEXT,
-        month_year TEXT,
-        working_days INTEGER,
-        holidays INTEGER,
-        total_earnings REAL,
-        total_deductions REAL,
-        net_salary REAL,
-        payment_method TEXT,
-        payment_status TEXT,
-        FOREIGN KEY (teacher_id) REFERENCES teachers (teacher_id)
-    )
-    ''')
-    
     # Insert some sample data
     sample_teacher = (
         'T001', 'John Doe', 'Jane Doe', '1990-01-01', 33, 'General',
@@ -94,9 +37,8 @@ def setup_database():
     VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
     ''', sample_salary)
     
-    # Commit changes and close connection
+    # Commit changes
     conn.commit()
-    conn.close()
     
     print("Database setup completed successfully!")
 
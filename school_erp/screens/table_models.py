@@ -0,0 +1,237 @@
+from PyQt6.QtWidgets import QTableView, QHeaderView, QAbstractItemView
+from PyQt6.QtCore import Qt, QAbstractTableModel, QModelIndex, QSortFilterProxyModel
+from PyQt6.QtGui import QColor
+
+# Rows handed to the view per fetchMore call
+FETCH_BATCH_SIZE = 200
+
+
+class RowTableModel(QAbstractTableModel):
+    """Read-only table model over a list of rows or an executed DB cursor.
+
+    The view only ever sees the rows fetched so far: canFetchMore/fetchMore
+    hand them over FETCH_BATCH_SIZE at a time as the user scrolls, and cursor
+    rows are not even read from SQLite until then. Cells are produced on
+    demand in data(), so no per-cell item objects are allocated.
+
+    headers may name more columns than the rows carry (e.g. an Actions
+    column); those cells are empty. foreground maps a column to
+    {value: color} (the None key is the fallback colour), alignment maps a
+    column to a Qt.AlignmentFlag and formatters map a column to a callable
+    producing the display text.
+    """
+
+    def __init__(self, headers, rows=None, parent=None, batch_size=FETCH_BATCH_SIZE):
+        super().__init__(parent)
+        self.headers = list(headers)
+        self.batch_size = batch_size
+        self.foreground = {}
+        self.alignment = {}
+        self.formatters = {}
+        self.default_alignment = None
+        self._rows = []
+        self._cursor = None
+        self._loaded = 0
+        self._colors = {}
+        if rows is not None:
+            self.set_rows(rows)
+
+    def set_rows(self, rows):
+        """Show a list of row sequences; the list is kept, not copied"""
+        self.beginResetModel()
+        self._rows = rows
+        self._cursor = None
+        self._loaded = min(len(rows), self.batch_size)
+        self.endResetModel()
+
+    def set_cursor(self, cursor):
+        """Show the rows of an executed cursor, reading them as the view scrolls"""
+        self.beginResetModel()
+        self._rows = []
+        self._cursor = cursor
+        self._loaded = 0
+        self.endResetModel()
+
+    def rows(self):
+        """All rows read so far (every row for list-backed models)"""
+        return self._rows
+
+    def row_data(self, row):
+        return self._rows[row]
+
+    def fetch_all(self):
+        """Hand every remaining row to the view"""
+        while self.canFetchMore():
+            self.fetchMore()
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else self._loaded
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.headers)
+
+    def canFetchMore(self, parent=QModelIndex()):
+        if parent.isValid():
+            return False
+        return self._cursor is not None or self._loaded < len(self._rows)
+
+    def fetchMore(self, parent=QModelIndex()):
+        if parent.isValid():
+            return
+        if self._cursor is not None:
+            batch = self._cursor.fetchmany(self.batch_size)
+            if len(batch) < self.batch_size:
+                self._cursor = None
+            self._rows.extend(batch)
+            count = len(self._rows) - self._loaded
+        else:
+            count = min(self.batch_size, len(self._rows) - self._loaded)
+        if count <= 0:
+            return
+        self.beginInsertRows(QModelIndex(), self._loaded, self._loaded + count - 1)
+        self._loaded += count
+        self.endInsertRows()
+
+    def _color(self, color):
+        if color not in self._colors:
+            self._colors[color] = QColor(color)
+        return self._colors[color]
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid():
+            return None
+        row = self._rows[index.row()]
+        column = index.column()
+        value = row[column] if column < len(row) else None
+
+        if role == Qt.ItemDataRole.DisplayRole:
+            if column in self.formatters:
+                return self.formatters[column](value)
+            return "" if value is None else str(value)
+        if role == Qt.ItemDataRole.UserRole:
+            return value
+        if role == Qt.ItemDataRole.ForegroundRole and column in self.foreground:
+            colors = self.foreground[column]
+            color = colors.get(value, colors.get(None))
+            return self._color(color) if color is not None else None
+        if role == Qt.ItemDataRole.TextAlignmentRole:
+            return self.alignment.get(column, self.default_alignment)
+        return None
+
+    def headerData(self, section, orientation, role=Qt.ItemDataRole.DisplayRole):
+        if role != Qt.ItemDataRole.DisplayRole:
+            return None
+        if orientation == Qt.Orientation.Horizontal:
+            return self.headers[section] if section < len(self.headers) else None
+        return str(section + 1)
+
+    def flags(self, index):
+        if not index.isValid():
+            return Qt.ItemFlag.NoItemFlags
+        return Qt.ItemFlag.ItemIsEnabled | Qt.ItemFlag.ItemIsSelectable
+
+
+class TableFilterProxyModel(QSortFilterProxyModel):
+    """Sorting and filtering for a RowTableModel.
+
+    set_search_text keeps rows where any of search_columns contains the text
+    (case-insensitive); set_matched_rows keeps only the source rows found by
+    a SearchIndex; set_column_filter adds a predicate on one column's value.
+    Numbers stored as text ("30", "85%") sort numerically.
+    """
+
+    def __init__(self, source, search_columns=None, parent=None):
+        super().__init__(parent)
+        self.setSourceModel(source)
+        self.setSortRole(Qt.ItemDataRole.UserRole)
+        self.search_columns = search_columns
+        self._search_text = ""
+        self._matched_rows = None
+        self._column_filters = {}
+
+    def set_search_text(self, text):
+        self._search_text = text.lower()
+        if self._search_text:
+            # Filter over every row, not only those fetched so far
+            self.sourceModel().fetch_all()
+        self.invalidateFilter()
+
+    def set_matched_rows(self, rows):
+        """Only show these source rows; None shows every row"""
+        self._matched_rows = rows
+        if rows is not None:
+            self.sourceModel().fetch_all()
+        self.invalidateFilter()
+
+    def set_column_filter(self, column, predicate):
+        """Filter on one column's value; a None predicate removes the filter"""
+        if predicate is None:
+            self._column_filters.pop(column, None)
+        else:
+            self._column_filters[column] = predicate
+            self.sourceModel().fetch_all()
+        self.invalidateFilter()
+
+    def source_row(self, proxy_row):
+        """Map a visible row number back to the source model row"""
+        return self.mapToSource(self.index(proxy_row, 0)).row()
+
+    def filterAcceptsRow(self, source_row, source_parent):
+        if self._matched_rows is not None and source_row not in self._matched_rows:
+            return False
+        row = self.sourceModel().row_data(source_row)
+        for column, predicate in self._column_filters.items():
+            if not predicate(row[column]):
+                return False
+        if not self._search_text:
+            return True
+        columns = self.search_columns if self.search_columns is not None else range(len(row))
+        return any(self._search_text in str(row[c]).lower() for c in columns)
+
+    def lessThan(self, left, right):
+        left_value = left.data(Qt.ItemDataRole.UserRole)
+        right_value = right.data(Qt.ItemDataRole.UserRole)
+        left_key, right_key = _sort_key(left_value), _sort_key(right_value)
+        if type(left_key) is type(right_key):
+            return left_key < right_key
+        # Numbers sort before text
+        return isinstance(left_key, float)
+
+
+def _sort_key(value):
+    if value is None:
+        return ""
+    if isinstance(value, (int, float)):
+        return float(value)
+    text = str(value)
+    try:
+        return float(text.rstrip('%').replace(',', ''))
+    except ValueError:
+        return text.lower()
+
+
+def create_table_view(model, search_columns=None, stretch=True):
+    """Create a sortable, row-selecting QTableView over model through a filter proxy.
+
+    Returns (view, proxy). Rows have a fixed height so the view never has to
+    measure them when laying out large tables.
+    """
+    proxy = TableFilterProxyModel(model, search_columns)
+    view = QTableView()
+    view.setModel(proxy)
+    # Keep the rows in their given order until a header is clicked
+    view.horizontalHeader().setSortIndicator(-1, Qt.SortOrder.AscendingOrder)
+    view.setSortingEnabled(True)
+    view.setSelectionBehavior(QAbstractItemView.SelectionBehavior.SelectRows)
+    view.setSelectionMode(QAbstractItemView.SelectionMode.SingleSelection)
+    view.setEditTriggers(QAbstractItemView.EditTrigger.NoEditTriggers)
+    view.verticalHeader().setDefaultSectionSize(36)
+    view.verticalHeader().setSectionResizeMode(QHeaderView.ResizeMode.Fixed)
+    if stretch:
+        view.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeMode.Stretch)
+    else:
+        # ResizeToContents would measure every row; size from the first batch instead
+        view.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeMode.Interactive)
+        model.modelReset.connect(view.resizeColumnsToContents)
+    return view, proxy
+
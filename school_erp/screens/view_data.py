@@ -1,61 +1,80 @@
-from database import db
+from database.db_config import db_config
+
+# Teachers with their salary structure and payments in one ordered pass
+TEACHER_PAYMENTS_QUERY = '''
+    SELECT t.teacher_id, t.name, t.mother_name, t.dob, t.department, t.designation,
+           t.contact_no, t.adar_no,
+           s.basic_salary, s.da_amount, s.hra_amount, s.conveyance, s.medical,
+           s.other_allowances, s.pf_deduction, s.professional_tax, s.income_tax,
+           s.other_deductions,
+           p.payment_id, p.month_year, p.payment_date, p.working_days, p.holidays,
+           p.total_earnings, p.total_deductions, p.net_salary, p.payment_method,
+           p.payment_status
+    FROM teachers t
+    LEFT JOIN salary_structure s ON s.teacher_id = t.teacher_id
+    LEFT JOIN salary_payments p ON p.teacher_id = t.teacher_id
+    ORDER BY t.teacher_id, p.payment_date
+'''
+
+def print_teacher(row):
+    print("\nTeacher Details:")
+    print(f"Name: {row[1]}")
+    print(f"ID: {row[0]}")
+    print(f"Mother's Name: {row[2]}")
+    print(f"DOB: {row[3]}")
+    print(f"Department: {row[4]}")
+    print(f"Designation: {row[5]}")
+    print(f"Contact: {row[6]}")
+    print(f"Aadhar: {row[7]}")
+    print("-" * 50)
+
+    if row[8] is not None:
+        print("Salary Structure:")
+        print(f"Basic Salary: ₹{row[8]}")
+        print(f"DA: ₹{row[9]}")
+        print(f"HRA: ₹{row[10]}")
+        print(f"Conveyance: ₹{row[11]}")
+        print(f"Medical: ₹{row[12]}")
+        print(f"Other Allowances: ₹{row[13]}")
+        print("\nDeductions:")
+        print(f"PF: ₹{row[14]}")
+        print(f"Professional Tax: ₹{row[15]}")
+        print(f"Income Tax: ₹{row[16]}")
+        print(f"Other Deductions: ₹{row[17]}")
+    print("=" * 100)
+
+def print_payment(row):
+    print(f"\nMonth/Year: {row[19]}")
+    print(f"Payment Date: {row[20]}")
+    print(f"Working Days: {row[21]}")
+    print(f"Holidays: {row[22]}")
+    print(f"Total Earnings: ₹{row[23]}")
+    print(f"Total Deductions: ₹{row[24]}")
+    print(f"Net Salary: ₹{row[25]}")
+    print(f"Payment Method: {row[26]}")
+    print(f"Status: {row[27]}")
 
 def view_all_data():
     print("\n=== TEACHERS DATA ===")
     print("-" * 100)
-    
-    # Get all teachers
-    db.cursor.execute("SELECT * FROM teachers")
-    teachers = db.cursor.fetchall()
-    
-    for teacher in teachers:
-        print("\nTeacher Details:")
-        print(f"Name: {teacher[1]}")
-        print(f"ID: {teacher[0]}")
-        print(f"Mother's Name: {teacher[2]}")
-        print(f"DOB: {teacher[3]}")
-        print(f"Department: {teacher[13]}")
-        print(f"Designation: {teacher[12]}")
-        print(f"Contact: {teacher[11]}")
-        print(f"Aadhar: {teacher[10]}")
-        print("-" * 50)
-        
-        # Get salary structure for this teacher
-        db.cursor.execute("SELECT * FROM salary_structure WHERE teacher_id = ?", (teacher[0],))
-        salary = db.cursor.fetchone()
-        if salary:
-            print("Salary Structure:")
-            print(f"Basic Salary: ₹{salary[1]}")
-            print(f"DA: ₹{salary[2]}")
-            print(f"HRA: ₹{salary[3]}")
-            print(f"Conveyance: ₹{salary[4]}")
-            print(f"Medical: ₹{salary[5]}")
-            print(f"Other Allowances: ₹{salary[6]}")
-            print("\nDeductions:")
-            print(f"PF: ₹{salary[7]}")
-            print(f"Professional Tax: ₹{salary[8]}")
-            print(f"Income Tax: ₹{salary[9]}")
-            print(f"Other Deductions: ₹{salary[10]}")
-        print("=" * 100)
-        
-        # Get payment history
-        db.cursor.execute("SELECT * FROM salary_payments WHERE teacher_id = ?", (teacher[0],))
-        payments = db.cursor.fetchall()
-        if payments:
-            print("\nPayment History:")
-            for payment in payments:
-                print(f"\nMonth/Year: {payment[3]}")
-                print(f"Payment Date: {payment[2]}")
-                print(f"Working Days: {payment[4]}")
-                print(f"Holidays: {payment[5]}")
-                print(f"Total Earnings: ₹{payment[6]}")
-                print(f"Total Deductions: ₹{payment[7]}")
-                print(f"Net Salary: ₹{payment[8]}")
-                print(f"Payment Method: {payment[9]}")
-                print(f"Status: {payment[10]}")
+
+    # One query instead of two more per teacher; rows arrive grouped by teacher
+    cursor = db_config.get_connection().execute(TEACHER_PAYMENTS_QUERY)
+    current = None
+    for row in cursor:
+        if row[0] != current:
+            if current is not None:
+                print("\n" + "=" * 100)
+            current = row[0]
+            print_teacher(row)
+            if row[18] is not None:
+                print("\nPayment History:")
+        if row[18] is not None:
+            print_payment(row)
+    if current is not None:
         print("\n" + "=" * 100)
 
 if __name__ == "__main__":
     print("Viewing Database Contents...")
     view_all_data()
-    print("\nDone viewing data!") 
\ No newline at end of file
+    print("\nDone viewing data!")
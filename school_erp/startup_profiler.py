@@ -0,0 +1,86 @@
+"""
+School ERP System - Startup Profiler
+Measures how long the login window takes to appear and which imports it
+pays for, against a time budget:
+
+    python main.py --profile-startup --startup-budget 400 --module-budget 50
+
+Import times come from a fresh interpreter run with -X importtime, so they
+are not hidden by modules this process has already loaded. Exits non-zero
+when the startup budget is exceeded.
+"""
+
+import os
+import subprocess
+import sys
+import time
+
+# Module main.py imports to show the first window
+STARTUP_MODULE = 'screens.login_screen'
+
+# Milliseconds from launch to a visible login window
+DEFAULT_STARTUP_BUDGET_MS = 500
+
+# Milliseconds any single import (with everything it imports) may take
+DEFAULT_MODULE_BUDGET_MS = 50
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+
+
+def import_times(module=STARTUP_MODULE):
+    """[(module, self_ms, cumulative_ms, depth)] for importing module in a fresh interpreter"""
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', f'import {module}'],
+        cwd=ROOT, capture_output=True, text=True
+    )
+    if result.returncode != 0:
+        raise RuntimeError(f"Importing {module} failed:\n{result.stderr.strip().splitlines()[-1]}")
+
+    times = []
+    for line in result.stderr.splitlines():
+        if not line.startswith('import time:') or 'self [us]' in line:
+            continue
+        self_us, cumulative_us, name = line[len('import time:'):].split('|')
+        # Nested imports are indented two spaces per level
+        depth = (len(name) - len(name.lstrip()) - 1) // 2
+        times.append((name.strip(), int(self_us) / 1000, int(cumulative_us) / 1000, depth))
+    return times
+
+
+def time_login_window():
+    """Milliseconds to import, build and show the login window in this process"""
+    start = time.perf_counter()
+    from PyQt6.QtWidgets import QApplication
+    from screens.login_screen import LoginScreen
+
+    app = QApplication.instance() or QApplication([sys.argv[0]])
+    window = LoginScreen()
+    window.show()
+    app.processEvents()
+    elapsed = (time.perf_counter() - start) * 1000
+    window.close()
+    return elapsed
+
+
+def profile_startup(budget_ms=DEFAULT_STARTUP_BUDGET_MS, module_budget_ms=DEFAULT_MODULE_BUDGET_MS,
+                    top=15):
+    """Print the startup report; returns 0 within budget, 1 over it"""
+    times = import_times()
+    total_ms = next(cumulative for name, _, cumulative, _ in times if name == STARTUP_MODULE)
+    window_ms = time_login_window()
+
+    print(f"Import {STARTUP_MODULE}: {total_ms:8.1f} ms (fresh interpreter)")
+    print(f"Login window shown:     {window_ms:8.1f} ms (budget {budget_ms:.0f} ms)")
+    print()
+    print(f"Slowest imports (cumulative; over {module_budget_ms:.0f} ms flagged):")
+    print(f"  {'cumulative':>10}  {'self':>8}  module")
+    # The startup module itself is the total above
+    slowest = sorted((t for t in times if t[0] != STARTUP_MODULE), key=lambda t: t[2], reverse=True)
+    for name, self_ms, cumulative_ms, depth in slowest[:top]:
+        flag = "  OVER" if cumulative_ms > module_budget_ms else ""
+        print(f"  {cumulative_ms:8.1f} ms  {self_ms:5.1f} ms  {'  ' * depth}{name}{flag}")
+
+    over = window_ms > budget_ms
+    print()
+    print(f"Startup {'OVER' if over else 'within'} budget: {window_ms:.1f} / {budget_ms:.0f} ms")
+    return 1 if over else 0
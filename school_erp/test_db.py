@@ -0,0 +1,382 @@
+"""
+School ERP System - Database Tests
+Run from the school_erp folder against a throwaway database:
+
+    python -m unittest test_db
+"""
+
+import csv
+import os
+import shutil
+import sqlite3
+import tempfile
+import unittest
+import warnings
+import numpy as np
+from database.connection_pool import close_all_pools
+from database.db_config import db_config
+from database.exporter import export_query, write_rows
+from database.grading import grade_exam, grade_for, letter_grades, parse_boundaries, publish_exam_results
+from database.importer import import_file
+from database.payroll import run_monthly_payroll
+from database.payroll_summary import get_payroll_summary, rebuild_payroll_summary, summarize
+from database.student_dao import StudentDAO
+from database.write_queue import WriteQueue, write_queue
+
+MONTH = 'May 2026'
+
+
+class TempDatabaseTest(unittest.TestCase):
+    """Runs each test against a fresh database in a temporary folder"""
+
+    def setUp(self):
+        self.db_dir = tempfile.mkdtemp()
+        self.saved_path = db_config.db_path
+        db_config.db_path = os.path.join(self.db_dir, 'school_erp.db')
+        db_config._schema_ready = False
+        self.conn = db_config.get_connection()
+
+    def tearDown(self):
+        # The shared writer thread holds a connection to this test's database
+        write_queue.close()
+        close_all_pools()
+        db_config.db_path = self.saved_path
+        db_config._schema_ready = False
+        shutil.rmtree(self.db_dir)
+
+    def add_students(self, class_name, section, count):
+        ids = [f'{class_name}-{section}-{number:02d}' for number in range(count)]
+        self.conn.executemany(
+            'INSERT INTO students (student_id, name, roll_no, class, section) VALUES (?, ?, ?, ?, ?)',
+            [(student_id, f'Student {student_id}', str(number + 1), class_name, section)
+             for number, student_id in enumerate(ids)]
+        )
+        self.conn.commit()
+        return ids
+
+
+class PayrollSummaryTest(TempDatabaseTest):
+    def setUp(self):
+        super().setUp()
+        for number in range(12):
+            teacher_id = f'T{number:03d}'
+            self.conn.execute(
+                'INSERT INTO teachers (teacher_id, name, department) VALUES (?, ?, ?)',
+                (teacher_id, f'Teacher {number}', 'Science' if number % 2 else 'English')
+            )
+            self.conn.execute(
+                'INSERT INTO salary_structure (teacher_id, basic_salary, pf_deduction) VALUES (?, ?, ?)',
+                (teacher_id, 50000 + number * 1000, 1800)
+            )
+        self.conn.commit()
+
+    def totals(self):
+        return summarize(get_payroll_summary(month_year=MONTH), 'month_year')[MONTH]
+
+    def pay_slip(self, teacher_id):
+        """Pay a teacher's slip the way the salary slip screen's save_payment does"""
+        slip_id, net_salary = self.conn.execute(
+            'SELECT slip_id, net_salary FROM salary_slips WHERE employee_id = ? AND pay_period = ?',
+            (teacher_id, MONTH)
+        ).fetchone()
+        self.conn.execute('''
+            INSERT INTO payments (slip_id, amount, payment_method, transaction_id, payment_details, status)
+            VALUES (?, ?, 'Bank Transfer', '20260531120000', '', 'COMPLETED')
+        ''', (slip_id, net_salary))
+        self.conn.commit()
+
+    def assert_matches_rebuild(self):
+        rows = get_payroll_summary(month_year=MONTH)
+        rebuild_payroll_summary(months=[MONTH])
+        self.assertEqual(rows, get_payroll_summary(month_year=MONTH))
+
+    def test_batch_run_then_slip_payment_counts_each_teacher_once(self):
+        result = run_monthly_payroll(MONTH, working_days=26, holidays=4)
+        self.assertEqual(result['processed'], 12)
+
+        self.pay_slip('T000')
+        totals = self.totals()
+        self.assertEqual(totals['payments'], 12)
+        self.assertAlmostEqual(totals['net_salary'], result['total_net_salary'])
+        self.assert_matches_rebuild()
+
+    def test_slip_payment_counts_again_once_salary_payment_is_deleted(self):
+        result = run_monthly_payroll(MONTH, working_days=26, holidays=4)
+        self.pay_slip('T000')
+
+        self.conn.execute('DELETE FROM salary_payments WHERE teacher_id = ?', ('T000',))
+        self.conn.commit()
+        totals = self.totals()
+        self.assertEqual(totals['payments'], 12)
+        self.assertAlmostEqual(totals['net_salary'], result['total_net_salary'])
+        self.assert_matches_rebuild()
+
+        # Recording the salary payment again takes the slip payment back out
+        self.conn.execute('''
+            INSERT INTO salary_payments (teacher_id, month_year, total_earnings, total_deductions,
+                net_salary, payment_status)
+            VALUES ('T000', ?, 50000, 1800, 48200, 'Pending')
+        ''', (MONTH,))
+        self.conn.commit()
+        self.assertEqual(self.totals()['payments'], 12)
+        self.assert_matches_rebuild()
+
+
+class GradingTest(unittest.TestCase):
+    def test_ties_share_a_rank_and_unmarked_students_are_not_ranked(self):
+        marks = np.array([[90.0], [80.0], [80.0], [np.nan], [50.0]])
+        result = grade_exam(marks, np.full(marks.shape, 100.0))
+
+        self.assertEqual(result['rank'].tolist(), [1, 2, 2, 0, 4])
+        np.testing.assert_allclose(result['percentile'], [100.0, 75.0, 75.0, np.nan, 25.0])
+        self.assertEqual(result['grade'].tolist(), ['A+', 'A', 'A', None, 'C+'])
+
+    def test_ranks_and_percentiles_are_within_each_group(self):
+        marks = np.array([[90.0], [60.0], [70.0], [95.0]])
+        result = grade_exam(marks, np.full(marks.shape, 100.0), groups=['9th', '9th', '10th', '10th'])
+
+        self.assertEqual(result['rank'].tolist(), [1, 2, 2, 1])
+        self.assertEqual(result['percentile'].tolist(), [100.0, 50.0, 50.0, 100.0])
+
+    def test_unmarked_subjects_are_left_out_without_warnings(self):
+        nan = np.nan
+        marks = np.array([[40.0, nan, nan], [30.0, 45.0, nan]])
+        max_marks = np.array([[50.0, 50.0, 100.0], [50.0, 50.0, 100.0]])
+        with warnings.catch_warnings():
+            warnings.simplefilter('error')
+            result = grade_exam(marks, max_marks)
+
+        self.assertEqual(result['subjects'].tolist(), [1, 2])
+        self.assertEqual(result['total_marks'].tolist(), [40.0, 75.0])
+        self.assertEqual(result['max_marks'].tolist(), [50.0, 100.0])
+        self.assertEqual(result['percentage'].tolist(), [80.0, 75.0])
+        self.assertEqual(result['subject_grades'][0].tolist(), ['A', None, None])
+
+        stats = result['subject_stats']
+        self.assertEqual(stats['students'].tolist(), [2, 1, 0])
+        self.assertEqual(stats['mean'][0], 70.0)
+        self.assertEqual(stats['median'][1], 90.0)
+        self.assertTrue(np.isnan(stats['mean'][2]) and np.isnan(stats['pass_rate'][2]))
+
+    def test_boundaries_are_parsed_and_a_minimum_is_inclusive(self):
+        boundaries = parse_boundaries("75:A, 90:A+,0:F, 50.5:B")
+        self.assertEqual(boundaries, [(90.0, 'A+'), (75.0, 'A'), (50.5, 'B'), (0.0, 'F')])
+
+        self.assertEqual(letter_grades([90, 89.99, 50.5, 50.49, -5, np.nan], boundaries).tolist(),
+                         ['A+', 'A', 'B', 'F', 'F', None])
+        self.assertEqual(grade_for(33), 'D')
+        self.assertEqual(grade_for(32.9), 'F')
+
+    def test_malformed_or_duplicate_boundaries_are_refused(self):
+        with self.assertRaises(ValueError):
+            parse_boundaries("90A+,0:F")
+        with self.assertRaises(ValueError):
+            parse_boundaries("ninety:A+,0:F")
+        with self.assertRaises(ValueError):
+            letter_grades([50], [(60, 'A'), (60, 'B'), (0, 'F')])
+
+
+class PublishExamResultsTest(TempDatabaseTest):
+    def test_report_cards_rank_students_within_their_class(self):
+        ninth = self.add_students('9th', 'A', 2)
+        tenth = self.add_students('10th', 'A', 2)
+        marks = {ninth[0]: (45, 40), ninth[1]: (30, 20), tenth[0]: (35, 35), tenth[1]: (50, 48)}
+        for student_id, (maths, science) in marks.items():
+            self.conn.executemany(
+                "INSERT INTO exam_results (student_id, exam_name, subject, marks, max_marks) "
+                "VALUES (?, 'Term 1', ?, ?, 50)",
+                [(student_id, 'Maths', maths), (student_id, 'Science', science)]
+            )
+        self.conn.commit()
+
+        result = publish_exam_results('Term 1')
+        self.assertEqual(result['published'], 4)
+
+        cards = {row[0]: row[1:] for row in self.conn.execute(
+            'SELECT student_id, percentage, grade, class_rank FROM exam_report_cards WHERE exam_name = ?',
+            ('Term 1',)
+        )}
+        self.assertEqual(cards[ninth[0]], (85.0, 'A', 1))
+        self.assertEqual(cards[ninth[1]], (50.0, 'C+', 2))
+        self.assertEqual(cards[tenth[0]], (70.0, 'B+', 2))
+        self.assertEqual(cards[tenth[1]], (98.0, 'A+', 1))
+
+
+class WriteQueueTest(TempDatabaseTest):
+    def setUp(self):
+        super().setUp()
+        self.queue = WriteQueue(max_delay=0.2)
+
+    def tearDown(self):
+        self.queue.close()
+        super().tearDown()
+
+    def notices(self):
+        return [row[0] for row in self.conn.execute('SELECT title FROM notices ORDER BY id')]
+
+    def test_writes_commit_together_and_report_their_row_ids(self):
+        futures = [
+            self.queue.submit('INSERT INTO notices (title, content) VALUES (?, ?)', (f'Notice {i}', 'Text'))
+            for i in range(20)
+        ]
+        row_ids = [future.result(5) for future in futures]
+
+        self.assertEqual(row_ids, list(range(row_ids[0], row_ids[0] + 20)))
+        self.assertEqual(self.notices(), [f'Notice {i}' for i in range(20)])
+
+    def test_failed_write_fails_only_its_own_future(self):
+        before = self.queue.submit('INSERT INTO notices (title, content) VALUES (?, ?)', ('Before', 'Text'))
+        failing = self.queue.submit('INSERT INTO notices (title, content) VALUES (?, NULL)', ('Broken',))
+        after = self.queue.submit('INSERT INTO notices (title, content) VALUES (?, ?)', ('After', 'Text'))
+
+        self.assertIsInstance(failing.exception(5), sqlite3.IntegrityError)
+        self.assertIsNotNone(before.result(5))
+        self.assertIsNotNone(after.result(5))
+        self.assertEqual(self.notices(), ['Before', 'After'])
+
+    def test_flush_waits_for_queued_writes_and_executemany_reports_rowcount(self):
+        future = self.queue.submit('INSERT INTO notices (title, content) VALUES (?, ?)',
+                                   [(f'Notice {i}', 'Text') for i in range(5)], many=True)
+        self.queue.flush(5)
+
+        self.assertTrue(future.done())
+        self.assertEqual(future.result(), 5)
+        self.assertEqual(len(self.notices()), 5)
+
+
+class AttendanceCountersTest(TempDatabaseTest):
+    def setUp(self):
+        super().setUp()
+        self.students = self.add_students('10th', 'A', 5)
+
+    def counters(self):
+        return {row[0]: row[1:] for row in self.conn.execute(
+            'SELECT student_id, present_days, total_days, percentage FROM attendance_summary'
+        )}
+
+    def recounted(self):
+        return {row[0]: row[1:] for row in self.conn.execute(
+            "SELECT student_id, SUM(status IN ('Present', 'Late')), COUNT(*), "
+            "ROUND(100.0 * SUM(status IN ('Present', 'Late')) / COUNT(*), 2) "
+            "FROM attendance GROUP BY student_id"
+        )}
+
+    def mark(self, date, statuses=None):
+        StudentDAO.mark_class_attendance('10th', 'A', date, statuses).result(5)
+
+    def test_marking_a_day_again_replaces_its_marks_in_the_counters(self):
+        first, second = self.students[:2]
+        self.mark('2026-10-01', {first: 'Absent'})
+        self.mark('2026-10-02', {first: 'Late', second: 'Absent'})
+        self.assertEqual(self.counters()[first], (1, 2, 50.0))
+
+        # Re-mark both days for the whole section
+        self.mark('2026-10-01', {second: 'Excused'})
+        self.mark('2026-10-02')
+
+        counters = self.counters()
+        self.assertEqual(counters[first], (2, 2, 100.0))
+        self.assertEqual(counters[second], (1, 2, 50.0))
+        self.assertEqual(counters, self.recounted())
+        self.assertEqual(self.conn.execute('SELECT COUNT(*) FROM attendance').fetchone()[0], 10)
+
+    def test_deleting_marks_takes_them_out_of_the_counters(self):
+        self.mark('2026-10-01', {self.students[0]: 'Absent'})
+        self.mark('2026-10-02')
+        self.conn.execute("DELETE FROM attendance WHERE date = '2026-10-01'")
+        self.conn.commit()
+
+        self.assertEqual(self.counters()[self.students[0]], (1, 1, 100.0))
+        self.assertEqual(self.counters(), self.recounted())
+
+
+class ImporterTest(TempDatabaseTest):
+    def write_csv(self, name, rows):
+        path = os.path.join(self.db_dir, name)
+        with open(path, 'w', newline='', encoding='utf-8') as f:
+            csv.writer(f).writerows(rows)
+        return path
+
+    def students(self):
+        return self.conn.execute(
+            'SELECT student_id, name, roll_no, class, dob, phone FROM students ORDER BY student_id'
+        ).fetchall()
+
+    def test_valid_rows_are_upserted_and_invalid_rows_reported(self):
+        path = self.write_csv('students.csv', [
+            ['Student list 2026'],
+            ['Student ID', 'Student Name', 'Roll Number', 'Grade', 'Date of Birth', 'Mobile'],
+            ['101.0', 'Asha', '1', '10th', '15/08/2011', '9876543210.0'],
+            ['102', 'Ravi', '2', '10th', 'not a date', ''],
+            ['103', '', '3', '10th', '', ''],
+            ['', '', '', '', '', ''],
+            ['104', 'Meena', '4', '9th', '2012-01-05', ''],
+        ])
+        result = import_file(path, 'students')
+
+        self.assertEqual((result['rows'], result['imported'], result['errors']), (4, 2, 2))
+        self.assertEqual(self.students(), [
+            ('101', 'Asha', '1', '10th', '2011-08-15', '9876543210'),
+            ('104', 'Meena', '4', '9th', '2012-01-05', None),
+        ])
+        with open(result['error_report'], newline='', encoding='utf-8') as f:
+            report = list(csv.reader(f))
+        self.assertEqual(report[0], ['row', 'column', 'value', 'error'])
+        self.assertEqual([tuple(row[:3]) for row in report[1:]],
+                         [('4', 'dob', 'not a date'), ('5', 'name', '')])
+
+    def test_partial_sheet_updates_only_its_columns_and_dry_run_writes_nothing(self):
+        import_file(self.write_csv('full.csv', [
+            ['student_id', 'name', 'roll_no', 'class', 'phone'],
+            ['101', 'Asha', '1', '10th', '555'],
+        ]), 'students')
+
+        path = self.write_csv('rename.csv', [
+            ['student_id', 'name', 'roll_no', 'class'],
+            ['101', 'Asha K', '1', '10th'],
+            ['105', 'Ravi', '5', '10th'],
+        ])
+        dry_run = import_file(path, 'students', dry_run=True)
+        self.assertEqual((dry_run['imported'], dry_run['error_report']), (2, None))
+        self.assertEqual(len(self.students()), 1)
+
+        import_file(path, 'students')
+        self.assertEqual(self.students(), [
+            ('101', 'Asha K', '1', '10th', None, '555'),
+            ('105', 'Ravi', '5', '10th', None, None),
+        ])
+        self.assertFalse(os.path.exists(os.path.join(self.db_dir, 'rename.errors.csv')))
+
+    def test_sheet_without_required_columns_is_refused(self):
+        path = self.write_csv('bad.csv', [['student_id', 'name'], ['101', 'Asha']])
+        with self.assertRaises(ValueError):
+            import_file(path, 'students')
+        self.assertEqual(self.students(), [])
+
+
+class ExporterTest(TempDatabaseTest):
+    def read_parquet(self, path):
+        import pyarrow.parquet as pq
+        return pq.read_table(path).to_pydict()
+
+    def test_parquet_batch_that_does_not_fit_the_first_raises(self):
+        path = os.path.join(self.db_dir, 'x.parquet')
+        with self.assertRaises(ValueError):
+            write_rows(path, ['a', 'b'], [[(1, None), (2, None)], [(2.5, 'x'), (3, 4.0)]])
+        with self.assertRaises(ValueError):
+            write_rows(path, ['a'], [[('x',)], [(4.0,)]])
+
+    def test_parquet_export_keeps_values_that_change_type_between_batches(self):
+        self.conn.execute('CREATE TABLE mixed (a, b)')
+        self.conn.executemany('INSERT INTO mixed VALUES (?, ?)',
+                              [(1, None), (2, None), (2.5, 'x'), (3, 4.0)])
+        self.conn.commit()
+
+        path = os.path.join(self.db_dir, 'mixed.parquet')
+        result = export_query('SELECT a, b FROM mixed ORDER BY rowid', [], path, batch_size=2)
+        self.assertEqual(result['rows'], 4)
+        self.assertEqual(self.read_parquet(path), {'a': [1.0, 2.0, 2.5, 3.0], 'b': [None, None, 'x', '4.0']})
+
+
+if __name__ == "__main__":
+    unittest.main()